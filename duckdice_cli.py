@@ -33,6 +33,8 @@ CONFIG_DIR = Path.home() / '.duckdice'
 CONFIG_FILE = CONFIG_DIR / 'config.json'
 PROFILES_FILE = CONFIG_DIR / 'profiles.json'
 DB_FILE = CONFIG_DIR / 'history.db'
+CHECKPOINT_DIR = os.path.join('data', 'checkpoints')
+BENCH_DIR = os.path.join('data', 'bench')
 
 
 class ConfigManager:
@@ -261,7 +263,8 @@ def _show_strategy_desc(strategy_name: str, desc_map: dict) -> None:
 
 def run_strategy(strategy_name: str, params: Dict[str, Any], config: EngineConfig,
                 api_key: str = None, dry_run: bool = True, use_parallel: bool = False,
-                max_concurrent: int = 5, resume_state: Optional[Dict[str, Any]] = None):
+                max_concurrent: int = 5, resume_state: Optional[Dict[str, Any]] = None,
+                record_cassette: Optional[str] = None):
     """Run a betting strategy with enhanced display and runtime controls"""
     
     # Use rich display if available
@@ -318,6 +321,7 @@ def run_strategy(strategy_name: str, params: Dict[str, Any], config: EngineConfi
     # Progress bar for rich display
     progress = None
     task_id = None
+    recorder = None
     
     if USE_RICH and display and config.max_bets:
         progress = display.create_progress_bar(config.max_bets, f"Running {strategy_name}")
@@ -401,7 +405,17 @@ def run_strategy(strategy_name: str, params: Dict[str, Any], config: EngineConfi
         if not dry_run:
             if not api_key:
                 raise ValueError("API key required for live betting")
-            api = DuckDiceAPI(DuckDiceConfig(api_key=api_key))
+            api_config = DuckDiceConfig(api_key=api_key)
+            if record_cassette:
+                from duckdice_api.api import http_adapter
+                from duckdice_api.cassette import RecordingAdapter
+                recorder = RecordingAdapter(record_cassette, http_adapter(api_config), meta={
+                    'strategy': strategy_name, 'params': params, 'symbol': config.symbol,
+                    'seed': config.seed, 'base_url': api_config.base_url,
+                })
+                api_config.transport = recorder
+                print(f"📼 Recording requests to {record_cassette}")
+            api = DuckDiceAPI(api_config)
         else:
             # For simulation, use mock API
             api = MockDuckDiceAPI()
@@ -495,6 +509,11 @@ def run_strategy(strategy_name: str, params: Dict[str, Any], config: EngineConfi
         if progress:
             progress.__exit__(None, None, None)
 
+        if recorder:
+            recorder.close()
+            print(f"📼 Recorded {recorder.recorded} requests to {record_cassette} "
+                  f"(benchmark it: duckdice bench-cassette {record_cassette})")
+
         # Stop keypress adjuster
         try:
             _adjuster.stop()
@@ -715,11 +734,90 @@ def _run_faucet_auto_loop(strategy_name: str, params: Dict[str, Any],
     print(f"{'='*60}\n")
 
 
+def _checkpoint_path(args, strategy_name: str, symbol: str, dry_run: bool) -> Optional[str]:
+    """Per strategy/currency/mode checkpoint file (None when disabled)."""
+    if not getattr(args, 'checkpoint_every', 10):
+        return None
+    ckpt_dir = getattr(args, 'checkpoint_dir', None) or CHECKPOINT_DIR
+    mode = 'sim' if dry_run else 'live'
+    return os.path.join(ckpt_dir, f"{strategy_name}_{symbol.lower()}_{mode}.ckpt")
+
+
+def _find_resume_checkpoint(args) -> Optional[Dict[str, Any]]:
+    """Newest checkpoint of a crashed or cancelled session matching args."""
+    from betbot_engine.session_checkpoint import is_resumable, load_checkpoint
+
+    ckpt_dir = Path(getattr(args, 'checkpoint_dir', None) or CHECKPOINT_DIR)
+    best = None
+    for path in ckpt_dir.glob('*.ckpt'):
+        ckpt = load_checkpoint(str(path))
+        if not is_resumable(ckpt):
+            continue
+        if args.strategy and ckpt.get('strategy_name') != args.strategy:
+            continue
+        if args.currency and str(ckpt.get('symbol', '')).lower() != args.currency.lower():
+            continue
+        if best is None or ckpt.get('written_at', 0) > best.get('written_at', 0):
+            best = ckpt
+    return best
+
+
+def _load_checkpoint_resume(args, ckpt: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply --continue defaults from a session checkpoint to args."""
+    from betbot_engine.session_checkpoint import decode_values
+
+    if not args.strategy:
+        args.strategy = ckpt['strategy_name']
+    if not args.currency:
+        args.currency = ckpt['symbol']
+    if not args.mode:
+        args.mode = 'simulation' if ckpt.get('dry_run') else 'live-main'
+    if not args.profile and not args.params:
+        args._resume_params = decode_values(ckpt.get('params') or {})
+
+    limits = ckpt.get('limits') or {}
+    if args.stop_loss is None and limits.get('stop_loss') is not None:
+        args.stop_loss = limits['stop_loss']
+    if args.take_profit is None and limits.get('take_profit') is not None:
+        args.take_profit = limits['take_profit']
+    if args.max_bets is None and limits.get('max_bets') is not None:
+        args.max_bets = limits['max_bets']
+    if args.max_losses is None and limits.get('max_losses') is not None:
+        args.max_losses = limits['max_losses']
+    if args.max_duration is None and limits.get('max_duration_sec') is not None:
+        args.max_duration = limits['max_duration_sec']
+
+    state = ' (crashed)' if ckpt.get('stop_reason') is None else ''
+    print(f"\n♻️  Continuing session from checkpoint: {ckpt['session_id']}{state}")
+    print(f"   Strategy : {ckpt['strategy_name']}")
+    print(f"   Currency : {ckpt['symbol']}")
+    print(f"   Bal at checkpoint : {Decimal(ckpt['balance']):.8f}")
+    print(f"   Loss streak       : {ckpt.get('loss_streak', '?')} (will restore)")
+    print(f"   Bets done         : {ckpt.get('bets_done', '?')} (strategy progression will restore)")
+    print()
+    return {
+        'resumed_from': ckpt['session_id'],
+        'loss_streak': ckpt.get('loss_streak', 0),
+        'bet_number': ckpt.get('bets_done', 0),
+        'last_balance': float(ckpt['balance']),
+        'checkpoint': ckpt,
+    }
+
+
 def _load_resume_state(args) -> Optional[Dict[str, Any]]:
     """Load and apply --continue session defaults to args."""
     if not getattr(args, 'resume', False):
         return None
 
+    # A checkpoint restores everything (including strategy internals) without a DB scan
+    try:
+        _ckpt = _find_resume_checkpoint(args)
+    except Exception as _e:
+        print(f"⚠️  Could not read checkpoints ({_e}).")
+        _ckpt = None
+    if _ckpt:
+        return _load_checkpoint_resume(args, _ckpt)
+
     db_path = getattr(args, 'db_path', None) or 'data/duckdice_bot.db'
     try:
         from betbot_engine.bet_database import BetDatabase
@@ -771,6 +869,15 @@ def _load_resume_state(args) -> Optional[Dict[str, Any]]:
         print(f"   Currency : {_last['symbol']}")
         print(f"   Bal when stopped : {_ended_bal:.8f}")
         print(f"   Loss streak      : {_tail.get('loss_streak', '?')} (will restore)")
+        if _tail.get('strategy_state_bet'):
+            # Only strategies with on_resume() take the logged state back;
+            # the rest restart fresh (a --checkpoint-every checkpoint restores them)
+            try:
+                _restorable = hasattr(get_strategy(args.strategy), 'on_resume')
+            except Exception:
+                _restorable = False
+            _how = "will restore" if _restorable else "logged only; strategy restarts fresh"
+            print(f"   Strategy state   : as of bet {_tail['strategy_state_bet']} ({_how})")
         print(f"   Bets done        : {_last.get('total_bets', '?')}")
         print()
         return _resume_state
@@ -1035,6 +1142,20 @@ def cmd_run(args):
         jitter_ms=jitter_ms,
         db_log=getattr(args, 'db_log', True),
         db_path=getattr(args, 'db_path', None),
+        db_payloads=getattr(args, 'db_payloads', 'compressed'),
+        db_mode=getattr(args, 'db_mode', 'direct'),
+        db_service=getattr(args, 'db_service', None),
+        log_format=getattr(args, 'log_format', 'jsonl'),
+        log_fsync_every=getattr(args, 'log_fsync_every', 0),
+        log_rotate_mb=getattr(args, 'log_rotate_mb', None),
+        log_rotate_sec=getattr(args, 'log_rotate_sec', None),
+        log_compress=getattr(args, 'log_compress', False),
+        state_snapshot_every=getattr(args, 'state_snapshot_every', 100),
+        state_snapshot_sec=getattr(args, 'state_snapshot_sec', 60.0) or None,
+        state_deltas=getattr(args, 'state_deltas', False),
+        checkpoint_path=_checkpoint_path(args, strategy_name, currency, is_simulation),
+        checkpoint_every=max(1, getattr(args, 'checkpoint_every', 10) or 1),
+        checkpoint_fsync=getattr(args, 'checkpoint_fsync', False),
         tle_hash=tle_hash or None,
         lottery_enabled=bool(getattr(args, 'lottery', False)),
         lottery_min_gap=lottery_gap_min,
@@ -1043,6 +1164,9 @@ def cmd_run(args):
         lottery_max_chance=lottery_chance_max,
     )
 
+    if getattr(args, 'record_cassette', None) and (is_simulation or use_faucet):
+        print("⚠️  --record-cassette records live main/TLE sessions only; not recording.")
+
     # Run strategy (faucet mode uses the auto-reclaim loop)
     if use_faucet and not is_simulation:
         # Resolve cookie: CLI arg → saved file → None
@@ -1071,6 +1195,7 @@ def cmd_run(args):
             use_parallel=use_parallel,
             max_concurrent=max_concurrent,
             resume_state=_resume_state,
+            record_cassette=getattr(args, 'record_cassette', None),
         )
 
 
@@ -1991,6 +2116,27 @@ def cmd_simulate(args):
         traceback.print_exc()
 
 
+def _open_checkpoint(args, default_path):
+    """Sweep checkpoint for a long-running command, or None unless --checkpoint/--resume."""
+    from betbot_engine.sweep_checkpoint import SweepCheckpoint
+
+    if args.checkpoint is None and not args.resume:
+        return None
+    path = args.checkpoint or default_path
+    ckpt = SweepCheckpoint(path, resume=args.resume)
+    if args.resume:
+        print(f"↻  Resuming from checkpoint {path} ({ckpt.count()} stored units)")
+    return ckpt
+
+
+def _close_checkpoint(ckpt):
+    if ckpt is None:
+        return
+    if ckpt.resume:
+        print(f"↻  Reused {ckpt.hits} units from checkpoint, simulated {ckpt.stored}")
+    ckpt.close()
+
+
 def cmd_simulate_all(args):
     """Monte Carlo simulation of all strategies → comprehensive HTML report."""
     import sys
@@ -2024,8 +2170,11 @@ def cmd_simulate_all(args):
     print(f"   Bets/run     : {rounds}")
     print(f"   Start balance: ${balance:.2f}")
     print(f"   Seed         : {seed}")
+    if args.target_ci:
+        print(f"   Early stop   : ROI ±{args.target_ci:g}% (95% CI) after {args.min_runs} runs")
     print(f"   Output       : {output}\n")
 
+    checkpoint = _open_checkpoint(args, os.path.join("data", "checkpoints.db"))
     results = []
     for idx, name in enumerate(names):
         try:
@@ -2038,14 +2187,15 @@ def cmd_simulate_all(args):
         # Progress bar
         bar_width = 20
 
-        def progress(run_i: int, total: int):
-            filled = int(bar_width * run_i / max(total, 1))
+        def progress(run_p):
+            filled = int(bar_width * run_p.completed / max(run_p.total, 1))
             bar = "█" * filled + "░" * (bar_width - filled)
-            pct = int(run_i / max(total, 1) * 100)
-            print(f"\r  [{idx+1:2d}/{len(names)}] {name:<35s} [{bar}] {pct:3d}%",
+            pct = int(run_p.completed / max(run_p.total, 1) * 100)
+            est = f"roi≈{run_p.roi_mean:+.2f}±{run_p.roi_ci:.2f}%" if run_p.completed > 1 else ""
+            print(f"\r  [{idx+1:2d}/{len(names)}] {name:<35s} [{bar}] {pct:3d}% {est:<22s}",
                   end="", flush=True)
 
-        progress(0, n_runs)
+        print(f"\r  [{idx+1:2d}/{len(names)}] {name:<35s} [{'░' * bar_width}]   0%", end="", flush=True)
         try:
             result = simulate_strategy(
                 cls,
@@ -2054,14 +2204,19 @@ def cmd_simulate_all(args):
                 n_runs=n_runs,
                 starting_balance=balance,
                 base_seed=seed,
-                progress_cb=progress,
+                target_ci=args.target_ci,
+                min_runs=args.min_runs,
+                on_run=progress,
+                checkpoint=checkpoint,
             )
             results.append(result)
             roi_str = f"{result.roi_mean:+.2f}%"
             dd_str  = f"dd={result.max_drawdown_mean:.1%}"
-            print(f"\r  [{idx+1:2d}/{len(names)}] {name:<35s} ✅  roi={roi_str:<10} {dd_str}")
+            runs_str = f" ({result.n_runs} runs, converged)" if result.n_runs < n_runs else ""
+            print(f"\r  [{idx+1:2d}/{len(names)}] {name:<35s} ✅  roi={roi_str:<10} {dd_str}{runs_str}{' ' * 20}")
         except Exception as e:
             print(f"\r  [{idx+1:2d}/{len(names)}] {name:<35s} ❌  {e}")
+    _close_checkpoint(checkpoint)
 
     if not results:
         print("\n❌ All simulations failed — no report generated.")
@@ -2078,6 +2233,380 @@ def cmd_simulate_all(args):
         traceback.print_exc()
 
 
+def cmd_db_compact(args):
+    """Move inline api_raw / strategy_state into the compressed payload table."""
+    from betbot_engine.bet_database import BetDatabase
+
+    db_path = Path(args.db_path)
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+    print(f"🗜  Compacting {db_path}…")
+    stats = BetDatabase(db_path).compact_payloads(
+        sample_every=args.sample_every, vacuum=not args.no_vacuum,
+    )
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    ratio = f" ({before / after:.1f}× smaller)" if after else ""
+    print(f"✅ {stats['rows']:,} rows migrated, {stats['payloads']:,} unique payloads")
+    print(f"   {before / 1e6:,.1f} MB → {after / 1e6:,.1f} MB{ratio}")
+
+
+def cmd_db_export(args):
+    """Stream bet history to CSV / NDJSON / columnar, optionally compressed."""
+    from betbot_engine.bet_database import BetDatabase
+
+    db_path = Path(args.db_path)
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+    simulation_mode = {"sim": True, "live": False}.get(args.mode)
+    try:
+        rows = BetDatabase(db_path).export(
+            Path(args.output),
+            format=args.format,
+            compression=args.compression or "auto",
+            columns=args.columns,
+            session_id=args.session,
+            strategy=args.strategy,
+            symbol=args.symbol,
+            since=args.since,
+            until=args.until,
+            simulation_mode=simulation_mode,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    print(f"✅ Exported {rows:,} bets → {args.output}")
+
+
+def cmd_db_prune(args):
+    """Apply retention: drop old raw bets, keep aggregates and rollups."""
+    from betbot_engine.bet_database import BetDatabase
+
+    db_path = Path(args.db_path)
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+    rollup_days = {}
+    if args.minute_days is not None:
+        rollup_days["1m"] = args.minute_days
+    if args.hour_days is not None:
+        rollup_days["1h"] = args.hour_days
+    deleted = BetDatabase(db_path).apply_retention(raw_days=args.raw_days, rollup_days=rollup_days)
+    print(f"✅ Deleted {deleted['bets']:,} raw bets and {deleted['rollups']:,} rollup rows")
+
+
+def cmd_db_bets(args):
+    """Page through logged bets with continuation cursors."""
+    from betbot_engine.bet_database import BetDatabase
+
+    db_path = Path(args.db_path)
+    if not db_path.exists():
+        print(f"❌ Database not found: {db_path}")
+        return
+    simulation_mode = {"sim": True, "live": False}.get(args.mode)
+    try:
+        page = BetDatabase(db_path).bet_page(
+            cursor=args.cursor,
+            page_size=args.page_size,
+            columns=["id", "session_id", "bet_number", "symbol", "amount", "chance", "roll", "won",
+                     "profit", "balance"],
+            session_id=args.session,
+            strategy=args.strategy,
+            symbol=args.symbol,
+            simulation_mode=simulation_mode,
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    if args.json:
+        print(json.dumps({"items": page.items, "next_cursor": page.next_cursor, "total": page.total}))
+        return
+    for row in page.items:
+        outcome = "W" if row["won"] else "L"
+        print(f"{row['id']:>10} {row['session_id']} #{row['bet_number']:<6} {row['symbol']:<5} "
+              f"{row['amount']:.8f} @ {row['chance']:.2f}% roll={row['roll']} {outcome} "
+              f"profit={row['profit']:.8f} balance={row['balance']:.8f}")
+    total = f" of {page.total:,}" if page.total is not None else ""
+    print(f"— {len(page.items)} bets{total}")
+    if page.next_cursor:
+        print(f"   next page: --cursor {page.next_cursor}")
+
+
+def cmd_db_ingest(args):
+    """Replay JSONL session logs into a bet database (resumes per file)."""
+    from betbot_engine.bet_database import BetDatabase
+    from betbot_engine.log_ingest import ingest_logs
+
+    missing = [p for p in args.logs if not Path(p).exists()]
+    if missing:
+        print(f"❌ Not found: {', '.join(missing)}")
+        return
+    db = BetDatabase(Path(args.db_path), commit_every=1000)
+    totals = ingest_logs(db, args.logs)
+    db.close()
+    print(f"✅ Ingested {totals['bets']:,} bets from {totals['files']:,} log files → {args.db_path}")
+
+
+def cmd_db_serve(args):
+    """Own the database's write connection for every session that uses --db-service."""
+    from betbot_engine.db_service import DatabaseService
+
+    try:
+        service = DatabaseService(Path(args.db_path), address=args.address,
+                                  batch_size=args.batch_size, payloads=args.payloads).start()
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return
+    print(f"🗄️  Serving {args.db_path} on {service.address} (Ctrl+C to stop)")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        service.stop()
+    stats = service.writer_stats
+    print(f"✅ {stats['written']:,} bets written in {stats['batches']:,} transactions "
+          f"from {service.stats['clients']:,} connections")
+
+
+def cmd_simulate_throughput(args):
+    """Project bets/hour and wager/hour for a strategy under API latency and rate limits."""
+    import json
+    from betbot_engine.sim_kernel import run_dry_session
+    from betbot_engine.virtual_clock import LatencyModel, RateLimitModel, VirtualClock
+
+    params = {}
+    if args.config:
+        try:
+            params = json.loads(args.config)
+        except json.JSONDecodeError:
+            print(f"❌ Invalid JSON config: {args.config}")
+            return
+
+    config = EngineConfig(
+        symbol=args.currency,
+        dry_run=True,
+        max_bets=args.bets,
+        stop_loss=args.stop_loss,
+        take_profit=args.take_profit,
+        delay_ms=args.delay_ms,
+        jitter_ms=args.jitter_ms,
+        seed=args.seed,
+    )
+    try:
+        clock = VirtualClock(
+            latency=LatencyModel(rtt_ms=args.rtt_ms, jitter_ms=args.rtt_jitter_ms,
+                                 distribution=args.latency_dist),
+            rate_limit=RateLimitModel(max_requests=args.rate_limit, window_sec=args.rate_window,
+                                      backoff_ms=args.backoff_ms,
+                                      honor_retry_after=args.retry_after),
+            concurrency=args.concurrency,
+            seed=args.seed,
+        )
+        run = run_dry_session(args.strategy, params, config,
+                              starting_balance=Decimal(str(args.balance)), clock=clock)
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    print(f"\n⏱️  Throughput projection: {args.strategy}")
+    print(f"   RTT {args.rtt_ms:.0f}ms ±{args.rtt_jitter_ms:.0f} ({args.latency_dist}), "
+          f"delay {args.delay_ms}ms + jitter {args.jitter_ms}ms, concurrency {args.concurrency}")
+    if args.rate_limit:
+        print(f"   Rate limit: {args.rate_limit} requests / {args.rate_window:g}s")
+    print()
+    print(run.timing.summary())
+    print(f"ROI: {run.roi:+.2f}% ({run.bets:,} bets, stop: {run.stop_reason})")
+
+
+def cmd_replay(args):
+    """Backtest a strategy against recorded rolls at full CPU speed."""
+    import json
+    import time
+    from betbot_engine.replay import load_rolls, replay_config, replay_strategy
+
+    params = {}
+    if args.config:
+        try:
+            params = json.loads(args.config)
+        except json.JSONDecodeError:
+            print(f"❌ Invalid JSON config: {args.config}")
+            return
+
+    try:
+        started = time.perf_counter()
+        rolls = load_rolls(args.rolls, session_id=args.session, limit=args.limit)
+        load_sec = time.perf_counter() - started
+        if not rolls:
+            print(f"❌ No recorded rolls in {args.rolls}")
+            return
+        config = replay_config(symbol=args.currency, max_bets=args.max_bets,
+                               stop_loss=args.stop_loss, take_profit=args.take_profit, seed=args.seed)
+        result = replay_strategy(args.strategy, params, rolls, config,
+                                 starting_balance=Decimal(str(args.balance)))
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    summary = result.summary
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    print(f"\n⏪  Replay: {args.strategy} over {len(rolls):,} recorded rolls "
+          f"(loaded in {load_sec:.2f}s)")
+    print(f"   Bets      : {summary['bets']:,} ({summary['bets_per_sec']:,.0f} bets/s), "
+          f"stop: {summary['stop_reason']}")
+    print(f"   Balance   : {summary['starting_balance']} → {summary['ending_balance']} "
+          f"(ROI {summary['roi']:+.2f}%)")
+    print(f"   Win rate  : {summary['win_rate'] * 100:.2f}%  "
+          f"max loss streak {summary['max_loss_streak']}  "
+          f"max drawdown {summary['max_drawdown'] * 100:.2f}%")
+    print(f"   Wagered   : {summary['total_wagered']:.8f} (max bet {summary['max_bet_size']:.8f})")
+
+
+def cmd_replay_compare(args):
+    """Compare many strategies / param sets over recorded rolls in one pass."""
+    import json
+    import time
+    from betbot_engine.counterfactual import build_lanes, evaluate_lanes
+    from betbot_engine.html_report import build_report
+    from betbot_engine.replay import load_rolls, replay_config
+
+    param_sets = None
+    if args.param_sets:
+        try:
+            with open(args.param_sets) as f:
+                param_sets = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Could not read param sets: {e}")
+            return
+
+    try:
+        rolls = load_rolls(args.rolls, session_id=args.session, limit=args.limit)
+        if not rolls:
+            print(f"❌ No recorded rolls in {args.rolls}")
+            return
+        lanes = build_lanes(args.strategies, param_sets, exclude=args.exclude)
+        if not lanes:
+            print("❌ No strategies to compare.")
+            return
+        config = replay_config(symbol=args.currency, stop_loss=args.stop_loss,
+                               take_profit=args.take_profit, seed=args.seed)
+        if not args.json:
+            print(f"\n⏪  Replaying {len(lanes)} strategy/param lanes over {len(rolls):,} rolls"
+                  f"{f' in runs of {args.window:,}' if args.window else ''}…")
+        started = time.perf_counter()
+        errors: Dict[str, List[str]] = {}
+        results = evaluate_lanes(
+            lanes, rolls, window=args.window, config=config,
+            starting_balance=Decimal(str(args.balance)), errors=errors,
+            progress=None if args.json else (
+                lambda done, total: print(f"   {done:,}/{total:,} rolls", end="\r", flush=True)),
+        )
+        elapsed = time.perf_counter() - started
+    except (KeyError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    ranked = sorted(results, key=lambda r: r.roi_mean, reverse=True)
+    if args.json:
+        print(json.dumps([{
+            "strategy": r.strategy_name,
+            "runs": r.n_runs,
+            "roi_mean": r.roi_mean,
+            "roi_median": r.roi_median,
+            "win_rate_mean": r.win_rate_mean,
+            "max_drawdown_mean": r.max_drawdown_mean,
+            "sharpe_mean": r.sharpe_mean,
+            "ruin_pct": r.ruin_pct,
+        } for r in ranked], indent=2))
+    else:
+        print(f"\n   {'Strategy':<32} {'ROI':>9} {'Win%':>7} {'MaxDD':>7} {'Ruin':>6}")
+        for r in ranked:
+            print(f"   {r.strategy_name:<32} {r.roi_mean:>+8.2f}% {r.win_rate_mean * 100:>6.2f}% "
+                  f"{r.max_drawdown_mean * 100:>6.1f}% {r.ruin_pct:>5.0f}%")
+        print(f"\n   {len(lanes) * len(rolls):,} lane-rolls in {elapsed:.1f}s")
+    for label, messages in errors.items():
+        print(f"⚠️  {label} failed in {len(messages)} run(s): {messages[0]}", file=sys.stderr)
+    if args.output:
+        path = build_report(results, args.output, title='DuckDice Bot — Replay Comparison')
+        if not args.json:
+            print(f"📄 Report: {path}")
+
+
+def cmd_bench_cassette(args):
+    """Benchmark the engine stack by replaying a recorded API session."""
+    import json
+    from betbot_engine.cassette_bench import bench_cassette, format_results
+    from duckdice_api.cassette import CassetteMismatch
+
+    params = None
+    if args.config:
+        try:
+            params = json.loads(args.config)
+        except json.JSONDecodeError:
+            print(f"❌ Invalid JSON config: {args.config}")
+            return
+
+    if not args.json:
+        print(f"\n📼 Replaying {args.cassette} at speed {args.speed:g} ({args.repeat} timed run(s))…")
+    try:
+        results = bench_cassette(args.cassette, args.strategy, params, speed=args.speed,
+                                 repeat=args.repeat, db_log=args.db_log, log_format=args.log_format,
+                                 checkpoint_every=args.checkpoint_every, profile=args.profile)
+    except (OSError, KeyError, ValueError, CassetteMismatch) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2) if args.json else "\n" + format_results(results))
+
+
+def cmd_bench(args):
+    """Measure hot-path throughput and store the results as JSON."""
+    import json
+    import time
+    from betbot_engine.db_bench import compare_results
+    from betbot_engine.throughput_bench import format_results, run_suite
+
+    progress = None if args.json else (lambda msg: print(f"   … {msg}", end="\r\033[K", flush=True))
+    if not args.json:
+        print(f"\n⏱️  Benchmarking: {', '.join(args.sections)}")
+    try:
+        results = run_suite(args.sections, args.strategies, args.strategy_bets, args.engine_bets,
+                            args.client_requests, args.concurrency, args.sim_runs, args.sim_bets,
+                            progress=progress)
+    except (KeyError, ValueError, OSError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return
+
+    output = args.output or os.path.join(BENCH_DIR, f"throughput_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("\n" + format_results(results))
+        print(f"\n📄 Results: {output}")
+
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"❌ Could not read baseline: {e}", file=sys.stderr)
+            sys.exit(2)
+        regressions = compare_results(baseline, results, args.tolerance)
+        for r in regressions:
+            print(f"⚠️  REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']})",
+                  file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        if not args.json:
+            print(f"✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
 # ---------------------------------------------------------------------------
 # Agent system CLI commands
 # ---------------------------------------------------------------------------
@@ -2088,7 +2617,8 @@ def cmd_analyze(args):
     from agents.simulation import StrategySimulator
 
     sim = StrategySimulator()
-    analyst = StrategyAnalyst(simulator=sim, data_dir=args.data_dir)
+    checkpoint = _open_checkpoint(args, os.path.join(args.data_dir, "checkpoints.db"))
+    analyst = StrategyAnalyst(simulator=sim, data_dir=args.data_dir, checkpoint=checkpoint)
 
     rounds = args.rounds
     seeds = args.seeds
@@ -2103,6 +2633,7 @@ def cmd_analyze(args):
         )
         print(report.summary())
         analyst.update_hall_of_fame(report)
+        _close_checkpoint(checkpoint)
     else:
         exclude = set(args.exclude) if args.exclude else None
         print(f"Evaluating all strategies ({rounds} rounds × {seeds} seeds)…")
@@ -2112,6 +2643,7 @@ def cmd_analyze(args):
             starting_balance=balance,
             exclude=exclude,
         )
+        _close_checkpoint(checkpoint)
         kept, pruned = analyst.prune(reports)
 
         print(f"\n{'─' * 70}")
@@ -2138,8 +2670,6 @@ def cmd_optimize(args):
     from agents.simulation import StrategySimulator
 
     sim = StrategySimulator()
-    analyst = StrategyAnalyst(simulator=sim, data_dir=args.data_dir)
-
     base_params = _default_params(args.strategy)
 
     if not args.grid:
@@ -2158,6 +2688,9 @@ def cmd_optimize(args):
                 vals.append(v)
         param_grid[key] = vals
 
+    checkpoint = _open_checkpoint(args, os.path.join(args.data_dir, "checkpoints.db"))
+    analyst = StrategyAnalyst(simulator=sim, data_dir=args.data_dir, checkpoint=checkpoint)
+
     print(f"Optimizing {args.strategy}: {len(param_grid)} params, "
           f"{args.rounds} rounds × {args.seeds} seeds")
 
@@ -2169,6 +2702,7 @@ def cmd_optimize(args):
         num_seeds=args.seeds,
         starting_balance=args.balance,
     )
+    _close_checkpoint(checkpoint)
 
     print(f"\n{'─' * 50}")
     print(best_report.summary())
@@ -2342,7 +2876,8 @@ def cmd_evolve(args):
     from agents.simulation import StrategySimulator
 
     sim = StrategySimulator()
-    analyst = StrategyAnalyst(simulator=sim, data_dir=args.data_dir)
+    checkpoint = _open_checkpoint(args, os.path.join(args.data_dir, "checkpoints.db"))
+    analyst = StrategyAnalyst(simulator=sim, data_dir=args.data_dir, checkpoint=checkpoint)
 
     # First evaluate to get top strategies
     print(f"🔬 Evaluating strategies…")
@@ -2353,6 +2888,7 @@ def cmd_evolve(args):
 
     if not kept:
         print("❌ No viable strategies to evolve.")
+        _close_checkpoint(checkpoint)
         return
 
     top_n = min(args.top, len(kept))
@@ -2364,6 +2900,7 @@ def cmd_evolve(args):
         num_seeds=args.seeds,
         starting_balance=args.balance,
     )
+    _close_checkpoint(checkpoint)
 
     print(f"\n{'─' * 70}")
     print(f"  {'Strategy':<30} {'Score':>8} {'EV':>10} {'Params'}")
@@ -2428,8 +2965,45 @@ def main():
                            help='Disable database logging')
     run_parser.add_argument('--db-path', type=str,
                            help='Custom database path (default: data/duckdice_bot.db)')
+    run_parser.add_argument('--db-payloads', choices=['inline', 'compressed', 'none'], default='compressed',
+                           help='How raw API payloads and strategy state are stored (default: compressed)')
+    run_parser.add_argument('--db-mode', choices=['direct', 'log'], default='direct',
+                           help='direct: log bets to the database from the bet loop; '
+                                'log: write only the JSONL session log and ingest it in the background '
+                                '(default: direct)')
+    run_parser.add_argument('--db-service', nargs='?', const='auto',
+                           default=os.environ.get('DUCKDICE_DB_SERVICE') or None, metavar='ADDRESS',
+                           help='Send database writes to a running db-serve process (no address: the '
+                                'default one for --db-path; env DUCKDICE_DB_SERVICE). Overrides --db-mode log')
+    run_parser.add_argument('--log-format', choices=['jsonl', 'binary'], default='jsonl',
+                           help='Session log format: JSON per record, or compact 64-byte binary bet '
+                                'records with rotation (default: jsonl; --db-mode log needs jsonl)')
+    run_parser.add_argument('--log-fsync-every', type=int, default=0, metavar='N',
+                           help='Binary log: fsync every N bets (default: 0 = leave to the OS)')
+    run_parser.add_argument('--log-rotate-mb', type=float, default=None, metavar='MB',
+                           help='Binary log: start a new segment past this size')
+    run_parser.add_argument('--log-rotate-sec', type=int, default=None, metavar='SEC',
+                           help='Binary log: start a new segment after this many seconds')
+    run_parser.add_argument('--log-compress', action='store_true',
+                           help='Binary log: gzip closed segments')
+    run_parser.add_argument('--state-snapshot-every', type=int, default=100, metavar='N',
+                           help='Store a full strategy-state snapshot every N bets (default: 100; 1 = every bet)')
+    run_parser.add_argument('--state-snapshot-sec', type=float, default=60.0, metavar='SEC',
+                           help='... or after SEC seconds (default: 60; 0 = bet count only)')
+    run_parser.add_argument('--state-deltas', action='store_true',
+                           help='Between snapshots, store the strategy-state keys that changed')
+    run_parser.add_argument('--checkpoint-every', type=int, default=10, metavar='K',
+                           help='Update the resume checkpoint every K bets (default: 10; 0 = off)')
+    run_parser.add_argument('--checkpoint-dir', type=str, default=CHECKPOINT_DIR, metavar='DIR',
+                           help=f'Directory for resume checkpoints (default: {CHECKPOINT_DIR})')
+    run_parser.add_argument('--checkpoint-fsync', action='store_true',
+                           help='Flush each checkpoint to disk (survives power loss; slower)')
+    run_parser.add_argument('--record-cassette', metavar='FILE', default=None,
+                           help='Live mode: record every API request/response to FILE for '
+                                'bench-cassette (the API key is not stored)')
     run_parser.add_argument('--continue', '-C', action='store_true', dest='resume',
-                           help='Continue the last cancelled session (restores strategy, params, limits, and state)')
+                           help='Continue the last crashed or cancelled session '
+                                '(restores strategy, params, limits, and state)')
     run_parser.add_argument('--faucet-cookie', type=str, dest='faucet_cookie',
                            help='Browser session cookie for faucet auto-claim (live-faucet mode). '
                                 'If omitted, uses cookie saved in ~/.duckdice/faucet_cookies.json')
@@ -2519,8 +3093,239 @@ def main():
         '--seed', type=int, default=42,
         help='Base random seed for reproducibility (default: 42)',
     )
+    sim_all_parser.add_argument(
+        '--target-ci', type=float, default=None, metavar='PCT',
+        help='Stop a strategy early once its mean ROI 95%% CI is within ±PCT points',
+    )
+    sim_all_parser.add_argument(
+        '--min-runs', type=int, default=10,
+        help='Minimum runs per strategy before stopping early (default: 10)',
+    )
+    sim_all_parser.add_argument(
+        '--checkpoint', metavar='FILE', nargs='?', const='', default=None,
+        help='Record finished runs so the sweep can be resumed (default file: data/checkpoints.db)',
+    )
+    sim_all_parser.add_argument(
+        '--resume', action='store_true',
+        help='Reuse runs already stored in the checkpoint instead of re-simulating them (implies --checkpoint)',
+    )
     sim_all_parser.set_defaults(func=cmd_simulate_all)
 
+    # Throughput projection on a virtual clock
+    tp_parser = subparsers.add_parser(
+        'simulate-throughput',
+        help='Project bets/hour and wager/hour under API latency and rate limits',
+    )
+    tp_parser.add_argument('-s', '--strategy', required=True, help='Strategy name')
+    tp_parser.add_argument('-c', '--config', help='Strategy config as JSON')
+    tp_parser.add_argument('--bets', type=int, default=10000, help='Bets to simulate (default: 10000)')
+    tp_parser.add_argument('--balance', type=float, default=100.0, help='Starting balance (default: 100.0)')
+    tp_parser.add_argument('--currency', default='btc', help='Currency symbol (default: btc)')
+    tp_parser.add_argument('--stop-loss', type=float, default=-0.99, help='Stop loss ratio (default: -0.99)')
+    tp_parser.add_argument('--take-profit', type=float, default=None, help='Take profit ratio')
+    tp_parser.add_argument('--delay-ms', type=int, default=0, help='Pacing delay per bet (default: 0)')
+    tp_parser.add_argument('--jitter-ms', type=int, default=0, help='Random extra delay per bet (default: 0)')
+    tp_parser.add_argument('--rtt-ms', type=float, default=80.0, help='Mean request round trip (default: 80)')
+    tp_parser.add_argument('--rtt-jitter-ms', type=float, default=20.0, help='Round-trip spread (default: 20)')
+    tp_parser.add_argument('--latency-dist', choices=['fixed', 'uniform', 'normal', 'lognormal'],
+                           default='lognormal', help='Round-trip distribution (default: lognormal)')
+    tp_parser.add_argument('--concurrency', type=int, default=1, help='Requests in flight (default: 1)')
+    tp_parser.add_argument('--rate-limit', type=int, default=None,
+                           help='Server limit: max requests per --rate-window (default: none)')
+    tp_parser.add_argument('--rate-window', type=float, default=1.0, help='Rate-limit window seconds (default: 1)')
+    tp_parser.add_argument('--backoff-ms', type=float, default=1000.0,
+                           help='First retry delay after a 429, doubled per retry (default: 1000)')
+    tp_parser.add_argument('--retry-after', action='store_true',
+                           help='Retry exactly when the rate-limit window frees up instead of backing off')
+    tp_parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    tp_parser.set_defaults(func=cmd_simulate_throughput)
+
+    # Backtest over recorded rolls
+    replay_parser = subparsers.add_parser(
+        'replay',
+        help='Backtest a strategy against recorded rolls (bet database, .ddbc export or CSV/JSON/Excel)',
+    )
+    replay_parser.add_argument('-s', '--strategy', required=True, help='Strategy name')
+    replay_parser.add_argument('-c', '--config', help='Strategy config as JSON')
+    replay_parser.add_argument('--rolls', default='data/duckdice_bot.db', metavar='SOURCE',
+                               help='Roll source (default: data/duckdice_bot.db)')
+    replay_parser.add_argument('--session', default=None, help='Bet database: replay one session only')
+    replay_parser.add_argument('--limit', type=int, default=None, help='Use at most this many rolls')
+    replay_parser.add_argument('--balance', type=float, default=100.0, help='Starting balance (default: 100.0)')
+    replay_parser.add_argument('--currency', default='btc', help='Currency symbol (default: btc)')
+    replay_parser.add_argument('--max-bets', type=int, default=None, help='Stop after this many bets')
+    replay_parser.add_argument('--stop-loss', type=float, default=-0.99, help='Stop loss ratio (default: -0.99)')
+    replay_parser.add_argument('--take-profit', type=float, default=None, help='Take profit ratio')
+    replay_parser.add_argument('--seed', type=int, default=42,
+                               help='Seed for strategy randomness and lottery shots (default: 42)')
+    replay_parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    replay_parser.set_defaults(func=cmd_replay)
+
+    compare_parser = subparsers.add_parser(
+        'replay-compare',
+        help='Compare strategies and param sets over recorded rolls in a single pass (HTML report)',
+    )
+    compare_parser.add_argument('--rolls', default='data/duckdice_bot.db', metavar='SOURCE',
+                                help='Roll source (default: data/duckdice_bot.db)')
+    compare_parser.add_argument('--strategies', nargs='+', metavar='NAME',
+                                help='Strategies to compare (default: all that can run unattended)')
+    compare_parser.add_argument('--exclude', nargs='+', metavar='NAME', default=[], help='Strategies to skip')
+    compare_parser.add_argument('--param-sets', metavar='FILE',
+                                help='JSON file: {"strategy" or "*": [params, ...]} (default: strategy defaults)')
+    compare_parser.add_argument('--window', type=int, default=None, metavar='ROLLS',
+                                help='Split the stream into runs of this many rolls (default: one run)')
+    compare_parser.add_argument('--session', default=None, help='Bet database: replay one session only')
+    compare_parser.add_argument('--limit', type=int, default=None, help='Use at most this many rolls')
+    compare_parser.add_argument('--balance', type=float, default=100.0, help='Starting balance (default: 100.0)')
+    compare_parser.add_argument('--currency', default='btc', help='Currency symbol (default: btc)')
+    compare_parser.add_argument('--stop-loss', type=float, default=-0.99, help='Stop loss ratio (default: -0.99)')
+    compare_parser.add_argument('--take-profit', type=float, default=None, help='Take profit ratio')
+    compare_parser.add_argument('--seed', type=int, default=42, help='Seed for strategy randomness (default: 42)')
+    compare_parser.add_argument('--output', default='replay_report.html',
+                                help='HTML report path (default: replay_report.html; empty to skip)')
+    compare_parser.add_argument('--json', action='store_true', help='Print the ranking as JSON')
+    compare_parser.set_defaults(func=cmd_replay_compare)
+
+    bench_cassette_parser = subparsers.add_parser(
+        'bench-cassette',
+        help='Benchmark client, engine and logging by replaying a session recorded with run --record-cassette',
+    )
+    bench_cassette_parser.add_argument('cassette', help='Cassette file')
+    bench_cassette_parser.add_argument('-s', '--strategy', default=None, help='Strategy (default: the recorded one)')
+    bench_cassette_parser.add_argument('-c', '--config', help='Strategy config as JSON (default: the recorded one)')
+    bench_cassette_parser.add_argument('--speed', type=float, default=0.0,
+                                       help='Replay pace: 1 = recorded round trips, 10 = 10x faster, '
+                                            '0 = no waits (default: 0)')
+    bench_cassette_parser.add_argument('--repeat', type=int, default=3,
+                                       help='Timed sessions, the fastest counts (default: 3)')
+    bench_cassette_parser.add_argument('--db-log', action='store_true', help='Also log bets to a bet database')
+    bench_cassette_parser.add_argument('--log-format', choices=['jsonl', 'binary'], default='jsonl',
+                                       help='Session log format (default: jsonl)')
+    bench_cassette_parser.add_argument('--checkpoint-every', type=int, default=0, metavar='K',
+                                       help='Write resume checkpoints every K bets (default: 0 = off)')
+    bench_cassette_parser.add_argument('--no-profile', action='store_false', dest='profile',
+                                       help='Skip the per-stage breakdown')
+    bench_cassette_parser.add_argument('--output', default=None, help='Also write the results JSON to this file')
+    bench_cassette_parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    bench_cassette_parser.set_defaults(func=cmd_bench_cassette)
+
+    bench_parser = subparsers.add_parser(
+        'bench',
+        help='Benchmark strategy decisions, the engine, the API client and the simulator (JSON results)',
+    )
+    bench_parser.add_argument('--sections', nargs='+', choices=['strategies', 'engine', 'client', 'simulator'],
+                              default=['strategies', 'engine', 'client', 'simulator'],
+                              help='What to measure (default: everything)')
+    bench_parser.add_argument('--strategies', nargs='+', metavar='NAME', default=None,
+                              help='Strategies for the decision-cost section (default: all)')
+    bench_parser.add_argument('--strategy-bets', type=int, default=2000,
+                              help='Timed decisions per strategy (default: 2000)')
+    bench_parser.add_argument('--engine-bets', type=int, default=2000,
+                              help='Dry-run bets per run_auto_bet session (default: 2000)')
+    bench_parser.add_argument('--client-requests', type=int, default=500,
+                              help='Bets per client concurrency level (default: 500)')
+    bench_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16],
+                              help='Client concurrency levels (default: 1 4 16)')
+    bench_parser.add_argument('--sim-runs', type=int, default=20, help='Simulator runs (default: 20)')
+    bench_parser.add_argument('--sim-bets', type=int, default=500, help='Bets per simulator run (default: 500)')
+    bench_parser.add_argument('--output', default=None,
+                              help=f'Results JSON (default: {BENCH_DIR}/throughput_<timestamp>.json)')
+    bench_parser.add_argument('--baseline', default=None,
+                              help='Earlier results JSON; exit 1 if anything got slower than --tolerance')
+    bench_parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown (default: 0.25)')
+    bench_parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    bench_parser.set_defaults(func=cmd_bench)
+
+    # Compact an existing bet database
+    compact_parser = subparsers.add_parser(
+        'db-compact',
+        help='Migrate a bet database to compressed, deduplicated payload storage',
+    )
+    compact_parser.add_argument('--db-path', default='data/duckdice_bot.db',
+                                help='Database file (default: data/duckdice_bot.db)')
+    compact_parser.add_argument('--sample-every', type=int, default=1, metavar='N',
+                                help='Keep the raw API payload of every Nth bet only (default: 1 = all)')
+    compact_parser.add_argument('--no-vacuum', action='store_true',
+                                help='Skip rebuilding the file afterwards')
+    compact_parser.set_defaults(func=cmd_db_compact)
+
+    export_parser = subparsers.add_parser(
+        'db-export',
+        help='Stream bet history to CSV, NDJSON or columnar (.ddbc), optionally gzip/xz',
+    )
+    export_parser.add_argument('output', help='Output file (format/compression inferred from suffix, '
+                                              'e.g. bets.csv.gz, bets.ndjson, bets.ddbc.xz)')
+    export_parser.add_argument('--db-path', default='data/duckdice_bot.db',
+                               help='Database file (default: data/duckdice_bot.db)')
+    export_parser.add_argument('--format', choices=['csv', 'ndjson', 'columnar'], default=None,
+                               help='Override the format inferred from the file name')
+    export_parser.add_argument('--compression', choices=['gzip', 'xz'], default=None,
+                               help='Override the compression inferred from the file name')
+    export_parser.add_argument('--columns', nargs='+', metavar='COL', default=None,
+                               help='Columns to export (default: the standard CSV set)')
+    export_parser.add_argument('--session', default=None, help='Only this session id')
+    export_parser.add_argument('--strategy', default=None, help='Only this strategy')
+    export_parser.add_argument('--symbol', default=None, help='Only this currency')
+    export_parser.add_argument('--since', default=None, help='Bets placed at or after (ISO time or epoch)')
+    export_parser.add_argument('--until', default=None, help='Bets placed before (ISO time or epoch)')
+    export_parser.add_argument('--mode', choices=['all', 'sim', 'live'], default='all',
+                               help='Simulated, live or all bets (default: all)')
+    export_parser.set_defaults(func=cmd_db_export)
+
+    prune_parser = subparsers.add_parser(
+        'db-prune',
+        help='Drop old raw bets while keeping session stats and time rollups',
+    )
+    prune_parser.add_argument('--db-path', default='data/duckdice_bot.db',
+                              help='Database file (default: data/duckdice_bot.db)')
+    prune_parser.add_argument('--raw-days', type=float, default=None, metavar='DAYS',
+                              help='Keep raw bet rows for this many days')
+    prune_parser.add_argument('--minute-days', type=float, default=None, metavar='DAYS',
+                              help='Keep per-minute rollups for this many days')
+    prune_parser.add_argument('--hour-days', type=float, default=None, metavar='DAYS',
+                              help='Keep per-hour rollups for this many days')
+    prune_parser.set_defaults(func=cmd_db_prune)
+
+    bets_parser = subparsers.add_parser(
+        'db-bets',
+        help='Page through logged bets (keyset pages with continuation cursors)',
+    )
+    bets_parser.add_argument('--db-path', default='data/duckdice_bot.db',
+                             help='Database file (default: data/duckdice_bot.db)')
+    bets_parser.add_argument('--cursor', default=None, help='next_cursor printed by the previous page')
+    bets_parser.add_argument('--page-size', type=int, default=50, help='Bets per page (default: 50)')
+    bets_parser.add_argument('--session', default=None, help='Only this session id')
+    bets_parser.add_argument('--strategy', default=None, help='Only this strategy')
+    bets_parser.add_argument('--symbol', default=None, help='Only this currency')
+    bets_parser.add_argument('--mode', choices=['all', 'sim', 'live'], default='all',
+                             help='Simulated, live or all bets (default: all)')
+    bets_parser.add_argument('--json', action='store_true', help='Print the page as JSON')
+    bets_parser.set_defaults(func=cmd_db_bets)
+
+    ingest_parser = subparsers.add_parser(
+        'db-ingest',
+        help='Replay JSONL session logs into the bet database (only what is not ingested yet)',
+    )
+    ingest_parser.add_argument('logs', nargs='+', metavar='LOG',
+                               help='Session log files or directories (e.g. bet_history/auto)')
+    ingest_parser.add_argument('--db-path', default='data/duckdice_bot.db',
+                               help='Database file (default: data/duckdice_bot.db)')
+    ingest_parser.set_defaults(func=cmd_db_ingest)
+
+    serve_parser = subparsers.add_parser(
+        'db-serve',
+        help='Run the shared database writer for concurrent sessions (run ... --db-service)',
+    )
+    serve_parser.add_argument('--db-path', default='data/duckdice_bot.db',
+                              help='Database file (default: data/duckdice_bot.db)')
+    serve_parser.add_argument('--address', default=None,
+                              help='Unix socket / named pipe to listen on (default: derived from --db-path)')
+    serve_parser.add_argument('--batch-size', type=int, default=500,
+                              help='Most bets per transaction (default: 500)')
+    serve_parser.add_argument('--payloads', choices=['inline', 'compressed', 'none'], default='compressed',
+                              help='How raw API payloads and strategy state are stored (default: compressed)')
+    serve_parser.set_defaults(func=cmd_db_serve)
+
     # Probe minimum bets
     probe_parser = subparsers.add_parser(
         'probe-min-bets',
@@ -2545,6 +3350,14 @@ def main():
         help='Agent data directory (default: data/agents)',
     )
 
+    def _add_checkpoint_args(p):
+        p.add_argument('--checkpoint', metavar='FILE', nargs='?', const='', default=None,
+                       help='Record finished units so the sweep can be resumed '
+                            '(default file: <data-dir>/checkpoints.db)')
+        p.add_argument('--resume', action='store_true',
+                       help='Reuse units already stored in the checkpoint instead of re-simulating them '
+                            '(implies --checkpoint)')
+
     # analyze
     analyze_parser = subparsers.add_parser(
         'analyze', help='Evaluate strategies using the autonomous agent system',
@@ -2555,6 +3368,7 @@ def main():
     analyze_parser.add_argument('-b', '--balance', type=float, default=100.0, help='Starting balance (default: 100.0)')
     analyze_parser.add_argument('--exclude', nargs='+', metavar='NAME', default=[], help='Strategies to skip')
     analyze_parser.add_argument('--data-dir', **_agent_data_dir_kw)
+    _add_checkpoint_args(analyze_parser)
     analyze_parser.set_defaults(func=cmd_analyze)
 
     # optimize
@@ -2568,6 +3382,7 @@ def main():
     opt_parser.add_argument('--seeds', type=int, default=10, help='Seeds per evaluation (default: 10)')
     opt_parser.add_argument('-b', '--balance', type=float, default=100.0, help='Starting balance (default: 100.0)')
     opt_parser.add_argument('--data-dir', **_agent_data_dir_kw)
+    _add_checkpoint_args(opt_parser)
     opt_parser.set_defaults(func=cmd_optimize)
 
     # agent-report
@@ -2609,6 +3424,7 @@ def main():
     evolve_parser.add_argument('--seeds', type=int, default=10, help='Seeds per evaluation (default: 10)')
     evolve_parser.add_argument('-b', '--balance', type=float, default=100.0, help='Starting balance (default: 100.0)')
     evolve_parser.add_argument('--data-dir', **_agent_data_dir_kw)
+    _add_checkpoint_args(evolve_parser)
     evolve_parser.set_defaults(func=cmd_evolve)
     
     args = parser.parse_args()
@@ -6,6 +6,8 @@ Runs strategies through a fast dry-run loop using the actual strategy interface
 Supports:
 - Single strategy evaluation over N rounds
 - Multi-seed parallel evaluation
+- Streaming multi-seed evaluation (sync generator / async iterator) with
+  running confidence intervals and early stopping
 - Batch evaluation across parameter grids
 """
 
@@ -17,11 +19,13 @@ import time
 from collections import deque
 from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Type
 
 from .metrics import SingleSimResult
 
 try:
+    from ..betbot_engine.running_stats import RunningEstimate
+    from ..betbot_engine.sweep_checkpoint import SweepCheckpoint
     from ..betbot_strategies import get_strategy
     from ..betbot_strategies.base import (
         BetResult,
@@ -36,6 +40,8 @@ except ImportError:
     _src = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
     if _src not in sys.path:
         sys.path.insert(0, _src)
+    from betbot_engine.running_stats import RunningEstimate
+    from betbot_engine.sweep_checkpoint import SweepCheckpoint
     from betbot_strategies import get_strategy
     from betbot_strategies.base import (
         BetResult,
@@ -93,6 +99,42 @@ class _SimAPI:
         }
 
 
+# ---------------------------------------------------------------------------
+# Streaming progress
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SimProgress:
+    """One completed run plus the running estimate over all runs so far."""
+
+    index: int                          # position in the seed list
+    seed: int
+    result: SingleSimResult
+    completed: int
+    total: int
+    roi_mean: float
+    roi_ci: float                       # 95% CI half-width (percentage points)
+    survival_rate: float
+    survival_ci: Tuple[float, float]    # 95% Wilson interval
+    converged: bool = False             # target CI reached; no more runs follow
+
+
+def _progress(estimate: RunningEstimate, index: int, seed: int, result: SingleSimResult) -> SimProgress:
+    est = estimate.add(result.roi, result.survived)
+    return SimProgress(
+        index=index,
+        seed=seed,
+        result=result,
+        completed=est.completed,
+        total=est.total,
+        roi_mean=est.mean,
+        roi_ci=est.ci,
+        survival_rate=est.rate,
+        survival_ci=est.rate_ci,
+        converged=est.converged,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Core simulator
 # ---------------------------------------------------------------------------
@@ -287,21 +329,20 @@ class StrategySimulator:
         take_profit: Optional[float] = None,
         parallel: bool = True,
         max_workers: Optional[int] = None,
+        checkpoint: Optional[SweepCheckpoint] = None,
     ) -> List[SingleSimResult]:
         """Run simulation across multiple seeds for statistical robustness.
 
         When ``parallel=True``, uses a process pool for concurrent execution.
+        With a ``checkpoint``, each finished seed is recorded as it completes
+        and seeds already stored (when resuming) are not re-run.
         """
         seeds = [base_seed + i for i in range(num_seeds)]
-        kw = dict(
-            strategy_name=strategy_name,
-            params=params,
-            rounds=rounds,
-            starting_balance=starting_balance,
-            symbol=symbol,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-        )
+        kw = self._sim_kwargs(strategy_name, params, rounds, starting_balance,
+                              symbol, stop_loss, take_profit)
+
+        if checkpoint is not None:
+            return self._run_checkpointed(seeds, kw, parallel, max_workers, checkpoint)
 
         if parallel and num_seeds > 1:
             return self._run_parallel(seeds, kw, max_workers)
@@ -311,6 +352,107 @@ class StrategySimulator:
             results.append(self.simulate_single(seed=seed, **kw))
         return results
 
+    def iter_multi_seed(
+        self,
+        strategy_name: str,
+        params: Dict[str, Any],
+        rounds: int = 1000,
+        starting_balance: float = 100.0,
+        symbol: str = "BTC",
+        num_seeds: int = 50,
+        base_seed: int = 42,
+        stop_loss: float = -0.99,
+        take_profit: Optional[float] = None,
+        parallel: bool = True,
+        max_workers: Optional[int] = None,
+        target_ci: Optional[float] = None,
+        min_runs: int = 10,
+    ) -> Iterator[SimProgress]:
+        """Yield each run as it completes, with running ROI/survival estimates.
+
+        Runs arrive in completion order (``SimProgress.index`` gives the seed
+        position). With ``target_ci`` set, the sweep stops once at least
+        ``min_runs`` runs are in and the 95% CI half-width of mean ROI is
+        within ``target_ci`` percentage points; that last item has
+        ``converged=True``. Closing the generator early (``break``) cancels
+        any pending runs.
+        """
+        seeds = [base_seed + i for i in range(num_seeds)]
+        kw = self._sim_kwargs(strategy_name, params, rounds, starting_balance,
+                              symbol, stop_loss, take_profit)
+        estimate = RunningEstimate(len(seeds), target_ci, min_runs)
+
+        if parallel and num_seeds > 1:
+            completed = self._iter_parallel(seeds, kw, max_workers)
+        else:
+            completed = ((i, self.simulate_single(seed=seed, **kw)) for i, seed in enumerate(seeds))
+
+        try:
+            for idx, result in completed:
+                progress = _progress(estimate, idx, seeds[idx], result)
+                yield progress
+                if progress.converged:
+                    return
+        finally:
+            close = getattr(completed, "close", None)
+            if close is not None:
+                close()
+
+    async def astream_multi_seed(
+        self,
+        strategy_name: str,
+        params: Dict[str, Any],
+        rounds: int = 1000,
+        starting_balance: float = 100.0,
+        symbol: str = "BTC",
+        num_seeds: int = 50,
+        base_seed: int = 42,
+        stop_loss: float = -0.99,
+        take_profit: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        target_ci: Optional[float] = None,
+        min_runs: int = 10,
+    ) -> AsyncIterator[SimProgress]:
+        """Async-iterator form of :meth:`iter_multi_seed` for event-loop callers.
+
+        Runs execute in a process pool; awaiting the next item never blocks
+        the loop. Leaving the ``async for`` early cancels pending runs.
+        """
+        import asyncio
+        from concurrent.futures import ProcessPoolExecutor
+
+        seeds = [base_seed + i for i in range(num_seeds)]
+        kw = self._sim_kwargs(strategy_name, params, rounds, starting_balance,
+                              symbol, stop_loss, take_profit)
+        estimate = RunningEstimate(len(seeds), target_ci, min_runs)
+        if not seeds:
+            return
+
+        loop = asyncio.get_running_loop()
+        workers = max_workers or min(len(seeds), os.cpu_count() or 4)
+        executor = ProcessPoolExecutor(max_workers=workers)
+        future_to_idx: Dict[Any, int] = {}
+        pending: set = set()
+        try:
+            for i, seed in enumerate(seeds):
+                fut = loop.run_in_executor(
+                    executor, _simulate_worker, (self.house_edge, self.ruin_balance_fraction, seed, kw)
+                )
+                future_to_idx[fut] = i
+                pending.add(fut)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    idx = future_to_idx[fut]
+                    progress = _progress(estimate, idx, seeds[idx], fut.result())
+                    yield progress
+                    if progress.converged:
+                        return
+        finally:
+            for fut in pending:
+                fut.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def batch_simulate(
         self,
         strategy_specs: List[Tuple[str, Dict[str, Any]]],
@@ -358,27 +500,96 @@ class StrategySimulator:
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _run_parallel(
+    @staticmethod
+    def _sim_kwargs(
+        strategy_name: str,
+        params: Dict[str, Any],
+        rounds: int,
+        starting_balance: float,
+        symbol: str,
+        stop_loss: float,
+        take_profit: Optional[float],
+    ) -> Dict[str, Any]:
+        return dict(
+            strategy_name=strategy_name,
+            params=params,
+            rounds=rounds,
+            starting_balance=starting_balance,
+            symbol=symbol,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+        )
+
+    def _iter_parallel(
         self,
         seeds: List[int],
         kw: Dict[str, Any],
         max_workers: Optional[int],
-    ) -> List[SingleSimResult]:
-        """Execute simulations across seeds using a process pool."""
+    ) -> Iterator[Tuple[int, SingleSimResult]]:
+        """Yield ``(seed_index, result)`` from a process pool as runs complete.
+
+        Closing the generator cancels runs that have not started yet.
+        """
         from concurrent.futures import ProcessPoolExecutor, as_completed
 
         workers = max_workers or min(len(seeds), os.cpu_count() or 4)
         args_list = [(self.house_edge, self.ruin_balance_fraction, seed, kw) for seed in seeds]
 
-        results: List[Optional[SingleSimResult]] = [None] * len(seeds)
-        with ProcessPoolExecutor(max_workers=workers) as executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
             future_to_idx = {
                 executor.submit(_simulate_worker, a): i
                 for i, a in enumerate(args_list)
             }
             for future in as_completed(future_to_idx):
-                idx = future_to_idx[future]
-                results[idx] = future.result()
+                yield future_to_idx[future], future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _run_checkpointed(
+        self,
+        seeds: List[int],
+        kw: Dict[str, Any],
+        parallel: bool,
+        max_workers: Optional[int],
+        checkpoint: SweepCheckpoint,
+    ) -> List[SingleSimResult]:
+        """Run only the seeds missing from ``checkpoint``, recording each as it lands."""
+        keys = [
+            checkpoint.unit_key(
+                "multi_seed",
+                house_edge=self.house_edge,
+                ruin_balance_fraction=self.ruin_balance_fraction,
+                seed=seed,
+                **kw,
+            )
+            for seed in seeds
+        ]
+        results: List[Optional[SingleSimResult]] = [checkpoint.get(k, SingleSimResult) for k in keys]
+        todo = [i for i, r in enumerate(results) if r is None]
+
+        if parallel and len(todo) > 1:
+            pending = self._iter_parallel([seeds[i] for i in todo], kw, max_workers)
+            completed = ((todo[j], result) for j, result in pending)
+        else:
+            completed = ((i, self.simulate_single(seed=seeds[i], **kw)) for i in todo)
+
+        for idx, result in completed:
+            checkpoint.put(keys[idx], result)
+            results[idx] = result
+
+        return [r for r in results if r is not None]
+
+    def _run_parallel(
+        self,
+        seeds: List[int],
+        kw: Dict[str, Any],
+        max_workers: Optional[int],
+    ) -> List[SingleSimResult]:
+        """Execute simulations across seeds using a process pool."""
+        results: List[Optional[SingleSimResult]] = [None] * len(seeds)
+        for idx, result in self._iter_parallel(seeds, kw, max_workers):
+            results[idx] = result
 
         return [r for r in results if r is not None]
 
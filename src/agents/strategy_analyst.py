@@ -15,11 +15,14 @@ import json
 import logging
 import os
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from .metrics import StrategyMetricsReport, compute_metrics
 from .simulation import StrategySimulator
 
+if TYPE_CHECKING:
+    from betbot_engine.sweep_checkpoint import SweepCheckpoint
+
 try:
     from ..betbot_strategies import get_strategy, list_strategies
 except ImportError:
@@ -50,9 +53,17 @@ class StrategyAnalyst:
         self,
         simulator: Optional[StrategySimulator] = None,
         data_dir: str = "data/agents",
+        checkpoint: Optional["SweepCheckpoint"] = None,
     ) -> None:
+        """
+        Args:
+            checkpoint: Optional sweep checkpoint; every simulated (params, seed)
+                unit is recorded there and, when it was opened with
+                ``resume=True``, finished units are not re-run.
+        """
         self._sim = simulator or StrategySimulator()
         self._data_dir = data_dir
+        self._checkpoint = checkpoint
         os.makedirs(data_dir, exist_ok=True)
 
     # ------------------------------------------------------------------
@@ -79,6 +90,7 @@ class StrategyAnalyst:
             starting_balance=starting_balance,
             symbol=symbol,
             num_seeds=num_seeds,
+            checkpoint=self._checkpoint,
         )
 
         report = compute_metrics(
@@ -374,17 +386,25 @@ class StrategyAnalyst:
         rounds: int = 500,
         num_seeds: int = 10,
         starting_balance: float = 100.0,
+        seed: Optional[int] = None,
     ) -> List[StrategyMetricsReport]:
         """Evolve top strategies by mutating their parameters.
 
         For each strategy in ``top_reports``, generate ``mutations_per_strategy``
         mutated variants and evaluate them. Returns all results (originals +
         mutations) sorted by composite score.
+
+        ``seed`` drives the mutations (default: current time). With a
+        checkpoint it is stored, so a resumed run replays the same mutations.
         """
         import random as _random
 
         all_reports: List[StrategyMetricsReport] = list(top_reports)
-        rng = _random.Random(int(time.time()))
+        if seed is None:
+            seed = int(time.time())
+        if self._checkpoint is not None:
+            seed = self._checkpoint.meta("evolve_seed", seed)
+        rng = _random.Random(seed)
 
         for report in top_reports:
             for i in range(mutations_per_strategy):
@@ -1,16 +1,759 @@
 """
 Database logger for complete betting stream persistence.
 Provides SQLite storage for debugging and strategy improvement analysis.
+
+With ``background_writes=True`` the betting thread only enqueues raw bet
+records into a bounded queue; a dedicated writer thread builds the rows and
+flushes them with ``executemany``, one transaction per batch. A full queue
+blocks the caller (backpressure) instead of dropping bets, and ``flush()`` /
+``close()`` (also run at interpreter exit) wait until everything queued is
+on disk. With ``service=`` the writes go to a shared ``DatabaseService``
+instead (see ``db_service``), so many processes can log to one file.
+
+Raw API payloads and strategy-state snapshots dominate the size of long
+histories. ``payloads="compressed"`` moves them out of ``bet_history`` into a
+zlib-compressed, content-deduplicated ``bet_payloads`` side table (optionally
+keeping only every Nth API payload); ``payloads="none"`` drops them.
+``compact_payloads()`` migrates an existing database.
+
+Per-session (``session_stats``) and per strategy/symbol/mode
+(``strategy_stats``) totals are kept up to date in the same transaction as
+the bets, so ``get_statistics`` and ``get_sessions`` never scan
+``bet_history``. Time-bucketed rollups (``bet_rollups``: balance OHLC,
+bet count, wagered volume and profit per minute / hour / day) are maintained
+the same way, so timelines can be charted and raw rows pruned with
+``apply_retention`` without losing history.
+
+Money columns (amounts, profits, payouts, balances and their aggregates) are
+INTEGER atomic units of 1e-8 coin (schema version 2, ``PRAGMA user_version``),
+so sums stay exact and run on integer arithmetic; reads convert back with
+``from_units``. Older databases with REAL columns are migrated on open.
+
+``log_offsets`` records how far each JSONL session log has been ingested
+(see ``log_ingest``); ``set_log_offset`` joins the current write
+transaction so rows and offset commit together.
 """
 
+import atexit
+import hashlib
+import queue
+import re
 import sqlite3
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from decimal import Decimal
-from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, List
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, ROUND_HALF_EVEN
+from contextlib import closing, contextmanager
+import zlib
+
+
+_INSERT_BET_SQL = """
+    INSERT INTO bet_history (
+        session_id, timestamp, bet_number,
+        symbol, strategy, amount, chance, target,
+        is_high, range_low, range_high, is_in, game_type,
+        roll, won, profit, payout,
+        balance, loss_streak, simulation_mode,
+        api_raw, strategy_state, api_raw_id, state_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# How api_raw / strategy_state are kept: inline TEXT columns, compressed and
+# deduplicated in bet_payloads, or not at all
+PAYLOAD_MODES = ("inline", "compressed", "none")
+
+# Background writer queue operations
+_OP_BET, _OP_CALL, _OP_FLUSH, _OP_STOP = range(4)
+
+# Schema version 2: money columns hold INTEGER atomic units. DuckDice quotes
+# every currency to 8 decimals (as does the engine), so one unit is 1e-8 of
+# whatever the row's symbol is.
+SCHEMA_VERSION = 2
+MONEY_DECIMALS = 8
+_UNITS_PER_COIN = 10 ** MONEY_DECIMALS
+_QUANTUM = Decimal(1).scaleb(-MONEY_DECIMALS)
+
+_MONEY_COLUMNS = {
+    "bet_history": ("amount", "profit", "payout", "balance"),
+    "session_stats": ("profit", "wagered", "min_balance", "max_balance", "max_win", "max_loss"),
+    "strategy_stats": ("profit", "wagered", "min_balance", "max_balance", "max_win", "max_loss"),
+    "bet_rollups": ("profit", "wagered", "open_balance", "high_balance", "low_balance",
+                    "close_balance"),
+}
+
+
+def to_units(value: Any) -> Optional[int]:
+    """Atomic units for a money value (Decimal, str, int or float), rounded half-even."""
+    if value is None or value == "":
+        return None
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value))
+        return int(amount.quantize(_QUANTUM, rounding=ROUND_HALF_EVEN).scaleb(MONEY_DECIMALS))
+    except (ArithmeticError, ValueError):
+        raise ValueError(f"Not a money amount: {value!r}") from None
+
+
+def from_units(units: Optional[float]) -> Optional[float]:
+    """Coin amount (float) for stored units; None stays None."""
+    return None if units is None else units / _UNITS_PER_COIN
+
+
+def units_to_decimal(units: Optional[int]) -> Optional[Decimal]:
+    """Exact coin amount for stored integer units."""
+    return None if units is None else Decimal(int(units)).scaleb(-MONEY_DECIMALS)
+
+
+def _rows_from_units(rows: List[Dict[str, Any]], table: str = "bet_history") -> List[Dict[str, Any]]:
+    columns = _MONEY_COLUMNS[table]
+    for row in rows:
+        for column in columns:
+            if column in row:
+                row[column] = from_units(row[column])
+    return rows
+
+
+def _migrate_money_units(conn: sqlite3.Connection):
+    """Rewrite REAL money columns of a version-1 database as INTEGER units."""
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return
+    conn.execute("BEGIN")
+    try:
+        for table, columns in _MONEY_COLUMNS.items():
+            info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            if not any(col[1] in columns and col[2].upper() == "REAL" for col in info):
+                continue
+            (ddl,) = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            ddl = re.sub(rf"^\s*CREATE TABLE(?: IF NOT EXISTS)?\s+[\"`\[]?{table}\b[\"`\]]?",
+                         f"CREATE TABLE {table}__units", ddl, count=1, flags=re.I)
+            for column in columns:
+                ddl = re.sub(rf"\b{column}\s+REAL\b", f"{column} INTEGER", ddl)
+            names = [col[1] for col in info]
+            select = ", ".join(
+                f"CAST(ROUND({name} * {_UNITS_PER_COIN}) AS INTEGER)" if name in columns else name
+                for name in names
+            )
+            conn.execute(ddl)
+            conn.execute(f"INSERT INTO {table}__units ({', '.join(names)}) SELECT {select} FROM {table}")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}__units RENAME TO {table}")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+# Read connections: memory-mapped I/O and a larger page cache for the
+# analytics queries; query_only makes a write through a reader fail loudly
+READ_POOL_SIZE = 4
+READ_MMAP_BYTES = 256 * 1024 * 1024
+READ_CACHE_KIB = 16 * 1024
+READ_STATEMENT_CACHE = 256
+
+
+class _ReadPool:
+    """
+    Idle read connections reused across calls and threads.
+
+    Each connection keeps its prepared-statement cache, so the fixed
+    dashboard queries are compiled once per connection instead of once per
+    call. Up to ``size`` idle connections are kept; extra concurrent readers
+    get a fresh connection that is closed on release (``size=0`` disables
+    pooling).
+    """
+
+    def __init__(self, db_path: Path, size: int):
+        self.db_path = db_path
+        self.size = max(0, size)
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.stats = {"opened": 0, "reused": 0}
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                               cached_statements=READ_STATEMENT_CACHE)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA mmap_size = {READ_MMAP_BYTES}")
+        conn.execute(f"PRAGMA cache_size = -{READ_CACHE_KIB}")
+        conn.execute("PRAGMA query_only = 1")
+        _register_functions(conn)
+        self.stats["opened"] += 1
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's connections are not ours to use
+                self._idle, self._pid = [], os.getpid()
+            if self._idle:
+                self.stats["reused"] += 1
+                return self._idle.pop()
+        return self._open()
+
+    def release(self, conn: sqlite3.Connection):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.size and self._pid == os.getpid():
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _open_write_connection(db_path: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    _register_functions(conn)
+    return conn
+
+
+def _register_functions(conn: sqlite3.Connection):
+    # bet_epoch(timestamp): the bet's own time as epoch seconds, exactly as
+    # rollups bucket it (NULL when unparseable)
+    conn.create_function("bet_epoch", 1, _bet_epoch, deterministic=True)
+
+
+class _PayloadStore:
+    """Encodes api_raw / strategy_state according to the payload mode."""
+
+    def __init__(self, mode: str = "inline", sample_every: int = 1, cache_size: int = 4096):
+        if mode not in PAYLOAD_MODES:
+            raise ValueError(f"Unknown payload mode: {mode}. Available: {', '.join(PAYLOAD_MODES)}")
+        self.mode = mode
+        self.sample_every = max(1, int(sample_every))
+        self._cache_size = cache_size
+        self._ids: Dict[bytes, int] = {}  # digest -> bet_payloads.id
+
+    def forget(self):
+        """Drop cached payload ids (after payloads were deleted)."""
+        self._ids.clear()
+
+    def keep_api_raw(self, bet_number: int) -> bool:
+        return self.sample_every == 1 or bet_number % self.sample_every == 1
+
+    def encode(self, conn: sqlite3.Connection, value: Any) -> tuple:
+        """Return ``(inline_text, payload_id)`` for one payload."""
+        if self.mode == "inline":
+            return json.dumps(value or {}), None
+        if self.mode == "none" or not value:
+            return None, None
+        return None, self.store(conn, json.dumps(value, sort_keys=True, separators=(",", ":")))
+
+    def store(self, conn: sqlite3.Connection, text: str) -> int:
+        """Insert (or find) a payload in bet_payloads by content digest."""
+        raw = text.encode()
+        digest = hashlib.blake2b(raw, digest_size=16).digest()
+        payload_id = self._ids.get(digest)
+        if payload_id is None:
+            conn.execute(
+                "INSERT OR IGNORE INTO bet_payloads (digest, data) VALUES (?, ?)",
+                (digest, zlib.compress(raw)),
+            )
+            payload_id = conn.execute(
+                "SELECT id FROM bet_payloads WHERE digest = ?", (digest,)
+            ).fetchone()[0]
+            if len(self._ids) >= self._cache_size:
+                self._ids.clear()
+            self._ids[digest] = payload_id
+        return payload_id
+
+
+def _load_payloads(conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Fill api_raw / strategy_state of bet rows whose payloads live in bet_payloads."""
+    ids = {r[col] for r in rows for col in ("api_raw_id", "state_id") if r.get(col)}
+    if not ids:
+        return rows
+    texts: Dict[int, str] = {}
+    id_list = list(ids)
+    for i in range(0, len(id_list), 500):
+        chunk = id_list[i:i + 500]
+        marks = ",".join("?" * len(chunk))
+        for payload_id, data in conn.execute(
+            f"SELECT id, data FROM bet_payloads WHERE id IN ({marks})", chunk
+        ):
+            texts[payload_id] = zlib.decompress(data).decode()
+    for r in rows:
+        if r.get("api_raw_id"):
+            r["api_raw"] = texts.get(r["api_raw_id"])
+        if r.get("state_id"):
+            r["strategy_state"] = texts.get(r["state_id"])
+    return rows
+
+
+def _bet_row(
+    record: tuple,
+    conn: sqlite3.Connection,
+    payloads: _PayloadStore,
+) -> tuple:
+    """Build the bet_history row for one ``log_bet`` record."""
+    (session_id, bet_data, result_data, bet_number, balance,
+     loss_streak, simulation_mode, strategy_state) = record
+
+    # Extract bet specification
+    amount = to_units(bet_data.get('amount', 0))
+    chance = float(bet_data.get('chance', 0)) if bet_data.get('chance') else None
+    is_high = 1 if bet_data.get('is_high') else 0
+    game_type = bet_data.get('game', 'dice')
+
+    # Extract range for range dice
+    range_vals = bet_data.get('range')
+    range_low = int(range_vals[0]) if range_vals else None
+    range_high = int(range_vals[1]) if range_vals else None
+    is_in = 1 if bet_data.get('is_in') else 0
+
+    # Extract result
+    win = 1 if result_data.get('win', False) else 0
+    profit = to_units(result_data.get('profit', 0))
+    roll = float(result_data.get('number', 0)) if result_data.get('number') is not None else None
+    payout = to_units(result_data.get('payout')) if result_data.get('payout') else None
+    timestamp = result_data.get('timestamp', datetime.now().isoformat())
+
+    # Calculate target from chance and is_high (for dice)
+    target = None
+    if game_type == 'dice' and chance is not None:
+        if is_high:
+            target = 100 - chance
+        else:
+            target = chance
+
+    api_raw = result_data.get('api_raw', {}) if payloads.keep_api_raw(bet_number) else None
+    api_raw_text, api_raw_id = payloads.encode(conn, api_raw)
+    state_text, state_id = payloads.encode(conn, strategy_state)
+
+    return (
+        session_id,
+        timestamp,
+        bet_number,
+        bet_data.get('symbol', ''),
+        bet_data.get('strategy', ''),
+        amount,
+        chance,
+        target,
+        is_high,
+        range_low,
+        range_high,
+        is_in,
+        game_type,
+        roll,
+        win,
+        profit,
+        payout,
+        to_units(balance),
+        loss_streak,
+        1 if simulation_mode else 0,
+        api_raw_text,
+        state_text,
+        api_raw_id,
+        state_id,
+    )
+
+
+def _insert_session(conn: sqlite3.Connection, row: tuple):
+    conn.execute("""
+            INSERT OR REPLACE INTO sessions (
+                session_id, strategy_name, symbol, simulation_mode,
+                starting_balance, started_at, strategy_params,
+                stop_loss, take_profit, max_bet, max_bets,
+                max_losses, max_duration_sec, metadata
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, row)
+
+
+def _finish_session(
+    conn: sqlite3.Connection,
+    session_id: str,
+    ending_balance: Decimal,
+    stop_reason: str,
+    total_bets: int,
+    wins: int,
+    losses: int,
+    ended_at: datetime,
+):
+    cursor = conn.cursor()
+
+    # Get session start info
+    cursor.execute(
+            "SELECT starting_balance, started_at FROM sessions WHERE session_id = ?",
+            (session_id,)
+    )
+    row = cursor.fetchone()
+    if not row:
+        return
+
+    starting_balance = Decimal(str(row['starting_balance'] or 0))
+    started_at = datetime.fromisoformat(row['started_at'])
+
+    # Calculate statistics
+    profit = ending_balance - starting_balance
+    profit_percent = (profit / starting_balance * 100) if starting_balance > 0 else 0
+    duration = (ended_at - started_at).total_seconds()
+
+    # Update session
+    cursor.execute("""
+            UPDATE sessions SET
+                ending_balance = ?,
+                ended_at = ?,
+                stop_reason = ?,
+                total_bets = ?,
+                wins = ?,
+                losses = ?,
+                profit = ?,
+                profit_percent = ?,
+                duration_seconds = ?
+            WHERE session_id = ?
+    """, (
+        float(ending_balance),
+        ended_at.isoformat(),
+        stop_reason,
+        total_bets,
+        wins,
+        losses,
+        float(profit),
+        float(profit_percent),
+        duration,
+        session_id
+    ))
+
+
+# Aggregate columns shared by session_stats and strategy_stats
+_STAT_FIELDS = ("bets", "wins", "profit", "wagered", "min_balance", "max_balance",
+                "max_win", "max_loss", "last_bet_at")
+
+
+def _stats_upsert_sql(table: str, columns: tuple, conflict: tuple) -> str:
+    cols = columns + _STAT_FIELDS
+
+    def lowest(col):
+        return f"MIN(COALESCE({col}, excluded.{col}), COALESCE(excluded.{col}, {col}))"
+
+    def highest(col):
+        return f"MAX(COALESCE({col}, excluded.{col}), COALESCE(excluded.{col}, {col}))"
+
+    return f"""
+        INSERT INTO {table} ({", ".join(cols)}) VALUES ({", ".join("?" * len(cols))})
+        ON CONFLICT({", ".join(conflict)}) DO UPDATE SET
+            bets = bets + excluded.bets,
+            wins = wins + excluded.wins,
+            profit = profit + excluded.profit,
+            wagered = wagered + excluded.wagered,
+            min_balance = {lowest("min_balance")},
+            max_balance = {highest("max_balance")},
+            max_win = {highest("max_win")},
+            max_loss = {lowest("max_loss")},
+            last_bet_at = {highest("last_bet_at")}
+    """
+
+
+_SESSION_STATS_UPSERT = _stats_upsert_sql(
+    "session_stats", ("session_id", "strategy", "symbol", "simulation_mode"), ("session_id",))
+_STRATEGY_STATS_UPSERT = _stats_upsert_sql(
+    "strategy_stats", ("strategy", "symbol", "simulation_mode"),
+    ("strategy", "symbol", "simulation_mode"))
+
+
+# Rollup bucket sizes in seconds
+ROLLUP_RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+_ROLLUP_UPSERT = """
+    INSERT INTO bet_rollups (
+        resolution, bucket, symbol, simulation_mode,
+        bets, wins, profit, wagered,
+        open_balance, high_balance, low_balance, close_balance, first_at, last_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(resolution, bucket, symbol, simulation_mode) DO UPDATE SET
+        bets = bets + excluded.bets,
+        wins = wins + excluded.wins,
+        profit = profit + excluded.profit,
+        wagered = wagered + excluded.wagered,
+        open_balance = CASE WHEN excluded.first_at < first_at
+                            THEN excluded.open_balance ELSE open_balance END,
+        close_balance = CASE WHEN excluded.last_at >= last_at
+                             THEN excluded.close_balance ELSE close_balance END,
+        high_balance = MAX(high_balance, excluded.high_balance),
+        low_balance = MIN(low_balance, excluded.low_balance),
+        first_at = MIN(first_at, excluded.first_at),
+        last_at = MAX(last_at, excluded.last_at)
+"""
+
+
+def _epoch(value: Any) -> float:
+    """Seconds since the epoch for a bet timestamp (epoch number or ISO string, naive = UTC)."""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            dt = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _bet_epoch(value: Any) -> Optional[float]:
+    try:
+        return _epoch(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Rollups:
+    """Pending time-bucket deltas for bet_rollups."""
+
+    def __init__(self):
+        self._buckets: Dict[tuple, list] = {}
+
+    def add(self, row: tuple):
+        try:
+            at = _epoch(row[1])
+        except ValueError:
+            return  # Unparseable timestamp: nothing to bucket by
+        symbol, amount, won, profit = row[3], row[5], row[14], row[15]
+        balance, simulation_mode = row[17], row[19]
+        for resolution in ROLLUP_RESOLUTIONS.values():
+            key = (resolution, int(at // resolution) * resolution, symbol, simulation_mode)
+            acc = self._buckets.get(key)
+            if acc is None:
+                acc = self._buckets[key] = [0, 0, 0, 0, balance, balance, balance, balance, at, at]
+            acc[0] += 1
+            acc[1] += won
+            acc[2] += profit
+            acc[3] += amount
+            acc[5] = max(acc[5], balance)
+            acc[6] = min(acc[6], balance)
+            if at < acc[8]:
+                acc[4], acc[8] = balance, at
+            if at >= acc[9]:
+                acc[7], acc[9] = balance, at
+
+    def flush(self, conn: sqlite3.Connection):
+        if self._buckets:
+            conn.executemany(_ROLLUP_UPSERT,
+                             [key + tuple(acc) for key, acc in self._buckets.items()])
+        self.clear()
+
+    def clear(self):
+        self._buckets.clear()
+
+
+class _Aggregates:
+    """Pending per-session / per-strategy / rollup deltas, applied once per transaction."""
+
+    def __init__(self):
+        self._sessions: Dict[tuple, list] = {}
+        self._strategies: Dict[tuple, list] = {}
+        self.rollups = _Rollups()
+
+    def add(self, row: tuple):
+        """Fold one ``_bet_row`` tuple into the pending deltas."""
+        session_id, timestamp, symbol, strategy = row[0], row[1], row[3], row[4]
+        amount, won, profit, balance, simulation_mode = row[5], row[14], row[15], row[17], row[19]
+        for table, key in (
+            (self._sessions, (session_id, strategy, symbol, simulation_mode)),
+            (self._strategies, (strategy, symbol, simulation_mode)),
+        ):
+            acc = table.get(key)
+            if acc is None:
+                acc = table[key] = [0, 0, 0, 0, balance, balance, None, None, timestamp]
+            acc[0] += 1
+            acc[1] += won
+            acc[2] += profit
+            acc[3] += amount
+            acc[4] = min(acc[4], balance)
+            acc[5] = max(acc[5], balance)
+            if won:
+                acc[6] = profit if acc[6] is None else max(acc[6], profit)
+            else:
+                acc[7] = profit if acc[7] is None else min(acc[7], profit)
+            acc[8] = max(acc[8], timestamp)
+        self.rollups.add(row)
+
+    def flush(self, conn: sqlite3.Connection):
+        if self._sessions:
+            conn.executemany(_SESSION_STATS_UPSERT,
+                             [key + tuple(acc) for key, acc in self._sessions.items()])
+        if self._strategies:
+            conn.executemany(_STRATEGY_STATS_UPSERT,
+                             [key + tuple(acc) for key, acc in self._strategies.items()])
+        self.rollups.flush(conn)
+        self.clear()
+
+    def clear(self):
+        self._sessions.clear()
+        self._strategies.clear()
+        self.rollups.clear()
+
+
+class _BackgroundWriter:
+    """
+    Writer thread owning the SQLite write connection.
+
+    Queue items are ``(op, payload)``; consecutive bets in a batch go through
+    one ``executemany`` and each batch is committed as a single transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        batch_size: int,
+        queue_size: int,
+        payloads: _PayloadStore,
+        aggregates: _Aggregates,
+    ):
+        self.db_path = db_path
+        self.payloads = payloads
+        self.aggregates = aggregates
+        self.batch_size = max(1, batch_size)
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, queue_size))
+        self._closed = False
+        self.stats = {
+            "queued": 0,            # bets accepted
+            "written": 0,           # bets committed
+            "batches": 0,           # transactions committed
+            "backpressure_waits": 0,  # puts that found the queue full and blocked
+            "max_depth": 0,
+            "errors": 0,
+            "dropped": 0,           # bets that could not be written
+        }
+        self.last_error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True, name="bet-db-writer")
+        self._thread.start()
+        _OPEN_WRITERS.add(self)
+
+    def put(self, op: int, payload: Any):
+        if self._closed:
+            raise RuntimeError("BetDatabase writer is closed")
+        item = (op, payload)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Backpressure: the betting thread waits for the writer to catch up
+            self.stats["backpressure_waits"] += 1
+            self._queue.put(item)
+        if op == _OP_BET:
+            self.stats["queued"] += 1
+        depth = self._queue.qsize()
+        if depth > self.stats["max_depth"]:
+            self.stats["max_depth"] = depth
+
+    def flush(self):
+        """Block until everything queued so far is committed."""
+        if self._closed or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self.put(_OP_FLUSH, done)
+        done.wait()
+
+    def close(self):
+        """Drain the queue, commit and stop the writer thread."""
+        if self._closed:
+            return
+        if self._thread.is_alive():
+            self.put(_OP_STOP, None)
+            self._closed = True
+            self._thread.join()
+        self._closed = True
+        _OPEN_WRITERS.discard(self)
+
+    def _run(self):
+        conn = _open_write_connection(self.db_path)
+        try:
+            stop = False
+            while not stop:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = any(op == _OP_STOP for op, _ in batch)
+                self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        waiters = [payload for op, payload in batch if op == _OP_FLUSH]
+        try:
+            try:
+                written = self._apply(conn, batch)
+                conn.commit()
+                self.stats["written"] += written
+                self.stats["batches"] += 1
+            except Exception as e:
+                conn.rollback()
+                self.aggregates.clear()
+                self.stats["errors"] += 1
+                self.last_error = e
+                # Retry one item per transaction so a bad row only loses itself
+                for item in batch:
+                    try:
+                        written = self._apply(conn, [item])
+                        conn.commit()
+                        self.stats["written"] += written
+                    except Exception as item_error:
+                        conn.rollback()
+                        self.aggregates.clear()
+                        self.last_error = item_error
+                        if item[0] == _OP_BET:
+                            self.stats["dropped"] += 1
+        finally:
+            for done in waiters:
+                done.set()
+
+    def _apply(self, conn: sqlite3.Connection, batch: List[tuple]) -> int:
+        """Execute a batch inside the open transaction; returns bets inserted."""
+        rows: List[tuple] = []
+        written = 0
+
+        def insert_rows():
+            conn.executemany(_INSERT_BET_SQL, rows)
+            for row in rows:
+                self.aggregates.add(row)
+            # Flush before session updates so end_session sees every bet
+            self.aggregates.flush(conn)
+            return len(rows)
+
+        for op, payload in batch:
+            if op == _OP_BET:
+                rows.append(_bet_row(payload, conn, self.payloads))
+                continue
+            if rows:
+                written += insert_rows()
+                rows = []
+            if op == _OP_CALL:
+                fn, args = payload
+                fn(conn, *args)
+        if rows:
+            written += insert_rows()
+        return written
+
+
+_OPEN_WRITERS: "set[_BackgroundWriter]" = set()
+
+
+@atexit.register
+def _close_open_writers():
+    """Flush-on-shutdown: drain every still-running writer before exit."""
+    for writer in list(_OPEN_WRITERS):
+        try:
+            writer.close()
+        except Exception:
+            pass
 
 
 class BetDatabase:
@@ -19,12 +762,32 @@ class BetDatabase:
     Stores complete bet data for debugging, analysis, and strategy improvement.
     """
     
-    def __init__(self, db_path: Optional[Path] = None, commit_every: int = 50):
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        commit_every: int = 50,
+        background_writes: bool = False,
+        queue_size: int = 10000,
+        payloads: str = "inline",
+        payload_sample_every: int = 1,
+        service: Optional[str] = None,
+        read_pool_size: int = READ_POOL_SIZE,
+    ):
         """
         Initialize bet database.
         
         Args:
             db_path: Path to SQLite database file. Defaults to data/duckdice_bot.db
+            commit_every: Bets per transaction (the writer thread's max batch
+                size when ``background_writes`` is set)
+            background_writes: Move all writes to a dedicated writer thread
+            queue_size: Bounded queue length before ``log_bet`` blocks
+            payloads: api_raw / strategy_state storage, one of PAYLOAD_MODES
+            payload_sample_every: Keep the API payload of every Nth bet only
+            service: Address of a running ``DatabaseService`` (``"auto"`` for
+                the default one of ``db_path``). Writes are forwarded to it
+                and its writer settings apply; reads stay local.
+            read_pool_size: Idle read connections kept for reuse
         """
         if db_path is None:
             db_path = Path("data") / "duckdice_bot.db"
@@ -34,17 +797,29 @@ class BetDatabase:
         self._commit_every = max(1, int(commit_every))
         self._write_conn: Optional[sqlite3.Connection] = None
         self._pending_write_count = 0
+        self._writer: Optional[_BackgroundWriter] = None
+        self._payloads = _PayloadStore(payloads, payload_sample_every)
+        self._aggregates = _Aggregates()
+        self._snapshot = threading.local()
+        self._read_pool = _ReadPool(self.db_path, read_pool_size)
+        self._remote = service is not None
         
+        if self._remote:
+            # The service created the schema; producers never take the write lock
+            from .db_service import ServiceWriter, default_address
+            address = default_address(self.db_path) if service == "auto" else service
+            self._writer = ServiceWriter(address)
+            _OPEN_WRITERS.add(self._writer)
+            return
         self._init_database()
+        if background_writes:
+            self._writer = _BackgroundWriter(self.db_path, self._commit_every, queue_size,
+                                             self._payloads, self._aggregates)
 
     def _ensure_write_connection(self) -> sqlite3.Connection:
         """Lazily create a dedicated write connection for batched commits."""
         if self._write_conn is None:
-            conn = sqlite3.connect(str(self.db_path))
-            conn.row_factory = sqlite3.Row
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            self._write_conn = conn
+            self._write_conn = _open_write_connection(self.db_path)
         return self._write_conn
 
     def _commit_if_needed(self, force: bool = False):
@@ -52,15 +827,41 @@ class BetDatabase:
         if not conn:
             return
         if force or self._pending_write_count >= self._commit_every:
+            self._aggregates.flush(conn)
             conn.commit()
             self._pending_write_count = 0
 
+    @property
+    def writer_stats(self) -> Dict[str, Any]:
+        """Background writer counters (empty when writing synchronously)."""
+        return dict(self._writer.stats) if self._writer else {}
+
     def flush(self):
-        """Force commit buffered writes."""
+        """Force commit buffered writes (waits for the writer thread to catch up)."""
+        if self._writer is not None:
+            self._writer.flush()
         self._commit_if_needed(force=True)
 
+    def rollback(self):
+        """
+        Discard synchronous writes that have not been committed yet.
+        
+        Pending aggregate deltas and cached payload ids go with them. Only
+        for synchronous writes (the writer thread rolls back its own batches).
+        """
+        if self._writer is not None:
+            raise ValueError("rollback requires background_writes=False")
+        if self._write_conn is not None:
+            self._write_conn.rollback()
+        self._aggregates.clear()
+        self._payloads.forget()
+        self._pending_write_count = 0
+
     def close(self):
-        """Flush and close the dedicated write connection."""
+        """Flush and close the write connection and idle read connections."""
+        self._read_pool.close()
+        if self._writer is not None:
+            self._writer.close()
         if self._write_conn is not None:
             try:
                 self._commit_if_needed(force=True)
@@ -68,6 +869,87 @@ class BetDatabase:
                 self._write_conn.close()
                 self._write_conn = None
 
+    def compact_payloads(
+        self,
+        sample_every: int = 1,
+        batch_size: int = 5000,
+        vacuum: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Migrate inline api_raw / strategy_state TEXT into bet_payloads.
+        
+        Rows are rewritten in id order, one transaction per ``batch_size``
+        rows, so the migration can be interrupted and re-run.
+        
+        Args:
+            sample_every: Keep the API payload of every Nth bet only
+            batch_size: Rows per transaction
+            vacuum: Rebuild the file afterwards to return freed pages
+        
+        Returns:
+            Dict with rows migrated, payloads stored and file size before/after
+        """
+        self.flush()
+        store = _PayloadStore("compressed", sample_every)
+        size_before = self._file_size()
+        migrated = 0
+        last_id = 0
+        conn = _open_write_connection(self.db_path)
+        try:
+            while True:
+                rows = conn.execute("""
+                    SELECT id, bet_number, api_raw, strategy_state, api_raw_id, state_id
+                    FROM bet_history
+                    WHERE id > ? AND (api_raw IS NOT NULL OR strategy_state IS NOT NULL)
+                    ORDER BY id LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                updates = []
+                for row in rows:
+                    api_raw_id = row["api_raw_id"]
+                    if row["api_raw"] is not None and store.keep_api_raw(row["bet_number"]):
+                        api_raw_id = self._migrate_payload(conn, store, row["api_raw"])
+                    state_id = row["state_id"]
+                    if row["strategy_state"] is not None:
+                        state_id = self._migrate_payload(conn, store, row["strategy_state"])
+                    updates.append((api_raw_id, state_id, row["id"]))
+                conn.executemany("""
+                    UPDATE bet_history
+                    SET api_raw = NULL, strategy_state = NULL, api_raw_id = ?, state_id = ?
+                    WHERE id = ?
+                """, updates)
+                conn.commit()
+                migrated += len(rows)
+                last_id = rows[-1]["id"]
+            payload_count = conn.execute("SELECT COUNT(*) FROM bet_payloads").fetchone()[0]
+            if vacuum:
+                conn.execute("VACUUM")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+        return {
+            "rows": migrated,
+            "payloads": payload_count,
+            "bytes_before": size_before,
+            "bytes_after": self._file_size(),
+        }
+
+    @staticmethod
+    def _migrate_payload(conn: sqlite3.Connection, store: _PayloadStore, text: str) -> Optional[int]:
+        try:
+            value = json.loads(text)
+        except ValueError:
+            return store.store(conn, text)
+        return store.encode(conn, value)[1]
+
+    def _file_size(self) -> int:
+        return sum(
+            p.stat().st_size
+            for p in (self.db_path, Path(f"{self.db_path}-wal"))
+            if p.exists()
+        )
+
     def __del__(self):
         try:
             self.close()
@@ -76,7 +958,8 @@ class BetDatabase:
     
     def _init_database(self):
         """Initialize or verify database schema."""
-        with self._get_connection() as conn:
+        with closing(_open_write_connection(self.db_path)) as conn:
+            _migrate_money_units(conn)
             cursor = conn.cursor()
             
             # Main bet history table (complete stream)
@@ -90,7 +973,7 @@ class BetDatabase:
                     -- Bet specification
                     symbol TEXT NOT NULL,
                     strategy TEXT NOT NULL,
-                    amount REAL NOT NULL,
+                    amount INTEGER NOT NULL,
                     chance REAL,
                     target REAL,
                     is_high INTEGER,
@@ -102,11 +985,11 @@ class BetDatabase:
                     -- Result
                     roll REAL,
                     won INTEGER NOT NULL,
-                    profit REAL NOT NULL,
-                    payout REAL,
+                    profit INTEGER NOT NULL,
+                    payout INTEGER,
                     
-                    -- State
-                    balance REAL NOT NULL,
+                    -- State (money columns are atomic units, see to_units)
+                    balance INTEGER NOT NULL,
                     loss_streak INTEGER DEFAULT 0,
                     
                     -- Metadata
@@ -118,6 +1001,80 @@ class BetDatabase:
                 )
             """)
             
+            # Compressed, deduplicated api_raw / strategy_state payloads
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bet_payloads (
+                    id INTEGER PRIMARY KEY,
+                    digest BLOB UNIQUE NOT NULL,
+                    data BLOB NOT NULL
+                )
+            """)
+            existing = {row[1] for row in cursor.execute("PRAGMA table_info(bet_history)")}
+            for column in ("api_raw_id", "state_id"):
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE bet_history ADD COLUMN {column} INTEGER")
+            
+            # Incrementally maintained aggregates (see _Aggregates)
+            had_stats = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'session_stats'"
+            ).fetchone() is not None
+            stat_columns = """
+                    bets INTEGER NOT NULL DEFAULT 0,
+                    wins INTEGER NOT NULL DEFAULT 0,
+                    profit INTEGER NOT NULL DEFAULT 0,
+                    wagered INTEGER NOT NULL DEFAULT 0,
+                    min_balance INTEGER,
+                    max_balance INTEGER,
+                    max_win INTEGER,
+                    max_loss INTEGER,
+                    last_bet_at TEXT
+            """
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS session_stats (
+                    session_id TEXT PRIMARY KEY,
+                    strategy TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    simulation_mode INTEGER NOT NULL,
+                    {stat_columns}
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS strategy_stats (
+                    strategy TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    simulation_mode INTEGER NOT NULL,
+                    {stat_columns},
+                    PRIMARY KEY (strategy, symbol, simulation_mode)
+                )
+            """)
+            if not had_stats:
+                self._rebuild_aggregates(cursor)
+
+            had_rollups = cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bet_rollups'"
+            ).fetchone() is not None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS bet_rollups (
+                    resolution INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    symbol TEXT NOT NULL,
+                    simulation_mode INTEGER NOT NULL,
+                    bets INTEGER NOT NULL,
+                    wins INTEGER NOT NULL,
+                    profit INTEGER NOT NULL,
+                    wagered INTEGER NOT NULL,
+                    open_balance INTEGER,
+                    high_balance INTEGER,
+                    low_balance INTEGER,
+                    close_balance INTEGER,
+                    first_at REAL,
+                    last_at REAL,
+                    PRIMARY KEY (resolution, bucket, symbol, simulation_mode)
+                )
+            """)
+            if not had_rollups:
+                self._rebuild_rollups(conn)
+            
             # Sessions tracking table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS sessions (
@@ -172,11 +1129,32 @@ class BetDatabase:
                     updated_at TEXT DEFAULT CURRENT_TIMESTAMP
                 )
             """)
+
+            # Session-log ingestion progress (byte offset per log file)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS log_offsets (
+                    path TEXT PRIMARY KEY,
+                    position INTEGER NOT NULL
+                )
+            """)
             
             # Create indexes for efficient querying
+            # Covering indexes for the hot read paths (see tests/test_bet_database_indexes.py):
+            # session tail / resume and per-session reads
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_bet_session 
-                ON bet_history(session_id)
+                CREATE INDEX IF NOT EXISTS idx_bet_session_tail
+                ON bet_history(session_id, bet_number, loss_streak, balance)
+            """)
+            # Superseded by idx_bet_session_tail (same leading column)
+            cursor.execute("DROP INDEX IF EXISTS idx_bet_session")
+            # get_recent_rolls, with and without a symbol filter
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_bet_symbol_rolls
+                ON bet_history(symbol, id, roll)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_bet_rolls
+                ON bet_history(id, roll)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_bet_timestamp 
@@ -194,19 +1172,53 @@ class BetDatabase:
                 CREATE INDEX IF NOT EXISTS idx_session_timestamp 
                 ON sessions(started_at DESC)
             """)
+            # get_last_cancelled_session on every --continue
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_session_stop_reason
+                ON sessions(stop_reason, started_at)
+            """)
             
+            # Only when it changes: setting it takes the write lock on every open
+            if cursor.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
             conn.commit()
     
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        """Read connection from the pool (or the pinned ``read_snapshot``)."""
+        pinned = getattr(self._snapshot, "conn", None)
+        if pinned is not None:
+            yield pinned
+            return
+        conn = self._read_pool.acquire()
         try:
             yield conn
         finally:
-            conn.close()
+            self._read_pool.release(conn)
     
+    @contextmanager
+    def read_snapshot(self):
+        """
+        Pin one WAL snapshot for the reads this thread makes in the block.
+        
+        Every query inside shares one read transaction, so results agree
+        with each other while a writer (or the database service) keeps
+        committing. Readers never block the writer in WAL mode.
+        """
+        if getattr(self._snapshot, "conn", None) is not None:
+            yield self
+            return
+        conn = self._read_pool.acquire()
+        try:
+            conn.execute("BEGIN")
+            # The snapshot is taken at the first read, not at BEGIN
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            self._snapshot.conn = conn
+            yield self
+        finally:
+            self._snapshot.conn = None
+            self._read_pool.release(conn)
+
     def start_session(
         self,
         session_id: str,
@@ -216,7 +1228,8 @@ class BetDatabase:
         starting_balance: Optional[Decimal] = None,
         strategy_params: Optional[Dict[str, Any]] = None,
         limits: Optional[Dict[str, Any]] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        started_at: Optional[datetime] = None
     ):
         """
         Start a new betting session.
@@ -230,26 +1243,17 @@ class BetDatabase:
             strategy_params: Strategy parameters
             limits: Session limits (stop_loss, take_profit, etc.)
             metadata: Additional metadata
+            started_at: Start time (default: now)
         """
-        conn = self._ensure_write_connection()
-        cursor = conn.cursor()
-
         limits = limits or {}
 
-        cursor.execute("""
-                INSERT OR REPLACE INTO sessions (
-                    session_id, strategy_name, symbol, simulation_mode,
-                    starting_balance, started_at, strategy_params,
-                    stop_loss, take_profit, max_bet, max_bets,
-                    max_losses, max_duration_sec, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        row = (
             session_id,
             strategy_name,
             symbol,
             1 if simulation_mode else 0,
             float(starting_balance) if starting_balance else None,
-            datetime.now().isoformat(),
+            (started_at or datetime.now()).isoformat(),
             json.dumps(strategy_params or {}),
             limits.get('stop_loss'),
             limits.get('take_profit'),
@@ -258,7 +1262,13 @@ class BetDatabase:
             limits.get('max_losses'),
             limits.get('max_duration_sec'),
             json.dumps(metadata or {})
-        ))
+        )
+        if self._writer is not None:
+            self._writer.put(_OP_CALL, (_insert_session, (row,)))
+            return
+
+        conn = self._ensure_write_connection()
+        _insert_session(conn, row)
         conn.commit()
     
     def log_bet(
@@ -275,6 +1285,9 @@ class BetDatabase:
         """
         Log a complete bet with all details.
         
+        With background writes the dicts are serialised later on the writer
+        thread, so callers must not mutate them after logging.
+        
         Args:
             session_id: Session identifier
             bet_data: Bet specification (amount, chance, etc.)
@@ -285,69 +1298,16 @@ class BetDatabase:
             simulation_mode: Whether this is simulated
             strategy_state: Internal strategy state snapshot
         """
+        record = (session_id, bet_data, result_data, bet_number, balance,
+                  loss_streak, simulation_mode, strategy_state)
+        if self._writer is not None:
+            self._writer.put(_OP_BET, record)
+            return
+
         conn = self._ensure_write_connection()
-        cursor = conn.cursor()
-
-        # Extract bet specification
-        amount = float(bet_data.get('amount', 0))
-        chance = float(bet_data.get('chance', 0)) if bet_data.get('chance') else None
-        is_high = 1 if bet_data.get('is_high') else 0
-        game_type = bet_data.get('game', 'dice')
-
-        # Extract range for range dice
-        range_vals = bet_data.get('range')
-        range_low = int(range_vals[0]) if range_vals else None
-        range_high = int(range_vals[1]) if range_vals else None
-        is_in = 1 if bet_data.get('is_in') else 0
-
-        # Extract result
-        win = 1 if result_data.get('win', False) else 0
-        profit = float(result_data.get('profit', 0))
-        roll = float(result_data.get('number', 0)) if result_data.get('number') is not None else None
-        payout = float(result_data.get('payout', 0)) if result_data.get('payout') else None
-        timestamp = result_data.get('timestamp', datetime.now().isoformat())
-
-        # Calculate target from chance and is_high (for dice)
-        target = None
-        if game_type == 'dice' and chance is not None:
-            if is_high:
-                target = 100 - chance
-            else:
-                target = chance
-
-        cursor.execute("""
-                INSERT INTO bet_history (
-                    session_id, timestamp, bet_number,
-                    symbol, strategy, amount, chance, target,
-                    is_high, range_low, range_high, is_in, game_type,
-                    roll, won, profit, payout,
-                    balance, loss_streak, simulation_mode,
-                    api_raw, strategy_state
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            session_id,
-            timestamp,
-            bet_number,
-            bet_data.get('symbol', ''),
-            bet_data.get('strategy', ''),
-            amount,
-            chance,
-            target,
-            is_high,
-            range_low,
-            range_high,
-            is_in,
-            game_type,
-            roll,
-            win,
-            profit,
-            payout,
-            float(balance),
-            loss_streak,
-            1 if simulation_mode else 0,
-            json.dumps(result_data.get('api_raw', {})),
-            json.dumps(strategy_state or {})
-        ))
+        row = _bet_row(record, conn, self._payloads)
+        conn.execute(_INSERT_BET_SQL, row)
+        self._aggregates.add(row)
         self._pending_write_count += 1
         self._commit_if_needed(force=False)
     
@@ -358,7 +1318,8 @@ class BetDatabase:
         stop_reason: str,
         total_bets: int,
         wins: int,
-        losses: int
+        losses: int,
+        ended_at: Optional[datetime] = None
     ):
         """
         End a betting session and compute final statistics.
@@ -370,57 +1331,41 @@ class BetDatabase:
             total_bets: Total number of bets placed
             wins: Number of winning bets
             losses: Number of losing bets
+            ended_at: End time (default: now)
         """
-        conn = self._ensure_write_connection()
-        cursor = conn.cursor()
+        args = (session_id, ending_balance, stop_reason, total_bets, wins, losses,
+                ended_at or datetime.now())
+        if self._writer is not None:
+            self._writer.put(_OP_CALL, (_finish_session, args))
+            return
 
+        conn = self._ensure_write_connection()
         self._commit_if_needed(force=True)
+        _finish_session(conn, *args)
+        conn.commit()
+    
+    def get_log_offset(self, path: str) -> int:
+        """Bytes of session log ``path`` already ingested (0 if never seen)."""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT position FROM log_offsets WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else 0
+
+    def set_log_offset(self, path: str, offset: int):
+        """
+        Record ingestion progress for ``path`` in the pending write transaction.
 
-        # Get session start info
-        cursor.execute(
-                "SELECT starting_balance, started_at FROM sessions WHERE session_id = ?",
-                (session_id,)
+        Only for synchronous writes: the offset commits together with the
+        bets logged before the next commit, never ahead of them.
+        """
+        if self._writer is not None:
+            raise ValueError("set_log_offset requires background_writes=False")
+        conn = self._ensure_write_connection()
+        conn.execute(
+            "INSERT INTO log_offsets (path, position) VALUES (?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET position = excluded.position",
+            (path, offset),
         )
-        row = cursor.fetchone()
-        if not row:
-            return
 
-        starting_balance = Decimal(str(row['starting_balance'] or 0))
-        started_at = datetime.fromisoformat(row['started_at'])
-        ended_at = datetime.now()
-
-        # Calculate statistics
-        profit = ending_balance - starting_balance
-        profit_percent = (profit / starting_balance * 100) if starting_balance > 0 else 0
-        duration = (ended_at - started_at).total_seconds()
-
-        # Update session
-        cursor.execute("""
-                UPDATE sessions SET
-                    ending_balance = ?,
-                    ended_at = ?,
-                    stop_reason = ?,
-                    total_bets = ?,
-                    wins = ?,
-                    losses = ?,
-                    profit = ?,
-                    profit_percent = ?,
-                    duration_seconds = ?
-                WHERE session_id = ?
-        """, (
-            float(ending_balance),
-            ended_at.isoformat(),
-            stop_reason,
-            total_bets,
-            wins,
-            losses,
-            float(profit),
-            float(profit_percent),
-            duration,
-            session_id
-        ))
-        conn.commit()
-    
     def get_session_bets(
         self,
         session_id: str,
@@ -436,7 +1381,8 @@ class BetDatabase:
                 LIMIT ?
             """, (session_id, limit))
             
-            return [dict(row) for row in cursor.fetchall()]
+            rows = _rows_from_units([dict(row) for row in cursor.fetchall()])
+            return _load_payloads(conn, rows)
     
     def get_sessions(
         self,
@@ -444,25 +1390,49 @@ class BetDatabase:
         strategy_name: Optional[str] = None,
         limit: int = 50
     ) -> List[Dict[str, Any]]:
-        """Get list of sessions with optional filters."""
-        query = "SELECT * FROM sessions WHERE 1=1"
+        """Get list of sessions with optional filters.
+        
+        Each row also carries ``wagered``, ``min_balance``, ``max_balance``
+        and ``last_bet_at`` from session_stats; sessions still running report
+        their live bet/win/loss/profit totals.
+        """
+        query = """
+            SELECT s.*,
+                a.bets AS agg_bets, a.wins AS agg_wins, a.profit AS agg_profit,
+                COALESCE(a.wagered, 0) AS wagered, a.min_balance, a.max_balance,
+                a.last_bet_at
+            FROM sessions s
+            LEFT JOIN session_stats a ON a.session_id = s.session_id
+            WHERE 1=1
+        """
         params = []
         
         if simulation_mode is not None:
-            query += " AND simulation_mode = ?"
+            query += " AND s.simulation_mode = ?"
             params.append(1 if simulation_mode else 0)
         
         if strategy_name:
-            query += " AND strategy_name = ?"
+            query += " AND s.strategy_name = ?"
             params.append(strategy_name)
         
-        query += " ORDER BY started_at DESC LIMIT ?"
+        query += " ORDER BY s.started_at DESC LIMIT ?"
         params.append(limit)
         
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            sessions = []
+            for row in cursor.fetchall():
+                session = dict(row)
+                bets = session.pop('agg_bets')
+                wins = session.pop('agg_wins')
+                profit = from_units(session.pop('agg_profit'))
+                for column in ('wagered', 'min_balance', 'max_balance'):
+                    session[column] = from_units(session[column])
+                if session['ended_at'] is None and bets:
+                    session.update(total_bets=bets, wins=wins, losses=bets - wins, profit=profit)
+                sessions.append(session)
+            return sessions
     
     def get_last_cancelled_session(
         self,
@@ -488,7 +1458,9 @@ class BetDatabase:
     def get_session_tail_state(self, session_id: str) -> Dict[str, Any]:
         """Return restorable state from the last bet of a session.
 
-        Returns a dict with: loss_streak, bet_number, last_balance.
+        Returns a dict with: loss_streak, bet_number, last_balance, and
+        strategy_state / strategy_state_bet (the strategy state rebuilt from
+        the nearest snapshot, and the bet it reflects) when one was logged.
         Used by strategies that implement on_resume() to restore internal state.
         """
         with self._get_connection() as conn:
@@ -501,20 +1473,298 @@ class BetDatabase:
             row = cursor.fetchone()
             if not row:
                 return {}
-            return {
+            tail = {
                 "loss_streak": row["loss_streak"] or 0,
                 "bet_number": row["bet_number"] or 0,
-                "last_balance": row["balance"] or 0,
+                "last_balance": from_units(row["balance"]) or 0,
+            }
+            state_bet, state = self._latest_strategy_state(conn, session_id)
+        if state is not None:
+            tail.update(strategy_state=state, strategy_state_bet=state_bet)
+        return tail
+
+    def get_strategy_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Latest strategy state of a session, rebuilt from its nearest snapshot."""
+        with self._get_connection() as conn:
+            return self._latest_strategy_state(conn, session_id)[1]
+
+    @staticmethod
+    def _latest_strategy_state(conn: sqlite3.Connection, session_id: str, chunk: int = 256) -> tuple:
+        """``(bet_number, state)`` from the last full snapshot plus later deltas."""
+        from .state_snapshots import is_full, reconstruct_state
+
+        records: List[Any] = []
+        last_bet, before = None, None
+        while True:
+            rows = [dict(r) for r in conn.execute("""
+                SELECT bet_number, strategy_state, state_id FROM bet_history
+                WHERE session_id = ? AND bet_number < ?
+                  AND (strategy_state != '{}' OR state_id IS NOT NULL)
+                ORDER BY bet_number DESC LIMIT ?
+            """, (session_id, before if before is not None else 2 ** 62, chunk))]
+            if not rows:
+                return None, None
+            _load_payloads(conn, rows)
+            for row in rows:
+                try:
+                    record = json.loads(row["strategy_state"])
+                except (TypeError, ValueError):
+                    continue
+                if not record:
+                    # Inline mode stores "{}" for bets without a state
+                    continue
+                last_bet = last_bet or row["bet_number"]
+                records.append(record)
+                if is_full(record):
+                    return last_bet, reconstruct_state(reversed(records))
+            before = rows[-1]["bet_number"]
+
+    @staticmethod
+    def _rebuild_aggregates(cursor: sqlite3.Cursor):
+        aggregates = """
+            COUNT(*), SUM(won), SUM(profit), SUM(amount), MIN(balance), MAX(balance),
+            MAX(CASE WHEN won = 1 THEN profit END), MIN(CASE WHEN won = 0 THEN profit END),
+            MAX(timestamp)
+        """
+        cursor.execute("DELETE FROM session_stats")
+        cursor.execute("DELETE FROM strategy_stats")
+        cursor.execute(f"""
+            INSERT INTO session_stats
+            SELECT session_id, MIN(strategy), MIN(symbol), MIN(simulation_mode), {aggregates}
+            FROM bet_history GROUP BY session_id
+        """)
+        cursor.execute(f"""
+            INSERT INTO strategy_stats
+            SELECT strategy, symbol, simulation_mode, {aggregates}
+            FROM bet_history GROUP BY strategy, symbol, simulation_mode
+        """)
+
+    @staticmethod
+    def _rebuild_rollups(conn: sqlite3.Connection, chunk: int = 20000):
+        """Recompute bet_rollups from bet_history, streaming in id order."""
+        conn.execute("DELETE FROM bet_rollups")
+        rollups = _Rollups()
+        last_id = 0
+        while True:
+            rows = conn.execute("""
+                SELECT id, timestamp, symbol, amount, won, profit, balance, simulation_mode
+                FROM bet_history WHERE id > ? ORDER BY id LIMIT ?
+            """, (last_id, chunk)).fetchall()
+            if not rows:
+                break
+            for r in rows:
+                # Shape it like a _bet_row tuple (only the fields rollups read)
+                row = [None] * 20
+                row[1], row[3], row[5], row[14] = r[1], r[2], r[3], r[4]
+                row[15], row[17], row[19] = r[5], r[6], r[7]
+                rollups.add(tuple(row))
+            rollups.flush(conn)
+            last_id = rows[-1][0]
+
+    def rebuild_aggregates(self):
+        """Recompute session_stats / strategy_stats from bet_history."""
+        self.flush()
+        with closing(_open_write_connection(self.db_path)) as conn:
+            self._rebuild_aggregates(conn.cursor())
+            self._rebuild_rollups(conn)
+            conn.commit()
+
+    def get_timeline(
+        self,
+        resolution: str = "1h",
+        symbol: Optional[str] = None,
+        simulation_mode: Optional[bool] = None,
+        since: Any = None,
+        until: Any = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Balance OHLC, bet rate, wager volume and profit per time bucket.
+        
+        Args:
+            resolution: One of ROLLUP_RESOLUTIONS ("1m", "1h", "1d")
+            symbol: Only this currency (rows are per symbol otherwise)
+            simulation_mode: Only simulated / live bets
+            since, until: Bounds as epoch seconds, ISO string or datetime
+        
+        Returns:
+            Rows ordered by bucket start, read from bet_rollups only
+        """
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(
+                f"Unknown resolution: {resolution}. Available: {', '.join(ROLLUP_RESOLUTIONS)}"
+            )
+        seconds = ROLLUP_RESOLUTIONS[resolution]
+        query = "SELECT * FROM bet_rollups WHERE resolution = ?"
+        params: List[Any] = [seconds]
+        
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        
+        if simulation_mode is not None:
+            query += " AND simulation_mode = ?"
+            params.append(1 if simulation_mode else 0)
+        
+        if since is not None:
+            query += " AND bucket >= ?"
+            params.append(int(_epoch(since) // seconds) * seconds)
+        
+        if until is not None:
+            query += " AND bucket < ?"
+            params.append(_epoch(until))
+        
+        query += " ORDER BY bucket ASC, symbol ASC"
+        
+        with self._get_connection() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {
+                'bucket': row['bucket'],
+                'time': datetime.fromtimestamp(row['bucket'], tz=timezone.utc).isoformat(),
+                'symbol': row['symbol'],
+                'simulation_mode': bool(row['simulation_mode']),
+                'bets': row['bets'],
+                'wins': row['wins'],
+                'profit': from_units(row['profit']),
+                'wagered': from_units(row['wagered']),
+                'open': from_units(row['open_balance']),
+                'high': from_units(row['high_balance']),
+                'low': from_units(row['low_balance']),
+                'close': from_units(row['close_balance']),
+                'bets_per_sec': row['bets'] / seconds,
             }
+            for row in rows
+        ]
+
+    def apply_retention(
+        self,
+        raw_days: Optional[float] = None,
+        rollup_days: Optional[Dict[str, float]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Drop old data while keeping summaries.
+        
+        Raw bet_history rows older than ``raw_days`` (by bet timestamp, the
+        same time rollups are bucketed by; rows whose timestamp cannot be
+        parsed are kept) and
+        their now-unreferenced payloads are deleted; session/strategy
+        aggregates and rollups are kept. ``rollup_days`` maps a resolution
+        (e.g. ``{"1m": 7}``) to how long its buckets are kept.
+        
+        Returns:
+            Dict with the number of bet rows and rollup rows deleted
+        """
+        if self._remote:
+            return self._writer.call("apply_retention", raw_days=raw_days,
+                                     rollup_days=rollup_days, now=now)
+        now = now or datetime.now(timezone.utc)
+        result = {'bets': 0, 'rollups': 0}
+
+        def prune(conn: sqlite3.Connection):
+            if raw_days is not None:
+                cutoff_epoch = (now - timedelta(days=raw_days)).timestamp()
+                result['bets'] = conn.execute(
+                    "DELETE FROM bet_history WHERE bet_epoch(timestamp) < ?",
+                    (cutoff_epoch,),
+                ).rowcount
+                conn.execute("""
+                    DELETE FROM bet_payloads WHERE id NOT IN (
+                        SELECT api_raw_id FROM bet_history WHERE api_raw_id IS NOT NULL
+                        UNION SELECT state_id FROM bet_history WHERE state_id IS NOT NULL
+                    )
+                """)
+                self._payloads.forget()
+            for name, days in (rollup_days or {}).items():
+                if name not in ROLLUP_RESOLUTIONS:
+                    raise ValueError(f"Unknown resolution: {name}")
+                cutoff_epoch = (now - timedelta(days=days)).timestamp()
+                result['rollups'] += conn.execute(
+                    "DELETE FROM bet_rollups WHERE resolution = ? AND bucket < ?",
+                    (ROLLUP_RESOLUTIONS[name], cutoff_epoch),
+                ).rowcount
+
+        if self._writer is not None:
+            # Serialised with pending writes (and the payload cache) on the writer thread
+            errors: List[Exception] = []
+
+            def guarded(conn: sqlite3.Connection):
+                try:
+                    prune(conn)
+                except Exception as e:
+                    errors.append(e)
+                    raise
+
+            self._writer.put(_OP_CALL, (guarded, ()))
+            self._writer.flush()
+            if errors:
+                raise errors[0]
+        else:
+            conn = self._ensure_write_connection()
+            self._commit_if_needed(force=True)
+            prune(conn)
+            conn.commit()
+        return result
 
     def get_statistics(
         self,
         session_id: Optional[str] = None,
         strategy_name: Optional[str] = None,
         simulation_mode: Optional[bool] = None,
-        since: Optional[str] = None
+        since: Optional[str] = None,
+        exact: bool = False,
+    ) -> Dict[str, Any]:
+        """Get aggregate statistics with optional filters.
+        
+        Answered from the aggregate tables; only ``since`` needs a scan of
+        bet_history. With ``exact`` the totals and extremes are Decimals
+        computed from the integer units (averages stay floats).
+        """
+        if since:
+            return self._scan_statistics(session_id, strategy_name, simulation_mode, since, exact)
+
+        table = "session_stats" if session_id else "strategy_stats"
+        query = f"""
+            SELECT
+                SUM(bets) as total_bets,
+                SUM(wins) as total_wins,
+                SUM(bets - wins) as total_losses,
+                SUM(profit) as total_profit,
+                CAST(SUM(profit) AS REAL) / SUM(bets) as avg_profit,
+                MAX(max_win) as max_win,
+                MIN(max_loss) as max_loss,
+                CAST(SUM(wagered) AS REAL) / SUM(bets) as avg_bet,
+                MIN(min_balance) as min_balance,
+                MAX(max_balance) as max_balance
+            FROM {table}
+            WHERE 1=1
+        """
+        params = []
+        
+        if session_id:
+            query += " AND session_id = ?"
+            params.append(session_id)
+        
+        if strategy_name:
+            query += " AND strategy = ?"
+            params.append(strategy_name)
+        
+        if simulation_mode is not None:
+            query += " AND simulation_mode = ?"
+            params.append(1 if simulation_mode else 0)
+        
+        with self._get_connection() as conn:
+            row = conn.execute(query, params).fetchone()
+        return self._statistics_dict(row, exact)
+
+    def _scan_statistics(
+        self,
+        session_id: Optional[str],
+        strategy_name: Optional[str],
+        simulation_mode: Optional[bool],
+        since: str,
+        exact: bool = False,
     ) -> Dict[str, Any]:
-        """Get aggregate statistics with optional filters."""
         query = """
             SELECT 
                 COUNT(*) as total_bets,
@@ -551,39 +1801,42 @@ class BetDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            row = cursor.fetchone()
-            
-            if not row or not row['total_bets']:
-                return {
-                    'total_bets': 0,
-                    'total_wins': 0,
-                    'total_losses': 0,
-                    'win_rate': 0,
-                    'total_profit': 0,
-                    'avg_profit': 0,
-                    'max_win': 0,
-                    'max_loss': 0,
-                    'avg_bet': 0,
-                    'min_balance': 0,
-                    'max_balance': 0,
-                }
-            
-            total_bets = row['total_bets']
-            total_wins = row['total_wins'] or 0
-            
+            return self._statistics_dict(cursor.fetchone(), exact)
+
+    @staticmethod
+    def _statistics_dict(row: Optional[sqlite3.Row], exact: bool = False) -> Dict[str, Any]:
+        if not row or not row['total_bets']:
             return {
-                'total_bets': total_bets,
-                'total_wins': total_wins,
-                'total_losses': row['total_losses'] or 0,
-                'win_rate': (total_wins / total_bets * 100) if total_bets > 0 else 0,
-                'total_profit': row['total_profit'] or 0,
-                'avg_profit': row['avg_profit'] or 0,
-                'max_win': row['max_win'] or 0,
-                'max_loss': row['max_loss'] or 0,
-                'avg_bet': row['avg_bet'] or 0,
-                'min_balance': row['min_balance'] or 0,
-                'max_balance': row['max_balance'] or 0,
+                'total_bets': 0,
+                'total_wins': 0,
+                'total_losses': 0,
+                'win_rate': 0,
+                'total_profit': 0,
+                'avg_profit': 0,
+                'max_win': 0,
+                'max_loss': 0,
+                'avg_bet': 0,
+                'min_balance': 0,
+                'max_balance': 0,
             }
+        
+        total_bets = row['total_bets']
+        total_wins = row['total_wins'] or 0
+        money = units_to_decimal if exact else from_units
+        
+        return {
+            'total_bets': total_bets,
+            'total_wins': total_wins,
+            'total_losses': row['total_losses'] or 0,
+            'win_rate': (total_wins / total_bets * 100) if total_bets > 0 else 0,
+            'total_profit': money(row['total_profit'] or 0),
+            'avg_profit': from_units(row['avg_profit'] or 0),
+            'max_win': money(row['max_win'] or 0),
+            'max_loss': money(row['max_loss'] or 0),
+            'avg_bet': from_units(row['avg_bet'] or 0),
+            'min_balance': money(row['min_balance'] or 0),
+            'max_balance': money(row['max_balance'] or 0),
+        }
     
     def get_recent_rolls(
         self,
@@ -596,12 +1849,10 @@ class BetDatabase:
         Returns a list of floats (0.0 – 9999.0) ordered oldest-first.
         """
         query = """
-            SELECT roll FROM (
-                SELECT id, roll FROM bet_history
-                WHERE roll IS NOT NULL
-                {symbol_filter}
-                ORDER BY id DESC LIMIT ?
-            ) ORDER BY id ASC
+            SELECT roll FROM bet_history
+            WHERE roll IS NOT NULL
+            {symbol_filter}
+            ORDER BY id DESC LIMIT ?
         """
         params: List[Any] = [limit]
         symbol_filter = ""
@@ -613,41 +1864,148 @@ class BetDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return [float(row[0]) for row in cursor.fetchall()]
+            rolls = [float(row[0]) for row in cursor.fetchall()]
+        # Newest-first from the index; reversing here avoids a temp sort
+        rolls.reverse()
+        return rolls
 
-    def export_to_csv(
+    def iter_bet_chunks(
         self,
-        output_path: Path,
+        columns: Optional[List[str]] = None,
+        chunk_size: int = 5000,
         session_id: Optional[str] = None,
-        **filters
-    ):
-        """Export bets to CSV file."""
-        import csv
-        
-        query = "SELECT * FROM bet_history WHERE 1=1"
-        params = []
+        strategy: Optional[str] = None,
+        symbol: Optional[str] = None,
+        since: Any = None,
+        until: Any = None,
+        simulation_mode: Optional[bool] = None,
+        after_id: int = 0,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream bets in id order, ``chunk_size`` rows at a time.
         
-        if session_id:
-            query += " AND session_id = ?"
-            params.append(session_id)
+        Filters are applied in SQL; ``since`` / ``until`` (epoch seconds,
+        ISO string or datetime) bound the bet timestamp. Each chunk is a
+        separate keyset query, so no read transaction is held between chunks.
         
-        query += " ORDER BY timestamp ASC LIMIT 100000"
+        Args:
+            columns: bet_history columns to return (default: all). Asking
+                for api_raw / strategy_state also loads compacted payloads.
+            after_id: Start after this bet id (keyset resume point)
+        """
+        available = {row[1] for row in self._table_info("bet_history")}
+        wanted = list(columns) if columns else sorted(available)
+        unknown = [c for c in wanted if c not in available]
+        if unknown:
+            raise ValueError(f"Unknown bet_history columns: {', '.join(unknown)}")
+        payload_cols = {"api_raw": "api_raw_id", "strategy_state": "state_id"}
+        select = set(wanted) | {"id"}
+        for col, ref in payload_cols.items():
+            if col in select:
+                select.add(ref)
+
+        where = ""
+        params: List[Any] = []
+        for column, value in (("session_id", session_id), ("strategy", strategy), ("symbol", symbol)):
+            if value:
+                where += f" AND {column} = ?"
+                params.append(value)
+        if simulation_mode is not None:
+            where += " AND simulation_mode = ?"
+            params.append(1 if simulation_mode else 0)
+        for op, bound in ((">=", since), ("<", until)):
+            if bound is not None:
+                where += f" AND bet_epoch(timestamp) {op} ?"
+                params.append(_epoch(bound))
+
+        query = (
+            f"SELECT {', '.join(sorted(select))} FROM bet_history "
+            f"WHERE id > ?{where} ORDER BY id LIMIT ?"
+        )
+        last_id = after_id
+        with self._get_connection() as conn:
+            while True:
+                rows = [dict(r) for r in conn.execute(query, [last_id, *params, chunk_size])]
+                if not rows:
+                    return
+                last_id = rows[-1]["id"]
+                if any(col in wanted for col in payload_cols):
+                    _load_payloads(conn, rows)
+                yield _rows_from_units([{c: r[c] for c in wanted} for r in rows])
+
+    def iter_bets(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Stream single bets (see ``iter_bet_chunks`` for arguments)."""
+        for chunk in self.iter_bet_chunks(**filters):
+            yield from chunk
+
+    def bet_page(
+        self,
+        cursor: Optional[str] = None,
+        page_size: int = 100,
+        columns: Optional[List[str]] = None,
+        **filters: Any,
+    ):
+        """
+        One keyset page of bets in id order (a ``CursorPage``).
         
+        ``next_cursor`` resumes after the page's last id, so deep pages cost
+        the same as the first. ``total`` is filled in from the aggregate
+        tables when the filters allow it (session / strategy / mode only),
+        otherwise None. ``filters`` are those of ``iter_bet_chunks``.
+        """
+        from duckdice_api.utils.pagination import CursorPaginator
+
+        wanted = list(columns) if columns else None
+        select = wanted + ["id"] if wanted and "id" not in wanted else wanted
+
+        def fetch_after(last_id: Optional[int], limit: int) -> List[Dict[str, Any]]:
+            chunks = self.iter_bet_chunks(columns=select, chunk_size=limit,
+                                          after_id=last_id or 0, **filters)
+            return next(chunks, [])
+
+        def count() -> Optional[int]:
+            used = {name for name, value in filters.items() if value is not None}
+            if used - {"session_id", "strategy", "simulation_mode"}:
+                return None
+            return self.get_statistics(
+                session_id=filters.get("session_id"),
+                strategy_name=filters.get("strategy"),
+                simulation_mode=filters.get("simulation_mode"),
+            )["total_bets"]
+
+        page = CursorPaginator.from_keyset(fetch_after, key=lambda row: row["id"],
+                                           page_size=page_size, count=count).get_page(cursor)
+        if select is not wanted:
+            page.items = [{c: row[c] for c in wanted} for row in page.items]
+        return page
+
+    def _table_info(self, table: str) -> List[tuple]:
         with self._get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            bets = [dict(row) for row in cursor.fetchall()]
+            return [tuple(r) for r in conn.execute(f"PRAGMA table_info({table})")]
+
+    def export(self, output_path: Path, **options: Any) -> int:
+        """Stream bets to CSV / NDJSON / columnar, optionally compressed.
         
-        if not bets:
-            return
+        See ``betbot_engine.bet_export.export_bets`` for the options.
+        """
+        from .bet_export import export_bets
+        self.flush()
+        return export_bets(self, output_path, **options)
+
+    def export_to_csv(
+        self,
+        output_path: Path,
+        session_id: Optional[str] = None,
+        **filters
+    ):
+        """Export bets to CSV file (streamed, no row limit).
         
-        with open(output_path, 'w', newline='') as f:
-            fieldnames = [
-                'timestamp', 'session_id', 'bet_number', 'strategy',
-                'symbol', 'amount', 'chance', 'target', 'roll',
-                'won', 'profit', 'balance', 'loss_streak'
-            ]
-            
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(bets)
+        ``filters`` are those of ``iter_bet_chunks``; nothing is written when
+        no bet matches.
+        """
+        probe = next(self.iter_bet_chunks(columns=["id"], chunk_size=1,
+                                          session_id=session_id, **filters), None)
+        if not probe:
+            return
+        self.export(output_path, format="csv", compression=None,
+                    session_id=session_id, **filters)
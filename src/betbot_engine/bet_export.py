@@ -0,0 +1,256 @@
+"""
+Streaming export of bet history.
+
+Rows are read from ``BetDatabase.iter_bets`` in id-ordered chunks and written
+as they arrive, so memory stays flat no matter how many bets are exported.
+Formats:
+
+- ``csv``      plain CSV with a header row
+- ``ndjson``   one JSON object per line
+- ``columnar`` chunked column store (``.ddbc``): per chunk, each column is a
+               packed float64 / int64 / string block, zlib-compressed. Read
+               back with ``read_columnar`` (NumPy arrays when available).
+
+Any format can be wrapped in gzip or xz; by default the compression is
+inferred from the file suffix (``bets.csv.gz``, ``bets.ndjson.xz``).
+
+Usage:
+    from betbot_engine.bet_export import export_bets, read_columnar
+
+    n = export_bets(db, "bets.ddbc", symbol="BTC", since="2026-03-01")
+    for chunk in read_columnar("bets.ddbc"):
+        print(chunk["profit"].sum())
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import lzma
+import math
+import struct
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    HAS_NUMPY = False
+
+EXPORT_FORMATS = ("csv", "ndjson", "columnar")
+COMPRESSIONS = ("gzip", "xz")
+
+# Default export columns (the historical export_to_csv set)
+DEFAULT_COLUMNS = (
+    "timestamp", "session_id", "bet_number", "strategy",
+    "symbol", "amount", "chance", "target", "roll",
+    "won", "profit", "balance", "loss_streak",
+)
+
+# Column types for the columnar format: f = float64, i = int64, s = UTF-8
+COLUMN_TYPES = {
+    "id": "i", "bet_number": "i", "is_high": "i", "range_low": "i", "range_high": "i",
+    "is_in": "i", "won": "i", "loss_streak": "i", "simulation_mode": "i",
+    "amount": "f", "chance": "f", "target": "f", "roll": "f", "profit": "f",
+    "payout": "f", "balance": "f",
+}
+
+_MAGIC = b"DDBC\x01"
+_CHUNK = b"CHNK"
+_INT_NULL = -(2 ** 63)
+
+
+def infer_format(path: Path) -> tuple:
+    """``(format, compression)`` from a file name such as ``bets.ndjson.gz``."""
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    compression = None
+    if suffixes and suffixes[-1] in (".gz", ".xz"):
+        compression = "gzip" if suffixes.pop() == ".gz" else "xz"
+    ext = suffixes[-1] if suffixes else ""
+    fmt = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".ddbc": "columnar"}.get(ext, "csv")
+    return fmt, compression
+
+
+def _open_output(path: Path, compression: Optional[str]) -> BinaryIO:
+    if compression is None:
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb")
+    if compression == "xz":
+        return lzma.open(path, "wb")
+    raise ValueError(f"Unknown compression: {compression}. Available: {', '.join(COMPRESSIONS)}")
+
+
+def _open_input(path: Path) -> BinaryIO:
+    with open(path, "rb") as f:
+        head = f.read(6)
+    if head.startswith(b"\x1f\x8b"):
+        return gzip.open(path, "rb")
+    if head.startswith(b"\xfd7zXZ"):
+        return lzma.open(path, "rb")
+    return open(path, "rb")
+
+
+# ---------------------------------------------------------------------------
+# Columnar container
+# ---------------------------------------------------------------------------
+
+def _encode_column(kind: str, values: Sequence[Any]) -> bytes:
+    if kind == "f":
+        packed = array("d", (math.nan if v is None else float(v) for v in values)).tobytes()
+    elif kind == "i":
+        packed = array("q", (_INT_NULL if v is None else int(v) for v in values)).tobytes()
+    else:
+        encoded = [None if v is None else str(v).encode() for v in values]
+        lengths = array("i", (-1 if b is None else len(b) for b in encoded))
+        packed = lengths.tobytes() + b"".join(b for b in encoded if b)
+    return zlib.compress(packed)
+
+
+def _decode_column(kind: str, blob: bytes, rows: int) -> Any:
+    raw = zlib.decompress(blob)
+    if kind == "f":
+        if HAS_NUMPY:
+            return np.frombuffer(raw, dtype="<f8").copy()
+        values = array("d")
+        values.frombytes(raw)
+        return [None if math.isnan(v) else v for v in values]
+    if kind == "i":
+        if HAS_NUMPY:
+            return np.frombuffer(raw, dtype="<i8").copy()
+        values = array("q")
+        values.frombytes(raw)
+        return [None if v == _INT_NULL else v for v in values]
+    lengths = array("i")
+    lengths.frombytes(raw[:rows * lengths.itemsize])
+    out: List[Optional[str]] = []
+    pos = rows * lengths.itemsize
+    for n in lengths:
+        if n < 0:
+            out.append(None)
+        else:
+            out.append(raw[pos:pos + n].decode())
+            pos += n
+    return out
+
+
+class ColumnarWriter:
+    """Writes row chunks to a ``.ddbc`` column store."""
+
+    def __init__(self, stream: BinaryIO, columns: Sequence[str]):
+        self._stream = stream
+        self.columns = list(columns)
+        self.types = [COLUMN_TYPES.get(c, "s") for c in self.columns]
+        header = json.dumps({
+            "columns": [{"name": c, "type": t} for c, t in zip(self.columns, self.types)],
+        }).encode()
+        stream.write(_MAGIC + struct.pack("<I", len(header)) + header)
+
+    def write_chunk(self, rows: Sequence[Dict[str, Any]]):
+        if not rows:
+            return
+        blocks = [
+            _encode_column(kind, [row.get(name) for row in rows])
+            for name, kind in zip(self.columns, self.types)
+        ]
+        self._stream.write(_CHUNK + struct.pack("<I", len(rows)))
+        for block in blocks:
+            self._stream.write(struct.pack("<I", len(block)) + block)
+
+
+def read_columnar(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one ``{column: values}`` dict per stored chunk.
+
+    Numeric columns are NumPy arrays when NumPy is installed (NULL = NaN for
+    floats, ``-2**63`` for ints), otherwise lists with ``None`` for NULL.
+    """
+    with _open_input(Path(path)) as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a columnar bet export: {path}")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len))
+        columns = [(c["name"], c["type"]) for c in header["columns"]]
+        while True:
+            tag = f.read(len(_CHUNK))
+            if not tag:
+                return
+            if tag != _CHUNK:
+                raise ValueError(f"Corrupt columnar export: {path}")
+            (rows,) = struct.unpack("<I", f.read(4))
+            chunk = {}
+            for name, kind in columns:
+                (size,) = struct.unpack("<I", f.read(4))
+                chunk[name] = _decode_column(kind, f.read(size), rows)
+            yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def export_bets(
+    db: Any,
+    output_path: Path,
+    format: Optional[str] = None,
+    compression: Optional[str] = "auto",
+    columns: Optional[Sequence[str]] = None,
+    chunk_size: int = 10000,
+    **filters: Any,
+) -> int:
+    """
+    Stream matching bets from ``db`` (a BetDatabase) into ``output_path``.
+
+    Args:
+        format: One of EXPORT_FORMATS (default: from the file suffix)
+        compression: "gzip", "xz", None, or "auto" (from the suffix)
+        columns: Columns to export (default: DEFAULT_COLUMNS; include
+            "api_raw" / "strategy_state" to export payloads)
+        chunk_size: Rows fetched and written per chunk
+        **filters: Passed to ``BetDatabase.iter_bets`` (session_id,
+            strategy, symbol, since, until, simulation_mode)
+
+    Returns:
+        Number of rows written
+    """
+    output_path = Path(output_path)
+    guessed_format, guessed_compression = infer_format(output_path)
+    format = format or guessed_format
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}. Available: {', '.join(EXPORT_FORMATS)}")
+    if compression == "auto":
+        compression = guessed_compression
+    columns = list(columns or DEFAULT_COLUMNS)
+
+    written = 0
+    with _open_output(output_path, compression) as raw:
+        chunks = db.iter_bet_chunks(columns=columns, chunk_size=chunk_size, **filters)
+        if format == "columnar":
+            writer = ColumnarWriter(raw, columns)
+            for rows in chunks:
+                writer.write_chunk(rows)
+                written += len(rows)
+            return written
+
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        try:
+            if format == "csv":
+                out = csv.DictWriter(text, fieldnames=columns, extrasaction="ignore")
+                out.writeheader()
+                for rows in chunks:
+                    out.writerows(rows)
+                    written += len(rows)
+            else:
+                for rows in chunks:
+                    text.write("".join(json.dumps(row, default=str) + "\n" for row in rows))
+                    written += len(rows)
+        finally:
+            text.flush()
+            text.detach()
+    return written
@@ -0,0 +1,268 @@
+"""
+Deterministic engine benchmarks over recorded HTTP cassettes.
+
+Replays a cassette (see ``duckdice_api.cassette``) through the real stack:
+``run_auto_bet`` in live mode, a ``DuckDiceAPI`` whose transport is a
+``ReplayAdapter``, the strategy, the session log and (optionally) the bet
+database and resume checkpoints. Only the socket is replaced, so the numbers
+show what the bot itself costs per bet, and a slowdown in any layer shows up
+without live traffic.
+
+Each benchmark runs the session ``repeat`` times and keeps the fastest run
+for bets/sec, then runs it once more under cProfile to split the time into
+stages:
+
+    network     replayed round-trip waits (0 at speed 0)
+    transport   building responses from the cassette
+    client      DuckDiceAPI + requests (sessions, JSON encoding/decoding)
+    strategy    the strategy's own code (next_bet, on_bet_result, ...)
+    logging     session log sink, bet database, log ingestor
+    checkpoint  resume checkpoint writes
+    engine      everything else in the bet loop
+
+Stage shares come from the profiled run; ``per_bet_ms`` applies them to the
+unprofiled per-bet time.
+
+    python -m betbot_engine.cassette_bench session.cassette --speed 0 --db-log
+"""
+
+import argparse
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from duckdice_api.api import DuckDiceAPI, DuckDiceConfig
+from duckdice_api.cassette import BET_PATHS, Cassette, ReplayAdapter
+
+from .db_bench import _metadata
+from .engine import EngineConfig, run_auto_bet
+
+STAGES = ("network", "transport", "client", "strategy", "logging", "checkpoint", "engine")
+
+_Func = tuple  # pstats key: (filename, lineno, function name)
+
+
+def _in(module: str) -> Callable[[_Func], bool]:
+    suffix = os.path.join(*module.split("/"))
+    return lambda func: func[0].endswith(suffix)
+
+
+_ENGINE = _in("betbot_engine/engine.py")
+_CASSETTE = _in("duckdice_api/cassette.py")
+_CLIENT = _in("duckdice_api/api.py")
+_CHECKPOINT = _in("betbot_engine/session_checkpoint.py")
+_LOG_MODULES = [_in("betbot_engine/bet_database.py"), _in("betbot_engine/session_log.py"),
+                _in("betbot_engine/log_ingest.py"), _in("betbot_engine/db_service.py")]
+_STRATEGY_DIR = os.sep + "betbot_strategies" + os.sep
+
+
+def _is_logging(func: _Func) -> bool:
+    # The session log sinks are the only callables defined in engine.py
+    return (_ENGINE(func) and func[2] == "__call__") or any(m(func) for m in _LOG_MODULES)
+
+
+def _outer_seconds(stats: Dict[_Func, tuple], pred: Callable[[_Func], bool]) -> float:
+    """Time inside functions matching ``pred``, counted where they are entered from outside."""
+    total = 0.0
+    for func, (_cc, _nc, _tt, _ct, callers) in stats.items():
+        if pred(func):
+            total += sum(timing[3] for caller, timing in callers.items() if not pred(caller))
+    return total
+
+
+def stage_seconds(profile: cProfile.Profile) -> Dict[str, float]:
+    """Split a profiled ``run_auto_bet`` call into STAGES (seconds)."""
+    stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+    # Entered through Profile.runcall, so it has no recorded caller
+    total = sum(timing[3] for func, timing in stats.items() if _ENGINE(func) and func[2] == "run_auto_bet")
+    network = _outer_seconds(stats, lambda f: _CASSETTE(f) and f[2] == "_wait")
+    transport = _outer_seconds(stats, _CASSETTE)
+    stages = {
+        "network": network,
+        "transport": transport - network,
+        "client": _outer_seconds(stats, _CLIENT) - transport,
+        "strategy": _outer_seconds(stats, lambda f: _STRATEGY_DIR in f[0]),
+        "logging": _outer_seconds(stats, _is_logging),
+        "checkpoint": _outer_seconds(stats, _CHECKPOINT),
+    }
+    stages = {name: max(0.0, seconds) for name, seconds in stages.items()}
+    stages["engine"] = max(0.0, total - sum(stages.values()))
+    return stages
+
+
+def _first_bet(cassette: Cassette) -> Dict[str, Any]:
+    for record in cassette.interactions:
+        if record["path"].endswith(BET_PATHS) and isinstance(record.get("body"), dict):
+            return record["body"]
+    return {}
+
+
+def _session(cassette: Cassette, strategy: str, params: Dict[str, Any], config: EngineConfig,
+             speed: float, profile: Optional[cProfile.Profile] = None) -> Dict[str, Any]:
+    adapter = ReplayAdapter(cassette, speed=speed)
+    api = DuckDiceAPI(DuckDiceConfig(api_key="cassette-replay", transport=adapter, fallback_domains=[],
+                                     base_url=cassette.meta.get("base_url", "https://duckdice.io/api")))
+    call = profile.runcall if profile else (lambda fn, *a, **kw: fn(*a, **kw))
+    # Console output of the strategy is discarded, as a terminal would dominate the timings
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        # Ends the session once every recorded request has been answered
+        summary = call(run_auto_bet, api, strategy, dict(params), config,
+                       stop_checker=lambda: adapter.remaining == 0)
+        seconds = time.perf_counter() - started
+    api.session.close()
+    if adapter.remaining == 0 and summary.get("stop_reason") == "stopped":
+        summary["stop_reason"] = "cassette_end"
+    return {"summary": summary, "seconds": seconds, "network_seconds": adapter.waited,
+            "requests": adapter.position}
+
+
+def bench_cassette(
+    cassette: Union[Cassette, str, Path],
+    strategy: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    speed: float = 0.0,
+    repeat: int = 3,
+    db_log: bool = False,
+    log_format: str = "jsonl",
+    checkpoint_every: int = 0,
+    profile: bool = True,
+    work_dir: Optional[Union[str, Path]] = None,
+) -> Dict[str, Any]:
+    """
+    Replay ``cassette`` through ``run_auto_bet`` and measure it.
+
+    Args:
+        cassette:         Cassette or path (recorded with ``run --record-cassette``)
+        strategy, params: Default to the ones stored in the cassette header
+        speed:            Replay pace (1.0 = recorded round trips, 0 = no waits)
+        repeat:           Timed sessions; the fastest counts
+        db_log:           Also log every bet to a bet database
+        log_format:       Session log format (``jsonl`` or ``binary``)
+        checkpoint_every: Resume checkpoint interval in bets (0 = off)
+        profile:          Add the per-stage breakdown (one extra, profiled session)
+        work_dir:         Where logs and databases go (default: a temporary directory)
+
+    The session ends when the cassette runs out. Raises ValueError when no
+    strategy is given or stored, and ``CassetteMismatch`` when the session
+    sends requests the recording does not have.
+    """
+    if not isinstance(cassette, Cassette):
+        cassette = Cassette.load(cassette)
+    meta = cassette.meta
+    strategy = strategy or meta.get("strategy")
+    if not strategy:
+        raise ValueError("No strategy given and none stored in the cassette")
+    if params is None:
+        params = meta.get("params") or {}
+    first_bet = _first_bet(cassette)
+    symbol = meta.get("symbol") or first_bet.get("symbol") or "BTC"
+
+    own_dir = work_dir is None
+    work_dir = Path(tempfile.mkdtemp(prefix="duckdice-cassette-") if own_dir else work_dir)
+    runs: List[Dict[str, Any]] = []
+    stages: Dict[str, float] = {}
+    try:
+        def config(n: int) -> EngineConfig:
+            run_dir = work_dir / f"run-{n}"
+            return EngineConfig(
+                symbol=symbol, dry_run=False, faucet=bool(first_bet.get("faucet")),
+                tle_hash=first_bet.get("tleHash"), delay_ms=0, jitter_ms=0,
+                stop_loss=-1.0, take_profit=None, seed=meta.get("seed") or 42,
+                log_dir=str(run_dir), log_format=log_format, db_log=db_log,
+                db_path=str(run_dir / "bets.db"),
+                checkpoint_path=str(run_dir / "session.ckpt") if checkpoint_every > 0 else None,
+                checkpoint_every=max(1, checkpoint_every),
+            )
+
+        for n in range(max(1, repeat)):
+            runs.append(_session(cassette, strategy, params, config(n), speed))
+        if profile:
+            profiler = cProfile.Profile()
+            _session(cassette, strategy, params, config(len(runs)), speed, profiler)
+            stages = stage_seconds(profiler)
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    best = min(runs, key=lambda r: r["seconds"])
+    bets = int(best["summary"].get("bets", 0))
+    seconds = best["seconds"]
+    local = seconds - best["network_seconds"]
+    results: Dict[str, Any] = {
+        "meta": _metadata(),
+        "cassette": {"requests": len(cassette.interactions), "bets": cassette.bets,
+                     "recorded_network_seconds": round(cassette.network_seconds, 6),
+                     "recorded": meta.get("recorded")},
+        "strategy": strategy,
+        "symbol": symbol,
+        "speed": speed,
+        "db_log": db_log,
+        "log_format": log_format,
+        "checkpoint_every": checkpoint_every,
+        "bets": bets,
+        "requests_replayed": best["requests"],
+        "stop_reason": best["summary"].get("stop_reason"),
+        "seconds": round(seconds, 6),
+        "network_seconds": round(best["network_seconds"], 6),
+        "bets_per_sec": bets / seconds if seconds > 0 else 0.0,
+        "local_bets_per_sec": bets / local if local > 0 else 0.0,
+    }
+    if stages:
+        profiled_total = sum(stages.values()) or 1.0
+        per_bet_ms = seconds / bets * 1000 if bets else 0.0
+        results["stages"] = {
+            name: {"share": round(stages[name] / profiled_total, 4),
+                   "per_bet_ms": round(stages[name] / profiled_total * per_bet_ms, 6)}
+            for name in STAGES
+        }
+    return results
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Human-readable summary of ``bench_cassette`` results."""
+    lines = [
+        f"{results['strategy']} over {results['cassette']['requests']:,} recorded requests "
+        f"({results['bets']:,} bets, speed {results['speed']:g})",
+        f"  {results['bets_per_sec']:,.0f} bets/s, {results['local_bets_per_sec']:,.0f} bets/s "
+        f"without the network ({results['seconds']:.3f}s, {results['network_seconds']:.3f}s waiting)",
+    ]
+    for name, stage in results.get("stages", {}).items():
+        lines.append(f"  {name:<10} {stage['share'] * 100:5.1f}%  {stage['per_bet_ms'] * 1000:9.1f} µs/bet")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the engine by replaying a recorded session")
+    parser.add_argument("cassette", help="Cassette file (record one with: duckdice run --record-cassette FILE)")
+    parser.add_argument("-s", "--strategy", default=None, help="Strategy (default: the recorded one)")
+    parser.add_argument("-c", "--config", default=None, help="Strategy params as JSON (default: the recorded ones)")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="Replay pace: 1 = recorded round trips, 10 = 10x faster, 0 = no waits (default)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed sessions, the fastest counts (default: 3)")
+    parser.add_argument("--db-log", action="store_true", help="Also log bets to a bet database")
+    parser.add_argument("--log-format", choices=["jsonl", "binary"], default="jsonl")
+    parser.add_argument("--checkpoint-every", type=int, default=0, metavar="K",
+                        help="Write resume checkpoints every K bets (default: 0 = off)")
+    parser.add_argument("--no-profile", action="store_false", dest="profile", help="Skip the per-stage breakdown")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = bench_cassette(args.cassette, args.strategy, json.loads(args.config) if args.config else None,
+                             speed=args.speed, repeat=args.repeat, db_log=args.db_log,
+                             log_format=args.log_format, checkpoint_every=args.checkpoint_every,
+                             profile=args.profile)
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Single-pass counterfactual evaluation of many strategies over one roll stream.
+
+Every lane (a registered strategy with one param set) gets its own kernel
+session, and all lanes advance in lockstep over the same recorded rolls:
+each roll is read once from the shared ``array('H')`` buffer and resolves the
+current bet of every lane still running. Comparing S strategies x P param
+sets costs one pass over the data instead of S x P replays that each
+re-read and re-parse it.
+
+The stream can be cut into consecutive windows of ``window`` rolls; each
+window is one "run" (fresh sessions for every lane), which gives the
+per-run distributions ``html_report.build_report`` expects.
+
+Usage:
+    from betbot_engine.counterfactual import build_lanes, evaluate_lanes
+    from betbot_engine.html_report import build_report
+    from betbot_engine.replay import load_rolls
+
+    rolls = load_rolls("data/duckdice_bot.db")
+    lanes = build_lanes(["paroli", "oscars-grind"], {"paroli": [{}, {"target_streak": 2}]})
+    build_report(evaluate_lanes(lanes, rolls, window=10_000), "replay_report.html")
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from betbot_strategies import list_strategies
+
+from .engine import EngineConfig
+from .replay import replay_config
+from .sim_kernel import NOT_SELF_CONTAINED, KernelSession
+from .strategy_simulator import StrategySimResult, _downsample, equity_bands
+
+# Need a user script, so they cannot be evaluated unattended
+SKIP_STRATEGIES = frozenset({"custom-script"}) | NOT_SELF_CONTAINED
+EQUITY_POINTS = 200
+
+
+@dataclass(frozen=True)
+class Lane:
+    """One strategy / param set evaluated over the stream."""
+    label: str
+    strategy: str
+    params: Dict[str, Any] = field(default_factory=dict, hash=False)
+
+
+def build_lanes(
+    strategies: Optional[Sequence[str]] = None,
+    param_sets: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    exclude: Sequence[str] = (),
+) -> List[Lane]:
+    """
+    Lanes for ``strategies`` (default: every registered kernel-capable one).
+
+    ``param_sets`` maps a strategy name (or ``"*"`` for all others) to a list
+    of param dicts; strategies without an entry run once with their
+    defaults. Labels are the strategy name, suffixed ``#n`` when a strategy
+    has several param sets.
+    """
+    if strategies is None:
+        registered = [s["name"] if isinstance(s, dict) else s for s in list_strategies()]
+        strategies = [name for name in registered if name not in SKIP_STRATEGIES]
+    param_sets = param_sets or {}
+    lanes = []
+    for name in strategies:
+        if name in exclude:
+            continue
+        sets = param_sets.get(name) or param_sets.get("*") or [{}]
+        for i, params in enumerate(sets, 1):
+            label = name if len(sets) == 1 else f"{name}#{i}"
+            lanes.append(Lane(label, name, dict(params)))
+    return lanes
+
+
+class _LaneRuns:
+    """Per-run metric lists of one lane (the StrategySimResult inputs)."""
+
+    def __init__(self) -> None:
+        self.roi: List[float] = []
+        self.final_balance: List[float] = []
+        self.win_rate: List[float] = []
+        self.max_drawdown: List[float] = []
+        self.sharpe: List[float] = []
+        self.max_loss_streak: List[int] = []
+        self.curves: List[List[float]] = []
+        self.errors: List[str] = []
+
+    def add(self, session: KernelSession) -> None:
+        run = session.finish("rolls_exhausted")
+        returns = session.returns
+        sharpe = 0.0
+        if returns is not None and returns.n >= 2 and returns.stdev > 0:
+            sharpe = returns.mean / returns.stdev * math.sqrt(returns.n)
+        self.roi.append(run.roi)
+        self.final_balance.append(run.ending_balance)
+        self.win_rate.append(run.wins / run.bets if run.bets else 0.0)
+        self.max_drawdown.append(run.max_drawdown)
+        self.sharpe.append(sharpe)
+        self.max_loss_streak.append(run.max_loss_streak)
+        self.curves.append(_downsample(session.equity, EQUITY_POINTS))
+
+    def add_failed(self, starting_balance: float, error: str) -> None:
+        """A crashed strategy counts as a total loss (as in simulate_strategy)."""
+        self.roi.append(-100.0)
+        self.final_balance.append(0.0)
+        self.win_rate.append(0.0)
+        self.max_drawdown.append(1.0)
+        self.sharpe.append(0.0)
+        self.max_loss_streak.append(0)
+        self.curves.append([starting_balance, 0.0])
+        self.errors.append(error)
+
+
+def evaluate_lanes(
+    lanes: Sequence[Lane],
+    rolls: Sequence[int],
+    window: Optional[int] = None,
+    config: Optional[EngineConfig] = None,
+    starting_balance: Decimal = Decimal("100"),
+    min_bet: Decimal = Decimal("0.00000001"),
+    progress: Optional[Callable[[int, int], None]] = None,
+    errors: Optional[Dict[str, List[str]]] = None,
+) -> List[StrategySimResult]:
+    """
+    Advance every lane over ``rolls`` in one pass.
+
+    Args:
+        lanes:            From :func:`build_lanes`
+        rolls:            Recorded rolls (0..9999), e.g. from ``replay.load_rolls``
+        window:           Rolls per run (default: the whole stream is one run)
+        config:           Session limits (default: ``replay_config()``)
+        starting_balance: Balance every session starts from
+        progress:         Optional callback(rolls_done, total) after each window
+        errors:           Optional dict filled with label -> error messages of
+                          lanes that raised (those runs count as total losses)
+
+    Returns:
+        One StrategySimResult per lane (``strategy_name`` is the lane label),
+        in lane order, ready for ``html_report.build_report``.
+    """
+    config = config or replay_config()
+    total = len(rolls)
+    window = max(1, int(window or total or 1))
+    balance_f = float(starting_balance)
+    runs = [_LaneRuns() for _ in lanes]
+
+    for start in range(0, total, window):
+        end = min(start + window, total)
+        equity_every = max(1, (end - start) // EQUITY_POINTS)
+        active = []
+        for i, lane in enumerate(lanes):
+            try:
+                session = KernelSession(lane.strategy, dict(lane.params), config, starting_balance,
+                                        min_bet, track_returns=True, equity_every=equity_every)
+            except Exception as e:
+                runs[i].add_failed(balance_f, str(e))
+                continue
+            active.append((i, session))
+        sessions = list(active)
+        failed = set()
+
+        for n in range(start, end):
+            number = rolls[n]
+            stopped = False
+            for i, session in active:
+                try:
+                    if not session.step(number):
+                        stopped = True
+                except Exception as e:
+                    runs[i].add_failed(balance_f, str(e))
+                    failed.add(i)
+                    stopped = True
+            if stopped:
+                active = [(i, s) for i, s in active if s.stop_reason is None and i not in failed]
+                if not active:
+                    break
+
+        for i, session in sessions:
+            if i not in failed:
+                runs[i].add(session)
+        if progress:
+            progress(end, total)
+
+    results = []
+    for lane, lane_runs in zip(lanes, runs):
+        if errors is not None and lane_runs.errors:
+            errors[lane.label] = lane_runs.errors
+        band_p10, band_mean, band_p90 = equity_bands(lane_runs.curves, balance_f)
+        results.append(StrategySimResult(
+            strategy_name=lane.label,
+            n_runs=len(lane_runs.roi),
+            bets_per_run=window,
+            starting_balance=balance_f,
+            roi_values=lane_runs.roi,
+            final_balance_values=lane_runs.final_balance,
+            win_rate_values=lane_runs.win_rate,
+            max_drawdown_values=lane_runs.max_drawdown,
+            sharpe_values=lane_runs.sharpe,
+            max_loss_streak_values=lane_runs.max_loss_streak,
+            equity_curves=lane_runs.curves,
+            band_p10=band_p10,
+            band_mean=band_mean,
+            band_p90=band_p90,
+        ))
+    return results
@@ -0,0 +1,491 @@
+"""
+Benchmarks for BetDatabase.
+
+``run_suite`` builds synthetic databases (10K to tens of millions of bets
+over many symbols, strategies and sessions) and measures, per size, the
+generation time and file size, the latency of every query method and the
+speed and size of each export format; plus insert throughput for each write
+mode (per-bet commits, batched commits, background writer, shared service).
+Results are one JSON document, and ``compare_results`` lists the metrics
+that got worse against an earlier run:
+
+    python -m betbot_engine.db_bench --rows 10000 1000000 --output bench.json
+    python -m betbot_engine.db_bench --rows 10000 --baseline bench.json  # exit 1 on regressions
+
+``read_latency_under_write`` measures what the web dashboard sees during a
+live session: the latency of the queries it polls while a writer keeps
+committing bets, once per read-pool size (``0`` = a new connection per
+call, the old behaviour).
+
+    from betbot_engine.db_bench import read_latency_under_write
+    read_latency_under_write("/tmp/bench.db", seconds=5)
+    # {"pool=0": {"get_statistics": {"p50_ms": ..., "p99_ms": ...}, ...}, "pool=4": {...}}
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .bet_database import _INSERT_BET_SQL, READ_POOL_SIZE, BetDatabase, _open_write_connection
+from .bet_export import EXPORT_FORMATS
+
+WRITE_MODES = ("sync-1", "sync-batched", "background", "service")
+DEFAULT_SIZES = (10_000, 100_000)
+BETS_PER_SESSION = 5_000
+
+SYMBOLS = ("BTC", "DOGE", "LTC", "ETH", "TRX", "XRP")
+STRATEGIES = ("paroli", "martingale", "dalembert", "fibonacci", "labouchere", "oscars-grind")
+
+# The queries the web dashboard polls during a live session
+DASHBOARD_QUERIES: Dict[str, Callable[[BetDatabase], Any]] = {
+    "get_statistics": lambda db: db.get_statistics(),
+    "get_sessions": lambda db: db.get_sessions(limit=50),
+    "get_recent_rolls": lambda db: db.get_recent_rolls(limit=1000),
+    "get_timeline": lambda db: db.get_timeline("1m"),
+}
+
+
+def synthetic_bet(rng: random.Random, symbol: str = "BTC", strategy: str = "paroli") -> tuple:
+    """``(bet_data, result_data)`` for one plausible dice bet."""
+    amount = Decimal(rng.randint(1, 100_000)).scaleb(-8)
+    chance = rng.choice((49.5, 33.0, 66.0, 9.9, 90.0))
+    win = rng.random() * 100 < chance
+    payout = amount * Decimal(str(round(99 / chance, 4)))
+    return (
+        {"symbol": symbol, "strategy": strategy, "amount": str(amount), "chance": str(chance),
+         "game": "dice", "is_high": rng.random() < 0.5},
+        {"win": win, "profit": str(payout - amount if win else -amount), "payout": str(payout),
+         "number": rng.randint(0, 9999), "simulated": True},
+    )
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds for samples in seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 4)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 4),
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "max_ms": round(ordered[-1] * 1000, 4),
+    }
+
+
+def seed_bets(db: BetDatabase, bets: int, sessions: int = 10, seed: int = 1) -> int:
+    """Log ``bets`` synthetic bets spread over ``sessions`` sessions."""
+    rng = random.Random(seed)
+    per_session = max(1, bets // max(1, sessions))
+    written = 0
+    for n in range(sessions):
+        session_id = f"bench-{seed}-{n}"
+        symbol, strategy = SYMBOLS[n % len(SYMBOLS)], STRATEGIES[n % len(STRATEGIES)]
+        db.start_session(session_id, strategy, symbol, simulation_mode=True,
+                         starting_balance=Decimal("1"))
+        balance, count, wins = Decimal("1"), min(per_session, bets - written), 0
+        for i in range(1, count + 1):
+            bet, result = synthetic_bet(rng, symbol, strategy)
+            balance += Decimal(result["profit"])
+            wins += result["win"]
+            db.log_bet(session_id, bet, result, i, balance, simulation_mode=True)
+        written += count
+        db.end_session(session_id, balance, "max_bets", count, wins, count - wins)
+    db.flush()
+    return written
+
+
+def _write_until(db_path: Path, stop: threading.Event, rate: Optional[float], counter: List[int]):
+    db = BetDatabase(db_path, commit_every=50)
+    rng = random.Random(7)
+    session_id = f"bench-live-{time.time_ns()}"
+    db.start_session(session_id, "paroli", "BTC", simulation_mode=True, starting_balance=Decimal("1"))
+    interval = 1.0 / rate if rate else 0.0
+    bet_number = 0
+    while not stop.is_set():
+        bet_number += 1
+        bet, result = synthetic_bet(rng)
+        db.log_bet(session_id, bet, result, bet_number, Decimal("1"), simulation_mode=True)
+        if interval:
+            time.sleep(interval)
+    db.end_session(session_id, Decimal("1"), "bench", bet_number, 0, 0)
+    db.close()
+    counter.append(bet_number)
+
+
+def read_latency_under_write(
+    db_path: Any,
+    seconds: float = 2.0,
+    pool_sizes: Iterable[int] = (0, READ_POOL_SIZE),
+    write_rate: Optional[float] = None,
+    seed: int = 5000,
+    queries: Optional[Dict[str, Callable[[BetDatabase], Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Dashboard read latency while another connection keeps writing.
+
+    Args:
+        db_path: Database file; seeded with ``seed`` bets when empty
+        seconds: How long each pool size is measured
+        pool_sizes: Read-pool sizes to compare (0 = no pooling)
+        write_rate: Bets per second for the writer (None = as fast as it can)
+        queries: name -> callable(db) (default: DASHBOARD_QUERIES)
+
+    Returns:
+        ``{"pool=N": {query: percentiles, "bets_written": n}}``
+    """
+    db_path = Path(db_path)
+    queries = queries or DASHBOARD_QUERIES
+    setup = BetDatabase(db_path, commit_every=1000)
+    if not setup.get_statistics()["total_bets"]:
+        seed_bets(setup, seed)
+    setup.close()
+
+    results: Dict[str, Any] = {}
+    for size in pool_sizes:
+        reader = BetDatabase(db_path, read_pool_size=size)
+        samples: Dict[str, List[float]] = {name: [] for name in queries}
+        stop, written = threading.Event(), []
+        writer = threading.Thread(target=_write_until, args=(db_path, stop, write_rate, written),
+                                  daemon=True)
+        writer.start()
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            for name, query in queries.items():
+                started = time.perf_counter()
+                query(reader)
+                samples[name].append(time.perf_counter() - started)
+        stop.set()
+        writer.join()
+        reader.close()
+        results[f"pool={size}"] = {name: percentiles(s) for name, s in samples.items()}
+        results[f"pool={size}"]["bets_written"] = written[0] if written else 0
+    return results
+
+
+def generate_dataset(
+    db_path: Any,
+    rows: int,
+    bets_per_session: int = BETS_PER_SESSION,
+    seed: int = 1,
+    chunk: int = 50_000,
+) -> Dict[str, Any]:
+    """
+    Fill a new database with ``rows`` synthetic bets, fast.
+
+    Rows are inserted with ``executemany`` in large transactions (no
+    payloads) and the aggregate / rollup tables are rebuilt once at the
+    end, so tens of millions of rows stay practical. Sessions cycle
+    through SYMBOLS x STRATEGIES, live and simulated.
+    """
+    rng = random.Random(seed)
+    db = BetDatabase(db_path)
+    sessions = max(1, -(-rows // bets_per_session))
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    started = time.perf_counter()
+    conn = _open_write_connection(db.db_path)
+    at = 0
+    try:
+        for n in range(sessions):
+            session_id = f"synthetic-{seed}-{n}"
+            symbol = SYMBOLS[n % len(SYMBOLS)]
+            strategy = STRATEGIES[(n // len(SYMBOLS)) % len(STRATEGIES)]
+            simulated = n % 3 != 0
+            count = min(bets_per_session, rows - n * bets_per_session)
+            first = start + timedelta(seconds=at)
+            db.start_session(session_id, strategy, symbol, simulation_mode=simulated,
+                             starting_balance=Decimal("1"), started_at=first)
+            balance, streak, wins, batch = 100_000_000, 0, 0, []
+            for i in range(1, count + 1):
+                amount = rng.randint(1, 100_000)
+                chance = rng.choice((49.5, 33.0, 66.0, 9.9, 90.0))
+                roll = rng.randint(0, 9999)
+                won = roll < chance * 100
+                payout = int(amount * 99 / chance)
+                profit = payout - amount if won else -amount
+                balance += profit
+                wins += won
+                streak = 0 if won else streak + 1
+                at += 1
+                timestamp = (start + timedelta(seconds=at)).isoformat()
+                batch.append((
+                    session_id, timestamp, i, symbol, strategy, amount, chance,
+                    round(100 - chance, 2), 1, None, None, None, "dice", roll, int(won),
+                    profit, payout, balance, streak, int(simulated), None, None, None, None,
+                ))
+                if len(batch) >= chunk:
+                    conn.executemany(_INSERT_BET_SQL, batch)
+                    conn.commit()
+                    batch = []
+            if batch:
+                conn.executemany(_INSERT_BET_SQL, batch)
+                conn.commit()
+            db.end_session(session_id, Decimal(balance).scaleb(-8), "max_bets", count, wins, count - wins,
+                           ended_at=start + timedelta(seconds=at))
+    finally:
+        conn.close()
+    inserted = time.perf_counter() - started
+    db.rebuild_aggregates()
+    db.close()
+    return {
+        "rows": rows,
+        "sessions": sessions,
+        "insert_seconds": round(inserted, 3),
+        "aggregate_seconds": round(time.perf_counter() - started - inserted, 3),
+        "rows_per_sec": round(rows / inserted) if inserted else None,
+    }
+
+
+def _file_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in (path, Path(f"{path}-wal")) if p.exists())
+
+
+def bench_inserts(work_dir: Any, bets: int = 5_000, modes: Iterable[str] = WRITE_MODES) -> Dict[str, Any]:
+    """Bets per second through ``log_bet`` for each write mode (until flushed)."""
+    work_dir = Path(work_dir)
+    rng = random.Random(3)
+    records = [synthetic_bet(rng) for _ in range(bets)]
+    results: Dict[str, Any] = {}
+    for mode in modes:
+        path = work_dir / f"insert-{mode}.db"
+        service = None
+        if mode == "service":
+            if sys.platform == "win32":
+                continue
+            from .db_service import DatabaseService
+            service = DatabaseService(path, address=str(work_dir / "bench.sock")).start()
+            db = BetDatabase(path, service=service.address)
+        else:
+            db = BetDatabase(path, commit_every=1 if mode == "sync-1" else 50,
+                             background_writes=mode == "background")
+        db.start_session("insert", "paroli", "BTC", simulation_mode=True, starting_balance=Decimal("1"))
+        started = time.perf_counter()
+        for i, (bet, result) in enumerate(records, 1):
+            db.log_bet("insert", bet, result, i, Decimal("1"), simulation_mode=True)
+        db.flush()
+        elapsed = time.perf_counter() - started
+        db.close()
+        if service is not None:
+            service.stop()
+        results[mode] = {"bets": bets, "seconds": round(elapsed, 4),
+                         "bets_per_sec": round(bets / elapsed) if elapsed else None}
+    return results
+
+
+def _query_methods(db: BetDatabase) -> Dict[str, Callable[[], Any]]:
+    """Every read method of BetDatabase with representative arguments."""
+    with db._get_connection() as conn:
+        row = conn.execute(
+            "SELECT session_id, strategy_name, symbol, started_at FROM sessions ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        middle = conn.execute("SELECT MAX(id) / 2 FROM bet_history").fetchone()[0] or 0
+    session_id, strategy, symbol, started_at = tuple(row)
+    from duckdice_api.utils.pagination import encode_cursor
+    deep = encode_cursor(middle)
+    return {
+        "get_statistics": lambda: db.get_statistics(),
+        "get_statistics_session": lambda: db.get_statistics(session_id=session_id),
+        "get_statistics_strategy": lambda: db.get_statistics(strategy_name=strategy, simulation_mode=True),
+        "get_statistics_since": lambda: db.get_statistics(session_id=session_id, since=started_at),
+        "get_sessions": lambda: db.get_sessions(limit=50),
+        "get_last_cancelled_session": lambda: db.get_last_cancelled_session(),
+        "get_session_tail_state": lambda: db.get_session_tail_state(session_id),
+        "get_session_bets_1000": lambda: db.get_session_bets(session_id, limit=1000),
+        "get_recent_rolls": lambda: db.get_recent_rolls(limit=5000),
+        "get_recent_rolls_symbol": lambda: db.get_recent_rolls(symbol=symbol, limit=5000),
+        "get_timeline_1h": lambda: db.get_timeline("1h"),
+        "get_timeline_1m_symbol": lambda: db.get_timeline("1m", symbol=symbol),
+        "bet_page_first": lambda: db.bet_page(page_size=100),
+        "bet_page_deep": lambda: db.bet_page(cursor=deep, page_size=100),
+        "bet_page_session": lambda: db.bet_page(page_size=100, session_id=session_id),
+    }
+
+
+def bench_queries(db: BetDatabase, repeat: int = 20) -> Dict[str, Any]:
+    """Latency percentiles of each query method (first call is a warm-up)."""
+    results = {}
+    for name, call in _query_methods(db).items():
+        call()
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - started)
+        results[name] = percentiles(samples)
+    return results
+
+
+def bench_exports(db: BetDatabase, out_dir: Any, formats: Iterable[str] = EXPORT_FORMATS) -> Dict[str, Any]:
+    """Rows per second and output size for each export format (uncompressed)."""
+    out_dir = Path(out_dir)
+    results = {}
+    for fmt in formats:
+        path = out_dir / f"export.{fmt}"
+        started = time.perf_counter()
+        rows = db.export(path, format=fmt, compression=None)
+        elapsed = time.perf_counter() - started
+        results[fmt] = {
+            "rows": rows,
+            "seconds": round(elapsed, 4),
+            "rows_per_sec": round(rows / elapsed) if elapsed else None,
+            "bytes": path.stat().st_size,
+        }
+        path.unlink()
+    return results
+
+
+def _metadata() -> Dict[str, Any]:
+    try:
+        from importlib.metadata import version
+        package_version = version("duckdice-betbot")
+    except Exception:
+        package_version = None
+    return {
+        "version": package_version,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or None,
+        "cpus": os.cpu_count(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    work_dir: Optional[Any] = None,
+    insert_bets: int = 5_000,
+    repeat: int = 20,
+    read_seconds: float = 1.0,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run every benchmark and return the results document.
+
+    Args:
+        sizes: Bets per synthetic database
+        work_dir: Where databases are built (default: a temporary directory, removed after)
+        insert_bets: Bets logged per write mode
+        repeat: Timed calls per query method
+        read_seconds: Dashboard reads under write load per size (0 = skip)
+        progress: Called with a line of text before each step
+    """
+    say = progress or (lambda _msg: None)
+    own_dir = work_dir is None
+    work_dir = Path(tempfile.mkdtemp(prefix="duckdice-bench-") if own_dir else work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    results: Dict[str, Any] = {"meta": _metadata(), "inserts": {}, "datasets": {}}
+    try:
+        say(f"insert throughput ({insert_bets:,} bets per mode)")
+        results["inserts"] = bench_inserts(work_dir, insert_bets)
+        for rows in sizes:
+            path = work_dir / f"synthetic-{rows}.db"
+            say(f"{rows:,} rows: generating")
+            entry = generate_dataset(path, rows)
+            entry["file_bytes"] = _file_bytes(path)
+            entry["bytes_per_bet"] = round(entry["file_bytes"] / rows, 1) if rows else None
+            db = BetDatabase(path)
+            say(f"{rows:,} rows: queries")
+            entry["queries"] = bench_queries(db, repeat)
+            say(f"{rows:,} rows: exports")
+            entry["exports"] = bench_exports(db, work_dir)
+            db.close()
+            if read_seconds:
+                say(f"{rows:,} rows: reads under write load")
+                entry["read_under_write"] = read_latency_under_write(path, seconds=read_seconds)
+            results["datasets"][str(rows)] = entry
+            for leftover in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+                if leftover.exists():
+                    leftover.unlink()
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def _flatten(doc: Any, prefix: str = "") -> Dict[str, float]:
+    flat: Dict[str, float] = {}
+    if isinstance(doc, dict):
+        for key, value in doc.items():
+            flat.update(_flatten(value, f"{prefix}{key}."))
+    elif isinstance(doc, (int, float)) and not isinstance(doc, bool):
+        flat[prefix[:-1]] = doc
+    return flat
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.25) -> List[Dict[str, Any]]:
+    """
+    Metrics that got worse by more than ``tolerance`` (0.25 = 25%).
+
+    Latencies (``*_ms``, ``seconds``) and sizes (``*bytes*``) regress when
+    they grow, throughputs (``*_per_sec``) when they shrink. Metrics missing
+    from either run are ignored.
+    """
+    old, new = _flatten(baseline), _flatten(current)
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        if key.startswith("meta."):
+            continue
+        before, after = old[key], new[key]
+        name = key.rsplit(".", 1)[-1]
+        if name.endswith("_per_sec"):
+            worse = after < before / (1 + tolerance)
+        elif name.endswith("_ms") or name.endswith("seconds") or "bytes" in name:
+            worse = after > before * (1 + tolerance)
+        else:
+            continue
+        if worse:
+            regressions.append({"metric": key, "baseline": before, "current": after,
+                                "ratio": round(after / before, 3) if before else None})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BetDatabase benchmark suite")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Synthetic database sizes in bets (default: 10000 100000)")
+    parser.add_argument("--insert-bets", type=int, default=5_000, help="Bets per write mode")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed calls per query method")
+    parser.add_argument("--read-seconds", type=float, default=1.0,
+                        help="Dashboard reads under write load per size (0 = skip)")
+    parser.add_argument("--work-dir", default=None, help="Keep databases here instead of a temp dir")
+    parser.add_argument("--output", default="-", help="Results JSON file (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.rows, args.work_dir, args.insert_bets, args.repeat, args.read_seconds,
+                        progress=lambda msg: print(f"… {msg}", file=sys.stderr))
+    text = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n")
+    if not args.baseline:
+        return 0
+    regressions = compare_results(json.loads(Path(args.baseline).read_text()), results, args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
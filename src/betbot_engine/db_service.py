@@ -0,0 +1,346 @@
+"""
+Shared single-writer service for a bet database.
+
+When the web runtime, TUI, CLI sessions and agent runs all log to the same
+SQLite file, every ``BetDatabase`` holding its own write connection means
+they queue on the write lock and stall with ``database is locked``.
+``DatabaseService`` owns the only write connection instead: producers
+connect over a local socket (a Unix socket, a named pipe on Windows) and
+forward the writes their ``BetDatabase`` would have made; the service feeds
+them to one background writer, which batches rows from every producer into
+shared transactions. Reads never go through the service: clients read the
+file directly and WAL gives each read transaction a consistent snapshot
+while the writer commits (``BetDatabase.read_snapshot()`` holds one across
+several queries).
+
+Usage::
+
+    service = DatabaseService("data/bets.db").start()   # or: duckdice_cli.py db-serve
+    db = BetDatabase("data/bets.db", service="auto")     # or service=service.address
+    db.log_bet(...)          # forwarded to the service
+    db.flush()               # returns once the service has committed it
+    db.get_statistics()      # read locally
+
+Each service generates a random key when it starts and writes it to a file
+only its owner can read, beside the socket (``<address>.key``); producers
+read it from there. The default socket lives in a private (0700) directory:
+``$XDG_RUNTIME_DIR/duckdice-db`` or, failing that, ``.duckdice-db`` next to
+the database file. Requests are pickled, so a producer never talks to a
+listener that cannot prove it knows the key.
+"""
+
+import hashlib
+import os
+import secrets
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .bet_database import (
+    _OP_BET,
+    _OP_CALL,
+    _OPEN_WRITERS,
+    BetDatabase,
+    _finish_session,
+    _insert_session,
+)
+
+# Requests are ``(kind, payload)``; only flush and call are answered
+_REQ_PUT, _REQ_FLUSH, _REQ_CALL = "put", "flush", "call"
+
+# Writer calls producers may forward, and BetDatabase methods they may run remotely
+_WRITER_CALLS = (_insert_session, _finish_session)
+_REMOTE_METHODS = ("apply_retention",)
+
+
+def _private_dir(path: Path) -> Path:
+    """Create ``path`` as a 0700 directory, refusing one that another user owns."""
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = path.lstat()
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise RuntimeError(f"{path} is not a directory owned by the current user")
+    if info.st_mode & 0o077:
+        os.chmod(path, 0o700)
+    return path
+
+
+def default_address(db_path: Any) -> str:
+    """Service address derived from the database path (same file, same address)."""
+    db_path = Path(db_path).resolve()
+    digest = hashlib.sha1(str(db_path).encode()).hexdigest()[:12]
+    if sys.platform == "win32":
+        return rf"\\.\pipe\duckdice-db-{digest}"
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    folder = Path(runtime) / "duckdice-db" if runtime else db_path.parent / ".duckdice-db"
+    return str(_private_dir(folder) / f"duckdice-db-{digest}.sock")
+
+
+def key_file(address: str) -> str:
+    """Where the service publishes the authentication key for ``address``."""
+    if sys.platform == "win32":
+        # Named pipes have no directory; the temp dir is per user on Windows
+        return os.path.join(tempfile.gettempdir(), address.rsplit("\\", 1)[-1] + ".key")
+    return address + ".key"
+
+
+def _write_key(address: str) -> bytes:
+    """Generate a fresh key and store it owner-read-only beside the socket."""
+    path = key_file(address)
+    if os.path.lexists(path):
+        os.unlink(path)
+    key = secrets.token_bytes(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key.hex().encode())
+    return key
+
+
+def read_key(address: str) -> bytes:
+    """Key of the service on ``address``; only trusted if this user wrote it."""
+    path = key_file(address)
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except FileNotFoundError:
+        raise RuntimeError(f"No database service key at {path}; is db-serve running?") from None
+    with os.fdopen(fd, "rb") as f:
+        info = os.fstat(f.fileno())
+        if sys.platform != "win32" and (info.st_uid != os.getuid() or info.st_mode & 0o077):
+            raise RuntimeError(f"Refusing {path}: not private to the current user")
+        return bytes.fromhex(f.read().decode())
+
+
+def _remove_stale_socket(address: str):
+    """Unlink a Unix socket left behind by a service that died; refuse a live one."""
+    if not os.path.exists(address):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(address)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(address)
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"A database service is already listening on {address}")
+
+
+def _hang_up(conn):
+    """Wake a thread blocked in ``conn.recv()`` by shutting the socket down."""
+    try:
+        with socket.fromfd(conn.fileno(), socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+
+class DatabaseService:
+    """
+    Owns the write connection of one database and serves producer writes.
+
+    Args:
+        db_path: Database file (default: BetDatabase's default)
+        address: Socket / pipe to listen on (default: ``default_address``)
+        batch_size: Most rows per transaction
+        queue_size: Pending writes before producers are slowed down
+        payloads: api_raw / strategy_state storage for every producer
+        authkey: Connection key (default: random, published via ``key_file``)
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        address: Optional[str] = None,
+        batch_size: int = 500,
+        queue_size: int = 50000,
+        payloads: str = "compressed",
+        authkey: Optional[bytes] = None,
+    ):
+        self.db = BetDatabase(db_path, commit_every=batch_size, background_writes=True,
+                              queue_size=queue_size, payloads=payloads)
+        self.address = address or default_address(self.db.db_path)
+        self._authkey = authkey
+        self._key_path: Optional[str] = None  # set when we published the key
+        self._listener: Optional[Listener] = None
+        self._thread: Optional[threading.Thread] = None
+        self._clients: Dict[Any, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._stopping = False
+        self.stats = {"clients": 0, "requests": 0, "rejected": 0}
+
+    @property
+    def writer_stats(self) -> Dict[str, Any]:
+        return self.db.writer_stats
+
+    def start(self) -> "DatabaseService":
+        """Listen in a background thread and return immediately."""
+        if sys.platform != "win32":
+            _remove_stale_socket(self.address)
+        if self._authkey is None:
+            self._authkey = _write_key(self.address)
+            self._key_path = key_file(self.address)
+        self._listener = Listener(self.address, authkey=self._authkey)
+        if sys.platform != "win32":
+            os.chmod(self.address, 0o600)
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True, name="bet-db-service")
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Run until ``stop()`` is called or the process is interrupted."""
+        if self._thread is None:
+            self.start()
+        try:
+            while self._thread.is_alive():
+                self._thread.join(0.5)
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop accepting, disconnect producers and commit everything received."""
+        if self._stopping:
+            return
+        self._stopping = True
+        if self._listener is not None:
+            try:
+                # accept() only returns for a connection; make one
+                Client(self.address, authkey=self._authkey).close()
+            except OSError:
+                pass
+            self._thread.join(5)
+            self._listener.close()
+            if self._key_path is not None:
+                try:
+                    os.unlink(self._key_path)
+                except OSError:
+                    pass
+        with self._lock:
+            clients = list(self._clients.items())
+        for conn, thread in clients:
+            _hang_up(conn)
+            thread.join(5)
+        self.db.close()
+
+    def __enter__(self) -> "DatabaseService":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while not self._stopping:
+            try:
+                conn = self._listener.accept()
+            except (AuthenticationError, EOFError, OSError):
+                if self._stopping:
+                    return
+                self.stats["rejected"] += 1
+                continue
+            if self._stopping:
+                conn.close()
+                return
+            thread = threading.Thread(target=self._serve, args=(conn,), daemon=True,
+                                      name="bet-db-service-client")
+            with self._lock:
+                self._clients[conn] = thread
+            self.stats["clients"] += 1
+            thread.start()
+
+    def _serve(self, conn):
+        writer = self.db._writer
+        try:
+            while True:
+                try:
+                    kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    return
+                self.stats["requests"] += 1
+                if kind == _REQ_PUT:
+                    op, item = payload
+                    if op == _OP_BET or (op == _OP_CALL and item[0] in _WRITER_CALLS):
+                        writer.put(op, item)
+                    else:
+                        self.stats["rejected"] += 1
+                elif kind == _REQ_FLUSH:
+                    writer.flush()
+                    conn.send(("ok", self.db.writer_stats))
+                elif kind == _REQ_CALL:
+                    name, kwargs = payload
+                    try:
+                        if name not in _REMOTE_METHODS:
+                            raise ValueError(f"Not a remote database method: {name}")
+                        conn.send(("ok", getattr(self.db, name)(**kwargs)))
+                    except Exception as e:
+                        conn.send(("error", e))
+        except (EOFError, OSError, RuntimeError):
+            # Producer gone or service shutting down
+            return
+        finally:
+            with self._lock:
+                self._clients.pop(conn, None)
+            conn.close()
+
+
+class ServiceWriter:
+    """
+    Producer side of a ``DatabaseService``, used by ``BetDatabase(service=)``.
+
+    Stands in for the background writer: bets and session calls are sent
+    without waiting, ``flush()`` waits until the service has committed
+    everything this producer sent before it.
+    """
+
+    def __init__(self, address: str, authkey: Optional[bytes] = None):
+        self.address = address
+        self._conn = Client(address, authkey=authkey or read_key(address))
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"queued": 0, "flushes": 0}
+        self.service_stats: Dict[str, Any] = {}
+        self.last_error: Optional[BaseException] = None
+
+    def put(self, op: int, payload: Any):
+        if self._closed:
+            raise RuntimeError("BetDatabase service connection is closed")
+        with self._lock:
+            self._conn.send((_REQ_PUT, (op, payload)))
+        if op == _OP_BET:
+            self.stats["queued"] += 1
+
+    def _request(self, kind: str, payload: Any) -> Any:
+        with self._lock:
+            self._conn.send((kind, payload))
+            status, value = self._conn.recv()
+        if status == "error":
+            self.last_error = value
+            raise value
+        return value
+
+    def flush(self):
+        """Block until the service has committed everything sent so far."""
+        if self._closed:
+            return
+        self.service_stats = self._request(_REQ_FLUSH, None)
+        self.stats["flushes"] += 1
+
+    def call(self, method: str, **kwargs: Any) -> Any:
+        """Run a maintenance method (``_REMOTE_METHODS``) on the service's database."""
+        return self._request(_REQ_CALL, (method, kwargs))
+
+    def close(self):
+        if self._closed:
+            return
+        try:
+            self.flush()
+        except (EOFError, OSError) as e:
+            self.last_error = e
+        finally:
+            self._closed = True
+            self._conn.close()
+            _OPEN_WRITERS.discard(self)
+
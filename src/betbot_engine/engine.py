@@ -12,6 +12,7 @@ import re
 import time
 import random
 from dataclasses import dataclass
+from functools import lru_cache
 from decimal import Decimal, getcontext, InvalidOperation
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
@@ -20,6 +21,17 @@ from duckdice_api.api import DuckDiceAPI, DuckDiceConfig
 from betbot_strategies.base import StrategyContext, SessionLimits, BetSpec, BetResult
 from betbot_strategies import list_strategies, get_strategy  # noqa: F401
 
+from .session_checkpoint import (
+    SessionCheckpoint,
+    capture_strategy,
+    decode_values,
+    encode_values,
+    restore_strategy,
+    rng_state,
+    set_rng_state,
+)
+from .state_snapshots import StateSnapshotter
+
 try:
     from .events import (
         SessionStartedEvent, BetPlacedEvent, BetResultEvent, 
@@ -51,6 +63,15 @@ except Exception:
     # Registration may be deferred if modules missing; CLI listing will show none
     pass
 
+# How bets reach the database: "direct" logs each bet to BetDatabase from the
+# bet loop; "log" writes only the JSONL session log and a background
+# ingestor replays it into the database (see log_ingest)
+DB_MODES = ("direct", "log")
+
+# Session log encoding: one JSON document per record, or compact binary bet
+# segments with a JSONL sidecar for other records (see session_log)
+LOG_FORMATS = ("jsonl", "binary")
+
 
 @dataclass
 class EngineConfig:
@@ -69,6 +90,20 @@ class EngineConfig:
     log_dir: str = os.path.join("bet_history", "auto")
     db_log: bool = True  # Enable database logging
     db_path: Optional[str] = None  # Custom database path
+    db_payloads: str = "compressed"  # api_raw / strategy_state storage: inline, compressed, none
+    db_mode: str = "direct"  # one of DB_MODES
+    db_service: Optional[str] = None  # DatabaseService address ("auto": derived from db_path)
+    state_snapshot_every: int = 100  # full strategy-state snapshot every N bets (1 = every bet)
+    state_snapshot_sec: Optional[float] = 60.0  # ... or when this many seconds have passed
+    state_deltas: bool = False  # store changed state keys between snapshots
+    checkpoint_path: Optional[str] = None  # memory-mapped resume checkpoint (see session_checkpoint)
+    checkpoint_every: int = 10  # update the checkpoint every N bets
+    checkpoint_fsync: bool = False  # msync each checkpoint (power-loss safe)
+    log_format: str = "jsonl"  # one of LOG_FORMATS
+    log_fsync_every: int = 0  # binary log: fsync every N bets (0 = leave to the OS)
+    log_rotate_mb: Optional[float] = None  # binary log: new segment past this size
+    log_rotate_sec: Optional[int] = None  # binary log: new segment after this age
+    log_compress: bool = False  # binary log: gzip closed segments
     tle_hash: Optional[str] = None  # Time Limited Event hash for TLE bets
     lottery_enabled: bool = False  # Engine-level lottery shots
     lottery_min_gap: int = 10  # Minimum bets between lottery shots
@@ -345,19 +380,78 @@ def _build_limits(config: EngineConfig) -> SessionLimits:
     )
 
 
+def _ingests_session_log(config: EngineConfig) -> bool:
+    # Only JSONL logs carry everything a database row needs; a shared
+    # database service already owns the writes
+    return (config.db_log and config.db_mode == "log" and config.log_format == "jsonl"
+            and not config.db_service)
+
+
 def _init_db_logger(config: EngineConfig, printer: Optional[Callable[[str], None]]):
-    if not config.db_log:
+    if not config.db_log or _ingests_session_log(config):
+        return None
+    try:
+        from .bet_database import BetDatabase
+        db_path = Path(config.db_path) if config.db_path else None
+        # Writes go to a background thread (or the shared service) so SQLite stays off the bet loop
+        return BetDatabase(db_path, background_writes=True, payloads=config.db_payloads,
+                           service=config.db_service)
+    except Exception as e:
+        if printer:
+            printer(f"⚠️  Database logging disabled: {e}")
+        return None
+
+
+def _start_log_ingestor(
+    config: EngineConfig,
+    log_file: str,
+    printer: Optional[Callable[[str], None]],
+):
+    if not _ingests_session_log(config):
         return None
     try:
         from .bet_database import BetDatabase
+        from .log_ingest import SessionLogIngestor
         db_path = Path(config.db_path) if config.db_path else None
-        return BetDatabase(db_path)
+        db = BetDatabase(db_path, commit_every=1000, payloads=config.db_payloads)
+        return SessionLogIngestor(db, log_file).start()
     except Exception as e:
         if printer:
             printer(f"⚠️  Database logging disabled: {e}")
         return None
 
 
+def _build_binary_sink(
+    log_base: str,
+    json_sink: Optional[Callable[[Dict[str, Any]], None]],
+    config: EngineConfig,
+    header: Dict[str, Any],
+) -> Callable[[Dict[str, Any]], None]:
+    from .session_log import SessionLogWriter
+
+    class _BinarySink:
+        def __init__(self):
+            self._external_sink = json_sink
+            self._writer = SessionLogWriter(
+                log_base,
+                header=header,
+                fsync_every=config.log_fsync_every,
+                rotate_bytes=int(config.log_rotate_mb * 1024 * 1024) if config.log_rotate_mb else None,
+                rotate_seconds=config.log_rotate_sec,
+                compress=config.log_compress,
+            )
+
+        def __call__(self, rec: Dict[str, Any]) -> None:
+            if self._external_sink:
+                self._external_sink(rec)
+            self._writer(rec)
+
+        def close(self) -> None:
+            self._writer.close()
+
+    return _BinarySink()
+
+
 def _build_sink(
     log_file: str,
     json_sink: Optional[Callable[[Dict[str, Any]], None]],
@@ -491,6 +585,86 @@ def _prepare_bet_for_execution(
     return validated_bet, None, lottery_applied, lottery_chance, lottery_countdown, original_game
 
 
+def _simulate_dry_run_bet(
+    bet: BetSpec,
+    amount_dec: Decimal,
+    rng: random.Random,
+) -> tuple[bool, Decimal, int, str, Optional[str]]:
+    """Resolve a prepared bet with the dry-run dice model.
+
+    Returns ``(win, profit, number, payout, chance)``. Shared by
+    run_auto_bet and the in-memory simulation kernel so both consume the
+    RNG identically.
+    """
+    if bet.get("game") == "dice":
+        chance = str(bet.get("chance"))
+        p = float(Decimal(chance) / Decimal(100)) if chance else 0.5
+        win = rng.random() < p
+        # Approx payout formula typical for dice sites (approximation): 99/chance
+        try:
+            payout_val = float(Decimal(99) / Decimal(chance))
+        except Exception:
+            payout_val = 2.0
+        amount_val = float(amount_dec)
+        profit = Decimal(str((payout_val - 1.0) * amount_val if win else -amount_val))
+        number = int(rng.random() * 10000)
+        return win, profit, number, str(payout_val), chance
+
+    # range dice: assume 0..9999, inclusive of endpoints
+    is_in = bet.get("is_in")
+    r = bet.get("range") or (0, 0)
+    size = max(0, (r[1] - r[0] + 1))
+    p = min(1.0, max(0.0, size / 10000.0))
+    win = (rng.random() < p) if is_in else (rng.random() >= p)
+    payout_val = 1.0 / max(1e-9, (p if is_in else (1.0 - p))) * 0.99
+    amount_val = float(amount_dec)
+    profit = Decimal(str((payout_val - 1.0) * amount_val if win else -amount_val))
+    number = int(rng.random() * 10000)
+    return win, profit, number, str(payout_val), str(round(p * 100, 5))
+
+
+@lru_cache(maxsize=1024)
+def _recorded_dice_terms(chance: str) -> tuple[int, float]:
+    """Win threshold (in 0..9999 ticks) and payout for a dice chance string."""
+    target = int(Decimal(chance) * 100) if chance else 5000
+    try:
+        payout_val = float(Decimal(99) / Decimal(chance))
+    except Exception:
+        payout_val = 2.0
+    return target, payout_val
+
+
+def _resolve_recorded_bet(
+    bet: BetSpec,
+    amount_dec: Decimal,
+    number: int,
+) -> tuple[bool, Decimal, int, str, Optional[str]]:
+    """Resolve a prepared bet against a recorded roll (0..9999).
+
+    Same return shape and payout model as ``_simulate_dry_run_bet``; used to
+    replay recorded roll streams. Dice high wins on ``number >= 10000 -
+    chance * 100``, low on ``number < chance * 100``.
+    """
+    if bet.get("game") == "dice":
+        chance = str(bet.get("chance"))
+        target, payout_val = _recorded_dice_terms(chance)
+        win = number >= 10000 - target if bet.get("is_high", True) else number < target
+        amount_val = float(amount_dec)
+        profit = Decimal(str((payout_val - 1.0) * amount_val if win else -amount_val))
+        return win, profit, number, str(payout_val), chance
+
+    is_in = bet.get("is_in")
+    r = bet.get("range") or (0, 0)
+    size = max(0, (r[1] - r[0] + 1))
+    p = min(1.0, max(0.0, size / 10000.0))
+    inside = r[0] <= number <= r[1]
+    win = inside if is_in else not inside
+    payout_val = 1.0 / max(1e-9, (p if is_in else (1.0 - p))) * 0.99
+    amount_val = float(amount_dec)
+    profit = Decimal(str((payout_val - 1.0) * amount_val if win else -amount_val))
+    return win, profit, number, str(payout_val), str(round(p * 100, 5))
+
+
 def run_auto_bet(
     api: DuckDiceAPI,
     strategy_name: str,
@@ -521,8 +695,15 @@ def run_auto_bet(
 
     # Logger
     session_id = time.strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(config.log_dir, f"{session_id}_{config.symbol}_{strategy_name}.jsonl")
-    sink = _build_sink(log_file, json_sink)
+    log_base = os.path.join(config.log_dir, f"{session_id}_{config.symbol}_{strategy_name}")
+    log_file = f"{log_base}.jsonl"
+    if config.log_format == "binary":
+        sink = _build_binary_sink(log_base, json_sink, config, {
+            "session_id": session_id, "symbol": config.symbol, "strategy": strategy_name,
+        })
+    else:
+        sink = _build_sink(log_file, json_sink)
+    ingestor = _start_log_ingestor(config, log_file, printer)
 
     # Random
     rng = random.Random(config.seed or int(time.time() * 1000) & 0xFFFFFFFF)
@@ -544,6 +725,10 @@ def run_auto_bet(
         printer=printer if printer else print,
     )
     strategy = StrategyCls(params, ctx)  # type: ignore[call-arg]
+    snapshotter = None
+    if (db or ingestor) and hasattr(strategy, 'get_state'):
+        snapshotter = StateSnapshotter(config.state_snapshot_every, config.state_snapshot_sec,
+                                       config.state_deltas)
 
     # Session state
     bets_done = 0
@@ -565,12 +750,40 @@ def run_auto_bet(
             strategy.on_resume(resume_state)
         except Exception as e:
             print_line(f"⚠️  State restore failed (starting fresh): {e}")
+
+    # Checkpoint restore: RNG, engine counters and strategy internals
+    checkpoint = resume_state.get("checkpoint") if resume_state else None
+    strategy_baseline = capture_strategy(strategy) if (checkpoint or config.checkpoint_path) else {}
+    if checkpoint:
+        try:
+            set_rng_state(rng, checkpoint["rng"])
+            lottery_countdown = int(checkpoint.get("lottery_countdown", lottery_countdown))
+            losses_in_row = int(checkpoint.get("loss_streak", 0))
+            if config.dry_run:
+                # Simulated balance carries over; live sessions use the fetched balance
+                current_balance = _decimal(checkpoint["balance"])
+            if checkpoint.get("last_result"):
+                ctx.recent_results.append(decode_values(checkpoint["last_result"]))
+            restored = restore_strategy(strategy, checkpoint, strategy_baseline)
+            print_line(f"[resume] checkpoint at bet#{checkpoint.get('bets_done')}: "
+                       f"restored {len(restored)} strategy fields")
+        except Exception as e:
+            print_line(f"⚠️  Checkpoint restore failed (starting fresh): {e}")
     start_msg = f"[start] strategy={strategy_name} symbol={config.symbol} dry_run={config.dry_run} faucet={config.faucet}"
     if resume_state:
         start_msg += f" resumed_from={resume_state.get('resumed_from', 'unknown')}"
     print_line(start_msg)
     
     # Start database session
+    session_limits = {
+        'stop_loss': config.stop_loss,
+        'take_profit': config.take_profit,
+        'max_bet': config.max_bet,
+        'max_bets': config.max_bets,
+        'max_losses': config.max_losses,
+        'max_duration_sec': config.max_duration_sec,
+    }
+    session_metadata = {'resumed_from': resume_state.get('resumed_from')} if resume_state else None
     if db:
         try:
             db.start_session(
@@ -580,18 +793,24 @@ def run_auto_bet(
                 simulation_mode=config.dry_run,
                 starting_balance=starting_balance,
                 strategy_params=params,
-                limits={
-                    'stop_loss': config.stop_loss,
-                    'take_profit': config.take_profit,
-                    'max_bet': config.max_bet,
-                    'max_bets': config.max_bets,
-                    'max_losses': config.max_losses,
-                    'max_duration_sec': config.max_duration_sec,
-                },
-                metadata={'resumed_from': resume_state.get('resumed_from')} if resume_state else None,
+                limits=session_limits,
+                metadata=session_metadata,
             )
         except Exception as e:
             print_line(f"⚠️  Database session start failed: {e}")
+    if ingestor:
+        sink({
+            "event": "session_start",
+            "time": start_ts,
+            "session_id": session_id,
+            "strategy": strategy_name,
+            "symbol": config.symbol,
+            "simulation_mode": config.dry_run,
+            "starting_balance": format(starting_balance, 'f'),
+            "params": params,
+            "limits": session_limits,
+            "metadata": session_metadata,
+        })
     
     if emitter and _EVENTS_AVAILABLE:
         emitter.emit(SessionStartedEvent(
@@ -604,6 +823,41 @@ def run_auto_bet(
 
     stopped_reason = "completed"
 
+    def checkpoint_state(stop_reason: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "session_id": session_id,
+            "resumed_from": resume_state.get("resumed_from") if resume_state else None,
+            "strategy_name": strategy_name,
+            "symbol": config.symbol,
+            "dry_run": config.dry_run,
+            "params": encode_values(params),
+            "limits": session_limits,
+            "bets_done": bets_done,
+            "wins": wins_count,
+            "losses": losses_count,
+            "loss_streak": losses_in_row,
+            "starting_balance": format(starting_balance, 'f'),
+            "balance": format(current_balance, 'f'),
+            "lottery_countdown": lottery_countdown,
+            "rng": rng_state(rng),
+            "strategy_attrs": capture_strategy(strategy),
+            "strategy_initial": strategy_baseline,
+            "last_result": encode_values({k: v for k, v in ctx.recent_results[-1].items() if k != "api_raw"})
+            if ctx.recent_results else None,
+            "stop_reason": stop_reason,
+        }
+
+    checkpointer = None
+    if config.checkpoint_path:
+        try:
+            checkpointer = SessionCheckpoint(config.checkpoint_path, config.checkpoint_every,
+                                             config.checkpoint_fsync)
+            # Written right away so a resumed session never loses its restored state
+            checkpointer.write(checkpoint_state())
+        except Exception as e:
+            print_line(f"⚠️  Checkpoint disabled: {e}")
+            checkpointer = None
+
     try:
         while True:
             # External stop (GUI/other)
@@ -660,32 +914,8 @@ def run_auto_bet(
 
             if ctx.dry_run:
                 simulated = True
-                # Simple simulation model
-                if bet.get("game") == "dice":
-                    chance = str(bet.get("chance"))
-                    p = float(Decimal(chance) / Decimal(100)) if chance else 0.5
-                    win = rng.random() < p
-                    # Approx payout formula typical for dice sites (approximation): 99/chance
-                    try:
-                        payout_val = float(Decimal(99) / Decimal(chance))
-                    except Exception:
-                        payout_val = 2.0
-                    amount_val = float(amount_dec)
-                    profit = Decimal(str((payout_val - 1.0) * amount_val if win else -amount_val))
-                    number = int(rng.random() * 10000)
-                    payout = str(payout_val)
-                else:
-                    # range dice: assume 0..9999, inclusive of endpoints
-                    r = range_vals or (0, 0)
-                    size = max(0, (r[1] - r[0] + 1))
-                    p = min(1.0, max(0.0, size / 10000.0))
-                    win = (rng.random() < p) if is_in else (rng.random() >= p)
-                    payout_val = 1.0 / max(1e-9, (p if is_in else (1.0 - p))) * 0.99
-                    amount_val = float(amount_dec)
-                    profit = Decimal(str((payout_val - 1.0) * amount_val if win else -amount_val))
-                    number = int(rng.random() * 10000)
-                    payout = str(payout_val)
-                    chance = str(round(p * 100, 5))
+                win, profit, number, payout, sim_chance = _simulate_dry_run_bet(bet, amount_dec, rng)
+                chance = sim_chance
                 current_balance += profit
                 api_raw = {"simulated": True}
             else:
@@ -852,8 +1082,16 @@ def run_auto_bet(
                 losses_in_row += 1
                 losses_count += 1
 
+            # Strategy state is stored as periodic snapshots (see state_snapshots)
+            strategy_state = None
+            if snapshotter is not None:
+                try:
+                    strategy_state = snapshotter.record(strategy.get_state, bets_done + 1)
+                except Exception:
+                    pass
+
             # Log
-            sink({
+            bet_record = {
                 "event": "bet",
                 "time": ts,
                 "strategy": strategy_name,
@@ -868,19 +1106,15 @@ def run_auto_bet(
                     "chance": lottery_chance,
                     "original_game": original_game,
                 },
-            })
+            }
+            if ingestor:
+                # The log is the only write path: the ingestor rebuilds the row from it
+                bet_record["state"] = strategy_state
+            sink(bet_record)
             
             # Log to database
             if db:
                 try:
-                    # Get strategy state if available
-                    strategy_state = None
-                    if hasattr(strategy, 'get_state'):
-                        try:
-                            strategy_state = strategy.get_state()
-                        except:
-                            pass
-                    
                     db.log_bet(
                         session_id=session_id,
                         bet_data={
@@ -951,11 +1185,26 @@ def run_auto_bet(
             # Sleep
             ctx.sleep_with_jitter()
 
+            # After the jitter draw, so a restored RNG continues the same stream
+            if checkpointer is not None:
+                try:
+                    checkpointer.maybe_write(bets_done, checkpoint_state)
+                except Exception as e:
+                    print_line(f"⚠️  Checkpoint disabled: {e}")
+                    checkpointer.close()
+                    checkpointer = None
+
     except KeyboardInterrupt:
         stopped_reason = "cancelled"
 
     # End
     strategy.on_session_end(stopped_reason)
+    if checkpointer is not None:
+        try:
+            checkpointer.write(checkpoint_state(stopped_reason))
+            checkpointer.close()
+        except Exception as e:
+            print_line(f"⚠️  Final checkpoint failed: {e}")
 
     duration = time.time() - start_ts
     
@@ -972,6 +1221,16 @@ def run_auto_bet(
             )
         except Exception as e:
             print_line(f"⚠️  Database session end failed: {e}")
+    if ingestor:
+        sink({
+            "event": "session_end",
+            "time": time.time(),
+            "stop_reason": stopped_reason,
+            "ending_balance": format(current_balance, 'f'),
+            "bets": bets_done,
+            "wins": wins_count,
+            "losses": losses_count,
+        })
     
     summary = {
         "strategy": strategy_name,
@@ -985,9 +1244,12 @@ def run_auto_bet(
     }
     sink({"event": "summary", **summary})
     if db:
-        db.flush()
+        db.close()
     if hasattr(sink, "close"):
         sink.close()
+    if ingestor:
+        # Catch the database up with the (now flushed) log
+        ingestor.stop()
     print_line(f"[summary] {json.dumps(summary)}")
     
     # Emit session ended event
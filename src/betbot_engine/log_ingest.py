@@ -0,0 +1,280 @@
+"""
+Session-log ingestion into BetDatabase.
+
+With ``EngineConfig(db_mode="log")`` the engine serialises each bet once,
+into its append-only JSONL session log, and never touches SQLite on the
+betting thread. A ``SessionLogIngestor`` thread tails that log and replays
+``session_start`` / ``bet`` / ``session_end`` records into a BetDatabase.
+
+The log is the source of truth: the byte offset reached in each log file is
+stored in the database (``log_offsets``) in the same transaction as the rows
+each record produced, so after a crash ingestion resumes exactly where it stopped and
+the two stores cannot disagree. A record that cannot be applied (say, a bet
+without ``bets_done``) is skipped and counted in ``errors``; its batch is
+rolled back and replayed without it, so no row is written twice.
+``ingest_logs`` rebuilds (or catches up) a database from a directory of logs.
+
+Usage:
+    from betbot_engine.log_ingest import SessionLogIngestor, ingest_logs
+
+    ingestor = SessionLogIngestor(BetDatabase(path), "bet_history/auto/x.jsonl").start()
+    ...
+    ingestor.stop()          # drains the log, then stops
+
+    ingest_logs(BetDatabase("rebuilt.db"), ["bet_history/auto"])
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .bet_database import BetDatabase
+
+# Records replayed into the database; everything else in the log is skipped
+SESSION_START, BET, SESSION_END = "session_start", "bet", "session_end"
+# Raised by _apply for records with missing or malformed fields
+_RECORD_ERRORS = (KeyError, TypeError, ValueError, ArithmeticError)
+
+
+class _BadRecord(Exception):
+    """A log line that cannot be applied; ``end`` is the offset just past it."""
+
+    def __init__(self, end: int):
+        super().__init__(end)
+        self.end = end
+
+
+def _when(ts: Optional[float]) -> Optional[datetime]:
+    return datetime.fromtimestamp(ts) if ts is not None else None
+
+
+class SessionLogIngestor:
+    """Tails one session log into a BetDatabase (exactly once per record)."""
+
+    def __init__(
+        self,
+        db: BetDatabase,
+        log_path: Union[str, Path],
+        poll_interval: float = 0.05,
+        batch_lines: int = 1000,
+    ):
+        """
+        Args:
+            db: Target database; it must write synchronously so bets and the
+                log offset commit together
+            log_path: JSONL session log written by the engine
+            poll_interval: Seconds between checks for new lines
+            batch_lines: Max lines applied per transaction
+        """
+        if db.writer_stats:
+            raise ValueError("SessionLogIngestor needs a BetDatabase without background_writes")
+        self.db = db
+        self.log_path = Path(log_path)
+        self.poll_interval = poll_interval
+        self.batch_lines = max(1, batch_lines)
+        self.records = 0
+        self.bets = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+        self._session: Dict[str, Any] = {}
+        self._skip: Set[int] = set()  # end offsets of records known to be bad
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.offset = db.get_log_offset(str(self.log_path))
+        if self.offset:
+            self._recover_session()
+
+    # -- thread control ---------------------------------------------------
+
+    def start(self) -> "SessionLogIngestor":
+        self._thread = threading.Thread(target=self._run, daemon=True, name="session-log-ingest")
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Ingest everything written so far, then stop the thread.
+
+        The thread closes the database's write connection on its way out
+        (SQLite connections belong to the thread that opened them).
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        try:
+            while True:
+                stopping = self._stop.is_set()
+                try:
+                    progressed = self.poll()
+                except Exception as e:  # keep tailing; the batch was rolled back
+                    self.errors += 1
+                    self.last_error = e
+                    progressed = False
+                if stopping and not progressed:
+                    return
+                if not progressed:
+                    self._stop.wait(self.poll_interval)
+        finally:
+            self.db.close()
+
+    # -- ingestion --------------------------------------------------------
+
+    def _recover_session(self):
+        """Reload the session_start record already consumed before a restart."""
+        marker = f'"event": "{SESSION_START}"'.encode()
+        with open(self.log_path, "rb") as f:
+            pos = 0
+            for line in f:
+                if pos >= self.offset:
+                    break
+                pos += len(line)
+                if marker in line and pos not in self._skip:
+                    self._session = json.loads(line)
+
+    def poll(self) -> bool:
+        """
+        Apply complete lines appended since the last call; True if any were.
+
+        Bad records are skipped (see ``errors`` / ``last_error``). Any other
+        failure rolls back the uncommitted part of the batch, rewinds
+        ``offset`` to the last committed record and re-raises.
+        """
+        if not self.log_path.exists():
+            return False
+        with open(self.log_path, "rb") as f:
+            progressed = False
+            while True:
+                f.seek(self.offset)
+                lines: List[bytes] = []
+                end = self.offset
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # partial line still being written
+                    lines.append(line)
+                    end += len(line)
+                    if len(lines) >= self.batch_lines:
+                        break
+                if not lines:
+                    return progressed
+                try:
+                    self._apply_batch(lines)
+                except _BadRecord as e:
+                    # Rolled back to the last commit; replay without the record
+                    self.errors += 1
+                    self.last_error = e.__cause__
+                    self._skip.add(e.end)
+                    continue
+                self.offset = end
+                self._skip = {p for p in self._skip if p > end}
+                progressed = True
+
+    def _apply_batch(self, lines: List[bytes]):
+        pos = self.offset
+        # (offset, records, bets) after each applied line, to rewind counters
+        applied: List[Tuple[int, int, int]] = [(pos, self.records, self.bets)]
+        try:
+            for line in lines:
+                pos += len(line)
+                # Joins the transaction that will hold this record's rows
+                self.db.set_log_offset(str(self.log_path), pos)
+                if pos in self._skip:
+                    continue
+                try:
+                    self._apply(line)
+                except _RECORD_ERRORS as e:
+                    raise _BadRecord(pos) from e
+                applied.append((pos, self.records, self.bets))
+            self.db.flush()
+        except BaseException:
+            self._rewind(applied)
+            raise
+
+    def _rewind(self, applied: List[Tuple[int, int, int]]):
+        """Drop uncommitted rows and resume from the last committed record."""
+        self.db.rollback()
+        committed = self.db.get_log_offset(str(self.log_path))
+        _, self.records, self.bets = [a for a in applied if a[0] <= committed][-1]
+        self.offset = committed
+        self._session = {}
+        if committed:
+            self._recover_session()
+
+    def _apply(self, line: bytes):
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            return  # not a record (e.g. a torn write before a crash)
+        self.records += 1
+        event = rec.get("event")
+        if event == SESSION_START:
+            self._session = rec
+            self.db.start_session(
+                session_id=rec["session_id"],
+                strategy_name=rec["strategy"],
+                symbol=rec["symbol"],
+                simulation_mode=bool(rec.get("simulation_mode")),
+                starting_balance=Decimal(str(rec["starting_balance"]))
+                if rec.get("starting_balance") is not None else None,
+                strategy_params=rec.get("params"),
+                limits=rec.get("limits"),
+                metadata=rec.get("metadata"),
+                started_at=_when(rec.get("time")),
+            )
+        elif event == BET and self._session:
+            self.db.log_bet(
+                session_id=self._session["session_id"],
+                bet_data={
+                    "symbol": rec.get("symbol", self._session["symbol"]),
+                    "strategy": rec.get("strategy", self._session["strategy"]),
+                    **(rec.get("bet") or {}),
+                },
+                result_data=rec.get("result") or {},
+                bet_number=rec["bets_done"],
+                balance=Decimal(str(rec["balance"])),
+                loss_streak=rec.get("loss_streak", 0),
+                simulation_mode=bool(self._session.get("simulation_mode")),
+                strategy_state=rec.get("state"),
+            )
+            self.bets += 1
+        elif event == SESSION_END and self._session:
+            self.db.end_session(
+                session_id=self._session["session_id"],
+                ending_balance=Decimal(str(rec["ending_balance"])),
+                stop_reason=rec["stop_reason"],
+                total_bets=rec["bets"],
+                wins=rec["wins"],
+                losses=rec["losses"],
+                ended_at=_when(rec.get("time")),
+            )
+
+
+def ingest_logs(db: BetDatabase, paths: Iterable[Union[str, Path]]) -> Dict[str, int]:
+    """
+    Catch ``db`` up with session logs (files or directories of ``*.jsonl``).
+
+    Files are replayed from their stored offsets, so re-running only adds
+    what is new; point it at an empty database to rebuild from scratch.
+    """
+    files: List[Path] = []
+    for p in paths:
+        p = Path(p)
+        files.extend(sorted(p.glob("*.jsonl")) if p.is_dir() else [p])
+    totals = {"files": 0, "records": 0, "bets": 0}
+    for path in files:
+        if not os.path.getsize(path):
+            continue
+        ingestor = SessionLogIngestor(db, path)
+        ingestor.poll()
+        totals["files"] += 1
+        totals["records"] += ingestor.records
+        totals["bets"] += ingestor.bets
+    return totals
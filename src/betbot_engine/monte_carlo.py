@@ -19,11 +19,28 @@ Usage:
     print(f"Win Rate: {results.win_rate:.2%}")
     print(f"ROI: {results.roi:.2%}")
     print(f"Max Drawdown: {results.max_drawdown:.2%}")
+
+Reproducibility:
+    Every simulation draws from its own ``random.Random`` substream derived
+    from the engine seed (``MonteCarloEngine.spawn``), so the global ``random``
+    module is never touched and ``batch_simulate`` returns the same results
+    whether it runs serially or across a process pool.
+
+Parallelism:
+    ``batch_simulate`` runs serially unless called with ``parallel=True``.
+    Process start-up dominates for short batches, so opt in only for large
+    ``rounds`` x ``len(configs)`` workloads.  Strategies that cannot be
+    pickled (e.g. classes defined inside a function) make the batch fall
+    back to a serial run with a ``RuntimeWarning``.
 """
 
 from __future__ import annotations
 
+import hashlib
+import os
+import pickle
 import statistics
+import warnings
 from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple
@@ -96,6 +113,19 @@ class SimulationResult:
         return "\n".join(lines)
 
 
+def derive_seed(root_seed: int, index: int) -> int:
+    """
+    Derive an independent 64-bit child seed from ``(root_seed, index)``.
+
+    Hash-based derivation (in the spirit of NumPy's ``SeedSequence.spawn``)
+    keeps neighbouring indices statistically unrelated, unlike ``root + i``.
+    """
+    digest = hashlib.blake2b(
+        f"{int(root_seed)}:{int(index)}".encode("ascii"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
 class MonteCarloEngine:
     """
     High-performance Monte Carlo simulator for betting strategies.
@@ -104,15 +134,28 @@ class MonteCarloEngine:
     strategy performance metrics without risking real funds.
     """
 
-    def __init__(self, seed: Optional[int] = None) -> None:
+    def __init__(self, seed: Optional[int] = None, max_workers: Optional[int] = None) -> None:
         """
         Initialize the engine.
         
         Args:
-            seed: Random seed for reproducibility (None = non-deterministic)
+            seed: Root seed for reproducibility (None = fresh OS entropy)
+            max_workers: Process count for batch_simulate (None = CPU count)
         """
-        if seed is not None:
-            random.seed(seed)
+        self.seed = int(seed) if seed is not None else random.SystemRandom().getrandbits(64)
+        self.max_workers = max_workers
+        self._spawned = 0
+
+    def spawn(self, n: int = 1) -> List[int]:
+        """
+        Reserve ``n`` child seeds from this engine's root seed.
+
+        Each call hands out the next unused substreams, so repeated
+        ``simulate`` calls on one engine are independent yet reproducible.
+        """
+        seeds = [derive_seed(self.seed, self._spawned + i) for i in range(n)]
+        self._spawned += n
+        return seeds
 
     def simulate(
         self,
@@ -123,6 +166,7 @@ class MonteCarloEngine:
         multiplier_range: Tuple[float, float] = (1.01, 10.0),
         win_probability: float = 0.5,
         fast_mode: bool = True,
+        rng: Optional[random.Random] = None,
     ) -> SimulationResult:
         """
         Run Monte Carlo simulation for a strategy.
@@ -135,17 +179,20 @@ class MonteCarloEngine:
             multiplier_range: (min, max) multiplier for random wins
             win_probability: Probability of win on each bet (0-1)
             fast_mode: Use simplified deterministic simulation vs full engine
+            rng: Explicit RNG substream (default: next spawned substream)
             
         Returns:
             SimulationResult with full statistics
         """
+        if rng is None:
+            rng = random.Random(self.spawn(1)[0])
         if fast_mode:
             return self._simulate_fast(
-                strategy_class, config, rounds, starting_balance, multiplier_range, win_probability
+                strategy_class, config, rounds, starting_balance, multiplier_range, win_probability, rng
             )
         else:
             return self._simulate_full(
-                strategy_class, config, rounds, starting_balance, multiplier_range, win_probability
+                strategy_class, config, rounds, starting_balance, multiplier_range, win_probability, rng
             )
 
     def _simulate_fast(
@@ -156,6 +203,7 @@ class MonteCarloEngine:
         starting_balance: float,
         multiplier_range: Tuple[float, float],
         win_probability: float,
+        rng: random.Random,
     ) -> SimulationResult:
         """Simplified fast simulation for quick estimates."""
         equity_curve: List[float] = [starting_balance]
@@ -175,13 +223,13 @@ class MonteCarloEngine:
         # Simulate rounds as probabilistic outcomes
         for _ in range(rounds):
             # Random bet amount (0.5-2% of balance)
-            bet_pct = random.uniform(0.005, 0.02)
+            bet_pct = rng.uniform(0.005, 0.02)
             bet = current_balance * bet_pct
             
             # Outcome: win or loss
-            if random.random() < win_probability:
+            if rng.random() < win_probability:
                 # Win: random multiplier
-                mult = random.uniform(multiplier_range[0], multiplier_range[1])
+                mult = rng.uniform(multiplier_range[0], multiplier_range[1])
                 profit = bet * (mult - 1)
                 current_balance += profit
                 win_count += 1
@@ -256,12 +304,13 @@ class MonteCarloEngine:
         starting_balance: float,
         multiplier_range: Tuple[float, float],
         win_probability: float,
+        rng: random.Random,
     ) -> SimulationResult:
         """Full simulation using strategy class (if available)."""
         # For now, fall back to fast mode
         # In future, this could instantiate the actual strategy and run it
         return self._simulate_fast(
-            strategy_class, config, rounds, starting_balance, multiplier_range, win_probability
+            strategy_class, config, rounds, starting_balance, multiplier_range, win_probability, rng
         )
 
     @staticmethod
@@ -357,23 +406,86 @@ class MonteCarloEngine:
         configs: List[Dict[str, Any]],
         rounds: int = 1000,
         starting_balance: float = 100.0,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
     ) -> List[SimulationResult]:
         """
         Run multiple simulations (one per config).
+
+        Each config gets its own spawned RNG substream, so the returned list
+        is identical whether the batch runs serially or in a process pool.
         
         Args:
             strategy_class: Strategy class
             configs: List of config dicts
             rounds: Rounds per simulation
             starting_balance: Starting balance
+            parallel: Opt in to fanning out across processes when there is
+                more than one config (default: serial).  Falls back to a
+                serial run with a ``RuntimeWarning`` if the engine or strategy
+                class cannot be pickled (e.g. a locally defined class)
+            max_workers: Override the engine's process count for this batch
             
         Returns:
-            List of SimulationResult objects
+            List of SimulationResult objects (same order as ``configs``)
         """
-        results = []
-        for config in configs:
-            result = self.simulate(
-                strategy_class, config, rounds=rounds, starting_balance=starting_balance
+        seeds = self.spawn(len(configs))
+        jobs = list(zip(configs, seeds))
+        context = (self, strategy_class, rounds, starting_balance)
+
+        if parallel and len(jobs) > 1:
+            if _picklable(context) and _picklable(jobs):
+                from concurrent.futures import ProcessPoolExecutor
+
+                workers = max_workers or self.max_workers or min(len(jobs), os.cpu_count() or 4)
+                # The engine and strategy class travel once per worker through
+                # the initializer; each job only carries its config and seed.
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_batch_worker,
+                    initargs=context,
+                ) as executor:
+                    return list(executor.map(_batch_worker, jobs))
+            warnings.warn(
+                "batch_simulate(parallel=True): strategy or configs cannot be "
+                "pickled; running the batch serially",
+                RuntimeWarning,
+                stacklevel=2,
             )
-            results.append(result)
-        return results
+
+        return [_run_batch_job(context, job) for job in jobs]
+
+
+def _picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+        return True
+    except Exception:
+        return False
+
+
+# Per-process (engine, strategy_class, rounds, starting_balance) set by the
+# pool initializer so it is unpickled once per worker rather than per job.
+_BATCH_CONTEXT: Optional[tuple] = None
+
+
+def _init_batch_worker(engine, strategy_class, rounds, starting_balance) -> None:
+    global _BATCH_CONTEXT
+    _BATCH_CONTEXT = (engine, strategy_class, rounds, starting_balance)
+
+
+def _batch_worker(job: tuple) -> SimulationResult:
+    """Top-level worker for ProcessPoolExecutor (must be picklable)."""
+    return _run_batch_job(_BATCH_CONTEXT, job)
+
+
+def _run_batch_job(context: tuple, job: tuple) -> SimulationResult:
+    engine, strategy_class, rounds, starting_balance = context
+    config, seed = job
+    return engine.simulate(
+        strategy_class,
+        config,
+        rounds=rounds,
+        starting_balance=starting_balance,
+        rng=random.Random(seed),
+    )
@@ -0,0 +1,198 @@
+"""
+Backtest replay over recorded roll streams.
+
+Feeds the rolls recorded in ``bet_history`` (or a columnar bet export, or a
+CSV/JSON/Excel history read by ``rng_analysis.FileImporter``) through any
+registered strategy. Each bet is resolved against the next recorded number
+instead of a fresh RNG draw, on the in-memory simulation kernel: no API, no
+sleeps, no session log or database writes.
+
+Rolls are loaded once into a compact ``array('H')`` column (2 bytes per
+roll, 0..9999), so millions of rolls fit comfortably in memory and can be
+shared by many replays.
+
+Usage:
+    from betbot_engine.replay import load_rolls, replay_strategy
+
+    rolls = load_rolls("data/duckdice_bot.db")
+    result = replay_strategy("paroli", {}, rolls, starting_balance=Decimal("100"))
+    print(result.summary)
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from array import array
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+from .engine import EngineConfig
+from .sim_kernel import KernelRun, run_dry_session
+
+ROLL_SCALE = 10000  # Rolls are stored as 0..9999
+DATABASE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+_FETCH = 65536
+
+
+def _check_range(rolls: array, source: Any) -> array:
+    if rolls and max(rolls) >= ROLL_SCALE:
+        raise ValueError(f"Rolls in {source} are outside 0..{ROLL_SCALE - 1}")
+    return rolls
+
+
+def _rolls_from_database(path: Path, session_id: Optional[str], limit: Optional[int]) -> array:
+    query = "SELECT roll FROM bet_history WHERE roll IS NOT NULL"
+    params: list = []
+    if session_id:
+        query += " AND session_id = ?"
+        params.append(session_id)
+    query += " ORDER BY id"
+    if limit:
+        query += " LIMIT ?"
+        params.append(int(limit))
+
+    rolls = array("H")
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(_FETCH)
+            if not rows:
+                break
+            rolls.extend(int(r[0]) for r in rows)
+    finally:
+        conn.close()
+    return rolls
+
+
+def _rolls_from_columnar(path: Path, limit: Optional[int]) -> array:
+    from .bet_export import read_columnar
+
+    rolls = array("H")
+    for chunk in read_columnar(path):
+        if "roll" not in chunk:
+            raise ValueError(f"Columnar export has no 'roll' column: {path}")
+        rolls.extend(int(v) for v in chunk["roll"] if v == v)  # NaN = no roll
+        if limit and len(rolls) >= limit:
+            del rolls[limit:]
+            break
+    return rolls
+
+
+def _rolls_from_file(path: Path, limit: Optional[int]) -> array:
+    from rng_analysis.file_importer import FileImporter
+
+    imported = FileImporter().import_file(path)
+    if not imported.success:
+        raise ValueError("; ".join(imported.errors) or f"Could not import {path}")
+    outcomes = imported.data["outcome"]
+    if limit:
+        outcomes = outcomes.iloc[:limit]
+    # Histories exported as 0..99.99 percentages
+    if len(outcomes) and outcomes.max() <= 100 and (outcomes % 1 != 0).any():
+        outcomes = (outcomes * 100).round()
+    return array("H", (int(v) for v in outcomes))
+
+
+def load_rolls(
+    source: Union[str, Path],
+    session_id: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> array:
+    """
+    Recorded rolls in bet order as an ``array('H')`` of 0..9999.
+
+    Args:
+        source:     Bet database (.db/.sqlite), columnar export (.ddbc), or a
+                    CSV/JSON/Excel history (needs pandas, via FileImporter)
+        session_id: Bet database only: rolls of one session
+        limit:      Stop after this many rolls
+
+    Raises ValueError for unreadable sources or rolls outside 0..9999.
+    """
+    path = Path(source)
+    if not path.exists():
+        raise ValueError(f"Roll source not found: {path}")
+    ext = path.suffix.lower()
+    if ext in DATABASE_SUFFIXES:
+        rolls = _rolls_from_database(path, session_id, limit)
+    elif ext == ".ddbc":
+        rolls = _rolls_from_columnar(path, limit)
+    else:
+        rolls = _rolls_from_file(path, limit)
+    return _check_range(rolls, path)
+
+
+def replay_config(symbol: str = "BTC", **overrides: Any) -> EngineConfig:
+    """EngineConfig suited to backtests: no pacing, wide stop loss, no take profit."""
+    values: Dict[str, Any] = dict(symbol=symbol, dry_run=True, delay_ms=0, jitter_ms=0,
+                                  stop_loss=-0.99, take_profit=None, seed=42, db_log=False)
+    values.update(overrides)
+    return EngineConfig(**values)
+
+
+@dataclass
+class ReplayResult:
+    """One strategy replayed over a roll stream."""
+    strategy: str
+    params: Dict[str, Any]
+    symbol: str
+    run: KernelRun
+    duration_sec: float
+    rolls_available: int
+
+    @property
+    def summary(self) -> Dict[str, Any]:
+        """The session summary ``run_auto_bet`` reports, plus replay metrics."""
+        run = self.run
+        return {
+            "strategy": self.strategy,
+            "symbol": self.symbol,
+            "bets": run.bets,
+            "duration_sec": self.duration_sec,
+            "stop_reason": run.stop_reason,
+            "starting_balance": format(Decimal(str(run.starting_balance)), 'f'),
+            "ending_balance": format(Decimal(str(run.ending_balance)), 'f'),
+            "profit": format(Decimal(str(run.ending_balance)) - Decimal(str(run.starting_balance)), 'f'),
+            "wins": run.wins,
+            "losses": run.losses,
+            "win_rate": run.wins / run.bets if run.bets else 0.0,
+            "roi": run.roi,
+            "total_wagered": run.total_wagered,
+            "max_bet_size": run.max_bet_size,
+            "max_drawdown": run.max_drawdown,
+            "max_loss_streak": run.max_loss_streak,
+            "rolls_available": self.rolls_available,
+            "bets_per_sec": run.bets / self.duration_sec if self.duration_sec > 0 else 0.0,
+        }
+
+
+def replay_strategy(
+    strategy_name: str,
+    params: Dict[str, Any],
+    rolls: Sequence[int],
+    config: Optional[EngineConfig] = None,
+    starting_balance: Decimal = Decimal("100"),
+    min_bet: Decimal = Decimal("0.00000001"),
+) -> ReplayResult:
+    """
+    Run ``strategy_name`` over ``rolls`` (see ``run_dry_session`` for limits).
+
+    ``config`` defaults to ``replay_config()``. Raises ValueError for
+    strategies that cannot run in the simulation kernel.
+    """
+    config = config or replay_config()
+    started = time.perf_counter()
+    run = run_dry_session(strategy_name, params, config, starting_balance=starting_balance,
+                          min_bet=min_bet, rolls=rolls)
+    return ReplayResult(
+        strategy=strategy_name,
+        params=dict(params),
+        symbol=config.symbol,
+        run=run,
+        duration_sec=time.perf_counter() - started,
+        rolls_available=len(rolls),
+    )
@@ -0,0 +1,108 @@
+"""
+Running estimates for streaming simulation results.
+
+Welford mean/variance with a normal-approximation confidence interval, and
+a Wilson interval for proportions (survival / ruin rates), and
+RunningEstimate which combines the two for the streaming simulation APIs:
+it reports converging estimates as runs complete and decides when a sweep
+can stop because the estimate is tight enough.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+Z_95 = 1.959964
+
+
+@dataclass
+class RunningStats:
+    """Streaming mean / variance (Welford)."""
+    n: int = 0
+    mean: float = 0.0
+    _m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def ci_halfwidth(self, z: float = Z_95) -> float:
+        """Half-width of the confidence interval for the mean (inf below 2 samples)."""
+        if self.n < 2:
+            return math.inf
+        return z * self.stdev / math.sqrt(self.n)
+
+    def interval(self, z: float = Z_95) -> Tuple[float, float]:
+        half = self.ci_halfwidth(z)
+        return self.mean - half, self.mean + half
+
+
+def wilson_interval(successes: int, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """Wilson score interval for a proportion; (0, 1) when n == 0."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+@dataclass
+class Estimate:
+    """Running estimate after one more run."""
+    completed: int
+    total: int
+    mean: float
+    ci: float                           # 95% CI half-width of the mean
+    rate: float                         # fraction of runs flagged
+    rate_ci: Tuple[float, float]        # 95% Wilson interval
+    converged: bool                     # target CI reached; no more runs follow
+
+
+class RunningEstimate:
+    """Mean of a per-run metric plus the rate of flagged runs, with early stop.
+
+    ``converged`` is set once at least ``min_runs`` (>= 2) runs are in, runs
+    remain, and the CI half-width of the mean is within ``target_ci``.
+    """
+
+    def __init__(self, total: int, target_ci: Optional[float] = None, min_runs: int = 10) -> None:
+        self.total = total
+        self.target_ci = target_ci
+        self.min_runs = max(2, min_runs)
+        self.stats = RunningStats()
+        self.flagged = 0
+
+    def add(self, value: float, flagged: bool) -> Estimate:
+        self.stats.add(value)
+        self.flagged += int(flagged)
+        n = self.stats.n
+        ci = self.stats.ci_halfwidth()
+        converged = (
+            self.target_ci is not None
+            and n >= self.min_runs
+            and n < self.total
+            and ci <= self.target_ci
+        )
+        return Estimate(
+            completed=n,
+            total=self.total,
+            mean=self.stats.mean,
+            ci=ci,
+            rate=self.flagged / n,
+            rate_ci=wilson_interval(self.flagged, n),
+            converged=converged,
+        )
@@ -0,0 +1,280 @@
+"""
+Crash-safe session checkpoints for fast resume.
+
+The engine writes its counters, RNG state and the strategy's internal
+attributes to a small memory-mapped file every ``every`` bets, updated in
+place. The file holds two slots that are written alternately; each carries a
+sequence number and a CRC, so a write torn by a crash leaves the previous
+slot intact and readers pick the newest valid one. Restarting reads a few KiB
+instead of scanning the bet database, and the strategy continues its
+progression instead of restarting at the base bet.
+
+Layout (little endian):
+    header  "DDCK" | version u16 | slot count u16 | slot size u32 | reserved u32
+    slot    seq u64 | payload length u32 | crc32 u32 | zlib(JSON) payload
+
+Usage:
+    from betbot_engine.session_checkpoint import SessionCheckpoint, load_checkpoint
+
+    with SessionCheckpoint("data/checkpoints/run.ckpt", every=10) as ckpt:
+        ckpt.maybe_write(bets_done, build_state)
+    state = load_checkpoint("data/checkpoints/run.ckpt")
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+CHECKPOINT_VERSION = 1
+DEFAULT_SLOT_SIZE = 32 * 1024
+
+_MAGIC = b"DDCK"
+_HEADER = struct.Struct("<4sHHII")
+_SLOT = struct.Struct("<QII")
+_SLOTS = 2
+
+# Stop reasons that leave a session worth continuing (None = crashed mid-run)
+RESUMABLE_STOP_REASONS = (None, "cancelled")
+
+
+class _Skip(Exception):
+    """Attribute value that cannot be checkpointed."""
+
+
+def _encode_value(value: Any, depth: int = 0) -> Any:
+    if depth > 8:
+        raise _Skip
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, deque):
+        return {"__deque__": [_encode_value(v, depth + 1) for v in value], "maxlen": value.maxlen}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode_value(v, depth + 1) for v in value]}
+    if isinstance(value, list):
+        return [_encode_value(v, depth + 1) for v in value]
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise _Skip
+        if any(k.startswith("__") and k.endswith("__") for k in value):
+            raise _Skip  # Would be read back as a tagged value
+        return {k: _encode_value(v, depth + 1) for k, v in value.items()}
+    raise _Skip
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode_value(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__decimal__" in value:
+        return Decimal(value["__decimal__"])
+    if "__deque__" in value:
+        return deque((_decode_value(v) for v in value["__deque__"]), maxlen=value.get("maxlen"))
+    if "__tuple__" in value:
+        return tuple(_decode_value(v) for v in value["__tuple__"])
+    return {k: _decode_value(v) for k, v in value.items()}
+
+
+def encode_values(values: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-safe form of ``values``; entries that cannot be encoded are dropped."""
+    encoded = {}
+    for name, value in values.items():
+        try:
+            encoded[name] = _encode_value(value)
+        except _Skip:
+            continue
+    return encoded
+
+
+def decode_values(encoded: Dict[str, Any]) -> Dict[str, Any]:
+    return {name: _decode_value(value) for name, value in encoded.items()}
+
+
+def capture_strategy(strategy: Any) -> Dict[str, Any]:
+    """
+    Encoded instance attributes of a strategy.
+
+    Only plain data (numbers, strings, Decimals and lists/tuples/deques/dicts
+    of them) is kept; the context, callables and helper objects are skipped.
+    """
+    values = {name: value for name, value in vars(strategy).items() if name != "ctx"}
+    return encode_values(values)
+
+
+def restore_strategy(strategy: Any, checkpoint: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Put checkpointed attributes back on a freshly started strategy.
+
+    ``baseline`` is ``capture_strategy`` of the fresh strategy (after
+    ``on_session_start``). An attribute is only restored when its fresh value
+    matches the value it started with in the checkpointed session, so changed
+    parameters (``--param base_bet=...``) and fresh balances win over the
+    checkpoint. Returns the names of the restored attributes.
+    """
+    saved = checkpoint.get("strategy_attrs") or {}
+    initial = checkpoint.get("strategy_initial") or {}
+    restored = []
+    for name, value in saved.items():
+        if baseline.get(name) != initial.get(name):
+            continue
+        try:
+            setattr(strategy, name, _decode_value(value))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        restored.append(name)
+    return restored
+
+
+def rng_state(rng: Any) -> List[Any]:
+    version, internal, gauss_next = rng.getstate()
+    return [version, list(internal), gauss_next]
+
+
+def set_rng_state(rng: Any, state: List[Any]) -> None:
+    version, internal, gauss_next = state
+    rng.setstate((version, tuple(internal), gauss_next))
+
+
+def _read_slots(data: bytes) -> Optional[Dict[str, Any]]:
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, slots, slot_size, _ = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != CHECKPOINT_VERSION:
+        return None
+    best_seq, best = -1, None
+    for i in range(slots):
+        offset = _HEADER.size + i * slot_size
+        if offset + _SLOT.size > len(data):
+            break
+        seq, length, crc = _SLOT.unpack_from(data, offset)
+        if seq == 0 or seq <= best_seq or length > slot_size - _SLOT.size:
+            continue
+        body = data[offset + _SLOT.size:offset + _SLOT.size + length]
+        if len(body) != length or zlib.crc32(struct.pack("<Q", seq) + body) != crc:
+            continue
+        try:
+            best = json.loads(zlib.decompress(body))
+        except (zlib.error, ValueError):
+            continue
+        best_seq = seq
+    if best is not None:
+        best["seq"] = best_seq
+    return best
+
+
+def load_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Newest valid checkpoint in ``path`` (None if missing or unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            return _read_slots(f.read())
+    except OSError:
+        return None
+
+
+def is_resumable(checkpoint: Optional[Dict[str, Any]]) -> bool:
+    return bool(checkpoint) and checkpoint.get("stop_reason") in RESUMABLE_STOP_REASONS
+
+
+class SessionCheckpoint:
+    """
+    In-place writer of a session checkpoint file.
+
+    Args:
+        path:      Checkpoint file (replaced by the first write)
+        every:     ``maybe_write`` writes every N bets
+        fsync:     msync after each write (survives power loss, not only
+                   process crashes; a process crash never loses mapped writes)
+        slot_size: Initial slot size; grows when a checkpoint does not fit
+    """
+
+    def __init__(self, path: str, every: int = 10, fsync: bool = False,
+                 slot_size: int = DEFAULT_SLOT_SIZE) -> None:
+        self.path = path
+        self.every = max(1, int(every))
+        self.fsync = fsync
+        self.writes = 0
+        self._seq = 0
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._slot_size = slot_size
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def _create(self, slot_size: int, body: bytes) -> None:
+        """Replace the file with a fresh one holding ``body`` in its first slot."""
+        size = _HEADER.size + _SLOTS * slot_size
+        offset = _HEADER.size + (self._seq % _SLOTS) * slot_size
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.truncate(size)
+            f.write(_HEADER.pack(_MAGIC, CHECKPOINT_VERSION, _SLOTS, slot_size, 0))
+            f.seek(offset)
+            f.write(self._slot_header(body) + body)
+            if self.fsync:
+                os.fsync(f.fileno())
+        # Until this rename the previous file (if any) stays valid
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._slot_size = slot_size
+
+    def _slot_header(self, body: bytes) -> bytes:
+        crc = zlib.crc32(struct.pack("<Q", self._seq) + body)
+        return _SLOT.pack(self._seq, len(body), crc)
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write(self, state: Dict[str, Any]) -> None:
+        """Store ``state`` in the older slot."""
+        body = zlib.compress(json.dumps({**state, "written_at": time.time()},
+                                        separators=(",", ":")).encode(), 1)
+        self._seq += 1
+        self.writes += 1
+        if self._map is None or len(body) > self._slot_size - _SLOT.size:
+            self._close_map()
+            slot_size = self._slot_size
+            while len(body) > slot_size - _SLOT.size:
+                slot_size *= 2
+            self._create(slot_size, body)
+            return
+        offset = _HEADER.size + (self._seq % _SLOTS) * self._slot_size
+        # Payload first, then the slot header that makes it valid
+        self._map[offset + _SLOT.size:offset + _SLOT.size + len(body)] = body
+        self._map[offset:offset + _SLOT.size] = self._slot_header(body)
+        if self.fsync:
+            self._map.flush()
+
+    def maybe_write(self, bets_done: int, build_state: Callable[[], Dict[str, Any]]) -> bool:
+        """Write ``build_state()`` when ``bets_done`` is a multiple of ``every``."""
+        if bets_done % self.every:
+            return False
+        self.write(build_state())
+        return True
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.flush()
+        self._close_map()
+
+    def __enter__(self) -> "SessionCheckpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
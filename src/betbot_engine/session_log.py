@@ -0,0 +1,354 @@
+"""
+Compact binary session logs.
+
+``EngineConfig(log_format="binary")`` replaces the JSONL session log with
+fixed-width 64-byte bet records (``BET_FIELDS``) in segment files, so a long
+session can be read back with a single ``numpy.frombuffer`` call instead of
+parsing one JSON document (with its nested ``api_raw``) per bet. Non-bet
+records (session start/end, summary, strategy logs) are rare and go to a
+small JSONL sidecar.
+
+Layout for a session log base ``bet_history/auto/<session>_<symbol>_<strategy>``:
+
+- ``<base>.0000.ddlog``, ``<base>.0001.ddlog``, ...  bet segments: magic,
+  JSON header, then packed records. Rotated by size and/or age; closed
+  segments are optionally gzip-compressed in the background
+  (``<base>.0000.ddlog.gz``).
+- ``<base>.events.jsonl``  everything that is not a bet.
+
+Amounts, profits and balances are stored as float64: precise enough for
+replay and analysis; BetDatabase keeps exact integer atomic units.
+
+Usage:
+    from betbot_engine.session_log import SessionLogWriter, read_session_log
+
+    with SessionLogWriter(base, rotate_bytes=64 << 20, compress=True) as log:
+        log(record)                      # engine sink records
+    cols = read_session_log(base)        # {"balance": ndarray, "win": ndarray, ...}
+"""
+
+from __future__ import annotations
+
+import glob
+import gzip
+import json
+import math
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+    HAS_NUMPY = False
+
+SEGMENT_SUFFIX = ".ddlog"
+EVENTS_SUFFIX = ".events.jsonl"
+
+# (name, struct code) of one bet record, little-endian, no padding (64 bytes)
+BET_FIELDS = (
+    ("time", "d"), ("amount", "d"), ("chance", "d"), ("profit", "d"),
+    ("payout", "d"), ("balance", "d"),
+    ("bet_number", "I"), ("loss_streak", "I"),
+    ("roll", "h"), ("range_low", "H"), ("range_high", "H"),
+    ("flags", "B"), ("game", "B"),
+)
+_RECORD = struct.Struct("<" + "".join(code for _, code in BET_FIELDS))
+RECORD_SIZE = _RECORD.size
+
+# Bits of the ``flags`` field, exposed as boolean columns by the reader
+FLAGS = ("win", "is_high", "is_in", "lottery", "simulated", "faucet")
+GAMES = ("dice", "range-dice")
+
+_NUMPY_TYPES = {"d": "<f8", "I": "<u4", "h": "<i2", "H": "<u2", "B": "u1"}
+
+_MAGIC = b"DDLG\x01"
+_SEGMENT_RE = re.compile(r"^(.*)\.(\d{4,})" + re.escape(SEGMENT_SUFFIX) + r"(\.gz)?$")
+
+
+def _num(value: Any) -> float:
+    if value in (None, ""):
+        return math.nan
+    return float(value)
+
+
+def encode_bet(rec: Dict[str, Any]) -> bytes:
+    """Pack an engine ``{"event": "bet", ...}`` sink record."""
+    bet = rec.get("bet") or {}
+    result = rec.get("result") or {}
+    lottery = rec.get("lottery") or {}
+    rng = result.get("range") or bet.get("range") or (0, 0)
+    number = result.get("number")
+    flags = 0
+    for bit, value in enumerate((
+        result.get("win"),
+        bet.get("is_high") if result.get("is_high") is None else result.get("is_high"),
+        bet.get("is_in") if result.get("is_in") is None else result.get("is_in"),
+        lottery.get("applied"),
+        result.get("simulated"),
+        bet.get("faucet"),
+    )):
+        if value:
+            flags |= 1 << bit
+    return _RECORD.pack(
+        float(rec.get("time") or result.get("timestamp") or 0.0),
+        _num(bet.get("amount")),
+        _num(result.get("chance") or bet.get("chance")),
+        _num(result.get("profit")),
+        _num(result.get("payout")),
+        _num(rec.get("balance", result.get("balance"))),
+        int(rec.get("bets_done") or 0),
+        int(rec.get("loss_streak") or 0),
+        -1 if number is None else int(number),
+        int(rng[0]),
+        int(rng[1]),
+        flags,
+        GAMES.index(bet["game"]) if bet.get("game") in GAMES else 0,
+    )
+
+
+class SessionLogWriter:
+    """
+    Engine log sink writing binary bet segments plus a JSONL event sidecar.
+
+    Durability: records are buffered in-process; ``fsync_every`` (records)
+    and ``fsync_interval`` (seconds) force them to disk. Either can be
+    0 / None to leave it to the OS; segments are always fsynced when closed.
+    """
+
+    def __init__(
+        self,
+        base: Union[str, Path],
+        header: Optional[Dict[str, Any]] = None,
+        fsync_every: int = 0,
+        fsync_interval: Optional[float] = None,
+        rotate_bytes: Optional[int] = None,
+        rotate_seconds: Optional[float] = None,
+        compress: bool = False,
+    ):
+        """
+        Args:
+            base: Path prefix of the segment and event files
+            header: JSON metadata written at the top of every segment
+            fsync_every: fsync after this many bet records (0 = never)
+            fsync_interval: fsync when this many seconds passed since the last
+            rotate_bytes: Start a new segment past this size
+            rotate_seconds: Start a new segment after this age
+            compress: gzip closed segments in the background
+        """
+        self.base = Path(base)
+        self.base.parent.mkdir(parents=True, exist_ok=True)
+        self.header = dict(header or {})
+        self.fsync_every = max(0, int(fsync_every))
+        self.fsync_interval = fsync_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compress = compress
+        self.segment = -1
+        self.records = 0
+        self._fh = None
+        self._events = None
+        self._compressors: List[threading.Thread] = []
+        self._open_segment()
+
+    # -- sink interface ---------------------------------------------------
+
+    def __call__(self, rec: Dict[str, Any]) -> None:
+        if rec.get("event") == "bet":
+            self.write_bet(rec)
+        else:
+            self.write_event(rec)
+
+    def write_bet(self, rec: Dict[str, Any]):
+        if self._should_rotate():
+            self._open_segment()
+        self._fh.write(encode_bet(rec))
+        self._size += RECORD_SIZE
+        self.records += 1
+        self._unsynced += 1
+        if (self.fsync_every and self._unsynced >= self.fsync_every) or (
+            self.fsync_interval is not None
+            and time.monotonic() - self._synced_at >= self.fsync_interval
+        ):
+            self._fsync()
+
+    def write_event(self, rec: Dict[str, Any]):
+        if self._events is None:
+            self._events = open(f"{self.base}{EVENTS_SUFFIX}", "a", encoding="utf-8")
+        self._events.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+        if rec.get("event") == "summary":
+            self._events.flush()
+
+    def close(self):
+        """Close (and compress) the current segment; wait for compression."""
+        self._close_segment()
+        if self._events is not None and not self._events.closed:
+            self._events.close()
+        for thread in self._compressors:
+            thread.join()
+        self._compressors.clear()
+
+    def __enter__(self) -> "SessionLogWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- segments ---------------------------------------------------------
+
+    def _should_rotate(self) -> bool:
+        if self.rotate_bytes and self._size >= self.rotate_bytes:
+            return True
+        return bool(self.rotate_seconds) and time.monotonic() - self._opened_at >= self.rotate_seconds
+
+    def _open_segment(self):
+        self._close_segment()
+        self.segment += 1
+        self.path = Path(f"{self.base}.{self.segment:04d}{SEGMENT_SUFFIX}")
+        header = json.dumps({
+            **self.header,
+            "segment": self.segment,
+            "record_size": RECORD_SIZE,
+            "fields": [name for name, _ in BET_FIELDS],
+        }).encode()
+        self._fh = open(self.path, "wb")
+        self._fh.write(_MAGIC + struct.pack("<I", len(header)) + header)
+        self._size = len(_MAGIC) + 4 + len(header)
+        self._opened_at = self._synced_at = time.monotonic()
+        self._unsynced = 0
+
+    def _close_segment(self):
+        if self._fh is None or self._fh.closed:
+            return
+        self._fsync()
+        self._fh.close()
+        if self.compress:
+            thread = threading.Thread(target=_gzip_file, args=(self.path,), daemon=True,
+                                      name="session-log-compress")
+            thread.start()
+            self._compressors.append(thread)
+
+    def _fsync(self):
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._synced_at = time.monotonic()
+        self._unsynced = 0
+
+
+def _gzip_file(path: Path):
+    target = Path(f"{path}.gz")
+    tmp = Path(f"{target}.tmp")
+    with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        while True:
+            block = src.read(1 << 20)
+            if not block:
+                break
+            dst.write(block)
+    os.replace(tmp, target)
+    os.remove(path)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def _base_of(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    match = _SEGMENT_RE.match(path.name)
+    if match:
+        return path.with_name(match.group(1))
+    if path.name.endswith(EVENTS_SUFFIX):
+        return path.with_name(path.name[: -len(EVENTS_SUFFIX)])
+    return path
+
+
+def segment_paths(path: Union[str, Path]) -> List[Path]:
+    """Segments of a log in order, given its base path or any of its files."""
+    base = _base_of(path)
+    found: Dict[int, Path] = {}
+    for candidate in base.parent.glob(f"{glob.escape(base.name)}.*{SEGMENT_SUFFIX}*"):
+        match = _SEGMENT_RE.match(candidate.name)
+        if not match or match.group(1) != base.name:
+            continue
+        index = int(match.group(2))
+        # A finished .gz wins over a segment that is still being compressed
+        if index not in found or candidate.name.endswith(".gz"):
+            found[index] = candidate
+    return [found[i] for i in sorted(found)]
+
+
+def _segment_records(path: Path) -> memoryview:
+    opener = gzip.open if path.name.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(_MAGIC):
+        raise ValueError(f"Not a binary session log: {path}")
+    (header_len,) = struct.unpack_from("<I", data, len(_MAGIC))
+    start = len(_MAGIC) + 4 + header_len
+    usable = (len(data) - start) // RECORD_SIZE * RECORD_SIZE  # drop a torn tail
+    return memoryview(data)[start:start + usable]
+
+
+def read_header(path: Union[str, Path]) -> Dict[str, Any]:
+    """JSON header of the first segment."""
+    first = segment_paths(path)[0]
+    opener = gzip.open if first.name.endswith(".gz") else open
+    with opener(first, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a binary session log: {first}")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(header_len))
+
+
+def iter_session_log(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield one dict per bet across all segments of a log."""
+    names = [name for name, _ in BET_FIELDS]
+    for segment in segment_paths(path):
+        for values in _RECORD.iter_unpack(_segment_records(segment)):
+            row = dict(zip(names, values))
+            flags = row.pop("flags")
+            for bit, flag in enumerate(FLAGS):
+                row[flag] = bool(flags >> bit & 1)
+            row["game"] = GAMES[row["game"]] if row["game"] < len(GAMES) else row["game"]
+            if row["roll"] < 0:
+                row["roll"] = None
+            yield row
+
+
+def read_session_log(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    All bets of a log as ``{column: values}``.
+
+    With NumPy every column is an array (one ``frombuffer`` per segment; the
+    ``flags`` bits become boolean columns, a missing roll is -1). Without
+    NumPy the columns are lists built from ``iter_session_log``.
+    """
+    if not HAS_NUMPY:
+        rows = list(iter_session_log(path))
+        columns = [name for name, _ in BET_FIELDS if name != "flags"] + list(FLAGS)
+        return {name: [row[name] for row in rows] for name in columns}
+
+    dtype = np.dtype([(name, _NUMPY_TYPES[code]) for name, code in BET_FIELDS])
+    parts = [np.frombuffer(_segment_records(p), dtype=dtype) for p in segment_paths(path)]
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+    out = {name: records[name].copy() for name, _ in BET_FIELDS if name != "flags"}
+    for bit, flag in enumerate(FLAGS):
+        out[flag] = (records["flags"] >> bit & 1).astype(bool)
+    return out
+
+
+def iter_events(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Non-bet records (session start/end, summary, strategy logs) of a log."""
+    events = Path(f"{_base_of(path)}{EVENTS_SUFFIX}")
+    if not events.exists():
+        return
+    with open(events, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,343 @@
+"""
+In-memory simulation kernel for dry-run sessions.
+
+Drives a registered strategy through the same bet preparation, dry-run dice
+model and stop rules as ``run_auto_bet(dry_run=True)``, but without the
+session JSONL log, BetDatabase, events, console output or sleeps. With the
+same ``EngineConfig.seed`` a kernel run consumes the RNG exactly like the
+engine, so per-run results match the full engine path.
+
+Usage:
+    from betbot_engine.sim_kernel import run_dry_session
+
+    run = run_dry_session("paroli", params, EngineConfig(symbol="BTC", seed=42),
+                          starting_balance=Decimal("10"))
+    print(run.stop_reason, run.ending_balance)
+
+Pass a ``VirtualClock`` to also project wall-clock throughput (latency,
+pacing, rate limits); the result lands in ``KernelRun.timing``. Pass
+``rolls`` to resolve bets against a recorded roll stream instead of the RNG
+(see ``replay``).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from betbot_strategies import get_strategy
+from betbot_strategies.base import BetResult, StrategyContext
+
+from .engine import (
+    EngineConfig,
+    _build_limits,
+    _decimal,
+    _init_lottery_state,
+    _prepare_bet_for_execution,
+    _resolve_recorded_bet,
+    _simulate_dry_run_bet,
+)
+from .running_stats import RunningStats
+from .virtual_clock import TimingReport, VirtualClock
+
+_SILENT: Callable[[Any], None] = lambda _: None
+
+# Strategies that are not self-contained and cannot run in the kernel:
+# balance-sweep-sniper polls live balances/CoinGecko prices, sleeps and calls
+# ctx.api.play_* itself; roll-hunt(-low) block on input() after a contest hit.
+NOT_SELF_CONTAINED = frozenset({
+    "balance-sweep-sniper",
+    "roll-hunt",
+    "roll-hunt-low",
+})
+
+
+class _KernelAPI:
+    """API stub exposing the starting balance to strategies that query it."""
+
+    def __init__(self, symbol: str, balance: Decimal):
+        self._symbol = symbol.upper()
+        self._balance = format(balance, "f")
+
+    def get_user_info(self) -> Dict[str, Any]:
+        return {
+            "username": "simulation_user",
+            "balances": [{"currency": self._symbol, "main": self._balance, "faucet": "0"}],
+        }
+
+
+@dataclass
+class KernelRun:
+    """Summary of one in-memory dry-run session."""
+    bets: int
+    wins: int
+    losses: int
+    starting_balance: float
+    ending_balance: float
+    min_balance: float
+    max_balance: float
+    total_wagered: float
+    max_bet_size: float
+    stop_reason: str
+    timing: Optional[TimingReport] = None
+    max_loss_streak: int = 0
+    max_drawdown: float = 0.0  # peak-to-trough as a fraction (0-1)
+
+    @property
+    def profit(self) -> float:
+        return self.ending_balance - self.starting_balance
+
+    @property
+    def roi(self) -> float:
+        if self.starting_balance <= 0:
+            return 0.0
+        return self.profit / self.starting_balance * 100
+
+
+class KernelSession:
+    """
+    One in-memory dry-run session, advanced a bet at a time.
+
+    ``run_dry_session`` drives a single session to its end; the counterfactual
+    evaluator advances many sessions in lockstep over one roll stream. Each
+    ``step`` places one bet and returns False once the session has stopped;
+    ``finish`` ends it (if still running) and returns the KernelRun.
+
+    Args as for :func:`run_dry_session`. ``track_returns`` also keeps the
+    per-bet return statistics (``returns``) for a Sharpe ratio, and
+    ``equity_every`` samples the balance every N bets into ``equity``.
+    Raises ValueError for strategies listed in NOT_SELF_CONTAINED.
+    """
+
+    def __init__(
+        self,
+        strategy_name: str,
+        params: Dict[str, Any],
+        config: EngineConfig,
+        starting_balance: Decimal,
+        min_bet: Decimal = Decimal("0.00000001"),
+        clock: Optional[VirtualClock] = None,
+        track_returns: bool = False,
+        equity_every: int = 0,
+    ):
+        if strategy_name in NOT_SELF_CONTAINED:
+            raise ValueError(f"Strategy {strategy_name} is not self-contained and cannot run in the simulation kernel")
+        self.starting_balance = starting_balance = _decimal(str(starting_balance))
+        self.config = config
+        self.limits = limits = _build_limits(config)
+        self.rng = rng = random.Random(config.seed or int(time.time() * 1000) & 0xFFFFFFFF)
+        self._lottery_min_gap, self._lottery_max_gap, self._lottery_countdown = _init_lottery_state(config, rng)
+        self.min_bet = min_bet
+        self.clock = clock
+
+        self.ctx = StrategyContext(
+            api=_KernelAPI(config.symbol, starting_balance),  # type: ignore[arg-type]
+            symbol=config.symbol,
+            faucet=config.faucet,
+            dry_run=True,
+            rng=rng,
+            logger=_SILENT,
+            limits=limits,
+            delay_ms=config.delay_ms,
+            jitter_ms=config.jitter_ms,
+            starting_balance=format(starting_balance, 'f'),
+            printer=_SILENT,
+        )
+        self.strategy = get_strategy(strategy_name)(params, self.ctx)  # type: ignore[call-arg]
+
+        self.bets = self.wins = self.losses = self.losses_in_row = 0
+        self.balance = starting_balance
+        self.min_balance = self.max_balance = float(starting_balance)
+        self.total_wagered = Decimal(0)
+        self.max_bet_size = 0.0
+        self.max_loss_streak = 0
+        self._peak = float(starting_balance)
+        self.max_drawdown = 0.0
+        self._jitter_sec = max(0, config.jitter_ms) / 1000.0
+        self._delay_sec = max(0, config.delay_ms) / 1000.0
+        self._stop_loss = Decimal(str(limits.stop_loss))
+        self._take_profit = Decimal(str(limits.take_profit)) if limits.take_profit is not None else None
+        self._amounts: List[float] = []
+        self._pauses: List[float] = []
+        self.returns = RunningStats() if track_returns else None
+        self.equity_every = equity_every
+        self.equity: List[float] = [float(starting_balance)] if equity_every else []
+        self.stop_reason: Optional[str] = None
+
+        self.strategy.on_session_start()
+
+    def _stop(self, reason: str) -> bool:
+        self.stop_reason = reason
+        self.strategy.on_session_end(reason)
+        return False
+
+    def step(self, number: Optional[int] = None) -> bool:
+        """
+        Place one bet; ``number`` is the recorded roll to resolve it against
+        (None = dry-run RNG). Returns False once the session has stopped.
+        """
+        if self.stop_reason is not None:
+            return False
+        limits = self.limits
+        if limits.max_bets is not None and self.bets >= limits.max_bets:
+            return self._stop("max_bets")
+        bet = self.strategy.next_bet()
+        if bet is None:
+            return self._stop("strategy_stopped")
+
+        prepared_bet, stop_reason, _, _, self._lottery_countdown, _ = _prepare_bet_for_execution(
+            bet,
+            ctx=self.ctx,
+            limits=limits,
+            config=self.config,
+            rng=self.rng,
+            lottery_countdown=self._lottery_countdown,
+            lottery_min_gap=self._lottery_min_gap,
+            lottery_max_gap=self._lottery_max_gap,
+            current_balance=self.balance,
+            discovered_api_min_bet=self.min_bet,
+            bet_offset_fn=None,
+            print_line=_SILENT,
+        )
+        if prepared_bet is None:
+            return self._stop(stop_reason or "insufficient_balance")
+
+        bet = prepared_bet
+        amount_dec = _decimal(bet["amount"])
+        if number is not None:
+            win, profit, number, payout, chance = _resolve_recorded_bet(bet, amount_dec, number)
+        else:
+            win, profit, number, payout, chance = _simulate_dry_run_bet(bet, amount_dec, self.rng)
+        previous = self.balance
+        self.balance += profit
+        is_range = bet.get("game") == "range-dice"
+
+        result: BetResult = {
+            "win": win,
+            "profit": format(profit, 'f'),
+            "balance": format(self.balance, 'f'),
+            "number": number,
+            "payout": payout,
+            "chance": chance or "",
+            "is_high": None if is_range else bet.get("is_high"),
+            "range": bet.get("range") if is_range else None,  # type: ignore[typeddict-item]
+            "is_in": bet.get("is_in") if is_range else None,
+            "api_raw": {"simulated": True},
+            "simulated": True,
+            "timestamp": time.time(),
+        }
+
+        if win:
+            self.losses_in_row = 0
+            self.wins += 1
+        else:
+            self.losses_in_row += 1
+            self.losses += 1
+            if self.losses_in_row > self.max_loss_streak:
+                self.max_loss_streak = self.losses_in_row
+
+        amount_f = float(amount_dec)
+        if self.clock is not None:
+            self._amounts.append(amount_f)
+        self.total_wagered += amount_dec
+        if amount_f > self.max_bet_size:
+            self.max_bet_size = amount_f
+        bal_f = float(self.balance)
+        if bal_f < self.min_balance:
+            self.min_balance = bal_f
+        if bal_f > self.max_balance:
+            self.max_balance = bal_f
+        if bal_f > self._peak:
+            self._peak = bal_f
+        elif self._peak > 0 and (self._peak - bal_f) / self._peak > self.max_drawdown:
+            self.max_drawdown = (self._peak - bal_f) / self._peak
+        if self.returns is not None and previous > 0:
+            self.returns.add(float(profit / previous))
+
+        self.ctx.recent_results.append(result)
+        self.strategy.on_bet_result(result)
+        self.bets += 1
+        if self.equity_every and self.bets % self.equity_every == 0:
+            self.equity.append(bal_f)
+
+        if limits.max_losses is not None and self.losses_in_row >= limits.max_losses:
+            return self._stop("max_losses")
+        if self.starting_balance > 0:
+            change_ratio = (self.balance - self.starting_balance) / self.starting_balance
+            if change_ratio <= self._stop_loss:
+                return self._stop("stop_loss")
+            if self._take_profit is not None and change_ratio >= self._take_profit:
+                return self._stop("take_profit")
+
+        # Same RNG draw as ctx.sleep_with_jitter(), minus the sleep
+        jitter = self.rng.uniform(0, self._jitter_sec)
+        if self.clock is not None:
+            self._pauses.append(self._delay_sec + jitter)
+        return True
+
+    def finish(self, reason: str = "completed") -> KernelRun:
+        """End the session (``reason`` if it is still running) and summarise it."""
+        if self.stop_reason is None:
+            if self.limits.max_bets is not None and self.bets >= self.limits.max_bets:
+                reason = "max_bets"
+            self._stop(reason)
+        if self.equity_every and self.equity[-1:] != [float(self.balance)]:
+            self.equity.append(float(self.balance))
+        return KernelRun(
+            bets=self.bets,
+            wins=self.wins,
+            losses=self.losses,
+            starting_balance=float(self.starting_balance),
+            ending_balance=float(self.balance),
+            min_balance=self.min_balance,
+            max_balance=self.max_balance,
+            total_wagered=float(self.total_wagered),
+            max_bet_size=self.max_bet_size,
+            stop_reason=self.stop_reason,
+            timing=self.clock.run(self._amounts, self._pauses) if self.clock is not None else None,
+            max_loss_streak=self.max_loss_streak,
+            max_drawdown=self.max_drawdown,
+        )
+
+
+def run_dry_session(
+    strategy_name: str,
+    params: Dict[str, Any],
+    config: EngineConfig,
+    starting_balance: Decimal,
+    min_bet: Decimal = Decimal("0.00000001"),
+    clock: Optional[VirtualClock] = None,
+    rolls: Optional[Sequence[int]] = None,
+) -> KernelRun:
+    """
+    Run one dry-run session entirely in memory.
+
+    Args:
+        strategy_name:    Registered strategy name
+        params:           Strategy params
+        config:           Engine config (seed, limits, lottery, jitter)
+        starting_balance: Balance the session starts from
+        min_bet:          Minimum bet floor (run_auto_bet reads it from the cache)
+        clock:            Optional VirtualClock to project wall-clock throughput
+        rolls:            Recorded rolls (0..9999) to resolve bets against, in
+                          order; the session stops with ``rolls_exhausted``
+                          when they run out
+
+    Returns:
+        KernelRun with per-session metrics.
+
+    ``max_duration_sec`` is ignored: kernel sessions take no wall-clock time.
+    Raises ValueError for strategies listed in NOT_SELF_CONTAINED.
+    """
+    session = KernelSession(strategy_name, params, config, starting_balance, min_bet, clock)
+    if rolls is None:
+        while session.step():
+            pass
+        return session.finish()
+    for number in rolls:
+        if not session.step(number):
+            break
+    return session.finish("rolls_exhausted")
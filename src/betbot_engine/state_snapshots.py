@@ -0,0 +1,112 @@
+"""
+Strategy-state snapshot policy for bet logging.
+
+``strategy.get_state()`` can be costly (some strategies run their detectors
+to build it) and its JSON is the largest part of a logged bet. Instead of
+storing it with every bet, ``StateSnapshotter`` stores a full snapshot every
+``every`` bets or ``interval_sec`` seconds and, in between, nothing or, with
+``deltas=True``, only the top-level keys that changed since the previous
+stored state:
+
+    {"snapshot": "full", "state": {...}}
+    {"snapshot": "delta", "base": 1200, "set": {"losing_streak": 3}, "unset": []}
+
+Without deltas ``get_state()`` is not called at all between snapshots.
+Rows logged before this policy hold the bare state dict; readers treat those
+as full snapshots. ``reconstruct_state`` folds the nearest full snapshot and
+the deltas after it back into the latest state (used on resume).
+"""
+
+import copy
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+FULL, DELTA = "full", "delta"
+
+
+def is_full(record: Any) -> bool:
+    """True for full snapshots, including bare (pre-policy) state dicts."""
+    if not isinstance(record, dict):
+        return False
+    return record.get("snapshot") == FULL or record.get("snapshot") not in (FULL, DELTA)
+
+
+def reconstruct_state(records: Iterable[Any]) -> Optional[Dict[str, Any]]:
+    """
+    State after the last record, from stored records in bet order.
+
+    Deltas before the first full snapshot cannot be applied and are skipped;
+    None when no full snapshot is found.
+    """
+    state: Optional[Dict[str, Any]] = None
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        if is_full(record):
+            body = record["state"] if record.get("snapshot") == FULL else record
+            state = dict(body) if isinstance(body, dict) else body
+        elif state is not None and isinstance(state, dict):
+            for key in record.get("unset", ()):
+                state.pop(key, None)
+            state.update(record.get("set", {}))
+    return state
+
+
+class StateSnapshotter:
+    """
+    Decides what to store for the strategy state of each bet.
+
+    Args:
+        every: Full snapshot every N bets (1 = every bet, the old behaviour)
+        interval_sec: Also take a full snapshot when this much time has passed
+        deltas: Store changed top-level keys between full snapshots
+    """
+
+    def __init__(
+        self,
+        every: int = 100,
+        interval_sec: Optional[float] = 60.0,
+        deltas: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.every = max(1, int(every))
+        self.interval_sec = interval_sec
+        self.deltas = deltas
+        self._clock = clock
+        self._current: Optional[Dict[str, Any]] = None
+        self._full_bet: Optional[int] = None
+        self._full_at = 0.0
+        self.stats = {"full": 0, "delta": 0, "skipped": 0}
+
+    def _full_due(self, bet_number: int) -> bool:
+        if self._full_bet is None:
+            return True
+        if bet_number - self._full_bet >= self.every:
+            return True
+        return bool(self.interval_sec) and self._clock() - self._full_at >= self.interval_sec
+
+    def record(self, get_state: Callable[[], Any], bet_number: int) -> Optional[Dict[str, Any]]:
+        """Record to store with bet ``bet_number`` (None = store nothing)."""
+        full = self._full_due(bet_number)
+        if not full and not self.deltas:
+            self.stats["skipped"] += 1
+            return None
+        state = get_state()
+        if full or not isinstance(state, dict) or not isinstance(self._current, dict):
+            snapshot = copy.deepcopy(state)
+            self._current = dict(snapshot) if isinstance(snapshot, dict) else None
+            self._full_bet, self._full_at = bet_number, self._clock()
+            self.stats["full"] += 1
+            return {"snapshot": FULL, "state": snapshot}
+
+        changed = {k: copy.deepcopy(v) for k, v in state.items()
+                   if k not in self._current or self._current[k] != v}
+        removed = [k for k in self._current if k not in state]
+        if not changed and not removed:
+            self.stats["skipped"] += 1
+            return None
+        for key in removed:
+            del self._current[key]
+        self._current.update(changed)
+        self.stats["delta"] += 1
+        return {"snapshot": DELTA, "base": self._full_bet, "set": changed, "unset": removed}
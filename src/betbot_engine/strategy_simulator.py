@@ -4,6 +4,10 @@ Strategy simulator: runs any registered strategy in pure-Python simulation mode.
 
 No API calls, no sleeps, no UI. Suitable for Monte Carlo batch runs across all
 strategies to produce comparative performance data.
+
+``iter_strategy_runs`` streams each run with a running ROI estimate and 95%
+confidence interval, and can stop once the estimate is tight enough;
+``simulate_strategy`` aggregates the same stream.
 """
 
 import math
@@ -12,10 +16,13 @@ import statistics
 from collections import deque
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
 
 from betbot_strategies.base import BetResult, BetSpec, SessionLimits, StrategyContext
 
+from .running_stats import RunningEstimate
+from .sweep_checkpoint import SweepCheckpoint
+
 
 # ── Result types ──────────────────────────────────────────────────────────────
 
@@ -152,6 +159,20 @@ class StrategySimResult:
         return statistics.mean(self.max_loss_streak_values) if self.max_loss_streak_values else 0.0
 
 
+@dataclass
+class RunProgress:
+    """One completed run plus running estimates over all runs so far."""
+    index: int
+    run: RunResult
+    completed: int
+    total: int
+    roi_mean: float
+    roi_ci: float                       # 95% CI half-width (percentage points)
+    ruin_rate: float                    # fraction of runs that lost 80%+
+    ruin_ci: Tuple[float, float]        # 95% Wilson interval
+    converged: bool = False             # target CI reached; no more runs follow
+
+
 # ── Simulator core ────────────────────────────────────────────────────────────
 
 _SILENT: Callable[[Any], None] = lambda _: None
@@ -304,6 +325,79 @@ def run_single(
     )
 
 
+def _failed_run(starting_balance: float) -> RunResult:
+    """Strategy crashed — treat as a total loss run."""
+    return RunResult(
+        bets=0, wins=0, losses=0,
+        starting_balance=starting_balance, final_balance=0.0,
+        min_balance=0.0, max_balance=starting_balance,
+        total_wagered=0.0,
+        equity_curve=[starting_balance, 0.0],
+        max_win_streak=0, max_loss_streak=0,
+    )
+
+
+def iter_strategy_runs(
+    strategy_cls: Type,
+    params: Dict[str, Any],
+    n_bets: int = 500,
+    n_runs: int = 30,
+    starting_balance: float = 100.0,
+    base_seed: int = 42,
+    target_ci: Optional[float] = None,
+    min_runs: int = 10,
+    checkpoint: Optional[SweepCheckpoint] = None,
+) -> Iterator[RunProgress]:
+    """
+    Yield each Monte Carlo run as it finishes, with running estimates.
+
+    Args:
+        target_ci: Stop early once at least ``min_runs`` runs are done and the
+                   95% CI half-width of mean ROI is within this many
+                   percentage points (the last item has ``converged=True``)
+        min_runs:  Minimum runs before early stopping is considered
+        checkpoint: Record each finished run; runs already stored (when
+                   resuming) are loaded instead of re-simulated
+
+    Other args as for :func:`simulate_strategy`. Breaking out of the loop
+    stops the sweep after the current run.
+    """
+    estimate = RunningEstimate(n_runs, target_ci, min_runs)
+    ruin_threshold = starting_balance * 0.2
+    name = strategy_cls.name() if hasattr(strategy_cls, "name") else str(strategy_cls)
+
+    for i in range(n_runs):
+        key = run = None
+        if checkpoint is not None:
+            key = checkpoint.unit_key("strategy_run", strategy=name, params=params,
+                                      n_bets=n_bets, starting_balance=starting_balance,
+                                      seed=base_seed + i)
+            run = checkpoint.get(key, RunResult)
+        if run is None:
+            try:
+                run = run_single(strategy_cls, params, n_bets, starting_balance, base_seed + i)
+            except Exception:
+                run = _failed_run(starting_balance)
+            else:
+                if key is not None:
+                    checkpoint.put(key, run)
+
+        est = estimate.add(run.roi, run.final_balance <= ruin_threshold)
+        yield RunProgress(
+            index=i,
+            run=run,
+            completed=est.completed,
+            total=est.total,
+            roi_mean=est.mean,
+            roi_ci=est.ci,
+            ruin_rate=est.rate,
+            ruin_ci=est.rate_ci,
+            converged=est.converged,
+        )
+        if est.converged:
+            return
+
+
 def simulate_strategy(
     strategy_cls: Type,
     params: Dict[str, Any],
@@ -312,6 +406,10 @@ def simulate_strategy(
     starting_balance: float = 100.0,
     base_seed: int = 42,
     progress_cb: Optional[Callable[[int, int], None]] = None,
+    target_ci: Optional[float] = None,
+    min_runs: int = 10,
+    on_run: Optional[Callable[[RunProgress], None]] = None,
+    checkpoint: Optional[SweepCheckpoint] = None,
 ) -> StrategySimResult:
     """
     Run Monte Carlo simulation for one strategy.
@@ -324,9 +422,14 @@ def simulate_strategy(
         starting_balance: Starting balance in USD
         base_seed:       Base random seed (each run uses base_seed + run_index)
         progress_cb:     Optional callback(run_index, total_runs)
+        target_ci:       Optional ROI CI half-width (pct points) to stop early at
+        min_runs:        Minimum runs before stopping early
+        on_run:          Optional callback(RunProgress) after each run
+        checkpoint:      Optional SweepCheckpoint to record / resume runs
 
     Returns:
-        StrategySimResult with aggregated statistics
+        StrategySimResult with aggregated statistics (``n_runs`` is the
+        number of runs actually completed)
     """
     roi_vals: List[float] = []
     final_bals: List[float] = []
@@ -336,22 +439,13 @@ def simulate_strategy(
     loss_streaks: List[int] = []
     all_curves: List[List[float]] = []
 
-    for i in range(n_runs):
-        if progress_cb:
-            progress_cb(i, n_runs)
-        try:
-            run = run_single(strategy_cls, params, n_bets, starting_balance, base_seed + i)
-        except Exception:
-            # Strategy crashed — treat as a total loss run
-            run = RunResult(
-                bets=0, wins=0, losses=0,
-                starting_balance=starting_balance, final_balance=0.0,
-                min_balance=0.0, max_balance=starting_balance,
-                total_wagered=0.0,
-                equity_curve=[starting_balance, 0.0],
-                max_win_streak=0, max_loss_streak=0,
-            )
-
+    if progress_cb:
+        progress_cb(0, n_runs)
+    runs = iter_strategy_runs(strategy_cls, params, n_bets, n_runs, starting_balance,
+                              base_seed, target_ci=target_ci, min_runs=min_runs,
+                              checkpoint=checkpoint)
+    for progress in runs:
+        run = progress.run
         roi_vals.append(run.roi)
         final_bals.append(run.final_balance)
         win_rates.append(run.win_rate)
@@ -359,23 +453,18 @@ def simulate_strategy(
         sharpes.append(run.sharpe_ratio)
         loss_streaks.append(run.max_loss_streak)
         all_curves.append(_downsample(run.equity_curve, 200))
+        if on_run:
+            on_run(progress)
+        if progress_cb and progress.completed < n_runs and not progress.converged:
+            progress_cb(progress.completed, n_runs)
 
-    # Build equity band (p10 / mean / p90) per time step
-    band_len = max(len(c) for c in all_curves) if all_curves else 0
-    # Pad short curves with their final value
-    padded = [c + [c[-1]] * (band_len - len(c)) if c else [starting_balance] * band_len
-              for c in all_curves]
-    band_p10 = band_mean = band_p90 = []
-    if padded and band_len:
-        band_p10 = [_percentile([run[t] for run in padded], 10) for t in range(band_len)]
-        band_mean = [statistics.mean([run[t] for run in padded]) for t in range(band_len)]
-        band_p90 = [_percentile([run[t] for run in padded], 90) for t in range(band_len)]
+    band_p10, band_mean, band_p90 = equity_bands(all_curves, starting_balance)
 
     name = strategy_cls.name() if hasattr(strategy_cls, "name") else str(strategy_cls)
 
     result = StrategySimResult(
         strategy_name=name,
-        n_runs=n_runs,
+        n_runs=len(roi_vals),
         bets_per_run=n_bets,
         starting_balance=starting_balance,
         roi_values=roi_vals,
@@ -392,6 +481,22 @@ def simulate_strategy(
     return result
 
 
+def equity_bands(
+    curves: List[List[float]], starting_balance: float,
+) -> Tuple[List[float], List[float], List[float]]:
+    """Per-step p10 / mean / p90 across equity curves (short curves padded with their last value)."""
+    band_len = max(len(c) for c in curves) if curves else 0
+    padded = [c + [c[-1]] * (band_len - len(c)) if c else [starting_balance] * band_len
+              for c in curves]
+    if not padded or not band_len:
+        return [], [], []
+    return (
+        [_percentile([run[t] for run in padded], 10) for t in range(band_len)],
+        [statistics.mean([run[t] for run in padded]) for t in range(band_len)],
+        [_percentile([run[t] for run in padded], 90) for t in range(band_len)],
+    )
+
+
 def _percentile(data: List[float], pct: int) -> float:
     if not data:
         return 0.0
@@ -0,0 +1,192 @@
+"""
+Durable checkpoints for long simulation sweeps.
+
+Every finished work unit (one strategy/params combination on one seed) is
+appended to a SQLite table keyed by a hash of everything that determines its
+result, so an interrupted ``optimize``/``evolve``/``simulate-all`` sweep can
+be re-run with ``resume=True`` and only the missing units are simulated.
+The CLI only records units when asked to (``--checkpoint`` / ``--resume``),
+since stored equity curves make the file grow with every sweep.
+Seeded runs are deterministic, so a stored unit is valid for any sweep that
+asks for the same key.
+
+Usage:
+    from betbot_engine.sweep_checkpoint import SweepCheckpoint
+
+    ckpt = SweepCheckpoint("data/checkpoints.db", resume=True)
+    key = ckpt.unit_key("multi_seed", strategy="paroli", params={}, seed=42)
+    result = ckpt.get(key, SingleSimResult)
+    if result is None:
+        result = run()
+        ckpt.put(key, result)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Optional, Type, TypeVar, get_args, get_origin, get_type_hints
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweep_units (
+    unit_key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    scalars TEXT NOT NULL,
+    arrays BLOB
+);
+CREATE TABLE IF NOT EXISTS sweep_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _is_number_list(value: Any) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(v, (int, float)) and not isinstance(v, bool) for v in value
+    )
+
+
+def _encode(result: Any) -> tuple:
+    """Split a result dataclass into JSON scalars and packed float arrays."""
+    scalars = {}
+    lengths = {}
+    packed = array("d")
+    for f in dataclasses.fields(result):
+        value = getattr(result, f.name)
+        if _is_number_list(value):
+            lengths[f.name] = len(value)
+            packed.extend(float(v) for v in value)
+        else:
+            scalars[f.name] = value
+    header = json.dumps({"scalars": scalars, "arrays": lengths}, default=str)
+    return header, zlib.compress(packed.tobytes())
+
+
+def _int_list_fields(cls: type) -> set:
+    """Names of ``List[int]`` fields, which are stored as floats in the blob."""
+    return {
+        name for name, hint in get_type_hints(cls).items()
+        if get_origin(hint) is list and get_args(hint) == (int,)
+    }
+
+
+def _decode(cls: Type[T], header: str, blob: Optional[bytes]) -> T:
+    data = json.loads(header)
+    fields = dict(data["scalars"])
+    packed = array("d")
+    if blob:
+        packed.frombytes(zlib.decompress(blob))
+    offset = 0
+    int_lists = _int_list_fields(cls)
+    for name, length in data["arrays"].items():
+        values = packed[offset:offset + length].tolist()
+        offset += length
+        fields[name] = [int(v) for v in values] if name in int_lists else values
+    return cls(**fields)
+
+
+class SweepCheckpoint:
+    """Append-only store of completed sweep units (thread-safe)."""
+
+    def __init__(self, path: str, resume: bool = False) -> None:
+        """
+        Args:
+            path:   SQLite file (created if missing)
+            resume: Return stored units from ``get``; when False every unit
+                    is recomputed (and still recorded)
+        """
+        self.path = path
+        self.resume = resume
+        self.hits = 0
+        self.stored = 0
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def unit_key(kind: str, **parts: Any) -> str:
+        """Stable key for a work unit from everything that determines its result."""
+        canonical = json.dumps({"kind": kind, **parts}, sort_keys=True, default=str)
+        return f"{kind}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+    def get(self, key: str, cls: Type[T]) -> Optional[T]:
+        """Stored result for ``key`` (None if missing or not resuming)."""
+        if not self.resume:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT scalars, arrays FROM sweep_units WHERE unit_key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            result = _decode(cls, row[0], row[1])
+        except (TypeError, ValueError, zlib.error):
+            return None  # Stale schema: recompute
+        self.hits += 1
+        return result
+
+    def put(self, key: str, result: Any) -> None:
+        """Durably record a finished unit (first write wins)."""
+        header, blob = _encode(result)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO sweep_units (unit_key, kind, created_at, scalars, arrays) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, key.split(":", 1)[0], time.time(), header, blob),
+            )
+            self._conn.commit()
+        self.stored += 1
+
+    def meta(self, key: str, default: Any) -> Any:
+        """Sweep-level value: the stored one when resuming, else ``default`` (then stored)."""
+        with self._lock:
+            if self.resume:
+                row = self._conn.execute(
+                    "SELECT value FROM sweep_meta WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    return json.loads(row[0])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sweep_meta (key, value) VALUES (?, ?)",
+                (key, json.dumps(default)),
+            )
+            self._conn.commit()
+        return default
+
+    def count(self, kind: Optional[str] = None) -> int:
+        with self._lock:
+            if kind is None:
+                row = self._conn.execute("SELECT COUNT(*) FROM sweep_units").fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT COUNT(*) FROM sweep_units WHERE kind = ?", (kind,)
+                ).fetchone()
+        return int(row[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SweepCheckpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
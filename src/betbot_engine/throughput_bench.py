@@ -0,0 +1,355 @@
+"""
+End-to-end throughput benchmarks for the hot paths.
+
+``run_suite`` measures, in one JSON document with machine info:
+
+    strategies  decision cost of every registered strategy: the time spent in
+                ``next_bet`` + ``on_bet_result`` per bet, on the simulation kernel
+    engine      ``run_auto_bet`` dry-run bets/sec with the bet database off
+                and on (the JSONL session log is always written)
+    client      DuckDiceAPI requests/sec and latency against a local stand-in
+                server, at several concurrency levels (threads sharing one client)
+    simulator   Monte Carlo ``simulate_strategy`` runs/sec
+
+Compare two runs with ``db_bench.compare_results`` (throughputs are
+``*_per_sec``, latencies ``*_ms``), or from the command line:
+
+    python -m betbot_engine.throughput_bench --output bench.json
+    python -m betbot_engine.throughput_bench --baseline bench.json  # exit 1 on regressions
+
+``StandInServer`` is the stand-in: a threaded HTTP server on 127.0.0.1 that
+answers ``bot/user-info`` and dice / range-dice bets like the real API.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from betbot_strategies import get_strategy, list_strategies
+from duckdice_api.api import DuckDiceAPI, DuckDiceConfig
+
+from .db_bench import _metadata, compare_results, percentiles
+from .engine import run_auto_bet
+from .replay import replay_config
+from .sim_kernel import NOT_SELF_CONTAINED, KernelSession
+from .strategy_simulator import simulate_strategy
+
+SECTIONS = ("strategies", "engine", "client", "simulator")
+DEFAULT_CONCURRENCY = (1, 4, 16)
+# Need a user script or live state, so they cannot be benchmarked unattended
+SKIP_STRATEGIES = frozenset({"custom-script"}) | NOT_SELF_CONTAINED
+ENGINE_STRATEGY = "unified-martingale"
+
+
+def _timed(fn: Callable, spent: List[float]) -> Callable:
+    def call(*args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            spent[0] += time.perf_counter() - started
+    return call
+
+
+def strategy_names() -> List[str]:
+    """Registered strategies that can run unattended on the simulation kernel."""
+    names = [s["name"] if isinstance(s, dict) else s for s in list_strategies()]
+    return [name for name in names if name not in SKIP_STRATEGIES]
+
+
+def bench_strategy(name: str, bets: int = 2_000, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Decision cost of one strategy over ``bets`` kernel bets.
+
+    Only ``next_bet`` and ``on_bet_result`` are timed; sessions that stop
+    early (stop loss, strategy stop) are restarted with the next seed.
+    """
+    spent = [0.0]
+    decisions = 0
+    seed = 42
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        while decisions < bets:
+            session = KernelSession(name, dict(params or {}), replay_config(seed=seed, max_bets=bets - decisions),
+                                    Decimal("100"))
+            strategy = session.strategy
+            strategy.next_bet = _timed(strategy.next_bet, spent)
+            strategy.on_bet_result = _timed(strategy.on_bet_result, spent)
+            while session.step():
+                pass
+            if session.bets == 0:
+                break
+            decisions += session.bets
+            seed += 1
+    if not decisions:
+        raise ValueError(f"{name} placed no bets")
+    return {
+        "decisions": decisions,
+        "decision_us": spent[0] / decisions * 1e6,
+        "decisions_per_sec": decisions / spent[0] if spent[0] > 0 else 0.0,
+    }
+
+
+def bench_strategies(names: Optional[Sequence[str]] = None, bets: int = 2_000,
+                     progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """``bench_strategy`` for each of ``names`` (default: all); failures are reported, not raised."""
+    results: Dict[str, Any] = {}
+    for name in names or strategy_names():
+        if progress:
+            progress(f"strategy {name}")
+        try:
+            results[name] = bench_strategy(name, bets)
+        except Exception as e:
+            results[name] = {"error": str(e)}
+    return results
+
+
+class _DummyAPI:
+    def get_user_info(self) -> Dict[str, Any]:
+        return {"balances": [{"currency": "BTC", "main": "100"}]}
+
+
+def bench_engine(bets: int = 2_000, strategy: str = ENGINE_STRATEGY,
+                 work_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """``run_auto_bet`` dry-run throughput with the bet database off and on."""
+    own_dir = work_dir is None
+    work_dir = Path(tempfile.mkdtemp(prefix="duckdice-bench-") if own_dir else work_dir)
+    results = {}
+    try:
+        for mode, db_log in (("db_off", False), ("db_on", True)):
+            run_dir = work_dir / f"engine-{mode}"
+            config = replay_config(max_bets=bets, db_log=db_log, log_dir=str(run_dir),
+                                   db_path=str(run_dir / "bets.db"))
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                started = time.perf_counter()
+                summary = run_auto_bet(_DummyAPI(), strategy, {}, config)  # type: ignore[arg-type]
+                seconds = time.perf_counter() - started
+            results[mode] = {"bets": summary["bets"], "seconds": round(seconds, 6),
+                             "bets_per_sec": summary["bets"] / seconds if seconds > 0 else 0.0}
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as against the real API
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def _reply(self, body: Dict[str, Any], status: int = 200) -> None:
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path.split("?")[0].endswith("/bot/user-info"):
+            self._reply({"username": "stand-in", "balances": [{"currency": "BTC", "main": "100", "faucet": "0"}]})
+        else:
+            self._reply({"error": "not found"}, 404)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        bet = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split("?")[0]
+        number = random.randrange(10000)
+        if path.endswith("/range-dice/play"):
+            low, high = bet.get("range") or (0, 0)
+            win = (low <= number <= high) == bool(bet.get("isIn"))
+            chance = Decimal(high - low + 1) / 100
+        elif path.endswith("/dice/play"):
+            chance = Decimal(str(bet.get("chance", "49.5")))
+            win = number >= 10000 - chance * 100 if bet.get("isHigh") else number < chance * 100
+        else:
+            self._reply({"error": "not found"}, 404)
+            return
+        amount = Decimal(str(bet.get("amount", "0")))
+        payout = (Decimal(99) / chance).quantize(Decimal("0.0001")) if chance else Decimal(0)
+        profit = amount * (payout - 1) if win else -amount
+        self._reply({"bet": {"result": bool(win), "number": number, "chance": str(chance),
+                             "payout": str(payout), "profit": str(profit)},
+                     "user": {"balance": "100"}})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StandInServer:
+    """Local HTTP stand-in for the DuckDice API (``with StandInServer() as server: server.url``)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = ThreadingHTTPServer((host, port), _StandInHandler)
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}/api"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def bench_client(requests_per_level: int = 500,
+                 concurrency: Iterable[int] = DEFAULT_CONCURRENCY) -> Dict[str, Any]:
+    """DuckDiceAPI bet throughput and latency against a StandInServer per concurrency level."""
+    levels = [max(1, int(c)) for c in concurrency]
+    results = {}
+    with StandInServer() as server:
+        for level in levels:
+            api = DuckDiceAPI(DuckDiceConfig(api_key="bench", base_url=server.url, fallback_domains=[],
+                                             pool_maxsize=max(level, 1)))
+            api.session.trust_env = False  # never route the local stand-in through an environment proxy
+            latencies: List[float] = []
+
+            def bet(_n: int) -> None:
+                started = time.perf_counter()
+                api.play_dice("BTC", "0.00000100", "49.50", True)
+                latencies.append(time.perf_counter() - started)
+
+            api.get_user_info()  # warm the connection pool
+            with ThreadPoolExecutor(max_workers=level) as pool:
+                started = time.perf_counter()
+                list(pool.map(bet, range(requests_per_level)))
+                seconds = time.perf_counter() - started
+            api.session.close()
+            results[f"concurrency={level}"] = {
+                "requests": len(latencies),
+                "seconds": round(seconds, 6),
+                "requests_per_sec": len(latencies) / seconds if seconds > 0 else 0.0,
+                **percentiles(latencies),
+            }
+    return results
+
+
+def bench_simulator(runs: int = 20, bets_per_run: int = 500, strategy: str = ENGINE_STRATEGY) -> Dict[str, Any]:
+    """Monte Carlo ``simulate_strategy`` throughput."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        result = simulate_strategy(get_strategy(strategy), {}, n_bets=bets_per_run, n_runs=runs)
+        seconds = time.perf_counter() - started
+    return {"strategy": strategy, "runs": result.n_runs, "bets_per_run": bets_per_run,
+            "seconds": round(seconds, 6),
+            "runs_per_sec": result.n_runs / seconds if seconds > 0 else 0.0,
+            "bets_per_sec": result.n_runs * bets_per_run / seconds if seconds > 0 else 0.0}
+
+
+def run_suite(
+    sections: Iterable[str] = SECTIONS,
+    strategies: Optional[Sequence[str]] = None,
+    strategy_bets: int = 2_000,
+    engine_bets: int = 2_000,
+    client_requests: int = 500,
+    concurrency: Iterable[int] = DEFAULT_CONCURRENCY,
+    sim_runs: int = 20,
+    sim_bets: int = 500,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the selected benchmark ``sections`` and return the results document.
+
+    Args:
+        sections:        Any of SECTIONS
+        strategies:      Strategies for the decision-cost section (default: all)
+        strategy_bets:   Timed decisions per strategy
+        engine_bets:     Bets per ``run_auto_bet`` session
+        client_requests: Bets per concurrency level
+        concurrency:     Client thread counts
+        sim_runs:        Monte Carlo runs (of ``sim_bets`` bets each)
+        progress:        Called with a line of text before each step
+    """
+    say = progress or (lambda _msg: None)
+    sections = list(sections)
+    unknown = set(sections) - set(SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark sections: {', '.join(sorted(unknown))}")
+    results: Dict[str, Any] = {"meta": _metadata()}
+    if "strategies" in sections:
+        results["strategies"] = bench_strategies(strategies, strategy_bets, progress=say)
+    if "engine" in sections:
+        say(f"run_auto_bet ({engine_bets:,} dry-run bets per mode)")
+        results["engine"] = bench_engine(engine_bets)
+    if "client" in sections:
+        say(f"client against the stand-in server ({client_requests:,} bets per level)")
+        results["client"] = bench_client(client_requests, concurrency)
+    if "simulator" in sections:
+        say(f"simulator ({sim_runs} runs x {sim_bets:,} bets)")
+        results["simulator"] = bench_simulator(sim_runs, sim_bets)
+    return results
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Human-readable summary of ``run_suite`` results."""
+    lines = []
+    if "strategies" in results:
+        lines.append("Strategy decision cost (next_bet + on_bet_result)")
+        ranked = sorted(results["strategies"].items(), key=lambda kv: kv[1].get("decision_us") or 0, reverse=True)
+        for name, r in ranked:
+            if "error" in r:
+                lines.append(f"  {name:<32} error: {r['error']}")
+            else:
+                lines.append(f"  {name:<32} {r['decision_us']:9.1f} µs  {r['decisions_per_sec']:>12,.0f}/s")
+    if "engine" in results:
+        lines.append("run_auto_bet (dry run)")
+        for mode, r in results["engine"].items():
+            lines.append(f"  {mode:<32} {r['bets_per_sec']:>12,.0f} bets/s")
+    if "client" in results:
+        lines.append("Client vs stand-in server")
+        for level, r in results["client"].items():
+            lines.append(f"  {level:<32} {r['requests_per_sec']:>12,.0f} req/s  "
+                         f"p50 {r['p50_ms']:.2f} ms  p99 {r['p99_ms']:.2f} ms")
+    if "simulator" in results:
+        r = results["simulator"]
+        lines.append(f"Simulator ({r['strategy']}, {r['bets_per_run']:,} bets/run)")
+        lines.append(f"  {'runs':<32} {r['runs_per_sec']:>12,.1f} runs/s  ({r['bets_per_sec']:,.0f} bets/s)")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end throughput benchmarks")
+    parser.add_argument("--sections", nargs="+", choices=SECTIONS, default=list(SECTIONS))
+    parser.add_argument("--strategies", nargs="+", default=None, help="Strategies to time (default: all)")
+    parser.add_argument("--strategy-bets", type=int, default=2_000, help="Timed decisions per strategy")
+    parser.add_argument("--engine-bets", type=int, default=2_000, help="Bets per run_auto_bet session")
+    parser.add_argument("--client-requests", type=int, default=500, help="Bets per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY))
+    parser.add_argument("--sim-runs", type=int, default=20, help="Monte Carlo runs")
+    parser.add_argument("--sim-bets", type=int, default=500, help="Bets per Monte Carlo run")
+    parser.add_argument("--output", default="-", help="Results JSON file (default: stdout)")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sections, args.strategies, args.strategy_bets, args.engine_bets,
+                        args.client_requests, args.concurrency, args.sim_runs, args.sim_bets,
+                        progress=lambda msg: print(f"… {msg}", file=sys.stderr))
+    text = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        Path(args.output).write_text(text + "\n")
+    if not args.baseline:
+        return 0
+    regressions = compare_results(json.loads(Path(args.baseline).read_text()), results, args.tolerance)
+    for r in regressions:
+        print(f"REGRESSION {r['metric']}: {r['baseline']} -> {r['current']} (x{r['ratio']})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
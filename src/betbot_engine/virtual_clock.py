@@ -0,0 +1,231 @@
+"""
+Discrete-event virtual clock for projecting betting throughput.
+
+Simulated sessions resolve bets instantly, which says nothing about how many
+bets (or how much wager) a session gets through per hour against the real
+API. ``VirtualClock`` replays a session's bets through an event queue that
+models request latency, client pacing (``delay_ms``/``jitter_ms``), a window
+of concurrent in-flight requests and a server-side rate limit with 429
+backoff. No real sleeps: the clock jumps from event to event.
+
+Usage:
+    from betbot_engine.virtual_clock import VirtualClock, LatencyModel, RateLimitModel
+
+    clock = VirtualClock(
+        latency=LatencyModel(rtt_ms=80, jitter_ms=20),
+        rate_limit=RateLimitModel(max_requests=30, window_sec=1.0),
+        concurrency=1,
+        seed=7,
+    )
+    report = clock.run(amounts=[0.1] * 1000, pauses=[0.0] * 1000)
+    print(report.bets_per_hour, report.wager_per_hour)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+# Event kinds, ordered so simultaneous events resolve deterministically
+_RESPONSE, _REJECTED, _ARRIVE, _SEND = 0, 1, 2, 3
+
+
+@dataclass
+class LatencyModel:
+    """Round-trip time of one API request (client → server → client)."""
+    rtt_ms: float = 80.0
+    jitter_ms: float = 0.0              # spread: std dev (normal/lognormal) or half-width (uniform)
+    distribution: str = "lognormal"
+
+    def __post_init__(self):
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution: {self.distribution}. "
+                f"Available: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one round-trip time in seconds."""
+        mean = max(0.0, self.rtt_ms)
+        spread = max(0.0, self.jitter_ms)
+        if spread == 0 or self.distribution == "fixed":
+            ms = mean
+        elif self.distribution == "uniform":
+            ms = rng.uniform(mean - spread, mean + spread)
+        elif self.distribution == "normal":
+            ms = rng.gauss(mean, spread)
+        else:
+            # Lognormal with the requested mean and std dev (long right tail)
+            if mean <= 0:
+                ms = 0.0
+            else:
+                sigma2 = math.log(1.0 + (spread / mean) ** 2)
+                ms = rng.lognormvariate(math.log(mean) - sigma2 / 2, math.sqrt(sigma2))
+        return max(0.0, ms) / 1000.0
+
+
+@dataclass
+class RateLimitModel:
+    """Server-side sliding-window limit; rejected requests get a 429."""
+    max_requests: Optional[int] = None  # per window; None = unlimited
+    window_sec: float = 1.0
+    backoff_ms: float = 1000.0          # first retry delay after a 429
+    backoff_factor: float = 2.0
+    max_backoff_ms: float = 30000.0
+    honor_retry_after: bool = False     # wait exactly until a slot frees instead of backing off
+
+    def backoff(self, attempt: int, retry_after: float) -> float:
+        """Seconds to wait before retry number ``attempt`` (1-based)."""
+        if self.honor_retry_after:
+            return max(0.0, retry_after)
+        delay_ms = self.backoff_ms * (self.backoff_factor ** (attempt - 1))
+        return min(delay_ms, self.max_backoff_ms) / 1000.0
+
+
+@dataclass
+class TimingReport:
+    """Projected wall-clock behaviour of one session."""
+    bets: int
+    total_wagered: float
+    elapsed_sec: float
+    requests: int                       # including rejected attempts
+    rate_limited: int                   # 429 responses
+    backoff_sec: float                  # total time spent waiting to retry
+    latencies_ms: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def bets_per_hour(self) -> float:
+        return self.bets / self.elapsed_sec * 3600 if self.elapsed_sec > 0 else 0.0
+
+    @property
+    def wager_per_hour(self) -> float:
+        return self.total_wagered / self.elapsed_sec * 3600 if self.elapsed_sec > 0 else 0.0
+
+    @property
+    def latency_mean_ms(self) -> float:
+        return sum(self.latencies_ms) / len(self.latencies_ms) if self.latencies_ms else 0.0
+
+    @property
+    def latency_p95_ms(self) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def summary(self) -> str:
+        return "\n".join([
+            f"Bets: {self.bets:,} in {self.elapsed_sec:,.1f}s (virtual)",
+            f"Bets/hour: {self.bets_per_hour:,.0f}",
+            f"Wager/hour: {self.wager_per_hour:,.8f}",
+            f"Requests: {self.requests:,} ({self.rate_limited:,} rate-limited, "
+            f"{self.backoff_sec:,.1f}s backing off)",
+            f"Latency: mean {self.latency_mean_ms:.1f}ms, p95 {self.latency_p95_ms:.1f}ms",
+        ])
+
+
+class VirtualClock:
+    """
+    Event-driven timing model for a sequence of bets.
+
+    ``concurrency`` request slots each loop: take the next bet, send it,
+    wait for the response (retrying on 429), then pause for that bet's
+    pacing delay. With one slot this is exactly run_auto_bet's
+    bet → response → sleep_with_jitter cycle.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyModel] = None,
+        rate_limit: Optional[RateLimitModel] = None,
+        concurrency: int = 1,
+        seed: Optional[int] = None,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        self.latency = latency or LatencyModel()
+        self.rate_limit = rate_limit or RateLimitModel()
+        self.concurrency = concurrency
+        self.seed = seed
+        self.now = 0.0
+
+    def run(self, amounts: Sequence[float], pauses: Sequence[float]) -> TimingReport:
+        """
+        Replay ``amounts`` (one per bet, in order) through the clock.
+
+        ``pauses[i]`` is the client-side sleep after bet ``i`` completes
+        (delay + jitter); missing entries count as zero.
+        """
+        rng = random.Random(self.seed)
+        limit = self.rate_limit
+        n = len(amounts)
+        self.now = 0.0
+
+        events: list = []
+        seq = 0
+        accepted: deque = deque()       # server-side arrival times inside the window
+        latencies: List[float] = []
+        requests = rate_limited = 0
+        backoff_total = 0.0
+        next_bet = 0
+        last_response = 0.0
+
+        def push(at: float, kind: int, bet: int, attempt: int, value: float = 0.0):
+            nonlocal seq
+            heapq.heappush(events, (at, kind, seq, bet, attempt, value))
+            seq += 1
+
+        for _ in range(min(self.concurrency, n)):
+            push(0.0, _SEND, next_bet, 1)
+            next_bet += 1
+
+        while events:
+            at, kind, _, bet, attempt, value = heapq.heappop(events)
+            self.now = at
+
+            if kind == _SEND:
+                requests += 1
+                rtt = self.latency.sample(rng)
+                push(at + rtt / 2, _ARRIVE, bet, attempt, rtt)
+
+            elif kind == _ARRIVE:
+                rtt = value
+                if limit.max_requests is not None:
+                    while accepted and accepted[0] <= at - limit.window_sec:
+                        accepted.popleft()
+                    if len(accepted) >= limit.max_requests:
+                        retry_after = accepted[0] + limit.window_sec - at
+                        push(at + rtt / 2, _REJECTED, bet, attempt, retry_after)
+                        continue
+                    accepted.append(at)
+                latencies.append(rtt * 1000.0)
+                push(at + rtt / 2, _RESPONSE, bet, attempt)
+
+            elif kind == _REJECTED:
+                # 429: back off, then resend the same bet
+                rate_limited += 1
+                wait = limit.backoff(attempt, value)
+                backoff_total += wait
+                push(at + wait, _SEND, bet, attempt + 1)
+
+            else:  # _RESPONSE
+                last_response = at
+                if next_bet < n:
+                    pause = pauses[bet] if bet < len(pauses) else 0.0
+                    push(at + max(0.0, pause), _SEND, next_bet, 1)
+                    next_bet += 1
+
+        return TimingReport(
+            bets=n,
+            total_wagered=float(sum(amounts)),
+            elapsed_sec=last_response,
+            requests=requests,
+            rate_limited=rate_limited,
+            backoff_sec=backoff_total,
+            latencies_ms=latencies,
+        )
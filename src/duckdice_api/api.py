@@ -23,6 +23,7 @@ class DuckDiceConfig:
     pool_maxsize: int = 20  # Max connections in pool
     max_retries: int = 3  # Retry failed requests
     fallback_domains: List[str] = None  # Alternative domains to try
+    transport: Optional[requests.adapters.BaseAdapter] = None  # Replaces the pooled HTTP adapter (e.g. a cassette)
     
     def __post_init__(self):
         """Initialize fallback domains if not provided."""
@@ -35,6 +36,16 @@ class DuckDiceConfig:
             ]
 
 
+def http_adapter(config: DuckDiceConfig) -> requests.adapters.HTTPAdapter:
+    """The pooled HTTP adapter DuckDiceAPI mounts by default."""
+    return requests.adapters.HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=config.max_retries,
+        pool_block=False  # Don't block when pool is full
+    )
+
+
 class DuckDiceAPI:
     def __init__(self, config: DuckDiceConfig):
         self.config = config
@@ -44,13 +55,8 @@ class DuckDiceAPI:
         # Create session with connection pooling for better performance
         self.session = requests.Session()
         
-        # Configure adapter with connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=config.pool_connections,
-            pool_maxsize=config.pool_maxsize,
-            max_retries=config.max_retries,
-            pool_block=False  # Don't block when pool is full
-        )
+        # Configure adapter with connection pooling (or the configured transport)
+        adapter = config.transport or http_adapter(config)
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
         
@@ -0,0 +1,257 @@
+"""
+Record/replay HTTP cassettes for DuckDiceAPI.
+
+A cassette is the request/response log of one real session: every request
+the client sent (method, path, JSON body) with the response it got (status,
+body) and how long the round trip took. ``RecordingAdapter`` writes it while
+a live session runs; ``ReplayAdapter`` serves it back in the same order, at
+the recorded pace, faster, or instantly. Both are ``requests`` transport
+adapters, mounted through ``DuckDiceConfig.transport``, so everything above
+the socket (the client, the engine, the strategy, logging) runs unchanged.
+
+The API key is never written: query strings are stored without it and
+request headers are not stored at all.
+
+File format: JSON lines, a header object followed by one object per request,
+appended as they happen (an interrupted recording stays readable).
+
+Usage:
+    from duckdice_api import DuckDiceAPI, DuckDiceConfig
+    from duckdice_api.cassette import RecordingAdapter, ReplayAdapter
+
+    recorder = RecordingAdapter("session.cassette", meta={"strategy": "paroli"})
+    api = DuckDiceAPI(DuckDiceConfig(api_key=key, transport=recorder))
+    ...
+    api = DuckDiceAPI(DuckDiceConfig(api_key="replay", transport=ReplayAdapter("session.cassette", speed=0)))
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+BET_PATHS = ("dice/play", "range-dice/play")
+_REDACTED_PARAMS = frozenset({"api_key"})
+_REDACT_RE = re.compile(r"\b(%s)=[^&\s'\"]*" % "|".join(sorted(_REDACTED_PARAMS)))
+
+
+class CassetteMismatch(requests.exceptions.RequestException):
+    """The client sent a request the cassette does not have next."""
+
+
+class CassetteExhausted(CassetteMismatch):
+    """Every recorded request has been replayed."""
+
+
+def _split_url(url: str) -> tuple:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in _REDACTED_PARAMS]
+    return parts.path, urlencode(query)
+
+
+def _redact(text: str) -> str:
+    """Blank redacted query parameters in free text (exception messages quote the URL)."""
+    return _REDACT_RE.sub(r"\1=REDACTED", text)
+
+
+def _json_body(body: Any) -> Any:
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    try:
+        return json.loads(body)
+    except ValueError:
+        return body
+
+
+@dataclass
+class Cassette:
+    """A loaded recording: header fields plus the ordered interactions."""
+    meta: Dict[str, Any] = field(default_factory=dict)
+    interactions: List[Dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        """Read a cassette file; a torn last line (interrupted recording) is dropped."""
+        meta: Dict[str, Any] = {}
+        interactions = []
+        with open(path, encoding="utf-8") as f:
+            for n, line in enumerate(f):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if n == 0 and "cassette" in record:
+                    meta = record
+                else:
+                    interactions.append(record)
+        if meta.get("cassette", CASSETTE_VERSION) > CASSETTE_VERSION:
+            raise ValueError(f"Cassette version {meta['cassette']} is newer than supported ({CASSETTE_VERSION})")
+        return cls(meta, interactions)
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"cassette": CASSETTE_VERSION, **self.meta}) + "\n")
+            for record in self.interactions:
+                f.write(json.dumps(record) + "\n")
+
+    @property
+    def bets(self) -> int:
+        """Recorded bet requests (dice and range dice)."""
+        return sum(1 for i in self.interactions if i["path"].endswith(BET_PATHS))
+
+    @property
+    def network_seconds(self) -> float:
+        """Total recorded round-trip time."""
+        return sum(i.get("elapsed", 0.0) for i in self.interactions)
+
+
+class RecordingAdapter(BaseAdapter):
+    """
+    Transport that forwards to ``inner`` (default: a plain HTTPAdapter) and
+    appends every request/response pair to the cassette at ``path``.
+
+    ``meta`` is stored in the header (strategy, params, symbol, ...), so a
+    benchmark can rerun the same session from the file alone.
+    """
+
+    def __init__(self, path: Union[str, Path], inner: Optional[BaseAdapter] = None,
+                 meta: Optional[Dict[str, Any]] = None):
+        super().__init__()
+        self.inner = inner or HTTPAdapter()
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._fh = open(self.path, "w", encoding="utf-8")
+        header = {"cassette": CASSETTE_VERSION,
+                  "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                  **(meta or {})}
+        self._fh.write(json.dumps(header, default=str) + "\n")
+        self._fh.flush()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        path, query = _split_url(request.url)
+        record: Dict[str, Any] = {"method": request.method, "path": path, "query": query,
+                                  "body": _json_body(request.body)}
+        started = time.perf_counter()
+        try:
+            response = self.inner.send(request, stream=stream, timeout=timeout, verify=verify,
+                                       cert=cert, proxies=proxies)
+        except requests.exceptions.RequestException as e:
+            record.update(error=type(e).__name__, message=_redact(str(e)))
+            self._append(record, started)
+            raise
+        record.update(status=response.status_code, reason=response.reason,
+                      content_type=response.headers.get("Content-Type"), response=response.text)
+        self._append(record, started)
+        return response
+
+    def _append(self, record: Dict[str, Any], started: float) -> None:
+        now = time.perf_counter()
+        record["elapsed"] = round(now - started, 6)
+        record["at"] = round(started - self._started, 6)
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.write(line)
+                self._fh.flush()
+                self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+        self.inner.close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport that answers requests from a cassette, in recorded order.
+
+    Args:
+        cassette:   A Cassette or the path of one
+        speed:      1.0 waits the recorded round-trip time, 10 ten times
+                    less, 0 not at all
+        match_body: Also require the JSON body to equal the recorded one
+                    (method and path always have to match)
+
+    ``waited`` accumulates the simulated network time, so callers can factor
+    it out. Raises CassetteMismatch / CassetteExhausted (RequestException
+    subclasses, so DuckDiceAPI does not try fallback domains on them).
+    """
+
+    def __init__(self, cassette: Union[Cassette, str, Path], speed: float = 1.0, match_body: bool = False):
+        super().__init__()
+        self.cassette = cassette if isinstance(cassette, Cassette) else Cassette.load(cassette)
+        self.speed = float(speed)
+        self.match_body = match_body
+        self.position = 0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return len(self.cassette.interactions) - self.position
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        path, _query = _split_url(request.url)
+        with self._lock:
+            if self.position >= len(self.cassette.interactions):
+                raise CassetteExhausted(
+                    f"Cassette exhausted after {self.position} requests ({request.method} {path})",
+                    request=request)
+            record = self.cassette.interactions[self.position]
+            expected = (record["method"], record["path"])
+            if (request.method, path) != expected or (
+                    self.match_body and _json_body(request.body) != record.get("body")):
+                raise CassetteMismatch(
+                    f"Request #{self.position + 1} is {request.method} {path}, "
+                    f"cassette has {expected[0]} {expected[1]}", request=request)
+            self.position += 1
+
+        self._wait(record.get("elapsed", 0.0))
+        if "error" in record:
+            error_cls = getattr(requests.exceptions, record["error"], requests.exceptions.ConnectionError)
+            raise error_cls(record.get("message", ""), request=request)
+        return self._build_response(request, record)
+
+    def _wait(self, elapsed: float) -> None:
+        if self.speed <= 0 or elapsed <= 0:
+            return
+        seconds = elapsed / self.speed
+        time.sleep(seconds)
+        with self._lock:
+            self.waited += seconds
+
+    @staticmethod
+    def _build_response(request, record: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = int(record.get("status", 200))
+        response.reason = record.get("reason") or ""
+        response.headers = CaseInsensitiveDict({"Content-Type": record.get("content_type") or "application/json"})
+        response._content = (record.get("response") or "").encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=record.get("elapsed", 0.0))
+        return response
+
+    def close(self) -> None:
+        pass
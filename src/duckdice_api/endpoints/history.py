@@ -3,21 +3,111 @@ Bet history endpoint and local tracking.
 
 Note: DuckDice API may not provide a dedicated bet history endpoint.
 This implementation uses local tracking and provides filtering/pagination.
+
+Each daily ``YYYY-MM-DD.jsonl`` file gets a sidecar ``YYYY-MM-DD.idx.json``
+index: byte offsets of fixed-size line blocks, their min/max timestamp, and
+bet/win counts per (currency, game type). Queries skip whole days and
+blocks from the index, count matches without parsing, and only parse the
+blocks that hold the requested page. Indexes are extended lazily when the
+day file has grown since they were written.
 """
 
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, List, Tuple
+from datetime import datetime, timedelta
 from decimal import Decimal
 import logging
 import json
+import os
 from pathlib import Path
 
 from ..models.bet import BetResult, BetHistoryPage, BetStatistics
-from ..utils.pagination import Paginator
-from ..utils.filters import FilterSet, DateRangeFilter, ValueFilter, BooleanFilter
+from ..utils.pagination import CursorPaginator, decode_cursor, encode_cursor
 
 logger = logging.getLogger(__name__)
 
+# Lines per index block (the unit that is skipped or parsed)
+INDEX_BLOCK_LINES = 512
+INDEX_SUFFIX = '.idx.json'
+INDEX_VERSION = 1
+
+# (day, byte offset just past a bet) - where a scan can resume
+HistoryPosition = Tuple[str, int]
+
+
+class _Query:
+    """Filters pushed down to day files, index blocks and raw lines."""
+
+    def __init__(
+        self,
+        days: Tuple[datetime, datetime],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        currency: Optional[str] = None,
+        game_type: Optional[str] = None,
+        wins_only: Optional[bool] = None,
+    ):
+        """
+        Args:
+            days: First and last day file to read
+            start_date / end_date: Exact timestamp bounds (inclusive), if any
+        """
+        self.days = days
+        self.start_date = start_date
+        self.end_date = end_date
+        self.currency = currency
+        self.game_type = game_type
+        self.wins_only = wins_only
+        # Cheap substring test before json.loads (json.dumps default separators)
+        self.needle = f'"currency": {json.dumps(currency)}'.encode() if currency else None
+
+    def block_count(self, block: Dict[str, Any], estimate: bool = False) -> Optional[int]:
+        """
+        Matching bets in a block from the index alone.
+
+        A block straddling a date bound returns None (it must be parsed), or
+        with ``estimate`` its count scaled by the share of its time span
+        inside the bounds.
+        """
+        min_ts = datetime.fromisoformat(block['min_ts']) if block['min_ts'] else None
+        max_ts = datetime.fromisoformat(block['max_ts']) if block['max_ts'] else None
+        if min_ts is None:
+            return 0
+        if (self.start_date and max_ts < self.start_date) or (self.end_date and min_ts > self.end_date):
+            return 0
+        partial = (self.start_date and min_ts < self.start_date) or (self.end_date and max_ts > self.end_date)
+        if partial and not estimate:
+            return None
+        total = 0
+        for key, (bets, wins) in block['groups'].items():
+            currency, game_type = key.split('|', 1)
+            if self.currency and currency != self.currency:
+                continue
+            if self.game_type and game_type != self.game_type:
+                continue
+            if self.wins_only is None:
+                total += bets
+            else:
+                total += wins if self.wins_only else bets - wins
+        if partial:
+            span = (max_ts - min_ts).total_seconds()
+            inside = (min(max_ts, self.end_date or max_ts) - max(min_ts, self.start_date or min_ts)).total_seconds()
+            if span > 0:
+                total = round(total * inside / span)
+        return total
+
+    def matches(self, bet_dict: Dict[str, Any]) -> bool:
+        if self.currency and bet_dict['currency'] != self.currency:
+            return False
+        if self.game_type and bet_dict.get('game_type', 'dice') != self.game_type:
+            return False
+        if self.wins_only is not None and bool(bet_dict['is_win']) != self.wins_only:
+            return False
+        if self.start_date or self.end_date:
+            ts = datetime.fromisoformat(bet_dict['timestamp'])
+            if (self.start_date and ts < self.start_date) or (self.end_date and ts > self.end_date):
+                return False
+        return True
+
 
 class BetHistoryManager:
     """
@@ -79,6 +169,229 @@ class BetHistoryManager:
             }
             f.write(json.dumps(bet_dict) + '\n')
     
+    def _date_range(
+        self,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        max_days: int,
+    ) -> Tuple[datetime, datetime]:
+        if end_date is None:
+            end_date = datetime.now()
+        if start_date is None:
+            start_date = end_date - timedelta(days=max_days)
+        return start_date, end_date
+
+    def _day_files(self, start_date: datetime, end_date: datetime) -> Iterator[Path]:
+        current = start_date.date()
+        while current <= end_date.date():
+            file_path = self.storage_dir / f"{current.isoformat()}.jsonl"
+            if file_path.exists():
+                yield file_path
+            current += timedelta(days=1)
+
+    # -- index -------------------------------------------------------------
+
+    def get_day_index(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Sidecar index of a daily file, extended first if the file has grown.
+
+        Returns:
+            Dict with ``size`` (bytes indexed), ``count``, ``min_ts``,
+            ``max_ts`` and ``blocks`` (``offset``, ``end``, ``lines``,
+            ``count``, ``min_ts``, ``max_ts``, ``groups``:
+            ``"CUR|game": [bets, wins]``)
+        """
+        index_path = file_path.with_suffix(INDEX_SUFFIX)
+        size = file_path.stat().st_size
+        index = None
+        if index_path.exists():
+            try:
+                with open(index_path, 'r') as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = None
+        if index is not None and index.get('version') == INDEX_VERSION and index['size'] == size:
+            return index
+        if index is None or index.get('version') != INDEX_VERSION or index['size'] > size:
+            index = {'version': INDEX_VERSION, 'size': 0, 'blocks': []}
+        self._extend_index(file_path, index, size)
+        tmp_path = index_path.with_name(index_path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+        return index
+
+    def _extend_index(self, file_path: Path, index: Dict[str, Any], size: int) -> None:
+        blocks = index['blocks']
+        # Refill a trailing partial block rather than leaving it short
+        if blocks and blocks[-1]['lines'] < INDEX_BLOCK_LINES:
+            index['size'] = blocks.pop()['offset']
+        offset = index['size']
+        block = None
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partial line still being written
+                if block is None:
+                    block = {'offset': offset, 'end': offset, 'lines': 0, 'count': 0,
+                             'min_ts': None, 'max_ts': None, 'groups': {}}
+                offset += len(line)
+                block['end'] = offset
+                block['lines'] += 1
+                if line.strip():
+                    try:
+                        bet_dict = json.loads(line)
+                        ts = bet_dict['timestamp']
+                        key = f"{bet_dict['currency']}|{bet_dict.get('game_type', 'dice')}"
+                        won = bool(bet_dict['is_win'])
+                    except (ValueError, KeyError) as e:
+                        logger.error("Skipping bad history line in %s: %s", file_path, e)
+                    else:
+                        block['count'] += 1
+                        if block['min_ts'] is None or datetime.fromisoformat(ts) < datetime.fromisoformat(block['min_ts']):
+                            block['min_ts'] = ts
+                        if block['max_ts'] is None or datetime.fromisoformat(ts) > datetime.fromisoformat(block['max_ts']):
+                            block['max_ts'] = ts
+                        counts = block['groups'].setdefault(key, [0, 0])
+                        counts[0] += 1
+                        counts[1] += int(won)
+                if block['lines'] >= INDEX_BLOCK_LINES:
+                    blocks.append(block)
+                    block = None
+        if block is not None:
+            blocks.append(block)
+        index['size'] = offset
+        index['count'] = sum(b['count'] for b in blocks)
+        stamps = [b for b in blocks if b['min_ts']]
+        index['min_ts'] = min((b['min_ts'] for b in stamps), key=datetime.fromisoformat, default=None)
+        index['max_ts'] = max((b['max_ts'] for b in stamps), key=datetime.fromisoformat, default=None)
+
+    # -- lazy queries ------------------------------------------------------
+
+    def _scan(
+        self,
+        query: _Query,
+        skip: int = 0,
+        after: Optional[HistoryPosition] = None,
+    ) -> Iterator[Tuple[BetResult, HistoryPosition]]:
+        """Matching bets in file order with their resume positions."""
+        for file_path in self._day_files(*query.days):
+            day = file_path.stem
+            if after and day < after[0]:
+                continue
+            resume_at = after[1] if after and day == after[0] else 0
+            index = self.get_day_index(file_path)
+            with open(file_path, 'rb') as f:
+                for block in index['blocks']:
+                    if block['end'] <= resume_at:
+                        continue
+                    if block['offset'] >= resume_at:
+                        count = query.block_count(block)
+                        if count == 0 or (count is not None and count <= skip):
+                            skip -= count or 0
+                            continue
+                    start = max(block['offset'], resume_at)
+                    f.seek(start)
+                    data = f.read(block['end'] - start)
+                    pos = start
+                    for line in data.splitlines(keepends=True):
+                        pos += len(line)
+                        if query.needle and query.needle not in line:
+                            continue
+                        bet_dict = self._parse_line(line, file_path)
+                        if bet_dict is None or not query.matches(bet_dict):
+                            continue
+                        if skip:
+                            skip -= 1
+                            continue
+                        yield self._to_bet_result(bet_dict), (day, pos)
+
+    def _count(self, query: _Query, estimate: bool = False) -> int:
+        total = 0
+        for file_path in self._day_files(*query.days):
+            index = self.get_day_index(file_path)
+            partial = []
+            for block in index['blocks']:
+                count = query.block_count(block, estimate)
+                if count is None:
+                    partial.append(block)
+                else:
+                    total += count
+            if partial:
+                with open(file_path, 'rb') as f:
+                    for block in partial:
+                        f.seek(block['offset'])
+                        for line in f.read(block['end'] - block['offset']).splitlines():
+                            if query.needle and query.needle not in line:
+                                continue
+                            bet_dict = self._parse_line(line, file_path)
+                            if bet_dict is not None and query.matches(bet_dict):
+                                total += 1
+        return total
+
+    def iter_bets(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        currency: Optional[str] = None,
+        game_type: Optional[str] = None,
+        wins_only: Optional[bool] = None,
+        max_days: int = 30,
+        offset: int = 0,
+    ) -> Iterator[BetResult]:
+        """
+        Lazily yield matching bets in chronological (file) order.
+
+        Filters are applied to the day index and raw lines before anything
+        is parsed into a BetResult; ``offset`` skips that many matches,
+        mostly without reading them.
+        """
+        days = self._date_range(start_date, end_date, max_days)
+        query = _Query(days, start_date, end_date, currency, game_type, wins_only)
+        for bet, _ in self._scan(query, skip=offset):
+            yield bet
+
+    def count_bets(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        currency: Optional[str] = None,
+        game_type: Optional[str] = None,
+        wins_only: Optional[bool] = None,
+        max_days: int = 30,
+    ) -> int:
+        """Number of matching bets, from the index wherever possible."""
+        days = self._date_range(start_date, end_date, max_days)
+        return self._count(_Query(days, start_date, end_date, currency, game_type, wins_only))
+
+    def cursor_paginator(
+        self,
+        page_size: int = 50,
+        currency: Optional[str] = None,
+        game_type: Optional[str] = None,
+        wins_only: Optional[bool] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        max_days: int = 30,
+        approximate_total: bool = False,
+    ) -> CursorPaginator[BetResult]:
+        """
+        Keyset paginator over the indexed history.
+
+        Continuation tokens encode a (day, byte offset) position, so every
+        page is a direct seek. With ``approximate_total`` the total comes
+        from the index alone, without parsing blocks on the date bounds.
+        """
+        days = self._date_range(start_date, end_date, max_days)
+        query = _Query(days, start_date, end_date, currency, game_type, wins_only)
+        return CursorPaginator(
+            lambda after: self._scan(query, after=tuple(after) if after else None),
+            page_size,
+            count=lambda: self._count(query, estimate=approximate_total),
+            count_is_estimate=approximate_total,
+        )
+
     def load_history(
         self,
         start_date: Optional[datetime] = None,
@@ -96,25 +409,10 @@ class BetHistoryManager:
         Returns:
             List of BetResult objects
         """
+        start_date, end_date = self._date_range(start_date, end_date, max_days)
         bets = []
-        
-        # Determine date range
-        if end_date is None:
-            end_date = datetime.now()
-        if start_date is None:
-            from datetime import timedelta
-            start_date = end_date - timedelta(days=max_days)
-        
-        # Load from daily files
-        current = start_date.date()
-        while current <= end_date.date():
-            file_path = self.storage_dir / f"{current.isoformat()}.jsonl"
-            if file_path.exists():
-                bets.extend(self._load_from_file(file_path))
-            
-            from datetime import timedelta
-            current += timedelta(days=1)
-        
+        for file_path in self._day_files(start_date, end_date):
+            bets.extend(self._load_from_file(file_path))
         return bets
     
     def _load_from_file(self, file_path: Path) -> List[BetResult]:
@@ -125,31 +423,42 @@ class BetHistoryManager:
             with open(file_path, 'r') as f:
                 for line in f:
                     if line.strip():
-                        bet_dict = json.loads(line)
-                        
-                        # Reconstruct BetResult
-                        bet = BetResult(
-                            bet_id=bet_dict.get('bet_id'),
-                            timestamp=datetime.fromisoformat(bet_dict['timestamp']),
-                            currency=bet_dict['currency'],
-                            amount=Decimal(bet_dict['amount']),
-                            chance=Decimal(bet_dict['chance']),
-                            target=Decimal(bet_dict['target']),
-                            result=Decimal(bet_dict['result']),
-                            payout=Decimal(bet_dict['payout']),
-                            profit=Decimal(bet_dict['profit']),
-                            is_win=bet_dict['is_win'],
-                            game_type=bet_dict.get('game_type', 'dice'),
-                            server_seed=bet_dict.get('server_seed'),
-                            client_seed=bet_dict.get('client_seed'),
-                            nonce=bet_dict.get('nonce'),
-                        )
-                        bets.append(bet)
+                        bets.append(self._to_bet_result(json.loads(line)))
         except Exception as e:
             # Log error but don't fail
             logger.error("Error loading history from %s: %s", file_path, e)
         
         return bets
+
+    @staticmethod
+    def _parse_line(line: bytes, file_path: Path) -> Optional[Dict[str, Any]]:
+        if not line.strip():
+            return None
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            logger.error("Skipping bad history line in %s: %s", file_path, e)
+            return None
+
+    @staticmethod
+    def _to_bet_result(bet_dict: Dict[str, Any]) -> BetResult:
+        """Reconstruct BetResult from a stored line"""
+        return BetResult(
+            bet_id=bet_dict.get('bet_id'),
+            timestamp=datetime.fromisoformat(bet_dict['timestamp']),
+            currency=bet_dict['currency'],
+            amount=Decimal(bet_dict['amount']),
+            chance=Decimal(bet_dict['chance']),
+            target=Decimal(bet_dict['target']),
+            result=Decimal(bet_dict['result']),
+            payout=Decimal(bet_dict['payout']),
+            profit=Decimal(bet_dict['profit']),
+            is_win=bet_dict['is_win'],
+            game_type=bet_dict.get('game_type', 'dice'),
+            server_seed=bet_dict.get('server_seed'),
+            client_seed=bet_dict.get('client_seed'),
+            nonce=bet_dict.get('nonce'),
+        )
     
     def get_history(
         self,
@@ -160,10 +469,15 @@ class BetHistoryManager:
         wins_only: Optional[bool] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
+        cursor: Optional[str] = None,
     ) -> BetHistoryPage:
         """
         Get paginated bet history with filters.
         
+        Only the index blocks holding the requested page are parsed; a
+        ``cursor`` (``next_cursor`` of the previous page) resumes right
+        after that page instead of counting ``page``.
+        
         Args:
             page: Page number (1-indexed)
             page_size: Items per page
@@ -172,53 +486,37 @@ class BetHistoryManager:
             wins_only: Filter wins (True), losses (False), or all (None)
             start_date: Start date filter
             end_date: End date filter
+            cursor: Continuation token from a previous page
             
         Returns:
             BetHistoryPage with filtered and paginated results
         """
-        # Load history
-        bets = self.load_history(start_date, end_date)
-        
-        # Apply filters
-        filter_set = FilterSet()
-        
-        if start_date or end_date:
-            filter_set.add(
-                DateRangeFilter(start_date, end_date),
-                lambda b: b.timestamp
-            )
-        
-        if currency:
-            filter_set.add(
-                ValueFilter(currency, 'eq'),
-                lambda b: b.currency
-            )
-        
-        if game_type:
-            filter_set.add(
-                ValueFilter(game_type, 'eq'),
-                lambda b: b.game_type
-            )
-        
-        if wins_only is not None:
-            filter_set.add(
-                BooleanFilter(wins_only),
-                lambda b: b.is_win
-            )
-        
-        filtered_bets = filter_set.apply(bets)
-        
-        # Paginate
-        paginator = Paginator(filtered_bets, page, page_size)
-        page_bets = paginator.get_page()
+        days = self._date_range(start_date, end_date, 30)
+        query = _Query(days, start_date, end_date, currency, game_type, wins_only)
+        total = self._count(query)
+        if cursor:
+            scan = self._scan(query, after=tuple(decode_cursor(cursor)))
+        else:
+            scan = self._scan(query, skip=(page - 1) * page_size)
+        page_bets = []
+        last_position = None
+        for bet, last_position in scan:
+            page_bets.append(bet)
+            if len(page_bets) >= page_size:
+                break
+        if cursor:
+            has_next = len(page_bets) == page_size and next(scan, None) is not None
+        else:
+            has_next = page * page_size < total
         
         return BetHistoryPage(
             bets=page_bets,
-            total=paginator.total,
+            total=total,
             page=page,
             page_size=page_size,
-            has_next=paginator.has_next,
-            has_prev=paginator.has_prev
+            has_next=has_next,
+            has_prev=page > 1 or bool(cursor),
+            next_cursor=encode_cursor(last_position) if has_next else None,
         )
     
     def get_statistics(
@@ -238,12 +536,9 @@ class BetHistoryManager:
         Returns:
             BetStatistics with aggregated data
         """
-        # Load and filter history
-        bets = self.load_history(start_date, end_date)
-        
-        if currency:
-            bets = [b for b in bets if b.currency == currency]
-        
+        # Whole day files in range, as load_history (no timestamp cut-off)
+        days = self._date_range(start_date, end_date, 30)
+        bets = [bet for bet, _ in self._scan(_Query(days, currency=currency))]
         return BetStatistics.from_bet_list(bets)
     
     def clear_session(self) -> None:
@@ -254,7 +549,8 @@ class BetHistoryManager:
         """Export history to CSV file"""
         import csv
         
-        bets = self.load_history(start_date, end_date)
+        days = self._date_range(start_date, end_date, 30)
+        bets = (bet for bet, _ in self._scan(_Query(days)))
         
         with open(output_path, 'w', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=[
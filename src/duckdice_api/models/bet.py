@@ -56,6 +56,7 @@ class BetHistoryPage:
     page_size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None  # continuation token for the next page
     
     @property
     def total_pages(self) -> int:
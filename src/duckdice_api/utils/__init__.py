@@ -2,7 +2,15 @@
 Utilities package for DuckDice API.
 """
 
-from .pagination import PaginationParams, Paginator, create_page_response
+from .pagination import (
+    PaginationParams,
+    Paginator,
+    create_page_response,
+    CursorPage,
+    CursorPaginator,
+    encode_cursor,
+    decode_cursor,
+)
 from .filters import (
     Filter,
     DateRangeFilter,
@@ -21,6 +29,10 @@ __all__ = [
     'PaginationParams',
     'Paginator',
     'create_page_response',
+    'CursorPage',
+    'CursorPaginator',
+    'encode_cursor',
+    'decode_cursor',
     'Filter',
     'DateRangeFilter',
     'ValueFilter',
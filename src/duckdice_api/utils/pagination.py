@@ -1,8 +1,16 @@
 """
 Pagination utilities for API responses.
+
+``Paginator`` pages an in-memory list by page number. ``CursorPaginator``
+pages sources that are too large to materialise (generators, SQLite
+queries, the local history index): each page ends with an opaque
+continuation token that resumes the source right after its last item.
 """
 
-from typing import TypeVar, Generic, Callable, Optional
+import base64
+import json
+from itertools import islice
+from typing import Any, Iterable, Iterator, TypeVar, Generic, Callable, Optional, Tuple
 from dataclasses import dataclass
 
 T = TypeVar('T')
@@ -126,3 +134,134 @@ def create_page_response(
         'has_next': paginator.has_next,
         'has_prev': paginator.has_prev,
     }
+
+
+def encode_cursor(position: Any) -> str:
+    """Opaque, URL-safe continuation token for a JSON-serialisable position."""
+    raw = json.dumps(position, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> Any:
+    """Position from ``encode_cursor``; ValueError for a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        return json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    """One page from a CursorPaginator"""
+    items: list[T]
+    page_size: int
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None  # None when the source cannot count cheaply
+    total_is_estimate: bool = False
+
+    @property
+    def has_next(self) -> bool:
+        """Check if there's a next page"""
+        return self.next_cursor is not None
+
+
+class CursorPaginator(Generic[T]):
+    """
+    Keyset paginator over a resumable source.
+
+    ``fetch(after)`` yields ``(item, position)`` pairs starting right after
+    ``after`` (None = from the beginning); positions must be JSON
+    serialisable. Only ``page_size + 1`` items are pulled per page.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Optional[Any]], Iterable[Tuple[T, Any]]],
+        page_size: int = 50,
+        count: Optional[Callable[[], Optional[int]]] = None,
+        count_is_estimate: bool = False,
+    ):
+        """
+        Initialize cursor paginator.
+
+        Args:
+            fetch: Resumable source, see above
+            page_size: Items per page
+            count: Optional total (called once per page)
+            count_is_estimate: Whether ``count`` is approximate
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be >= 1")
+        self.fetch = fetch
+        self.page_size = page_size
+        self.count = count
+        self.count_is_estimate = count_is_estimate
+
+    @classmethod
+    def from_iterable(
+        cls,
+        factory: Callable[[], Iterable[T]],
+        page_size: int = 50,
+        count: Optional[Callable[[], Optional[int]]] = None,
+        count_is_estimate: bool = False,
+    ) -> 'CursorPaginator[T]':
+        """
+        Page a re-iterable source (``factory`` returns a fresh iterator).
+
+        The position is the item offset; resuming skips that many items
+        lazily, so nothing before the page is kept in memory.
+        """
+        def fetch(after: Optional[int]) -> Iterator[Tuple[T, int]]:
+            start = int(after or 0)
+            for offset, item in enumerate(islice(factory(), start, None), start + 1):
+                yield item, offset
+        return cls(fetch, page_size, count, count_is_estimate)
+
+    @classmethod
+    def from_keyset(
+        cls,
+        fetch_after: Callable[[Optional[Any], int], Iterable[T]],
+        key: Callable[[T], Any],
+        page_size: int = 50,
+        count: Optional[Callable[[], Optional[int]]] = None,
+        count_is_estimate: bool = False,
+    ) -> 'CursorPaginator[T]':
+        """
+        Page a keyset query: ``fetch_after(last_key, limit)`` returns up to
+        ``limit`` items ordered by ``key`` and strictly after ``last_key``
+        (e.g. ``SELECT ... WHERE id > ? ORDER BY id LIMIT ?``).
+        """
+        def fetch(after: Optional[Any]) -> Iterator[Tuple[T, Any]]:
+            for item in fetch_after(after, page_size + 1):
+                yield item, key(item)
+        return cls(fetch, page_size, count, count_is_estimate)
+
+    def get_page(self, cursor: Optional[str] = None) -> CursorPage[T]:
+        """Get the page starting after ``cursor`` (first page if None)"""
+        after = decode_cursor(cursor) if cursor else None
+        items: list[T] = []
+        last_position = None
+        has_more = False
+        for item, position in self.fetch(after):
+            if len(items) >= self.page_size:
+                has_more = True
+                break
+            items.append(item)
+            last_position = position
+        return CursorPage(
+            items=items,
+            page_size=self.page_size,
+            next_cursor=encode_cursor(last_position) if has_more else None,
+            total=self.count() if self.count else None,
+            total_is_estimate=self.count_is_estimate,
+        )
+
+    def pages(self, cursor: Optional[str] = None) -> Iterator[CursorPage[T]]:
+        """Iterate pages until the source is exhausted"""
+        while True:
+            page = self.get_page(cursor)
+            yield page
+            if not page.next_cursor:
+                return
+            cursor = page.next_cursor
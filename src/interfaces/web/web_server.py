@@ -3,6 +3,7 @@ Minimal web interface server for DuckDice Bot.
 
 Provides:
 - Runtime API (start/stop/state/events)
+- Bet history API (cursor-paginated, from the bet database)
 - Strategy/schema discovery
 - A browser dashboard page
 """
@@ -11,6 +12,7 @@ from __future__ import annotations
 
 import asyncio
 from decimal import Decimal
+from functools import lru_cache
 import json
 import random
 from pathlib import Path
@@ -477,6 +479,41 @@ def runtime_dashboard() -> Dict[str, Any]:
     return runtime.get_dashboard()
 
 
+@lru_cache(maxsize=1)
+def _bet_database():
+    """One reader for the history endpoints, so its read pool survives between polls."""
+    from ...betbot_engine.bet_database import BetDatabase
+
+    return BetDatabase()
+
+
+@app.get("/api/history/bets")
+def history_bets(
+    cursor: str | None = None,
+    page_size: int = 100,
+    session_id: str | None = None,
+    strategy: str | None = None,
+    symbol: str | None = None,
+) -> Dict[str, Any]:
+    """One page of logged bets; pass ``next_cursor`` back as ``cursor`` for the next."""
+    try:
+        page = _bet_database().bet_page(
+            cursor=cursor,
+            page_size=max(1, min(1000, page_size)),
+            session_id=session_id,
+            strategy=strategy,
+            symbol=symbol,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {
+        "items": page.items,
+        "next_cursor": page.next_cursor,
+        "has_next": page.has_next,
+        "total": page.total,
+    }
+
+
 @app.get("/api/runtime/stream")
 async def runtime_stream(
     request: Request,
@@ -8,16 +8,47 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 import json
+import signal
 import time
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from duckdice_api.api import DuckDiceAPI, DuckDiceConfig
-from betbot_engine.engine import AutoBetEngine, EngineConfig
+from betbot_engine.engine import AutoBetEngine, EngineConfig, _resolve_discovered_min_bet
+from betbot_engine.sim_kernel import NOT_SELF_CONTAINED, run_dry_session
 from betbot_strategies import list_strategies, get_strategy
 
+BACKENDS = ('kernel', 'engine')
+# Need special configuration, or do their own I/O (network, sleeps, input())
+SKIP_STRATEGIES = ['custom-script', 'faucet-grind'] + sorted(NOT_SELF_CONTAINED)
+UNIT_TIMEOUT_SEC = 120.0  # Wall-clock budget per kernel work unit
+
+
+class _UnitTimeout(BaseException):
+    """Raised by SIGALRM; not an Exception so strategies cannot swallow it"""
+
+
+def _raise_unit_timeout(signum, frame):
+    raise _UnitTimeout()
+
+
+def _error_run(error: str) -> Dict[str, Any]:
+    return {
+        'error': error,
+        'busted': True,
+        'profit_percent': -100.0
+    }
+
+
+def _skipped(strategy_name: str) -> Dict[str, Any]:
+    return {
+        'strategy': strategy_name,
+        'skipped': True,
+        'error': 'Requires special configuration'
+    }
+
 
 class MockDuckDiceAPI:
     """Mock API for simulation"""
@@ -33,32 +64,231 @@ class MockDuckDiceAPI:
         }
 
 
+def _comparison_config(currency: str, max_bets: int, seed: int) -> EngineConfig:
+    """Engine config shared by both backends so their runs stay comparable"""
+    return EngineConfig(
+        symbol=currency,
+        dry_run=True,
+        faucet=False,
+        stop_loss=-0.99,  # Allow 99% loss before stopping
+        take_profit=10.0,  # 1000% profit
+        max_bets=max_bets,
+        max_losses=None,
+        max_duration_sec=None,
+        delay_ms=0,  # Fast simulation
+        jitter_ms=0,
+        seed=seed
+    )
+
+
+def _finish_run_metrics(run_metrics: Dict[str, Any], starting_balance: float) -> Dict[str, Any]:
+    """Fill in derived per-run fields (win rate, profit, profit %)"""
+    if run_metrics['bets_placed'] > 0:
+        run_metrics['win_rate'] = (run_metrics['wins'] / run_metrics['bets_placed']) * 100
+    else:
+        # No bets placed - set sensible defaults
+        run_metrics['win_rate'] = 0.0
+    run_metrics['profit'] = run_metrics['ending_balance'] - starting_balance
+    run_metrics['profit_percent'] = (run_metrics['profit'] / starting_balance) * 100 if starting_balance > 0 else 0.0
+    return run_metrics
+
+
+def _kernel_runs_worker(unit: tuple) -> List[Dict[str, Any]]:
+    """Run a chunk of seeds for one strategy on the in-memory kernel (picklable)
+
+    Where SIGALRM is available the chunk is cut off after its timeout, so a
+    strategy that blocks cannot stall a pool worker; remaining seeds are
+    recorded as failed runs.
+    """
+    strategy_name, params, seeds, currency, max_bets, starting_balance, min_bet, timeout = unit
+    runs = []
+    alarm = None
+    if timeout and hasattr(signal, 'setitimer'):
+        try:
+            alarm = signal.signal(signal.SIGALRM, _raise_unit_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        except ValueError:
+            alarm = None  # Not in the main thread
+    try:
+        for run_seed in seeds:
+            try:
+                run = run_dry_session(
+                    strategy_name,
+                    dict(params),
+                    _comparison_config(currency, max_bets, run_seed),
+                    starting_balance=Decimal(str(starting_balance)),
+                    min_bet=min_bet,
+                )
+            except _UnitTimeout:
+                break
+            except Exception as e:
+                # Record failed run
+                runs.append(_error_run(str(e)))
+                continue
+            run_metrics = {
+                'bets_placed': run.bets,
+                'wins': run.wins,
+                'losses': run.losses,
+                'ending_balance': run.ending_balance,
+                'max_balance': run.max_balance,
+                'min_balance': run.min_balance,
+                'busted': run.bets > 0 and run.min_balance <= 0.0001,
+                'total_wagered': run.total_wagered,
+                'max_bet_size': run.max_bet_size,
+                'stop_reason': run.stop_reason,
+            }
+            runs.append(_finish_run_metrics(run_metrics, starting_balance))
+    except _UnitTimeout:
+        pass  # Alarm fired between runs
+    finally:
+        if alarm is not None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, alarm)
+    while len(runs) < len(seeds):
+        runs.append(_error_run(f'timed out after {timeout:.0f}s'))
+    return runs
+
+
 class StrategyComparator:
-    """Compare all strategies under identical conditions with Monte Carlo simulation"""
+    """Compare all strategies under identical conditions with Monte Carlo simulation
+
+    backend='kernel' (default) runs every (strategy, seed) pair on the in-memory
+    simulation kernel across a process pool; backend='engine' drives the full
+    run_auto_bet dry-run path sequentially. Both produce identical per-run results.
+    """
     
     def __init__(self, starting_balance: float = 1.0, max_bets: int = 10000,
-                 currency: str = 'btc', seed: int = 42, num_runs: int = 100):
+                 currency: str = 'btc', seed: int = 42, num_runs: int = 100,
+                 backend: str = 'kernel', workers: Optional[int] = None,
+                 unit_timeout: float = UNIT_TIMEOUT_SEC):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Available: {', '.join(BACKENDS)}")
         self.starting_balance = starting_balance
         self.max_bets = max_bets
         self.currency = currency
         self.seed = seed
         self.num_runs = num_runs  # Number of simulation runs per strategy
+        self.backend = backend
+        self.workers = workers  # Kernel backend process count (None = cpu count)
+        self.unit_timeout = unit_timeout
         self.results = []
         
+    def _strategy_params(self, strategy_name: str) -> Dict[str, Any]:
+        """Default params for a strategy, with comparison-specific overrides"""
+        try:
+            strategy_class = get_strategy(strategy_name)
+            schema = strategy_class.get_parameters_schema()
+            params = {k: v.get('default') for k, v in schema.items()}
+            
+            # Special handling for specific strategies
+            if strategy_name == 'target-aware':
+                params['target_balance'] = self.starting_balance * 2  # Double the balance
+        except:
+            params = {}
+        return params
+    
+    def _kernel_seed_chunk(self, idx: int, chunk_size: int) -> List[int]:
+        first = idx * chunk_size
+        return [self.seed + n for n in range(first, min(first + chunk_size, self.num_runs))]
+    
+    def _kernel_units(self, strategy_name: str, min_bet: Decimal, chunk_size: int) -> List[tuple]:
+        params = self._strategy_params(strategy_name)
+        n_chunks = (self.num_runs + chunk_size - 1) // chunk_size
+        return [
+            (strategy_name, params, self._kernel_seed_chunk(i, chunk_size), self.currency,
+             self.max_bets, self.starting_balance, min_bet, self.unit_timeout)
+            for i in range(n_chunks)
+        ]
+    
+    def _run_kernel(self, strategy_names: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Fan (strategy, seed chunk) work units out over a process pool"""
+        from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+        
+        # Resolve the min-bet floor once instead of per run
+        min_bet = _resolve_discovered_min_bet(
+            None, _comparison_config(self.currency, self.max_bets, self.seed), lambda _: None
+        )
+        workers = self.workers or os.cpu_count() or 1
+        chunk_size = max(1, min(10, self.num_runs // workers))
+        chunks: Dict[str, List[Any]] = {}
+        
+        if workers <= 1:
+            for name in strategy_names:
+                chunks[name] = [_kernel_runs_worker(u) for u in self._kernel_units(name, min_bet, chunk_size)]
+                self._print_progress(name, [r for c in chunks[name] for r in c])
+        else:
+            remaining: Dict[str, int] = {}
+            executor = ProcessPoolExecutor(max_workers=workers)
+            futures = {}
+            for name in strategy_names:
+                units = self._kernel_units(name, min_bet, chunk_size)
+                chunks[name] = [None] * len(units)
+                remaining[name] = len(units)
+                for idx, unit in enumerate(units):
+                    futures[executor.submit(_kernel_runs_worker, unit)] = (name, idx)
+            
+            def _record(name: str, idx: int, runs: List[Dict[str, Any]]):
+                chunks[name][idx] = runs
+                remaining[name] -= 1
+                if remaining[name] == 0:
+                    self._print_progress(name, [r for c in chunks[name] for r in c])
+            
+            # Backstop for platforms without SIGALRM: every worker may run its
+            # share of units back to back, each within unit_timeout. Where
+            # SIGALRM exists the worker cuts its own unit off first, so the
+            # pool always drains; otherwise late units are cancelled and any
+            # still-running worker is left to finish in the background.
+            deadline = None
+            if self.unit_timeout:
+                deadline = time.monotonic() + self.unit_timeout * (len(futures) // workers + 2)
+            timed_out = False
+            try:
+                for future, (name, idx) in futures.items():
+                    if timed_out and not future.done():
+                        runs = [_error_run('timed out') for _ in self._kernel_seed_chunk(idx, chunk_size)]
+                        _record(name, idx, runs)
+                        continue
+                    try:
+                        wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+                        runs = future.result(timeout=wait)
+                    except FuturesTimeout:
+                        timed_out = True
+                        runs = [_error_run('timed out') for _ in self._kernel_seed_chunk(idx, chunk_size)]
+                    except Exception as e:
+                        # Worker crashed or the unit could not be pickled
+                        error = str(e) or type(e).__name__
+                        runs = [_error_run(error) for _ in self._kernel_seed_chunk(idx, chunk_size)]
+                    _record(name, idx, runs)
+            finally:
+                executor.shutdown(wait=not timed_out, cancel_futures=True)
+        
+        # Chunks are kept in seed order, so runs line up with the engine backend
+        return {name: [r for c in chunks[name] for r in c] for name in strategy_names}
+    
+    def _print_progress(self, strategy_name: str, all_run_metrics: List[Dict[str, Any]]):
+        profits = [r.get('profit_percent', -100) for r in all_run_metrics] or [0.0]
+        busts = sum(1 for r in all_run_metrics if r.get('busted', False))
+        print(f"Running {strategy_name}... ✅ {len(all_run_metrics)} runs, "
+              f"avg: {sum(profits) / len(profits):+.2f}%, busts: {busts}", flush=True)
+    
     def run_strategy(self, strategy_name: str) -> Dict[str, Any]:
         """Run a single strategy multiple times (Monte Carlo) and collect aggregate metrics"""
-        print(f"Running {strategy_name}...", end=' ', flush=True)
-        
         # Skip strategies that require special setup
-        skip_strategies = ['custom-script', 'faucet-grind']
-        if strategy_name in skip_strategies:
-            print(f"⏭️  Skipped (requires special config)")
-            return {
-                'strategy': strategy_name,
-                'skipped': True,
-                'error': 'Requires special configuration'
-            }
+        if strategy_name in SKIP_STRATEGIES:
+            print(f"Running {strategy_name}... ⏭️  Skipped (requires special config)")
+            return _skipped(strategy_name)
         
+        if self.backend == 'kernel':
+            return self._aggregate(strategy_name, self._run_kernel([strategy_name])[strategy_name])
+        
+        print(f"Running {strategy_name}...", end=' ', flush=True)
+        metrics = self._aggregate(strategy_name, self._run_engine(strategy_name))
+        if 'busts' in metrics:
+            print(f"✅ {self.num_runs} runs, avg: {metrics['avg_profit_percent']:+.2f}%, busts: {metrics['busts']}")
+        return metrics
+    
+    def _run_engine(self, strategy_name: str) -> List[Dict[str, Any]]:
+        """Run every seed through the full dry-run engine (session log, DB, events)"""
         # Aggregate metrics across all runs
         all_run_metrics = []
         
@@ -67,31 +297,10 @@ class StrategyComparator:
             run_seed = self.seed + run_num
             
             # Get default params for strategy
-            try:
-                strategy_class = get_strategy(strategy_name)
-                schema = strategy_class.get_parameters_schema()
-                params = {k: v.get('default') for k, v in schema.items()}
-                
-                # Special handling for specific strategies
-                if strategy_name == 'target-aware':
-                    params['target_balance'] = self.starting_balance * 2  # Double the balance
-            except:
-                params = {}
+            params = self._strategy_params(strategy_name)
             
             # Create config with unique seed for this run
-            config = EngineConfig(
-                symbol=self.currency,
-                dry_run=True,
-                faucet=False,
-                stop_loss=-0.99,  # Allow 99% loss before stopping
-                take_profit=10.0,  # 1000% profit
-                max_bets=self.max_bets,
-                max_losses=None,
-                max_duration_sec=None,
-                delay_ms=0,  # Fast simulation
-                jitter_ms=0,
-                seed=run_seed
-            )
+            config = _comparison_config(self.currency, self.max_bets, run_seed)
             
             # Track metrics for this single run
             run_metrics = {
@@ -103,7 +312,7 @@ class StrategyComparator:
                 'min_balance': self.starting_balance,
                 'busted': False,
                 'total_wagered': 0.0,
-                'bet_sizes': []
+                'max_bet_size': 0.0,
             }
             
             def track_bet(bet_data: Dict[str, Any]):
@@ -133,7 +342,8 @@ class StrategyComparator:
                 run_metrics['ending_balance'] = balance
                 run_metrics['max_balance'] = max(run_metrics['max_balance'], balance)
                 run_metrics['min_balance'] = min(run_metrics['min_balance'], balance)
-                run_metrics['bet_sizes'].append(amount)
+                run_metrics['total_wagered'] += amount
+                run_metrics['max_bet_size'] = max(run_metrics['max_bet_size'], amount)
                 
                 # Check for bust
                 if balance <= 0.0001:
@@ -152,35 +362,23 @@ class StrategyComparator:
                 )
                 
                 # Calculate run metrics
-                if run_metrics['bets_placed'] > 0:
-                    run_metrics['win_rate'] = (run_metrics['wins'] / run_metrics['bets_placed']) * 100
-                    run_metrics['profit'] = run_metrics['ending_balance'] - self.starting_balance
-                    run_metrics['profit_percent'] = (run_metrics['profit'] / self.starting_balance) * 100
-                else:
-                    # No bets placed - set sensible defaults
-                    run_metrics['win_rate'] = 0.0
-                    run_metrics['profit'] = run_metrics['ending_balance'] - self.starting_balance
-                    run_metrics['profit_percent'] = (run_metrics['profit'] / self.starting_balance) * 100 if self.starting_balance > 0 else 0.0
-                
-                if run_metrics['bet_sizes']:
-                    run_metrics['total_wagered'] = sum(run_metrics['bet_sizes'])
-                
+                _finish_run_metrics(run_metrics, self.starting_balance)
                 run_metrics['stop_reason'] = result.get('stop_reason', 'unknown')
                 
                 all_run_metrics.append(run_metrics)
                 
             except Exception as e:
                 # Record failed run
-                all_run_metrics.append({
-                    'error': str(e),
-                    'busted': True,
-                    'profit_percent': -100.0
-                })
+                all_run_metrics.append(_error_run(str(e)))
             
             # Progress indicator every 10 runs
             if (run_num + 1) % 10 == 0:
                 print(f"{run_num + 1}", end='...', flush=True)
         
+        return all_run_metrics
+    
+    def _aggregate(self, strategy_name: str, all_run_metrics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate per-run metrics into one comparison record"""
         # Aggregate results from all runs
         if not all_run_metrics:
             print("❌ No valid runs")
@@ -196,8 +394,9 @@ class StrategyComparator:
         # Calculate aggregated metrics
         bets_placed_list = [r.get('bets_placed', 0) for r in all_run_metrics]
         min_balances = [r.get('min_balance', self.starting_balance) for r in all_run_metrics]
-        bet_sizes_all = [size for r in all_run_metrics for size in r.get('bet_sizes', [])]
         total_wagered_list = [r.get('total_wagered', 0) for r in all_run_metrics]
+        max_bet_sizes = [r.get('max_bet_size', 0) for r in all_run_metrics]
+        total_bets = sum(bets_placed_list)
         
         metrics = {
             'strategy': strategy_name,
@@ -225,8 +424,8 @@ class StrategyComparator:
             # Additional aggregated metrics for HTML report
             'bets_placed': int(sum(bets_placed_list) / len(bets_placed_list)) if bets_placed_list else 0,
             'min_balance': sum(min_balances) / len(min_balances) if min_balances else self.starting_balance,
-            'avg_bet_size': sum(bet_sizes_all) / len(bet_sizes_all) if bet_sizes_all else 0,
-            'max_bet_size': max(bet_sizes_all) if bet_sizes_all else 0,
+            'avg_bet_size': sum(total_wagered_list) / total_bets if total_bets else 0,
+            'max_bet_size': max(max_bet_sizes) if max_bet_sizes else 0,
             'total_wagered': sum(total_wagered_list) / len(total_wagered_list) if total_wagered_list else 0,
             'duration_sec': 0.0,  # Not applicable for Monte Carlo
             'stop_reason': f"{self.num_runs} runs completed",
@@ -239,8 +438,6 @@ class StrategyComparator:
             'busts': busts,
         }
         
-        print(f"✅ {self.num_runs} runs, avg: {metrics['avg_profit_percent']:+.2f}%, busts: {busts}")
-        
         return metrics
     
     def run_all(self) -> List[Dict[str, Any]]:
@@ -255,12 +452,22 @@ class StrategyComparator:
         print(f"Max Bets: {self.max_bets}")
         print(f"Strategies: {len(strategy_names)}")
         print(f"Seed: {self.seed} (reproducible)")
+        print(f"Backend: {self.backend}")
         print(f"{'='*60}\n")
         
-        results = []
-        for strategy_name in strategy_names:
-            metrics = self.run_strategy(strategy_name)
-            results.append(metrics)
+        if self.backend == 'kernel':
+            # One pool for every (strategy, seed) unit, so slow strategies overlap
+            runnable = [n for n in strategy_names if n not in SKIP_STRATEGIES]
+            all_runs = self._run_kernel(runnable)
+            results = [
+                self._aggregate(name, all_runs[name]) if name in all_runs else _skipped(name)
+                for name in strategy_names
+            ]
+        else:
+            results = []
+            for strategy_name in strategy_names:
+                metrics = self.run_strategy(strategy_name)
+                results.append(metrics)
         
         self.results = results
         return results
@@ -774,6 +981,10 @@ def main():
                        help='Random seed for reproducibility (default: 42)')
     parser.add_argument('-o', '--output', type=str, default='strategy_comparison.html',
                        help='Output HTML file (default: strategy_comparison.html)')
+    parser.add_argument('--backend', choices=BACKENDS, default='kernel',
+                       help='Simulation backend: in-memory kernel or full engine (default: kernel)')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                       help='Worker processes for the kernel backend (default: CPU count)')
     
     args = parser.parse_args()
     
@@ -782,7 +993,9 @@ def main():
         max_bets=args.max_bets,
         currency=args.currency,
         seed=args.seed,
-        num_runs=args.runs
+        num_runs=args.runs,
+        backend=args.backend,
+        workers=args.workers
     )
     
     # Run all strategies
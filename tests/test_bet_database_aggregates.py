@@ -0,0 +1,106 @@
+import os
+import random
+import sqlite3
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+
+SESSIONS = [
+    ("s1", "paroli", "BTC", True),
+    ("s2", "paroli", "DOGE", True),
+    ("s3", "kelly-capped", "BTC", False),
+]
+
+
+def _fill(db, n_per_session=60, seed=7):
+    rng = random.Random(seed)
+    for session_id, strategy, symbol, sim in SESSIONS:
+        db.start_session(session_id, strategy, symbol, simulation_mode=sim,
+                         starting_balance=Decimal("100"))
+        balance = Decimal("100")
+        for i in range(1, n_per_session + 1):
+            amount = Decimal(rng.randint(1, 500)) / 1000
+            win = rng.random() < 0.49
+            profit = amount if win else -amount
+            balance += profit
+            db.log_bet(
+                session_id=session_id,
+                bet_data={"symbol": symbol, "strategy": strategy, "amount": str(amount),
+                          "chance": "49.5", "is_high": True},
+                result_data={"win": win, "profit": str(profit), "number": rng.randint(0, 9999),
+                             "timestamp": f"2026-03-21T00:{i // 60:02d}:{i % 60:02d}"},
+                bet_number=i,
+                balance=balance,
+                simulation_mode=sim,
+            )
+    db.flush()
+
+
+FILTERS = [
+    {},
+    {"session_id": "s2"},
+    {"strategy_name": "paroli"},
+    {"simulation_mode": False},
+    {"strategy_name": "paroli", "simulation_mode": True},
+    {"session_id": "s3", "strategy_name": "paroli"},
+]
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_aggregates_match_full_scan(tmp_path: Path, background):
+    db = BetDatabase(tmp_path / "agg.db", commit_every=16, background_writes=background)
+    _fill(db)
+    for filters in FILTERS:
+        fast = db.get_statistics(**filters)
+        scan = db.get_statistics(since="2000-01-01", **filters)
+        assert fast.keys() == scan.keys()
+        for key in fast:
+            assert fast[key] == pytest.approx(scan[key]), (filters, key)
+    db.close()
+
+
+def test_statistics_do_not_read_bet_history(tmp_path: Path):
+    db = BetDatabase(tmp_path / "agg.db")
+    _fill(db, n_per_session=10)
+    with sqlite3.connect(str(tmp_path / "agg.db")) as conn:
+        conn.execute("DELETE FROM bet_history")
+    assert db.get_statistics()["total_bets"] == 30
+    assert db.get_statistics(session_id="s1")["total_bets"] == 10
+    db.close()
+
+
+def test_open_sessions_report_live_totals(tmp_path: Path):
+    db = BetDatabase(tmp_path / "agg.db")
+    _fill(db, n_per_session=12)
+    db.end_session("s3", Decimal("100"), "done", total_bets=12, wins=5, losses=7)
+
+    sessions = {s["session_id"]: s for s in db.get_sessions()}
+    live = db.get_statistics(session_id="s1")
+    assert sessions["s1"]["total_bets"] == 12
+    assert sessions["s1"]["wins"] == live["total_wins"]
+    assert sessions["s1"]["profit"] == pytest.approx(live["total_profit"])
+    assert sessions["s1"]["wagered"] > 0
+    # Ended sessions keep the totals recorded by end_session
+    assert sessions["s3"]["wins"] == 5
+    db.close()
+
+
+def test_existing_database_is_backfilled(tmp_path: Path):
+    path = tmp_path / "legacy.db"
+    db = BetDatabase(path)
+    _fill(db, n_per_session=20)
+    expected = db.get_statistics()
+    db.close()
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("DROP TABLE session_stats")
+        conn.execute("DROP TABLE strategy_stats")
+
+    reopened = BetDatabase(path)
+    assert reopened.get_statistics() == pytest.approx(expected)
+    reopened.close()
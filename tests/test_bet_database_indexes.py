@@ -0,0 +1,87 @@
+"""Query-plan regression tests: hot BetDatabase reads must stay index-only."""
+
+import os
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    db = BetDatabase(tmp_path / "plans.db", commit_every=500)
+    for n, (session_id, symbol) in enumerate([("s1", "BTC"), ("s2", "DOGE")]):
+        db.start_session(session_id, "paroli", symbol, simulation_mode=True,
+                         starting_balance=Decimal("100"))
+        for i in range(1, 201):
+            db.log_bet(
+                session_id=session_id,
+                bet_data={"symbol": symbol, "strategy": "paroli", "amount": "1", "chance": "49.5"},
+                result_data={"win": i % 2 == 0, "profit": "1", "number": (i * 37 + n) % 10000},
+                bet_number=i,
+                balance=Decimal("100"),
+                loss_streak=i % 5,
+            )
+        db.end_session(session_id, Decimal("100"), "cancelled", total_bets=200, wins=100, losses=100)
+    yield db
+    db.close()
+
+
+def _traced(db, monkeypatch):
+    """Record the expanded SQL of every statement the read path runs."""
+    statements = []
+    original = BetDatabase._get_connection
+
+    def tracing(self):
+        cm = original(self)
+        conn = cm.__enter__()
+        conn.set_trace_callback(statements.append)
+
+        class _Wrapper:
+            def __enter__(self):
+                return conn
+
+            def __exit__(self, *exc):
+                return cm.__exit__(*exc)
+
+        return _Wrapper()
+
+    monkeypatch.setattr(BetDatabase, "_get_connection", tracing)
+    return statements
+
+
+def _plan(db, sql):
+    with db._get_connection() as conn:
+        return " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+
+
+@pytest.mark.parametrize("call, index", [
+    (lambda db: db.get_recent_rolls(limit=50), "COVERING INDEX idx_bet_rolls"),
+    (lambda db: db.get_recent_rolls(symbol="DOGE", limit=50), "COVERING INDEX idx_bet_symbol_rolls"),
+    (lambda db: db.get_session_tail_state("s2"), "COVERING INDEX idx_bet_session_tail"),
+    (lambda db: db.get_last_cancelled_session(), "INDEX idx_session_stop_reason"),
+    (lambda db: db.get_session_bets("s1"), "INDEX idx_bet_session_tail"),
+])
+def test_hot_queries_use_indexes(db, monkeypatch, call, index):
+    statements = _traced(db, monkeypatch)
+    call(db)
+    monkeypatch.undo()
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert selects
+    plan = _plan(db, selects[0])
+    assert index in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_recent_rolls_are_oldest_first(db):
+    rolls = db.get_recent_rolls(symbol="BTC", limit=3)
+    assert rolls == [float((i * 37) % 10000) for i in (198, 199, 200)]
+
+
+def test_tail_state_is_last_bet(db):
+    assert db.get_session_tail_state("s1") == {"loss_streak": 0, "bet_number": 200, "last_balance": 100.0}
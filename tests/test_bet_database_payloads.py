@@ -0,0 +1,100 @@
+import json
+import os
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+
+
+def _api_raw(i):
+    return {
+        "bet": {"hash": f"{i:064x}", "number": 1234 + i, "result": i % 2 == 0,
+                "choice": ">4999", "betAmount": "0.00000001", "chance": 49.5},
+        "user": {"username": "duck", "balance": "100.00000000", "level": 3},
+        "padding": "x" * 600,
+    }
+
+
+def _fill(db, n, session_id="s1"):
+    db.start_session(session_id, "test-strat", "BTC", simulation_mode=True,
+                     starting_balance=Decimal("100"))
+    for i in range(1, n + 1):
+        db.log_bet(
+            session_id=session_id,
+            bet_data={"symbol": "BTC", "strategy": "test-strat", "amount": "0.00000001",
+                      "chance": "49.5", "game": "dice", "is_high": True},
+            result_data={"win": i % 2 == 0, "profit": "0.00000001", "number": 1234 + i,
+                         "api_raw": _api_raw(i)},
+            bet_number=i,
+            balance=Decimal("100"),
+            strategy_state={"phase": "grind", "step": i % 3},
+        )
+    db.flush()
+
+
+def test_compressed_payloads_round_trip_and_dedupe(tmp_path: Path):
+    db = BetDatabase(tmp_path / "c.db", payloads="compressed")
+    _fill(db, 30)
+
+    bets = db.get_session_bets("s1")
+    assert json.loads(bets[4]["api_raw"]) == _api_raw(5)
+    assert json.loads(bets[4]["strategy_state"]) == {"phase": "grind", "step": 2}
+    with db._get_connection() as conn:
+        # 30 unique API payloads + 3 distinct strategy states
+        assert conn.execute("SELECT COUNT(*) FROM bet_payloads").fetchone()[0] == 33
+        inline = conn.execute(
+            "SELECT COUNT(*) FROM bet_history WHERE api_raw IS NOT NULL OR strategy_state IS NOT NULL"
+        ).fetchone()[0]
+    assert inline == 0
+    db.close()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_sampled_payloads_keep_every_nth(tmp_path: Path, background):
+    db = BetDatabase(tmp_path / "s.db", payloads="compressed", payload_sample_every=3,
+                     background_writes=background)
+    _fill(db, 9)
+    kept = [b["bet_number"] for b in db.get_session_bets("s1") if b["api_raw"]]
+    assert kept == [1, 4, 7]
+    db.close()
+
+
+def test_payloads_none_drops_raw_data(tmp_path: Path):
+    db = BetDatabase(tmp_path / "n.db", payloads="none")
+    _fill(db, 5)
+    bets = db.get_session_bets("s1")
+    assert len(bets) == 5
+    assert all(b["api_raw"] is None and b["strategy_state"] is None for b in bets)
+    db.close()
+
+
+def test_unknown_payload_mode_rejected(tmp_path: Path):
+    with pytest.raises(ValueError):
+        BetDatabase(tmp_path / "x.db", payloads="zip")
+
+
+def test_compact_payloads_migrates_inline_database(tmp_path: Path):
+    path = tmp_path / "legacy.db"
+    db = BetDatabase(path, commit_every=500)
+    _fill(db, 1500)
+    before = db.get_session_bets("s1")
+    db.close()
+
+    db = BetDatabase(path)
+    stats = db.compact_payloads(batch_size=400)
+    assert stats["rows"] == 1500
+    assert stats["bytes_after"] * 2 < stats["bytes_before"]
+
+    after = db.get_session_bets("s1")
+    assert [json.loads(b["api_raw"]) for b in after] == [json.loads(b["api_raw"]) for b in before]
+    assert [json.loads(b["strategy_state"]) for b in after] == [
+        json.loads(b["strategy_state"]) for b in before
+    ]
+    # Re-running is a no-op
+    assert db.compact_payloads(vacuum=False)["rows"] == 0
+    db.close()
@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine import bet_database  # noqa: E402
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from betbot_engine.db_bench import read_latency_under_write, seed_bets  # noqa: E402
+
+
+def test_pooled_readers_see_new_commits(tmp_path: Path):
+    path = tmp_path / "r.db"
+    writer = BetDatabase(path, commit_every=1)
+    reader = BetDatabase(path)
+    seed_bets(writer, 20, sessions=2)
+
+    assert reader.get_statistics()["total_bets"] == 20
+    # A half-read result must not leave the pooled connection on an old snapshot
+    assert reader.get_session_tail_state("bench-1-0")["bet_number"] == 10
+    assert len(reader.get_recent_rolls(limit=5)) == 5
+    seed_bets(writer, 30, sessions=3, seed=2)
+    assert reader.get_statistics()["total_bets"] == 50
+    assert reader._read_pool.stats["opened"] == 1
+    assert reader._read_pool.stats["reused"] >= 3
+    writer.close()
+    reader.close()
+
+
+def test_read_connections_are_tuned_and_read_only(tmp_path: Path):
+    db = BetDatabase(tmp_path / "r.db")
+    with db._get_connection() as conn:
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -bet_database.READ_CACHE_KIB
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] in (0, bet_database.READ_MMAP_BYTES)
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM bet_history")
+    db.close()
+
+
+def test_pool_serves_concurrent_threads(tmp_path: Path):
+    path = tmp_path / "r.db"
+    db = BetDatabase(path, read_pool_size=2)
+    seed_bets(db, 200, sessions=4)
+    errors, barrier = [], threading.Barrier(6)
+
+    def read():
+        try:
+            barrier.wait()
+            for _ in range(30):
+                assert db.get_statistics()["total_bets"] == 200
+                assert len(db.get_sessions()) == 4
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len(db._read_pool._idle) <= 2
+    db.close()
+
+
+def test_read_latency_benchmark_reports_every_query(tmp_path: Path):
+    results = read_latency_under_write(tmp_path / "b.db", seconds=0.2, pool_sizes=(0, 2), seed=500)
+    assert set(results) == {"pool=0", "pool=2"}
+    for run in results.values():
+        assert run["bets_written"] > 0
+        assert run["get_statistics"]["count"] > 0
+        assert run["get_statistics"]["p50_ms"] <= run["get_statistics"]["p99_ms"]
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+
+T0 = datetime(2026, 3, 21, 10, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _log(db, i, at, balance, symbol="BTC", amount="1", win=True):
+    db.log_bet(
+        session_id="s1",
+        bet_data={"symbol": symbol, "strategy": "paroli", "amount": amount, "chance": "49.5"},
+        result_data={"win": win, "profit": amount if win else f"-{amount}", "number": 5000,
+                     "timestamp": at},
+        bet_number=i,
+        balance=Decimal(balance),
+        simulation_mode=True,
+    )
+
+
+def _fill(db):
+    db.start_session("s1", "paroli", "BTC", simulation_mode=True, starting_balance=Decimal("100"))
+    # Minute 0: 100 -> 103 (high 104), minute 1: 102 -> 99, next hour: one bet
+    for i, (offset, balance) in enumerate(
+        [(5, "101"), (20, "104"), (50, "103"), (65, "102"), (110, "99"), (3700, "98")], 1
+    ):
+        _log(db, i, T0 + offset, balance)
+    # ISO timestamps are bucketed too (naive = UTC)
+    _log(db, 7, "2026-03-21T10:00:30", "100", symbol="DOGE", amount="2")
+    db.flush()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_minute_and_hour_rollups(tmp_path: Path, background):
+    db = BetDatabase(tmp_path / "r.db", commit_every=2, background_writes=background)
+    _fill(db)
+
+    minutes = db.get_timeline("1m", symbol="BTC")
+    assert [m["bucket"] - T0 for m in minutes] == [0, 60, 3660]
+    first = minutes[0]
+    assert (first["open"], first["high"], first["low"], first["close"]) == (101, 104, 101, 103)
+    assert first["bets"] == 3
+    assert first["bets_per_sec"] == pytest.approx(3 / 60)
+    assert minutes[1]["close"] == 99
+
+    hours = db.get_timeline("1h")
+    assert [(h["symbol"], h["bets"]) for h in hours] == [("BTC", 5), ("DOGE", 1), ("BTC", 1)]
+    assert hours[0]["wagered"] == 5
+    assert hours[0]["low"] == 99 and hours[0]["high"] == 104
+    assert db.get_timeline("1d")[0]["bets"] == 6
+    db.close()
+
+
+def test_timeline_bounds_and_validation(tmp_path: Path):
+    db = BetDatabase(tmp_path / "r.db")
+    _fill(db)
+    assert len(db.get_timeline("1m", symbol="BTC", since=T0 + 60, until=T0 + 3600)) == 1
+    with pytest.raises(ValueError):
+        db.get_timeline("5m")
+    db.close()
+
+
+@pytest.mark.parametrize("background", [False, True])
+def test_retention_drops_raw_rows_but_keeps_rollups(tmp_path: Path, background):
+    db = BetDatabase(tmp_path / "r.db", payloads="compressed", background_writes=background)
+    _fill(db)
+    later = datetime.now(timezone.utc) + timedelta(days=40)
+    deleted = db.apply_retention(raw_days=30, rollup_days={"1m": 30}, now=later)
+    assert deleted == {"bets": 7, "rollups": 4}
+
+    assert db.get_session_bets("s1") == []
+    assert db.get_timeline("1m") == []
+    assert sum(h["bets"] for h in db.get_timeline("1h")) == 7
+    assert db.get_statistics()["total_bets"] == 7
+    db.close()
+
+
+def test_retention_and_export_bounds_use_bet_timestamp(tmp_path: Path):
+    db = BetDatabase(tmp_path / "r.db")
+    _fill(db)  # Bets from March, all inserted just now
+    recent = datetime.now(timezone.utc)
+    _log(db, 8, recent.isoformat(), "97")
+    db.flush()
+
+    window = db.iter_bets(columns=["bet_number"], since=T0 + 60, until=T0 + 3600)
+    assert [b["bet_number"] for b in window] == [4, 5]
+
+    deleted = db.apply_retention(raw_days=30, now=recent + timedelta(days=1))
+    assert deleted["bets"] == 7
+    assert [b["bet_number"] for b in db.get_session_bets("s1")] == [8]
+    db.close()
+
+
+def test_existing_database_rollups_are_backfilled(tmp_path: Path):
+    path = tmp_path / "legacy.db"
+    db = BetDatabase(path)
+    _fill(db)
+    expected = db.get_timeline("1m")
+    db.close()
+    with sqlite3.connect(str(path)) as conn:
+        conn.execute("DROP TABLE bet_rollups")
+
+    reopened = BetDatabase(path)
+    assert reopened.get_timeline("1m") == expected
+    reopened.close()
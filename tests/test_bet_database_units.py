@@ -0,0 +1,108 @@
+import os
+import re
+import sqlite3
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine import bet_database  # noqa: E402
+from betbot_engine.bet_database import BetDatabase, from_units, to_units  # noqa: E402
+
+
+def _fill(db, n, session_id="s1"):
+    db.start_session(session_id, "paroli", "BTC", simulation_mode=True, starting_balance=Decimal("1"))
+    balance = Decimal("1")
+    for i in range(1, n + 1):
+        win = i % 3 != 0
+        profit = Decimal("0.1") if win else Decimal("-0.2")
+        balance += profit
+        db.log_bet(session_id, {"symbol": "BTC", "strategy": "paroli", "amount": "0.1", "chance": "50"},
+                   {"win": win, "profit": str(profit), "payout": "0.2" if win else None, "number": i},
+                   i, balance)
+    db.flush()
+    return balance
+
+
+def _downgrade(path: Path):
+    """Turn a database back into the REAL-column (version 1) layout."""
+    conn = sqlite3.connect(path)
+    for table, columns in bet_database._MONEY_COLUMNS.items():
+        (ddl,) = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (table,)).fetchone()
+        ddl = re.sub(rf"CREATE TABLE(?: IF NOT EXISTS)?\s+{table}\b", f"CREATE TABLE {table}_old", ddl)
+        for column in columns:
+            ddl = re.sub(rf"\b{column}\s+INTEGER\b", f"{column} REAL", ddl)
+        names = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        select = ", ".join(f"{n} / 1e8" if n in columns else n for n in names)
+        conn.execute(ddl)
+        conn.execute(f"INSERT INTO {table}_old SELECT {select} FROM {table}")
+        conn.execute(f"DROP TABLE {table}")
+        conn.execute(f"ALTER TABLE {table}_old RENAME TO {table}")
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+
+def test_unit_conversions():
+    assert to_units("0.1") == 10_000_000
+    assert to_units(Decimal("-0.000000015")) == -2
+    assert to_units(0.3) == 30_000_000
+    assert to_units(None) is None
+    assert from_units(12_345) == 0.00012345
+    with pytest.raises(ValueError):
+        to_units("lots")
+
+
+def test_money_columns_are_integer_and_sums_exact(tmp_path: Path):
+    db = BetDatabase(tmp_path / "u.db")
+    balance = _fill(db, 3000)
+
+    with sqlite3.connect(tmp_path / "u.db") as conn:
+        types = conn.execute(
+            "SELECT DISTINCT typeof(amount), typeof(profit), typeof(balance) FROM bet_history"
+        ).fetchall()
+        assert types == [("integer", "integer", "integer")]
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == bet_database.SCHEMA_VERSION
+
+    stats = db.get_statistics(exact=True)
+    assert stats["total_profit"] == Decimal("0") and balance == Decimal("1")
+    assert stats["max_balance"] == Decimal("1.2")
+    assert isinstance(db.get_statistics()["avg_bet"], float)
+    assert db.get_statistics()["avg_bet"] == pytest.approx(0.1)
+
+    bets = db.get_session_bets("s1", limit=3)
+    assert [b["amount"] for b in bets] == [0.1, 0.1, 0.1]
+    assert db.get_session_tail_state("s1")["last_balance"] == 1.0
+    (session,) = db.get_sessions()
+    assert session["wagered"] == 300.0 and session["profit"] == 0.0
+    db.close()
+
+
+def test_legacy_real_database_is_migrated(tmp_path: Path):
+    path = tmp_path / "legacy.db"
+    db = BetDatabase(path)
+    _fill(db, 50)
+    expected = db.get_session_bets("s1")
+    expected_stats = db.get_statistics()
+    expected_timeline = db.get_timeline(resolution="1m")
+    db.close()
+    _downgrade(path)
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT typeof(balance) FROM bet_history LIMIT 1").fetchone() == ("real",)
+
+    db = BetDatabase(path)
+    assert db.get_session_bets("s1") == expected
+    assert db.get_statistics() == expected_stats
+    assert db.get_timeline(resolution="1m") == expected_timeline
+    _fill(db, 10, session_id="s2")
+    assert db.get_statistics()["total_bets"] == 60
+    db.close()
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT DISTINCT typeof(profit) FROM session_stats").fetchall() == [("integer",)]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_bet_session_tail" in indexes
@@ -0,0 +1,106 @@
+import csv
+import gzip
+import json
+import lzma
+import os
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from betbot_engine.bet_export import infer_format, read_columnar  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path: Path):
+    db = BetDatabase(tmp_path / "export.db", commit_every=1000, payloads="compressed")
+    for session_id, symbol, sim in (("s1", "BTC", True), ("s2", "DOGE", False)):
+        db.start_session(session_id, "paroli", symbol, simulation_mode=sim)
+        for i in range(1, 1201):
+            db.log_bet(
+                session_id=session_id,
+                bet_data={"symbol": symbol, "strategy": "paroli", "amount": "0.5", "chance": "49.5"},
+                result_data={"win": i % 3 == 0, "profit": "0.5" if i % 3 == 0 else "-0.5",
+                             "number": i, "api_raw": {"bet": {"id": i}}},
+                bet_number=i,
+                balance=Decimal("100"),
+                simulation_mode=sim,
+                strategy_state={"step": i % 4},
+            )
+    db.flush()
+    yield db
+    db.close()
+
+
+def test_export_to_csv_is_not_truncated(db, tmp_path, monkeypatch):
+    # The old implementation capped exports at LIMIT 100000; use a tiny chunk
+    # size to prove rows are streamed rather than loaded at once
+    out = tmp_path / "all.csv"
+    monkeypatch.setattr(BetDatabase, "iter_bet_chunks",
+                        _with_chunk_size(BetDatabase.iter_bet_chunks, 100))
+    db.export_to_csv(out)
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2400
+    assert rows[0]["session_id"] == "s1" and rows[-1]["session_id"] == "s2"
+
+
+def _with_chunk_size(original, size):
+    def patched(self, *args, **kwargs):
+        kwargs["chunk_size"] = size
+        return original(self, *args, **kwargs)
+    return patched
+
+
+def test_export_to_csv_writes_nothing_without_matches(db, tmp_path):
+    out = tmp_path / "none.csv"
+    db.export_to_csv(out, session_id="missing")
+    assert not out.exists()
+
+
+@pytest.mark.parametrize("name, opener", [
+    ("bets.ndjson", open),
+    ("bets.ndjson.gz", gzip.open),
+    ("bets.jsonl.xz", lzma.open),
+])
+def test_ndjson_with_filters_and_compression(db, tmp_path, name, opener):
+    out = tmp_path / name
+    n = db.export(out, symbol="DOGE", simulation_mode=False,
+                  columns=["bet_number", "profit", "api_raw", "strategy_state"])
+    assert n == 1200
+    with opener(out, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert len(rows) == 1200
+    assert rows[9] == {"bet_number": 10, "profit": -0.5,
+                       "api_raw": json.dumps({"bet": {"id": 10}}, separators=(",", ":")),
+                       "strategy_state": json.dumps({"step": 2}, separators=(",", ":"))}
+
+
+@pytest.mark.parametrize("name", ["bets.ddbc", "bets.ddbc.xz"])
+def test_columnar_round_trip(db, tmp_path, name):
+    out = tmp_path / name
+    assert db.export(out, session_id="s1", chunk_size=500) == 1200
+    chunks = list(read_columnar(out))
+    assert [len(c["bet_number"]) for c in chunks] == [500, 500, 200]
+    bet_numbers = [int(v) for c in chunks for v in c["bet_number"]]
+    assert bet_numbers == list(range(1, 1201))
+    assert sum(float(v) for c in chunks for v in c["profit"]) == pytest.approx(-200.0)
+    assert chunks[0]["symbol"][0] == "BTC"
+    assert chunks[0]["target"][0] == pytest.approx(49.5)
+
+
+def test_unknown_column_and_format_rejected(db, tmp_path):
+    with pytest.raises(ValueError):
+        db.export(tmp_path / "x.csv", columns=["nope"])
+    with pytest.raises(ValueError):
+        db.export(tmp_path / "x.csv", format="parquet")
+
+
+def test_infer_format():
+    assert infer_format(Path("a.csv.gz")) == ("csv", "gzip")
+    assert infer_format(Path("a.ndjson")) == ("ndjson", None)
+    assert infer_format(Path("a.ddbc.xz")) == ("columnar", "xz")
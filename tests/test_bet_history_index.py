@@ -0,0 +1,107 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from duckdice_api.endpoints import history as history_module  # noqa: E402
+from duckdice_api.endpoints.history import BetHistoryManager  # noqa: E402
+from duckdice_api.models.bet import BetResult  # noqa: E402
+
+DAY0 = datetime(2026, 3, 1)
+
+
+def _bet(i, ts, rng):
+    win = rng.random() < 0.45
+    amount = Decimal(rng.randint(1, 1000)) / 10 ** 8
+    return BetResult(
+        bet_id=str(i), timestamp=ts, currency=rng.choice(["BTC", "DOGE", "LTC"]),
+        amount=amount, chance=Decimal("49.5"), target=Decimal("50.5"),
+        result=Decimal(rng.randint(0, 9999)) / 100, payout=Decimal("2"),
+        profit=amount if win else -amount, is_win=win,
+        game_type="range" if i % 7 == 0 else "dice",
+    )
+
+
+@pytest.fixture
+def manager(tmp_path: Path):
+    rng = random.Random(5)
+    mgr = BetHistoryManager(storage_dir=tmp_path)
+    i = 0
+    for day in range(4):
+        for n in range(1300):
+            i += 1
+            mgr.add_bet(_bet(i, DAY0 + timedelta(days=day, seconds=n * 60), rng))
+    return mgr
+
+
+def _reference(mgr, start, end, currency=None, game_type=None, wins_only=None):
+    bets = mgr.load_history(start, end)
+    return [
+        b for b in bets
+        if start <= b.timestamp <= end
+        and (currency is None or b.currency == currency)
+        and (game_type is None or b.game_type == game_type)
+        and (wins_only is None or b.is_win == wins_only)
+    ]
+
+
+FILTERS = [
+    {},
+    {"currency": "DOGE"},
+    {"game_type": "range"},
+    {"wins_only": True},
+    {"currency": "BTC", "wins_only": False, "game_type": "dice"},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_pages_match_full_load(manager, filters):
+    # Partial first and last days exercise block-level parsing
+    start, end = DAY0 + timedelta(hours=5), DAY0 + timedelta(days=3, hours=2)
+    expected = _reference(manager, start, end, **filters)
+    assert manager.count_bets(start, end, **filters) == len(expected)
+    for page in (1, 7, 30):
+        result = manager.get_history(page=page, page_size=100, start_date=start, end_date=end, **filters)
+        assert result.bets == expected[(page - 1) * 100: page * 100]
+        assert result.total == len(expected)
+        assert result.has_next == (page * 100 < len(expected))
+    assert list(manager.iter_bets(start, end, offset=250, **filters)) == expected[250:]
+
+
+def test_page_seek_parses_only_the_page(manager, monkeypatch):
+    start, end = DAY0, DAY0 + timedelta(days=4)
+    manager.count_bets(start, end)  # build the indexes
+    built = []
+    original = BetHistoryManager._to_bet_result
+    monkeypatch.setattr(BetHistoryManager, "_to_bet_result",
+                        staticmethod(lambda d: built.append(1) or original(d)))
+    page = manager.get_history(page=20, page_size=50, start_date=start, end_date=end, currency="LTC")
+    assert len(page.bets) == 50
+    assert len(built) == 50
+    assert all(b.currency == "LTC" for b in page.bets)
+
+
+def test_index_extends_after_appends(manager, tmp_path: Path):
+    day = tmp_path / "2026-03-02.jsonl"
+    before = manager.get_day_index(day)["count"]
+    rng = random.Random(9)
+    for n in range(10):
+        manager.add_bet(_bet(10_000 + n, DAY0 + timedelta(days=1, hours=23, minutes=n), rng))
+    index = manager.get_day_index(day)
+    assert index["count"] == before + 10
+    assert index["size"] == day.stat().st_size
+    assert sum(b["count"] for b in index["blocks"]) == index["count"]
+    assert day.with_suffix(history_module.INDEX_SUFFIX).exists()
+
+
+def test_stale_or_corrupt_index_is_rebuilt(manager, tmp_path: Path):
+    day = tmp_path / "2026-03-03.jsonl"
+    expected = manager.get_day_index(day)
+    day.with_suffix(history_module.INDEX_SUFFIX).write_text("{not json")
+    assert manager.get_day_index(day) == expected
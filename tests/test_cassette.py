@@ -0,0 +1,157 @@
+import json
+import os
+import random
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.cassette_bench import STAGES, bench_cassette  # noqa: E402
+from betbot_engine.engine import EngineConfig, run_auto_bet  # noqa: E402
+from duckdice_api.api import DuckDiceAPI, DuckDiceConfig  # noqa: E402
+from duckdice_api.cassette import (  # noqa: E402
+    Cassette, CassetteExhausted, CassetteMismatch, RecordingAdapter, ReplayAdapter,
+)
+
+
+class FakeServer(BaseAdapter):
+    """Answers user-info and dice bets like the real API, without a network."""
+
+    def __init__(self, balance="1", seed=3):
+        super().__init__()
+        self.balance = Decimal(balance)
+        self.rng = random.Random(seed)
+
+    def send(self, request, **kwargs):
+        if request.url.split("?")[0].endswith("bot/user-info"):
+            body = {"balances": [{"currency": "BTC", "main": str(self.balance)}]}
+        else:
+            bet = json.loads(request.body)
+            amount, chance = Decimal(bet["amount"]), Decimal(bet["chance"])
+            number = self.rng.randrange(10000)
+            win = number >= 10000 - chance * 100 if bet["isHigh"] else number < chance * 100
+            payout = (Decimal(99) / chance).quantize(Decimal("0.0001"))
+            profit = amount * (payout - 1) if win else -amount
+            self.balance += profit
+            body = {"bet": {"result": bool(win), "number": number, "profit": str(profit),
+                            "payout": str(payout), "chance": str(chance)},
+                    "user": {"balance": str(self.balance)}}
+        response = requests.Response()
+        response.status_code, response.url, response.request = 200, request.url, request
+        response._content = json.dumps(body).encode()
+        return response
+
+    def close(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def min_bet_cache(tmp_path: Path, monkeypatch):
+    # Live sessions probe the coin's min bet unless it is cached under ./data
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "min_bets.json").write_text('{"BTC": "0.00000001"}')
+
+
+def _session(tmp_path: Path, transport, name: str, bets=30):
+    records = []
+    api = DuckDiceAPI(DuckDiceConfig(api_key="secret-key", transport=transport, fallback_domains=[]))
+    cfg = EngineConfig(symbol="BTC", dry_run=False, max_bets=bets, seed=7, delay_ms=0, jitter_ms=0,
+                       stop_loss=-1.0, take_profit=None, db_log=False, log_dir=str(tmp_path / name))
+    run_auto_bet(api, "unified-martingale", {}, cfg,
+                 json_sink=lambda r: records.append((r["bet"]["amount"], r["result"]["number"], r["balance"]))
+                 if r.get("event") == "bet" else None)
+    api.session.close()
+    return records
+
+
+def _record(tmp_path: Path, bets=30) -> Path:
+    path = tmp_path / "session.cassette"
+    recorder = RecordingAdapter(path, FakeServer(), meta={"strategy": "unified-martingale", "seed": 7})
+    _session(tmp_path, recorder, "recorded", bets)
+    return path
+
+
+def test_replay_reproduces_the_recorded_session(tmp_path: Path):
+    path = tmp_path / "session.cassette"
+    recorder = RecordingAdapter(path, FakeServer(), meta={"strategy": "unified-martingale"})
+    recorded = _session(tmp_path, recorder, "recorded")
+
+    cassette = Cassette.load(path)
+    assert cassette.meta["strategy"] == "unified-martingale"
+    assert len(cassette.interactions) == 31 and cassette.bets == 30
+    assert "secret-key" not in path.read_text()
+
+    replay = ReplayAdapter(path, speed=0)
+    assert _session(tmp_path, replay, "replayed") == recorded
+    assert replay.remaining == 0 and replay.waited == 0.0
+    with pytest.raises(CassetteExhausted):
+        DuckDiceAPI(DuckDiceConfig(api_key="k", transport=replay, fallback_domains=[])).get_user_info()
+
+
+def test_transport_errors_are_recorded_without_the_api_key(tmp_path: Path):
+    class Unreachable(BaseAdapter):
+        def send(self, request, **kwargs):
+            raise requests.exceptions.ConnectionError(
+                f"Max retries exceeded with url: {request.path_url} (Caused by NewConnectionError)"
+            )
+
+        def close(self):
+            pass
+
+    path = tmp_path / "errors.cassette"
+    session = requests.Session()
+    session.mount("https://", RecordingAdapter(path, Unreachable()))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get("https://duckdice.io/api/bot/user-info?api_key=secret-key&x=1")
+    session.close()
+
+    assert "secret-key" not in path.read_text()
+    (record,) = Cassette.load(path).interactions
+    assert record["error"] == "ConnectionError"
+    assert "api_key=REDACTED&x=1" in record["message"]
+
+    replay = requests.Session()
+    replay.mount("https://", ReplayAdapter(path, speed=0))
+    with pytest.raises(requests.exceptions.ConnectionError, match="REDACTED"):
+        replay.get("https://duckdice.io/api/bot/user-info?api_key=other")
+
+
+def test_replay_checks_request_order_and_paces_round_trips(tmp_path: Path):
+    cassette = Cassette({"strategy": "paroli"}, [
+        {"method": "GET", "path": "/api/bot/user-info", "body": None, "status": 200,
+         "response": '{"balances": []}', "elapsed": 0.02},
+    ] * 3)
+    cassette.save(tmp_path / "c.cassette")
+
+    def calls(speed):
+        adapter = ReplayAdapter(tmp_path / "c.cassette", speed=speed)
+        api = DuckDiceAPI(DuckDiceConfig(api_key="k", transport=adapter, fallback_domains=[]))
+        for _ in range(3):
+            assert api.get_user_info() == {"balances": []}
+        return adapter.waited
+
+    assert calls(1.0) == pytest.approx(0.06)
+    assert calls(4.0) == pytest.approx(0.015)
+    assert calls(0) == 0.0
+
+    api = DuckDiceAPI(DuckDiceConfig(api_key="k", transport=ReplayAdapter(cassette, speed=0),
+                                     fallback_domains=[]))
+    with pytest.raises(CassetteMismatch):
+        api.play_dice("BTC", "0.1", "49.5", True)
+
+
+def test_bench_reports_throughput_and_stages(tmp_path: Path):
+    path = _record(tmp_path)
+    results = bench_cassette(path, repeat=1, db_log=True, checkpoint_every=5, work_dir=tmp_path / "bench")
+    assert results["strategy"] == "unified-martingale" and results["bets"] == 30
+    assert results["requests_replayed"] == 31 and results["network_seconds"] == 0.0
+    assert results["bets_per_sec"] > 0 and results["stop_reason"] == "cassette_end"
+    assert set(results["stages"]) == set(STAGES)
+    assert sum(s["share"] for s in results["stages"].values()) == pytest.approx(1.0, abs=0.01)
+    assert all(results["stages"][name]["share"] > 0 for name in ("client", "strategy", "logging", "checkpoint"))
@@ -0,0 +1,71 @@
+import os
+import random
+import sys
+from array import array
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.counterfactual import SKIP_STRATEGIES, Lane, build_lanes, evaluate_lanes  # noqa: E402
+from betbot_engine.html_report import build_report  # noqa: E402
+from betbot_engine.replay import replay_strategy  # noqa: E402
+
+
+class CountingRolls:
+    """Roll buffer that counts element reads."""
+
+    def __init__(self, rolls):
+        self.rolls, self.reads = rolls, 0
+
+    def __len__(self):
+        return len(self.rolls)
+
+    def __getitem__(self, i):
+        self.reads += 1
+        return self.rolls[i]
+
+
+def _rolls(n, seed=5):
+    rng = random.Random(seed)
+    return array("H", (rng.randrange(10000) for _ in range(n)))
+
+
+def test_build_lanes_expands_param_sets():
+    lanes = build_lanes(["paroli", "oscars-grind"], {"paroli": [{}, {"target_streak": 2}]})
+    assert [lane.label for lane in lanes] == ["paroli#1", "paroli#2", "oscars-grind"]
+    assert lanes[1].params == {"target_streak": 2}
+    assert [lane.label for lane in build_lanes(["paroli"], {"*": [{"chance": "40"}]})] == ["paroli"]
+
+    every = {lane.strategy for lane in build_lanes()}
+    assert every and not every & SKIP_STRATEGIES
+    assert "paroli" not in {lane.strategy for lane in build_lanes(exclude=["paroli"])}
+
+
+def test_single_pass_matches_separate_replays():
+    rolls = _rolls(3000)
+    counting = CountingRolls(rolls)
+    lanes = build_lanes(["paroli", "unified-martingale"], {"paroli": [{}, {"target_streak": 2}]})
+    results = evaluate_lanes(lanes, counting, window=1000, starting_balance=Decimal("1"))
+    assert counting.reads == len(rolls)
+
+    for lane, result in zip(lanes, results):
+        assert result.strategy_name == lane.label and result.n_runs == 3
+        separate = [replay_strategy(lane.strategy, lane.params, rolls[w:w + 1000],
+                                    starting_balance=Decimal("1")).run for w in (0, 1000, 2000)]
+        assert result.roi_values == [run.roi for run in separate]
+        assert result.max_loss_streak_values == [run.max_loss_streak for run in separate]
+        assert result.max_drawdown_values == [run.max_drawdown for run in separate]
+        assert all(len(curve) <= 202 for curve in result.equity_curves)
+
+
+def test_failing_lane_counts_as_total_loss_and_reports(tmp_path: Path):
+    errors = {}
+    lanes = [Lane("paroli", "paroli"), Lane("sniper", "balance-sweep-sniper")]
+    results = evaluate_lanes(lanes, _rolls(500), window=250, errors=errors)
+    assert list(errors) == ["sniper"] and len(errors["sniper"]) == 2
+    assert results[1].roi_values == [-100.0, -100.0]
+    assert results[0].n_runs == 2
+
+    report = build_report(results, str(tmp_path / "report.html"))
+    assert "paroli" in Path(report).read_text()
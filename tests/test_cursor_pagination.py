@@ -0,0 +1,117 @@
+import os
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from duckdice_api.endpoints.history import BetHistoryManager  # noqa: E402
+from duckdice_api.models.bet import BetResult  # noqa: E402
+from duckdice_api.utils import CursorPaginator, decode_cursor, encode_cursor  # noqa: E402
+
+
+def test_cursor_tokens_round_trip_and_reject_garbage():
+    for position in (None, 42, ["2026-03-01", 1024], {"id": 7}):
+        token = encode_cursor(position)
+        assert "=" not in token and "/" not in token
+        assert decode_cursor(token) == position
+    with pytest.raises(ValueError):
+        decode_cursor("%%%not-a-cursor")
+
+
+def test_generator_pages_are_lazy():
+    pulled = []
+
+    def source():
+        for i in range(1, 1_000_001):
+            pulled.append(i)
+            yield i
+
+    paginator = CursorPaginator.from_iterable(source, page_size=10)
+    first = paginator.get_page()
+    assert first.items == list(range(1, 11)) and first.has_next and first.total is None
+    second = paginator.get_page(first.next_cursor)
+    assert second.items == list(range(11, 21))
+    # One look-ahead item per page, nothing else materialised
+    assert len(pulled) == 11 + 21
+
+
+def test_pages_cover_everything_once():
+    paginator = CursorPaginator.from_iterable(lambda: iter(range(95)), page_size=10, count=lambda: 95)
+    pages = list(paginator.pages())
+    assert [len(p.items) for p in pages] == [10] * 9 + [5]
+    assert sum((p.items for p in pages), []) == list(range(95))
+    assert pages[-1].next_cursor is None and pages[0].total == 95
+
+
+def test_keyset_over_sqlite_query():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+    conn.executemany("INSERT INTO t (v) VALUES (?)", [(f"v{i}",) for i in range(250)])
+
+    def fetch_after(last_id, limit):
+        return conn.execute("SELECT id, v FROM t WHERE id > ? ORDER BY id LIMIT ?",
+                            (last_id or 0, limit)).fetchall()
+
+    paginator = CursorPaginator.from_keyset(fetch_after, key=lambda row: row[0], page_size=100)
+    pages = list(paginator.pages())
+    assert [len(p.items) for p in pages] == [100, 100, 50]
+    assert decode_cursor(pages[0].next_cursor) == 100
+
+
+def test_bet_database_pages(tmp_path: Path):
+    db = BetDatabase(tmp_path / "p.db")
+    for session_id in ("s1", "s2"):
+        db.start_session(session_id, "paroli", "BTC", starting_balance=Decimal("10"))
+        for i in range(1, 131):
+            db.log_bet(session_id, {"symbol": "BTC", "strategy": "paroli", "amount": "0.1", "chance": "50"},
+                       {"win": i % 2 == 0, "profit": "0.1", "number": i}, i, Decimal("10"))
+    db.flush()
+
+    page = db.bet_page(page_size=60, session_id="s2", columns=["bet_number", "roll"])
+    seen = []
+    while True:
+        assert page.total == 130
+        assert all(set(row) == {"bet_number", "roll"} for row in page.items)
+        seen += [row["bet_number"] for row in page.items]
+        if not page.has_next:
+            break
+        page = db.bet_page(cursor=page.next_cursor, page_size=60, session_id="s2",
+                           columns=["bet_number", "roll"])
+    assert seen == list(range(1, 131))
+    assert db.bet_page(page_size=5, symbol="BTC").total is None
+    db.close()
+
+
+def test_history_cursor_pages_match_offset_pages(tmp_path: Path):
+    mgr = BetHistoryManager(storage_dir=tmp_path)
+    day0 = datetime(2026, 3, 1)
+    for i in range(1500):
+        mgr.add_bet(BetResult(
+            bet_id=str(i), timestamp=day0 + timedelta(minutes=3 * i), currency="BTC" if i % 3 else "DOGE",
+            amount=Decimal("1"), chance=Decimal("50"), target=Decimal("50"), result=Decimal("10"),
+            payout=Decimal("2"), profit=Decimal("1"), is_win=i % 2 == 0,
+        ))
+    start, end = day0 + timedelta(hours=7), day0 + timedelta(days=3)
+    filters = dict(currency="BTC", start_date=start, end_date=end)
+
+    page, cursor_pages = mgr.get_history(page=1, page_size=100, **filters), []
+    while True:
+        cursor_pages.append(page.bets)
+        if not page.next_cursor:
+            break
+        page = mgr.get_history(page_size=100, cursor=page.next_cursor, **filters)
+    offset_pages = [mgr.get_history(page=n, page_size=100, **filters).bets
+                    for n in range(1, len(cursor_pages) + 1)]
+    assert cursor_pages == offset_pages
+    assert sum(map(len, cursor_pages)) == page.total
+
+    exact = mgr.cursor_paginator(page_size=100, **filters).get_page()
+    approx = mgr.cursor_paginator(page_size=100, approximate_total=True, **filters).get_page()
+    assert approx.items == exact.items and approx.total_is_estimate
+    assert abs(approx.total - exact.total) <= exact.total * 0.1
@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine import db_bench  # noqa: E402
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+
+
+def test_generated_dataset_is_consistent(tmp_path: Path):
+    info = db_bench.generate_dataset(tmp_path / "g.db", 12_000, bets_per_session=5_000)
+    assert info["sessions"] == 3
+
+    db = BetDatabase(tmp_path / "g.db")
+    assert db.get_statistics()["total_bets"] == 12_000
+    sessions = db.get_sessions()
+    assert sorted(s["total_bets"] for s in sessions) == [2_000, 5_000, 5_000]
+    assert {s["symbol"] for s in sessions} == {"BTC", "DOGE", "LTC"}
+    # Aggregates and rollups were rebuilt from the raw rows
+    scanned = db.get_statistics(since="2000-01-01", exact=True)
+    assert db.get_statistics(exact=True)["total_profit"] == scanned["total_profit"]
+    assert sum(b["bets"] for b in db.get_timeline("1h")) == scanned["total_bets"]
+    db.close()
+
+
+def test_suite_emits_json_with_every_section(tmp_path: Path):
+    results = db_bench.run_suite(sizes=[3_000], work_dir=tmp_path, insert_bets=100, repeat=2,
+                                 read_seconds=0)
+    json.dumps(results)
+    assert set(results["inserts"]) >= {"sync-1", "sync-batched", "background"}
+    dataset = results["datasets"]["3000"]
+    assert dataset["file_bytes"] > 0
+    assert {"get_statistics", "get_sessions", "bet_page_deep", "get_timeline_1h"} <= set(dataset["queries"])
+    assert set(dataset["exports"]) == {"csv", "ndjson", "columnar"}
+    assert all(e["rows"] == 3_000 for e in dataset["exports"].values())
+    assert list(tmp_path.glob("synthetic-*")) == []
+
+
+def test_compare_results_flags_only_regressions():
+    baseline = {"meta": {"created": 1}, "inserts": {"background": {"bets_per_sec": 1000, "seconds": 1.0}},
+                "datasets": {"10": {"queries": {"q": {"p50_ms": 1.0, "count": 5}}, "file_bytes": 100}}}
+    current = {"meta": {"created": 2}, "inserts": {"background": {"bets_per_sec": 700, "seconds": 1.1}},
+               "datasets": {"10": {"queries": {"q": {"p50_ms": 0.5, "count": 9}}, "file_bytes": 200}}}
+    regressions = {r["metric"] for r in db_bench.compare_results(baseline, current)}
+    assert regressions == {"inserts.background.bets_per_sec", "datasets.10.file_bytes"}
@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import stat
+import sys
+from multiprocessing import AuthenticationError
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from betbot_engine.db_service import DatabaseService, ServiceWriter, default_address, key_file  # noqa: E402
+from betbot_engine.engine import AutoBetEngine, EngineConfig  # noqa: E402
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix socket tests")
+
+
+class DummyAPI:
+    def get_user_info(self):
+        return {"balances": [{"currency": "BTC", "main": "100.0"}]}
+
+
+def _produce(db_path, session_id, bets):
+    db = BetDatabase(db_path, service="auto")
+    db.start_session(session_id, "paroli", "BTC", simulation_mode=True, starting_balance=Decimal("1"))
+    for i in range(1, bets + 1):
+        db.log_bet(session_id, {"symbol": "BTC", "strategy": "paroli", "amount": "0.001", "chance": "50"},
+                   {"win": i % 2 == 0, "profit": "0.001" if i % 2 == 0 else "-0.001", "number": i},
+                   i, Decimal("1"), simulation_mode=True)
+    db.end_session(session_id, Decimal("1"), "max_bets", bets, bets // 2, bets - bets // 2)
+    db.close()
+
+
+@pytest.fixture
+def service(tmp_path: Path):
+    service = DatabaseService(tmp_path / "shared.db", address=default_address(tmp_path / "shared.db"))
+    with service:
+        yield service
+
+
+def test_concurrent_processes_share_one_writer(service, tmp_path: Path):
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_produce, args=(service.db.db_path, f"p{n}", 400)) for n in range(4)]
+    for proc in procs:
+        proc.start()
+    _produce(service.db.db_path, "local", 400)
+    for proc in procs:
+        proc.join(60)
+        assert proc.exitcode == 0
+
+    db = BetDatabase(service.db.db_path, service=service.address)
+    db.flush()
+    assert db.get_statistics()["total_bets"] == 2000
+    sessions = {s["session_id"]: s for s in db.get_sessions()}
+    assert len(sessions) == 5
+    assert all(s["stop_reason"] == "max_bets" and s["total_bets"] == 400 for s in sessions.values())
+    stats = service.writer_stats
+    assert stats["written"] == 2000 and stats["dropped"] == 0
+    # Rows from all producers shared transactions
+    assert stats["batches"] < 2000
+    db.close()
+
+
+def test_read_snapshot_is_stable_while_service_writes(service):
+    path = service.db.db_path
+    producer = BetDatabase(path, service=service.address)
+    reader = BetDatabase(path, service=service.address)
+    _produce(path, "first", 50)
+
+    with reader.read_snapshot():
+        before = reader.get_statistics()["total_bets"]
+        _produce(path, "second", 50)
+        producer.flush()
+        assert reader.get_statistics()["total_bets"] == before == 50
+        assert len(reader.get_session_bets("second")) == 0
+    assert reader.get_statistics()["total_bets"] == 100
+    producer.close()
+    reader.close()
+
+
+def test_producers_never_write_and_maintenance_runs_remotely(service):
+    db = BetDatabase(service.db.db_path, service=service.address)
+    with pytest.raises(ValueError):
+        db.set_log_offset("x.jsonl", 10)
+    assert db.apply_retention(rollup_days={"1m": 1}) == {"bets": 0, "rollups": 0}
+    with pytest.raises(ValueError):
+        db._writer.call("compact_payloads")
+    db.close()
+
+
+def test_engine_logs_through_service(service, tmp_path: Path):
+    cfg = EngineConfig(symbol="BTC", dry_run=True, max_bets=25, seed=3, take_profit=None,
+                       stop_loss=-0.99, delay_ms=0, jitter_ms=0, log_dir=str(tmp_path / "logs"),
+                       db_path=str(service.db.db_path), db_service=service.address)
+    AutoBetEngine(DummyAPI(), cfg).run(strategy_name="paroli", params={})
+
+    (session,) = BetDatabase(service.db.db_path, service=service.address).get_sessions()
+    assert session["total_bets"] == 25
+    assert service.stats["clients"] >= 1
+
+
+def test_socket_dir_and_key_are_private(service):
+    folder = os.path.dirname(service.address)
+    assert stat.S_IMODE(os.stat(folder).st_mode) == 0o700
+    key = key_file(service.address)
+    assert stat.S_IMODE(os.stat(key).st_mode) == 0o600
+
+    with pytest.raises(AuthenticationError):
+        ServiceWriter(service.address, authkey=b"duckdice-bet-db")
+    os.chmod(key, 0o644)
+    with pytest.raises(RuntimeError, match="not private"):
+        ServiceWriter(service.address)
+    os.chmod(key, 0o600)
+    ServiceWriter(service.address).close()
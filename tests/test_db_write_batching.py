@@ -67,3 +67,63 @@ def test_bet_database_flush_persists_batched_writes(tmp_path: Path):
         losses=3,
     )
     db.close()
+
+
+def _log(db, session_id, i, **result):
+    db.log_bet(
+        session_id=session_id,
+        bet_data={"symbol": "BTC", "strategy": "test-strat", "amount": "0.00000001",
+                  "chance": "49.5", "game": "dice", "is_high": True},
+        result_data={"win": i % 2 == 0, "profit": "0.00000001", "number": 1234 + i,
+                     "timestamp": f"2026-03-21T00:00:{i:02d}", "api_raw": {}, **result},
+        bet_number=i,
+        balance=Decimal("100"),
+        simulation_mode=True,
+    )
+
+
+def test_background_writer_batches_and_flushes_in_order(tmp_path: Path):
+    db = BetDatabase(tmp_path / "bg.db", commit_every=8, background_writes=True)
+    db.start_session("s1", "test-strat", "BTC", simulation_mode=True,
+                     starting_balance=Decimal("100"))
+    for i in range(1, 41):
+        _log(db, "s1", i)
+    db.end_session("s1", Decimal("101"), "done", total_bets=40, wins=20, losses=20)
+    db.flush()
+
+    bets = db.get_session_bets("s1")
+    assert [b["bet_number"] for b in bets] == list(range(1, 41))
+    session = db.get_sessions()[0]
+    assert session["stop_reason"] == "done"
+    assert session["profit"] == 1.0
+
+    stats = db.writer_stats
+    assert stats["queued"] == stats["written"] == 40
+    assert stats["batches"] >= 40 // 8
+    db.close()
+
+
+def test_background_writer_backpressure_and_close_drains(tmp_path: Path):
+    db = BetDatabase(tmp_path / "bp.db", commit_every=4, background_writes=True, queue_size=2)
+    db.start_session("s1", "test-strat", "BTC")
+    for i in range(1, 201):
+        _log(db, "s1", i)
+    db.close()
+
+    reader = BetDatabase(tmp_path / "bp.db")
+    assert len(reader.get_session_bets("s1")) == 200
+    assert db.writer_stats["max_depth"] <= 2
+
+
+def test_background_writer_drops_only_bad_rows(tmp_path: Path):
+    db = BetDatabase(tmp_path / "bad.db", commit_every=50, background_writes=True)
+    db.start_session("s1", "test-strat", "BTC")
+    _log(db, "s1", 1)
+    _log(db, "s1", 2, profit="not-a-number")
+    _log(db, "s1", 3)
+    db.flush()
+
+    assert [b["bet_number"] for b in db.get_session_bets("s1")] == [1, 3]
+    assert db.writer_stats["dropped"] == 1
+    assert isinstance(db._writer.last_error, ValueError)
+    db.close()
@@ -0,0 +1,144 @@
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from betbot_engine.engine import AutoBetEngine, EngineConfig  # noqa: E402
+from betbot_engine.log_ingest import SessionLogIngestor, ingest_logs  # noqa: E402
+
+COLUMNS = ("bet_number", "amount", "chance", "roll", "won", "profit", "balance", "loss_streak")
+
+
+class DummyAPI:
+    def get_user_info(self):
+        return {"balances": [{"currency": "BTC", "main": "100.0"}]}
+
+
+def _run(tmp_path: Path, name: str, db_mode: str, max_bets: int = 40):
+    cfg = EngineConfig(
+        symbol="BTC", dry_run=True, max_bets=max_bets, seed=2024,
+        take_profit=None, stop_loss=-0.99, delay_ms=0, jitter_ms=0,
+        log_dir=str(tmp_path / name), db_path=str(tmp_path / f"{name}.db"), db_mode=db_mode,
+    )
+    AutoBetEngine(DummyAPI(), cfg).run(strategy_name="paroli", params={})
+    return tmp_path / f"{name}.db", next((tmp_path / name).glob("*.jsonl"))
+
+
+def _rows(db: BetDatabase):
+    (session,) = db.get_sessions()
+    bets = db.get_session_bets(session["session_id"])
+    return session, [tuple(b[c] for c in COLUMNS) for b in bets]
+
+
+def test_log_mode_matches_direct_mode(tmp_path: Path):
+    direct_db, _ = _run(tmp_path, "direct", "direct")
+    log_db, _ = _run(tmp_path, "log", "log")
+
+    direct_session, direct_rows = _rows(BetDatabase(direct_db))
+    log_session, log_rows = _rows(BetDatabase(log_db))
+    assert len(log_rows) == 40
+    assert log_rows == direct_rows
+    for key in ("stop_reason", "total_bets", "wins", "losses", "ending_balance", "strategy_name"):
+        assert log_session[key] == direct_session[key]
+
+
+def test_ingest_logs_rebuilds_and_is_idempotent(tmp_path: Path):
+    log_db, log_file = _run(tmp_path, "log", "log", max_bets=25)
+    _, expected = _rows(BetDatabase(log_db))
+
+    rebuilt = BetDatabase(tmp_path / "rebuilt.db")
+    assert ingest_logs(rebuilt, [log_file.parent])["bets"] == 25
+    assert ingest_logs(rebuilt, [log_file.parent])["bets"] == 0
+    assert _rows(rebuilt)[1] == expected
+    assert rebuilt.get_statistics()["total_bets"] == 25
+
+
+def test_tailing_resumes_after_partial_lines_and_restarts(tmp_path: Path):
+    _, log_file = _run(tmp_path, "src", "log", max_bets=30)
+    lines = log_file.read_bytes().splitlines(keepends=True)
+    tail = tmp_path / "tail.jsonl"
+    db = BetDatabase(tmp_path / "tail.db")
+
+    # First 10 lines plus half of the 11th, as if the engine were mid-write
+    tail.write_bytes(b"".join(lines[:10]) + lines[10][:7])
+    first = SessionLogIngestor(db, tail)
+    first.poll()
+    ingested = first.bets
+
+    # The ingestor dies; the engine finishes the log; a new ingestor resumes
+    tail.write_bytes(b"".join(lines))
+    second = SessionLogIngestor(db, tail)
+    assert second.offset == sum(len(line) for line in lines[:10])
+    second.poll()
+    db.close()
+
+    db = BetDatabase(tmp_path / "tail.db")
+    assert ingested + second.bets == 30
+    assert db.get_statistics()["total_bets"] == 30
+    (session,) = db.get_sessions()
+    assert session["stop_reason"] == json.loads(lines[-2])["stop_reason"]
+    assert session["total_bets"] == 30
+
+
+@pytest.mark.parametrize("commit_every", [1, 1000])
+def test_malformed_record_is_skipped_without_duplicates(tmp_path: Path, commit_every):
+    _, log_file = _run(tmp_path, "src", "log", max_bets=5)
+    lines = log_file.read_bytes().splitlines(keepends=True)
+    start = next(i for i, line in enumerate(lines) if b'"event": "bet"' in line)
+    bad = json.loads(lines[start + 3])
+    del bad["bets_done"]
+    lines[start + 3] = (json.dumps(bad) + "\n").encode()
+    broken = tmp_path / "broken.jsonl"
+    broken.write_bytes(b"".join(lines))
+
+    db = BetDatabase(tmp_path / "broken.db", commit_every=commit_every)
+    ingestor = SessionLogIngestor(db, broken)
+    for _ in range(3):
+        ingestor.poll()
+    assert ingestor.offset == broken.stat().st_size
+    assert ingestor.errors == 1 and isinstance(ingestor.last_error, KeyError)
+    assert ingestor.bets == 4
+    db.close()
+
+    db = BetDatabase(tmp_path / "broken.db")
+    assert db.get_statistics()["total_bets"] == 4
+    (session,) = db.get_sessions()
+    assert [b["bet_number"] for b in db.get_session_bets(session["session_id"])] == [1, 2, 3, 5]
+    db.close()
+
+
+def test_failed_batch_is_rolled_back_before_retry(tmp_path: Path, monkeypatch):
+    _, log_file = _run(tmp_path, "src", "log", max_bets=6)
+    db = BetDatabase(tmp_path / "retry.db", commit_every=1000)
+    ingestor = SessionLogIngestor(db, log_file)
+    log_bet = db.log_bet
+    calls = []
+
+    def flaky(**kwargs):
+        calls.append(kwargs["bet_number"])
+        if len(calls) == 4:
+            raise sqlite3.OperationalError("database is locked")
+        log_bet(**kwargs)
+
+    monkeypatch.setattr(db, "log_bet", flaky)
+    with pytest.raises(sqlite3.OperationalError):
+        ingestor.poll()
+    assert ingestor.bets == 0
+    assert ingestor.poll()
+    assert ingestor.bets == 6 and ingestor.errors == 0
+    db.close()
+
+    assert BetDatabase(tmp_path / "retry.db").get_statistics()["total_bets"] == 6
+
+
+def test_background_database_rejected(tmp_path: Path):
+    db = BetDatabase(tmp_path / "bg.db", background_writes=True)
+    with pytest.raises(ValueError):
+        SessionLogIngestor(db, tmp_path / "x.jsonl")
+    db.close()
@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.monte_carlo import MonteCarloEngine, derive_seed  # noqa: E402
+
+
+def test_same_seed_reproduces_results_despite_global_rng_use():
+    first = MonteCarloEngine(seed=7).simulate(None, {}, rounds=200)
+    random.seed(12345)
+    random.random()
+    second = MonteCarloEngine(seed=7).simulate(None, {}, rounds=200)
+
+    assert first.equity_curve == second.equity_curve
+    assert first.final_balance == second.final_balance
+
+
+def test_engine_does_not_touch_global_rng():
+    random.seed(99)
+    expected = random.random()
+
+    random.seed(99)
+    MonteCarloEngine(seed=1).simulate(None, {}, rounds=50)
+    assert random.random() == expected
+
+
+def test_successive_simulations_use_independent_substreams():
+    engine = MonteCarloEngine(seed=3)
+    a = engine.simulate(None, {}, rounds=100)
+    b = engine.simulate(None, {}, rounds=100)
+
+    assert a.equity_curve != b.equity_curve
+    assert engine.spawn(2) == [derive_seed(3, 2), derive_seed(3, 3)]
+
+
+def test_batch_simulate_parallel_matches_serial():
+    configs = [{"i": i} for i in range(4)]
+
+    serial = MonteCarloEngine(seed=42).batch_simulate(None, configs, rounds=150, parallel=False)
+    parallel = MonteCarloEngine(seed=42).batch_simulate(
+        None, configs, rounds=150, parallel=True, max_workers=2
+    )
+
+    assert [r.equity_curve for r in serial] == [r.equity_curve for r in parallel]
+    assert len({r.final_balance for r in serial}) == len(configs)
+
+
+def test_batch_simulate_falls_back_to_serial_for_unpicklable_strategy():
+    class LocalStrategy:
+        pass
+
+    configs = [{}, {}]
+    with pytest.warns(RuntimeWarning, match="running the batch serially"):
+        parallel = MonteCarloEngine(seed=5).batch_simulate(
+            LocalStrategy, configs, rounds=100, parallel=True
+        )
+    serial = MonteCarloEngine(seed=5).batch_simulate(LocalStrategy, configs, rounds=100)
+
+    assert [r.equity_curve for r in parallel] == [r.equity_curve for r in serial]
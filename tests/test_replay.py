@@ -0,0 +1,70 @@
+import os
+import sqlite3
+import sys
+from array import array
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from betbot_engine.bet_export import export_bets  # noqa: E402
+from betbot_engine.db_bench import seed_bets  # noqa: E402
+from betbot_engine.engine import _resolve_recorded_bet  # noqa: E402
+from betbot_engine.replay import load_rolls, replay_config, replay_strategy  # noqa: E402
+
+
+@pytest.mark.parametrize("is_high,number,win", [
+    (True, 5050, True), (True, 5049, False), (False, 4949, True), (False, 4950, False),
+])
+def test_dice_resolves_against_recorded_number(is_high, number, win):
+    bet = {"game": "dice", "amount": "1", "chance": "49.5", "is_high": is_high}
+    won, profit, rolled, payout, chance = _resolve_recorded_bet(bet, Decimal("1"), number)
+    assert (won, rolled, chance) == (win, number, "49.5")
+    assert profit == (Decimal(str(float(payout) - 1.0)) if win else Decimal("-1"))
+
+
+def test_range_dice_resolves_against_recorded_number():
+    bet = {"game": "range-dice", "amount": "1", "range": (100, 199), "is_in": True}
+    assert _resolve_recorded_bet(bet, Decimal("1"), 150)[0] is True
+    assert _resolve_recorded_bet(bet, Decimal("1"), 200)[0] is False
+    assert _resolve_recorded_bet({**bet, "is_in": False}, Decimal("1"), 200)[0] is True
+
+
+def test_rolls_load_from_database_and_columnar_export(tmp_path: Path):
+    db = BetDatabase(tmp_path / "h.db")
+    seed_bets(db, 3000, sessions=3)
+    with sqlite3.connect(tmp_path / "h.db") as conn:
+        expected = [int(r) for (r,) in conn.execute("SELECT roll FROM bet_history ORDER BY id")]
+
+    rolls = load_rolls(tmp_path / "h.db")
+    assert isinstance(rolls, array) and rolls.tolist() == expected
+    assert len(load_rolls(tmp_path / "h.db", session_id="bench-1-1")) == 1000
+    assert load_rolls(tmp_path / "h.db", limit=10).tolist() == expected[:10]
+
+    export_bets(db, tmp_path / "h.ddbc")
+    assert sorted(load_rolls(tmp_path / "h.ddbc").tolist()) == sorted(expected)
+    db.close()
+    with pytest.raises(ValueError):
+        load_rolls(tmp_path / "missing.db")
+
+
+def test_replay_follows_the_recorded_stream():
+    # A high bet wins on every 9999, loses on every 0
+    rolls = array("H", [0] * 6 + [9999] * 44)
+    result = replay_strategy("unified-martingale", {"chance": "49.5", "is_high": True}, rolls,
+                             starting_balance=Decimal("1"))
+    summary = result.summary
+    assert summary["bets"] == 50 and summary["stop_reason"] == "rolls_exhausted"
+    assert (summary["wins"], summary["losses"], summary["max_loss_streak"]) == (44, 6, 6)
+    assert summary["max_drawdown"] > 0
+    assert set(summary) >= {"strategy", "symbol", "duration_sec", "starting_balance", "ending_balance", "profit"}
+
+    # Same stream, same outcome; limits still apply
+    assert replay_strategy("unified-martingale", {"chance": "49.5"}, rolls,
+                           starting_balance=Decimal("1")).run == result.run
+    capped = replay_strategy("unified-martingale", {}, rolls, replay_config(max_bets=10),
+                             starting_balance=Decimal("1"))
+    assert (capped.run.bets, capped.run.stop_reason) == (10, "max_bets")
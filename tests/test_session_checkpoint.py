@@ -0,0 +1,98 @@
+import os
+import sys
+from collections import deque
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine import session_checkpoint  # noqa: E402
+from betbot_engine.engine import EngineConfig, run_auto_bet  # noqa: E402
+from betbot_engine.session_checkpoint import SessionCheckpoint, load_checkpoint  # noqa: E402
+
+
+class DummyAPI:
+    def get_user_info(self):
+        return {"balances": [{"currency": "BTC", "main": "100.0"}]}
+
+
+def test_newest_valid_slot_wins_after_torn_write(tmp_path: Path):
+    path = str(tmp_path / "s.ckpt")
+    with SessionCheckpoint(path) as ckpt:
+        for bet in range(1, 4):
+            ckpt.write({"bets_done": bet})
+    assert load_checkpoint(path)["bets_done"] == 3
+
+    # Tear the newest slot (seq 3 lives in slot 1): the previous one is used
+    data = bytearray(Path(path).read_bytes())
+    offset = session_checkpoint._HEADER.size + session_checkpoint.DEFAULT_SLOT_SIZE + 20
+    data[offset] ^= 0xFF
+    Path(path).write_bytes(bytes(data))
+    assert load_checkpoint(path)["bets_done"] == 2
+    assert load_checkpoint(str(tmp_path / "missing.ckpt")) is None
+
+
+def test_checkpoint_grows_past_slot_size(tmp_path: Path):
+    path = str(tmp_path / "s.ckpt")
+    big = {"history": [os.urandom(8).hex() for _ in range(5000)]}
+    with SessionCheckpoint(path, slot_size=1024) as ckpt:
+        ckpt.write({"bets_done": 1})
+        ckpt.write({"bets_done": 2, **big})
+        ckpt.write({"bets_done": 3, **big})
+    loaded = load_checkpoint(path)
+    assert loaded["bets_done"] == 3 and loaded["history"] == big["history"]
+
+
+def test_strategy_attributes_round_trip():
+    class Strategy:
+        pass
+
+    strategy = Strategy()
+    strategy.ctx = object()
+    strategy.base_bet = Decimal("0.001")
+    strategy._step = 4
+    strategy._window = deque([1.5, 2.5], maxlen=3)
+    strategy._pair = (1, "a")
+    strategy._callback = print
+    captured = session_checkpoint.capture_strategy(strategy)
+    assert set(captured) == {"base_bet", "_step", "_window", "_pair"}
+
+    fresh = Strategy()
+    fresh.base_bet, fresh._step, fresh._window, fresh._pair = Decimal("0.002"), 0, deque(maxlen=3), (0, "")
+    checkpoint = {"strategy_attrs": captured,
+                  "strategy_initial": {**captured, "_step": 0, "_window": {"__deque__": [], "maxlen": 3},
+                                       "_pair": {"__tuple__": [0, ""]}}}
+    restored = session_checkpoint.restore_strategy(
+        fresh, checkpoint, session_checkpoint.capture_strategy(fresh))
+    # base_bet changed since the checkpointed session started: the new value wins
+    assert sorted(restored) == ["_pair", "_step", "_window"]
+    assert fresh.base_bet == Decimal("0.002") and fresh._step == 4
+    assert fresh._window == deque([1.5, 2.5], maxlen=3) and fresh._pair == (1, "a")
+
+
+def _run(tmp_path: Path, name: str, max_bets: int, strategy: str, resume_state=None):
+    bets = []
+    cfg = EngineConfig(symbol="BTC", dry_run=True, max_bets=max_bets, seed=21, take_profit=None,
+                       stop_loss=-0.99, delay_ms=0, jitter_ms=0, db_log=False,
+                       log_dir=str(tmp_path / name), checkpoint_path=str(tmp_path / f"{name}.ckpt"),
+                       checkpoint_every=7)
+    run_auto_bet(DummyAPI(), strategy, {}, cfg, resume_state=resume_state,
+                 json_sink=lambda r: bets.append((r["bet"]["amount"], r["result"]["number"], r["balance"]))
+                 if r.get("event") == "bet" else None)
+    return bets
+
+
+@pytest.mark.parametrize("strategy", ["unified-martingale", "oscars-grind"])
+def test_resumed_session_continues_where_it_stopped(tmp_path: Path, strategy):
+    straight = _run(tmp_path, "straight", 60, strategy)
+    first = _run(tmp_path, "first", 24, strategy)
+    checkpoint = load_checkpoint(str(tmp_path / "first.ckpt"))
+    assert checkpoint["bets_done"] == 24 and checkpoint["stop_reason"] == "max_bets"
+
+    # A crash would leave the periodic checkpoint of bet 21; a clean stop writes bet 24
+    resumed = _run(tmp_path, "resumed", 36, strategy, resume_state={
+        "resumed_from": checkpoint["session_id"], "checkpoint": checkpoint})
+    assert first + resumed == straight
+    assert load_checkpoint(str(tmp_path / "resumed.ckpt"))["resumed_from"] == checkpoint["session_id"]
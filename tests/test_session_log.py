@@ -0,0 +1,123 @@
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine import session_log  # noqa: E402
+from betbot_engine.engine import AutoBetEngine, EngineConfig  # noqa: E402
+from betbot_engine.session_log import (  # noqa: E402
+    RECORD_SIZE,
+    SessionLogWriter,
+    iter_events,
+    iter_session_log,
+    read_header,
+    read_session_log,
+    segment_paths,
+)
+
+
+class DummyAPI:
+    def get_user_info(self):
+        return {"balances": [{"currency": "BTC", "main": "100.0"}]}
+
+
+def _bet(i):
+    return {
+        "event": "bet", "time": 1_760_000_000.0 + i, "strategy": "paroli", "symbol": "BTC",
+        "bet": {"game": "dice", "amount": f"0.{i:08d}", "chance": "49.5", "is_high": i % 2 == 0},
+        "result": {"win": i % 3 == 0, "profit": "0.00000010", "balance": "1.5", "number": i * 7 % 10000,
+                   "payout": "1.98", "chance": "49.5", "simulated": True, "api_raw": {"x": "y" * 300}},
+        "balance": f"{100 + i}.5", "loss_streak": i % 4, "bets_done": i,
+        "lottery": {"applied": i == 5},
+    }
+
+
+def test_records_round_trip(tmp_path: Path):
+    base = tmp_path / "s"
+    with SessionLogWriter(base, header={"symbol": "BTC"}) as log:
+        log({"event": "session_start", "symbol": "BTC"})
+        for i in range(1, 11):
+            log(_bet(i))
+        log({"event": "summary", "bets": 10})
+
+    rows = list(iter_session_log(base))
+    assert [r["bet_number"] for r in rows] == list(range(1, 11))
+    assert rows[4]["amount"] == pytest.approx(0.00000005)
+    assert rows[4]["lottery"] and not rows[3]["lottery"]
+    assert rows[2]["win"] and rows[1]["is_high"] and rows[0]["simulated"]
+    assert rows[6]["roll"] == 49 and rows[6]["balance"] == 107.5 and rows[6]["game"] == "dice"
+    assert read_header(base)["symbol"] == "BTC"
+    assert [e["event"] for e in iter_events(base)] == ["session_start", "summary"]
+    # No JSON per bet: a segment is its header plus one fixed-width record per bet
+    (segment,) = segment_paths(base)
+    assert (segment.stat().st_size - 10 * RECORD_SIZE) < 256
+
+
+def test_rotation_compression_and_numpy_reader(tmp_path: Path):
+    np = pytest.importorskip("numpy")
+    base = tmp_path / "s"
+    with SessionLogWriter(base, rotate_bytes=20 * RECORD_SIZE, compress=True, fsync_every=7) as log:
+        for i in range(1, 101):
+            log(_bet(i))
+
+    segments = segment_paths(base)
+    assert len(segments) >= 5
+    assert all(p.name.endswith(".ddlog.gz") for p in segments)
+    cols = read_session_log(segments[2])  # any segment names the whole log
+    assert isinstance(cols["balance"], np.ndarray)
+    assert cols["bet_number"].tolist() == list(range(1, 101))
+    assert cols["win"].sum() == 33
+    assert cols["profit"].sum() == pytest.approx(100 * 1e-7)
+
+
+def test_torn_tail_is_ignored(tmp_path: Path):
+    base = tmp_path / "s"
+    log = SessionLogWriter(base)
+    for i in range(1, 6):
+        log(_bet(i))
+    log.close()
+    (segment,) = segment_paths(base)
+    with open(segment, "ab") as f:
+        f.write(b"\x00" * (RECORD_SIZE // 2))
+    assert len(list(iter_session_log(base))) == 5
+
+
+def test_reader_without_numpy(tmp_path: Path, monkeypatch):
+    base = tmp_path / "s"
+    with SessionLogWriter(base) as log:
+        for i in range(1, 4):
+            log(_bet(i))
+    monkeypatch.setattr(session_log, "HAS_NUMPY", False)
+    cols = read_session_log(base)
+    assert cols["bet_number"] == [1, 2, 3]
+    assert cols["win"] == [False, False, True]
+
+
+def test_engine_binary_log_matches_jsonl(tmp_path: Path):
+    def run(fmt):
+        cfg = EngineConfig(symbol="BTC", dry_run=True, max_bets=30, seed=77, take_profit=None,
+                           stop_loss=-0.99, delay_ms=0, jitter_ms=0, db_log=False,
+                           log_dir=str(tmp_path / fmt), log_format=fmt)
+        AutoBetEngine(DummyAPI(), cfg).run(strategy_name="paroli", params={})
+        return tmp_path / fmt
+
+    jsonl_dir, binary_dir = run("jsonl"), run("binary")
+    (jsonl_file,) = jsonl_dir.glob("*.jsonl")
+    bets = [r for r in map(json.loads, jsonl_file.read_text().splitlines()) if r["event"] == "bet"]
+    (segment,) = binary_dir.glob("*.ddlog")
+    rows = list(iter_session_log(segment))
+
+    assert len(rows) == len(bets) == 30
+    for rec, row in zip(bets, rows):
+        assert row["balance"] == pytest.approx(float(rec["balance"]))
+        assert row["amount"] == pytest.approx(float(rec["bet"]["amount"]))
+        assert row["win"] == rec["result"]["win"]
+        assert row["roll"] == rec["result"]["number"]
+    events = [e["event"] for e in iter_events(segment)]
+    assert events[-1] == "summary"
+    assert not math.isnan(rows[0]["time"])
@@ -0,0 +1,90 @@
+import os
+import signal
+import sys
+import time
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from betbot_engine.engine import EngineConfig  # noqa: E402
+from betbot_engine.sim_kernel import run_dry_session  # noqa: E402
+import strategy_comparison  # noqa: E402
+from strategy_comparison import StrategyComparator  # noqa: E402
+
+
+def _config(seed: int) -> EngineConfig:
+    return EngineConfig(symbol="btc", dry_run=True, max_bets=150, stop_loss=-0.99,
+                        take_profit=10.0, delay_ms=0, jitter_ms=0, seed=seed)
+
+
+def test_kernel_is_reproducible():
+    a = run_dry_session("unified-martingale", {}, _config(5), Decimal("10"))
+    b = run_dry_session("unified-martingale", {}, _config(5), Decimal("10"))
+
+    assert a == b
+    assert a.bets == a.wins + a.losses > 0
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("strategy", ["unified-martingale", "oscars-grind", "paroli", "one-three-two-six"])
+def test_kernel_backend_matches_engine_backend(strategy, workers, tmp_path, monkeypatch):
+    # The engine backend writes session logs and the bet DB relative to cwd
+    monkeypatch.chdir(tmp_path)
+    kwargs = dict(starting_balance=10.0, max_bets=120, seed=11, num_runs=5)
+
+    kernel = StrategyComparator(backend="kernel", workers=workers, **kwargs).run_strategy(strategy)
+    engine = StrategyComparator(backend="engine", **kwargs).run_strategy(strategy)
+
+    assert "error" not in kernel and kernel["bets_placed"] > 0
+    for key in ("avg_profit_percent", "worst_profit_percent", "bets_placed", "avg_win_rate",
+                "bust_count", "min_balance", "total_wagered", "avg_bet_size", "max_bet_size"):
+        assert kernel[key] == pytest.approx(engine[key]), key
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        StrategyComparator(backend="fast")
+
+
+def test_kernel_rejects_strategies_that_are_not_self_contained():
+    with pytest.raises(ValueError):
+        run_dry_session("balance-sweep-sniper", {}, _config(1), Decimal("10"))
+
+    result = StrategyComparator(num_runs=2).run_strategy("roll-hunt")
+    assert result["skipped"] is True
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs SIGALRM")
+def test_stalled_unit_is_cut_off(monkeypatch):
+    def stall(*args, **kwargs):
+        time.sleep(30)
+
+    monkeypatch.setattr(strategy_comparison, "run_dry_session", stall)
+    comparator = StrategyComparator(num_runs=3, workers=1, unit_timeout=0.2)
+
+    started = time.monotonic()
+    runs = comparator._run_kernel(["paroli"])["paroli"]
+
+    assert time.monotonic() - started < 5
+    assert len(runs) == 3
+    assert all("timed out" in r["error"] for r in runs)
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs SIGALRM")
+def test_stalled_units_in_pool_are_cut_off(monkeypatch):
+    def stall(*args, **kwargs):
+        time.sleep(30)
+
+    # Pool workers are forked on Linux and inherit the patched kernel
+    monkeypatch.setattr(strategy_comparison, "run_dry_session", stall)
+    comparator = StrategyComparator(num_runs=4, workers=2, unit_timeout=0.2)
+
+    started = time.monotonic()
+    runs = comparator._run_kernel(["paroli"])["paroli"]
+
+    assert time.monotonic() - started < 10
+    assert len(runs) == 4
+    assert all("timed out" in r["error"] for r in runs)
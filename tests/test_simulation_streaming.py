@@ -0,0 +1,114 @@
+"""Tests for the streaming simulation APIs (running estimates, early stop)."""
+
+import asyncio
+import os
+import statistics
+import sys
+
+import pytest
+
+_src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if _src not in sys.path:
+    sys.path.insert(0, _src)
+
+from agents.simulation import StrategySimulator
+from betbot_engine.running_stats import RunningEstimate, RunningStats, wilson_interval
+from betbot_engine.strategy_simulator import iter_strategy_runs, simulate_strategy
+from betbot_strategies import get_strategy
+
+KW = dict(strategy_name="kelly-capped", params={}, rounds=40, starting_balance=100.0)
+
+
+class TestRunningStats:
+    def test_matches_batch_statistics(self):
+        values = [1.5, -2.0, 3.25, 0.0, 7.5, -1.0]
+        stats = RunningStats()
+        for v in values:
+            stats.add(v)
+        assert stats.mean == pytest.approx(statistics.mean(values))
+        assert stats.stdev == pytest.approx(statistics.stdev(values))
+        lo, hi = stats.interval()
+        assert lo < stats.mean < hi
+
+    def test_ci_undefined_below_two_samples(self):
+        stats = RunningStats()
+        stats.add(1.0)
+        assert stats.ci_halfwidth() == float("inf")
+
+    def test_wilson_interval_bounds(self):
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+        lo, hi = wilson_interval(10, 10)
+        assert 0.6 < lo < 1.0 and hi == pytest.approx(1.0)
+
+    def test_running_estimate_converges_only_with_runs_left(self):
+        est = RunningEstimate(total=4, target_ci=100.0, min_runs=1)
+        first = est.add(1.0, True)
+        assert first.completed == 1 and not first.converged  # min_runs floors at 2
+        second = est.add(1.5, False)
+        assert second.converged and second.rate == 0.5
+        assert second.rate_ci == wilson_interval(1, 2)
+
+        last = RunningEstimate(total=2, target_ci=100.0, min_runs=2)
+        last.add(1.0, False)
+        assert not last.add(1.0, False).converged  # nothing left to skip
+
+
+class TestIterMultiSeed:
+    def test_sequential_stream_matches_batch(self):
+        sim = StrategySimulator()
+        stream = list(sim.iter_multi_seed(num_seeds=5, parallel=False, **KW))
+        batch = sim.simulate_multi_seed(num_seeds=5, parallel=False, **KW)
+
+        assert [p.completed for p in stream] == [1, 2, 3, 4, 5]
+        assert [p.result.final_balance for p in stream] == [r.final_balance for r in batch]
+        assert stream[-1].roi_mean == pytest.approx(statistics.mean(r.roi for r in batch))
+        assert not any(p.converged for p in stream)
+
+    def test_parallel_stream_yields_every_seed(self):
+        sim = StrategySimulator()
+        stream = list(sim.iter_multi_seed(num_seeds=6, parallel=True, max_workers=2, **KW))
+
+        assert sorted(p.index for p in stream) == list(range(6))
+        assert {p.seed for p in stream} == {42 + i for i in range(6)}
+        assert stream[-1].completed == 6
+
+    def test_target_ci_stops_early(self):
+        sim = StrategySimulator()
+        stream = list(sim.iter_multi_seed(num_seeds=50, parallel=False, target_ci=1e9, min_runs=4, **KW))
+
+        assert len(stream) == 4
+        assert stream[-1].converged
+
+    def test_breaking_out_of_parallel_stream_returns(self):
+        sim = StrategySimulator()
+        stream = sim.iter_multi_seed(num_seeds=20, parallel=True, max_workers=2, **KW)
+        first = next(stream)
+        stream.close()
+        assert first.completed == 1
+
+    def test_async_stream(self):
+        sim = StrategySimulator()
+
+        async def collect():
+            return [p async for p in sim.astream_multi_seed(num_seeds=4, max_workers=2, **KW)]
+
+        stream = asyncio.run(collect())
+        assert sorted(p.index for p in stream) == [0, 1, 2, 3]
+        assert stream[-1].completed == 4
+
+
+class TestStrategySimulatorStreaming:
+    def test_iter_strategy_runs_and_early_stop(self):
+        cls = get_strategy("kelly-capped")
+        runs = list(iter_strategy_runs(cls, {}, n_bets=50, n_runs=30, target_ci=1e9, min_runs=5))
+        assert len(runs) == 5 and runs[-1].converged
+
+        result = simulate_strategy(cls, {}, n_bets=50, n_runs=30, target_ci=1e9, min_runs=5)
+        assert result.n_runs == 5
+        assert result.roi_mean == pytest.approx(runs[-1].roi_mean)
+
+    def test_progress_cb_sequence_unchanged(self):
+        calls = []
+        simulate_strategy(get_strategy("kelly-capped"), {}, n_bets=20, n_runs=4,
+                          progress_cb=lambda i, n: calls.append((i, n)))
+        assert calls == [(0, 4), (1, 4), (2, 4), (3, 4)]
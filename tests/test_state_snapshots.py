@@ -0,0 +1,117 @@
+import json
+import os
+import random
+import sqlite3
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.bet_database import BetDatabase  # noqa: E402
+from betbot_engine.engine import AutoBetEngine, EngineConfig  # noqa: E402
+from betbot_engine.state_snapshots import StateSnapshotter, reconstruct_state  # noqa: E402
+
+
+class DummyAPI:
+    def get_user_info(self):
+        return {"balances": [{"currency": "BTC", "main": "100.0"}]}
+
+
+def _states(n, seed=3):
+    rng = random.Random(seed)
+    state = {"phase": "farm", "streak": 0, "history": [], "scores": {"a": 1.0}}
+    for _ in range(n):
+        state = json.loads(json.dumps(state))
+        state["streak"] = rng.randint(0, 3)
+        if rng.random() < 0.3:
+            state["phase"] = rng.choice(["farm", "snipe", "recover"])
+        if rng.random() < 0.2:
+            state["history"].append(rng.random())
+        if rng.random() < 0.1:
+            state.pop("scores", None) if "scores" in state else state.update(scores={"b": 2})
+        yield state
+
+
+def test_without_deltas_get_state_runs_only_for_snapshots():
+    calls = []
+    snapshotter = StateSnapshotter(every=5, interval_sec=None)
+    records = [snapshotter.record(lambda: calls.append(1) or {"n": len(calls)}, bet) for bet in range(1, 13)]
+    assert len(calls) == 3
+    assert [bet for bet, r in enumerate(records, 1) if r] == [1, 6, 11]
+    assert records[5] == {"snapshot": "full", "state": {"n": 2}}
+
+
+def test_time_based_snapshots():
+    now = [0.0]
+    snapshotter = StateSnapshotter(every=1000, interval_sec=30, clock=lambda: now[0])
+    assert snapshotter.record(dict, 1)
+    now[0] = 29.0
+    assert snapshotter.record(dict, 2) is None
+    now[0] = 31.0
+    assert snapshotter.record(dict, 3)["snapshot"] == "full"
+
+
+def test_deltas_reconstruct_every_state():
+    snapshotter = StateSnapshotter(every=25, interval_sec=None, deltas=True)
+    records = []
+    for bet, state in enumerate(_states(200), 1):
+        records.append(snapshotter.record(lambda: state, bet))
+        assert reconstruct_state(records) == state
+    assert snapshotter.stats["full"] == 8 and snapshotter.stats["delta"] > 100
+    # Deltas only carry the keys that changed
+    assert all(set(r["set"]) <= {"phase", "streak", "history", "scores"} for r in records if r and "set" in r)
+
+
+@pytest.mark.parametrize("payloads", ["inline", "compressed"])
+def test_tail_state_comes_from_nearest_snapshot(tmp_path: Path, payloads):
+    db = BetDatabase(tmp_path / "s.db", payloads=payloads)
+    db.start_session("s1", "x", "BTC", starting_balance=Decimal("1"))
+    snapshotter = StateSnapshotter(every=50, interval_sec=None, deltas=True)
+    states = list(_states(333))
+    for bet, state in enumerate(states, 1):
+        db.log_bet("s1", {"amount": "0.1", "chance": "50"}, {"win": True, "profit": "0.1"}, bet,
+                   Decimal("1"), strategy_state=snapshotter.record(lambda: state, bet))
+    db.flush()
+    tail = db.get_session_tail_state("s1")
+    assert tail["strategy_state"] == states[-1]
+    # Last full snapshot was bet 301; later bets only stored deltas when something changed
+    assert 301 <= tail["strategy_state_bet"] <= 333
+    assert all(s == states[-1] for s in states[tail["strategy_state_bet"] - 1:])
+    assert db.get_strategy_state("s1") == states[-1]
+    assert db.get_strategy_state("missing") is None
+    db.close()
+
+
+def test_pre_policy_rows_hold_full_states(tmp_path: Path):
+    db = BetDatabase(tmp_path / "legacy.db")
+    db.start_session("s1", "x", "BTC", starting_balance=Decimal("1"))
+    for bet in range(1, 6):
+        db.log_bet("s1", {"amount": "0.1", "chance": "50"}, {"win": True, "profit": "0.1"}, bet,
+                   Decimal("1"), strategy_state={"step": bet})
+    db.log_bet("s1", {"amount": "0.1", "chance": "50"}, {"win": True, "profit": "0.1"}, 6, Decimal("1"))
+    db.flush()
+    tail = db.get_session_tail_state("s1")
+    assert tail["strategy_state"] == {"step": 5} and tail["strategy_state_bet"] == 5
+    assert tail["bet_number"] == 6
+    db.close()
+
+
+def test_engine_stores_periodic_snapshots(tmp_path: Path):
+    cfg = EngineConfig(symbol="BTC", dry_run=True, max_bets=35, seed=9, take_profit=None,
+                       stop_loss=-0.99, delay_ms=0, jitter_ms=0, log_dir=str(tmp_path / "logs"),
+                       db_path=str(tmp_path / "e.db"), state_snapshot_every=10, state_snapshot_sec=None)
+    AutoBetEngine(DummyAPI(), cfg).run(strategy_name="simple-progression-40", params={})
+
+    with sqlite3.connect(tmp_path / "e.db") as conn:
+        stored = [n for (n,) in conn.execute(
+            "SELECT bet_number FROM bet_history WHERE state_id IS NOT NULL OR strategy_state IS NOT NULL "
+            "ORDER BY bet_number")]
+    total = BetDatabase(tmp_path / "e.db").get_statistics()["total_bets"]
+    assert stored == list(range(1, total + 1, 10))
+    tail = BetDatabase(tmp_path / "e.db").get_sessions()[0]
+    state = BetDatabase(tmp_path / "e.db").get_session_tail_state(tail["session_id"])
+    assert state["strategy_state_bet"] == stored[-1]
+    assert "current_multiplier" in state["strategy_state"]
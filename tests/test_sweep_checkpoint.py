@@ -0,0 +1,120 @@
+"""Tests for sweep checkpoint / resume."""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import List
+
+import pytest
+
+_src = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+if _src not in sys.path:
+    sys.path.insert(0, _src)
+
+from agents.metrics import SingleSimResult
+from agents.simulation import StrategySimulator
+from agents.strategy_analyst import StrategyAnalyst
+from betbot_engine.strategy_simulator import simulate_strategy
+from betbot_engine.sweep_checkpoint import SweepCheckpoint
+from betbot_strategies import get_strategy
+
+KW = dict(strategy_name="kelly-capped", params={}, rounds=40, starting_balance=100.0)
+
+
+@pytest.fixture
+def ckpt_path(tmp_path):
+    return str(tmp_path / "checkpoints.db")
+
+
+def test_round_trip_preserves_result(ckpt_path):
+    result = StrategySimulator().simulate_single(seed=3, **KW)
+    with SweepCheckpoint(ckpt_path) as ckpt:
+        key = ckpt.unit_key("multi_seed", seed=3)
+        ckpt.put(key, result)
+    with SweepCheckpoint(ckpt_path, resume=True) as ckpt:
+        restored = ckpt.get(key, SingleSimResult)
+    assert restored == result
+
+
+@dataclass
+class _Curves:
+    streaks: List[int]
+    balances: List[float]
+
+
+def test_round_trip_restores_int_lists_from_type_hints(ckpt_path):
+    with SweepCheckpoint(ckpt_path, resume=True) as ckpt:
+        ckpt.put("k", _Curves(streaks=[1, 3], balances=[1.0, 2.5]))
+        restored = ckpt.get("k", _Curves)
+    assert restored == _Curves(streaks=[1, 3], balances=[1.0, 2.5])
+    assert all(type(v) is int for v in restored.streaks)
+    assert all(type(v) is float for v in restored.balances)
+
+
+def test_get_ignores_store_unless_resuming(ckpt_path):
+    result = StrategySimulator().simulate_single(seed=1, **KW)
+    with SweepCheckpoint(ckpt_path) as ckpt:
+        key = ckpt.unit_key("multi_seed", seed=1)
+        ckpt.put(key, result)
+        assert ckpt.get(key, SingleSimResult) is None
+        assert ckpt.count("multi_seed") == 1
+
+
+def test_unit_key_depends_on_every_part():
+    base = SweepCheckpoint.unit_key("k", params={"a": 1, "b": 2}, seed=1)
+    assert base == SweepCheckpoint.unit_key("k", seed=1, params={"b": 2, "a": 1})
+    assert base != SweepCheckpoint.unit_key("k", params={"a": 1, "b": 3}, seed=1)
+    assert base != SweepCheckpoint.unit_key("k", params={"a": 1, "b": 2}, seed=2)
+
+
+def test_multi_seed_resume_skips_finished_seeds(ckpt_path, monkeypatch):
+    sim = StrategySimulator()
+    fresh = sim.simulate_multi_seed(num_seeds=4, parallel=False, **KW)
+
+    # Interrupted sweep: only the first two seeds made it to disk
+    with SweepCheckpoint(ckpt_path) as ckpt:
+        sim.simulate_multi_seed(num_seeds=2, parallel=False, checkpoint=ckpt, **KW)
+
+    calls = []
+    original = StrategySimulator.simulate_single
+
+    def counting(self, *args, **kwargs):
+        calls.append(kwargs["seed"])
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(StrategySimulator, "simulate_single", counting)
+    with SweepCheckpoint(ckpt_path, resume=True) as ckpt:
+        resumed = sim.simulate_multi_seed(num_seeds=4, parallel=False, checkpoint=ckpt, **KW)
+        assert ckpt.hits == 2
+
+    assert calls == [44, 45]
+    assert resumed == fresh
+
+
+def test_simulate_strategy_resume_matches_fresh(ckpt_path):
+    cls = get_strategy("kelly-capped")
+    fresh = simulate_strategy(cls, {}, n_bets=30, n_runs=5)
+    with SweepCheckpoint(ckpt_path) as ckpt:
+        simulate_strategy(cls, {}, n_bets=30, n_runs=5, checkpoint=ckpt)
+    with SweepCheckpoint(ckpt_path, resume=True) as ckpt:
+        resumed = simulate_strategy(cls, {}, n_bets=30, n_runs=5, checkpoint=ckpt)
+        assert ckpt.hits == 5
+        assert ckpt.stored == 0
+    assert resumed.roi_values == fresh.roi_values
+    assert resumed.band_mean == fresh.band_mean
+
+
+def test_evolve_replays_mutations_on_resume(ckpt_path, tmp_path):
+    sim = StrategySimulator()
+    with SweepCheckpoint(ckpt_path) as ckpt:
+        analyst = StrategyAnalyst(simulator=sim, data_dir=str(tmp_path), checkpoint=ckpt)
+        top = [analyst.evaluate_strategy("paroli", rounds=30, num_seeds=2)]
+        first = analyst.evolve(top, mutations_per_strategy=2, rounds=30, num_seeds=2, seed=123)
+
+    with SweepCheckpoint(ckpt_path, resume=True) as ckpt:
+        analyst = StrategyAnalyst(simulator=sim, data_dir=str(tmp_path), checkpoint=ckpt)
+        # A different requested seed is overridden by the stored one
+        second = analyst.evolve(top, mutations_per_strategy=2, rounds=30, num_seeds=2, seed=999)
+        assert ckpt.stored == 0
+
+    assert [r.params for r in second] == [r.params for r in first]
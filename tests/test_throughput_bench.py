@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine import throughput_bench  # noqa: E402
+from betbot_engine.db_bench import compare_results  # noqa: E402
+from duckdice_api.api import DuckDiceAPI, DuckDiceConfig  # noqa: E402
+
+
+def test_strategy_decision_cost():
+    result = throughput_bench.bench_strategy("paroli", bets=300)
+    assert result["decisions"] == 300
+    assert result["decision_us"] > 0 and result["decisions_per_sec"] > 0
+    assert not set(throughput_bench.strategy_names()) & throughput_bench.SKIP_STRATEGIES
+
+
+def test_stand_in_server_answers_like_the_api():
+    with throughput_bench.StandInServer() as server:
+        api = DuckDiceAPI(DuckDiceConfig(api_key="k", base_url=server.url, fallback_domains=[]))
+        api.session.trust_env = False
+        assert api.get_main_balance("BTC") == 100.0
+        bet = api.play_dice("BTC", "0.001", "49.50", True)["bet"]
+        assert bet["result"] == (bet["number"] >= 5050)
+        ranged = api.play_range_dice("BTC", "0.001", [0, 4999], True)["bet"]
+        assert ranged["result"] == (ranged["number"] <= 4999) and ranged["chance"] == "50"
+        api.session.close()
+
+
+def test_suite_emits_comparable_json():
+    results = throughput_bench.run_suite(strategies=["paroli", "custom-script"], strategy_bets=100,
+                                         engine_bets=100, client_requests=20, concurrency=[1, 2],
+                                         sim_runs=2, sim_bets=50)
+    json.dumps(results)
+    assert {"python", "platform", "machine", "cpus"} <= set(results["meta"])
+    assert results["strategies"]["paroli"]["decisions"] == 100
+    assert "error" in results["strategies"]["custom-script"]
+    assert set(results["engine"]) == {"db_off", "db_on"}
+    assert all(r["bets"] == 100 for r in results["engine"].values())
+    assert set(results["client"]) == {"concurrency=1", "concurrency=2"}
+    assert all(r["requests"] == 20 and r["p99_ms"] > 0 for r in results["client"].values())
+    assert results["simulator"]["runs"] == 2
+    assert throughput_bench.format_results(results)
+
+    slower = json.loads(json.dumps(results))
+    slower["engine"]["db_off"]["bets_per_sec"] /= 2
+    assert [r["metric"] for r in compare_results(results, slower)] == ["engine.db_off.bets_per_sec"]
+
+    with pytest.raises(ValueError):
+        throughput_bench.run_suite(sections=["network"])
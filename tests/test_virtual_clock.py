@@ -0,0 +1,62 @@
+import os
+import sys
+from decimal import Decimal
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from betbot_engine.engine import EngineConfig  # noqa: E402
+from betbot_engine.sim_kernel import run_dry_session  # noqa: E402
+from betbot_engine.virtual_clock import LatencyModel, RateLimitModel, VirtualClock  # noqa: E402
+
+
+def test_sequential_timing_is_latency_plus_pacing():
+    clock = VirtualClock(latency=LatencyModel(rtt_ms=100, distribution="fixed"))
+    report = clock.run(amounts=[1.0] * 10, pauses=[0.5] * 10)
+
+    # 10 round trips, 9 pauses between them (no sleep after the last bet)
+    assert report.elapsed_sec == pytest.approx(10 * 0.1 + 9 * 0.5)
+    assert report.requests == 10
+    assert report.rate_limited == 0
+    assert report.wager_per_hour == pytest.approx(10.0 / report.elapsed_sec * 3600)
+
+
+def test_concurrency_window_raises_throughput():
+    latency = LatencyModel(rtt_ms=80, jitter_ms=20)
+    serial = VirtualClock(latency=latency, concurrency=1, seed=3).run([1.0] * 400, [])
+    windowed = VirtualClock(latency=latency, concurrency=4, seed=3).run([1.0] * 400, [])
+
+    assert windowed.bets_per_hour > 3 * serial.bets_per_hour
+
+
+@pytest.mark.parametrize("retry_after", [False, True])
+def test_rate_limit_caps_throughput_and_counts_429s(retry_after):
+    limit = RateLimitModel(max_requests=10, window_sec=1.0, backoff_ms=200, honor_retry_after=retry_after)
+    clock = VirtualClock(latency=LatencyModel(rtt_ms=20, distribution="fixed"), rate_limit=limit,
+                         concurrency=8, seed=1)
+    report = clock.run([1.0] * 300, [])
+
+    assert report.rate_limited > 0
+    assert report.requests == 300 + report.rate_limited
+    assert report.bets_per_hour <= 10 * 3600 * 1.05
+
+
+def test_unknown_latency_distribution_rejected():
+    with pytest.raises(ValueError):
+        LatencyModel(distribution="pareto")
+
+
+def test_kernel_clock_does_not_change_outcomes():
+    config = EngineConfig(symbol="btc", dry_run=True, max_bets=300, stop_loss=-0.99,
+                          delay_ms=50, jitter_ms=100, seed=9)
+    plain = run_dry_session("paroli", {}, config, Decimal("10"))
+    timed = run_dry_session("paroli", {}, config, Decimal("10"),
+                            clock=VirtualClock(latency=LatencyModel(rtt_ms=80, distribution="fixed")))
+
+    assert timed.ending_balance == plain.ending_balance
+    assert timed.bets == plain.bets and plain.timing is None
+    assert timed.timing.bets == timed.bets
+    assert timed.timing.total_wagered == pytest.approx(timed.total_wagered)
+    # At least delay + RTT per bet
+    assert timed.timing.elapsed_sec >= timed.bets * 0.08 + (timed.bets - 1) * 0.05